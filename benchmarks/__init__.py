@@ -0,0 +1,10 @@
+"""Benchmark harness for storage and endpoint hot paths.
+
+- synthetic: deterministic large-project generator at named scales
+- scenarios: the named operations that get measured
+- harness: timing, query counting, peak RSS and baseline comparison
+
+Run ``python -m benchmarks --help``. Baselines are machine-specific, so
+record one per machine (``--out``) and compare later runs to it
+(``--compare``); the command exits 1 when a scenario regressed.
+"""
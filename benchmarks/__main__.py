@@ -0,0 +1,146 @@
+"""CLI: build a synthetic project, run the scenarios, record or compare a baseline.
+
+Examples:
+  python -m benchmarks --scale 10k --out benchmarks/baseline.json
+  python -m benchmarks --scale 10k --compare benchmarks/baseline.json
+  python -m benchmarks --scale 100k --db /tmp/bench-100k.db --only lens. storage.export_json
+  python -m benchmarks --scale 100k --skip storage.insights.duplicates
+  python -m benchmarks --list
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import harness
+from benchmarks.scenarios import SCENARIOS, Context
+from benchmarks.synthetic import GENERATOR_VERSION, SCALES, build_project
+
+
+def _load_or_build(db_path, scale, seed):
+    """Open *db_path*, reusing its synthetic project when it matches scale and seed."""
+    from storage.db import Database
+
+    meta_path = db_path.with_suffix(db_path.suffix + ".meta.json")
+    wanted = {"scale_name": scale, "seed": seed, "generator_version": GENERATOR_VERSION}
+    if db_path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if {k: meta.get(k) for k in wanted} == wanted:
+            print(f"Reusing {db_path} ({scale}, seed {seed})")
+            return Database(db_path=db_path), meta
+        raise SystemExit(f"{db_path} holds a different synthetic project; "
+                         f"pick another --db or delete it")
+
+    print(f"Building {scale} project (seed {seed}) in {db_path} ...")
+    start = time.perf_counter()
+    db = Database(db_path=db_path)
+    meta = build_project(db, scale, seed=seed)
+    meta.update(wanted)
+    meta["build_seconds"] = round(time.perf_counter() - start, 1)
+    meta_path.write_text(json.dumps(meta, indent=2))
+    print(f"  built in {meta['build_seconds']}s: {meta['counts']}")
+    return db, meta
+
+
+def _context(db, project_id):
+    from web.app import create_app
+
+    app = create_app()
+    app.db = db
+    app.config["TESTING"] = True       # no rate limiting
+    with db._conn() as conn:
+        entity_ids = [r[0] for r in conn.execute(
+            "SELECT id FROM entities WHERE project_id = ? ORDER BY id LIMIT 100",
+            (project_id,))]
+        category = conn.execute(
+            "SELECT id FROM categories WHERE project_id = ? AND parent_id IS NULL "
+            "ORDER BY id LIMIT 1", (project_id,)).fetchone()
+    return Context(db=db, client=app.test_client(), project_id=project_id,
+                   entity_ids=entity_ids, category_id=category[0] if category else None)
+
+
+def _print_comparison(rows, threshold):
+    print(f"\n{'scenario':<34} {'base p50':>10} {'now p50':>10} {'change':>8} "
+          f"{'queries':>11}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        queries = f"{row['baseline_queries']}->{row['current_queries']}"
+        print(f"{row['scenario']:<34} {row['baseline_p50_ms']:>10.2f} "
+              f"{row['current_p50_ms']:>10.2f} {row['change']:>+8.0%} {queries:>11}{flag}")
+    regressed = [r["scenario"] for r in rows if r["regressed"]]
+    if regressed:
+        print(f"\n{len(regressed)} scenario(s) regressed beyond {threshold:.0%}: "
+              f"{', '.join(regressed)}")
+    else:
+        print(f"\nNo regressions beyond {threshold:.0%}.")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark storage and endpoint hot paths on a synthetic project",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("\n", 2)[2],
+    )
+    parser.add_argument("--scale", choices=list(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", type=Path,
+                        help="Database file to build into and reuse across runs "
+                             "(default: a temporary file)")
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="Scenario names or prefixes (e.g. lens. storage.get_entities)")
+    parser.add_argument("--skip", nargs="+", metavar="NAME",
+                        help="Scenario names or prefixes to leave out")
+    parser.add_argument("--repeat", type=int, default=harness.DEFAULT_REPEAT,
+                        help=f"Timed calls per scenario (default: {harness.DEFAULT_REPEAT})")
+    parser.add_argument("--out", type=Path, help="Write results here as a JSON baseline")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE",
+                        help="Compare against a baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=harness.DEFAULT_THRESHOLD,
+                        help="Allowed p50 slowdown as a fraction "
+                             f"(default: {harness.DEFAULT_THRESHOLD})")
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return 0
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["meta"].get("scale_name") != args.scale:
+            print(f"warning: baseline was recorded at scale "
+                  f"{baseline['meta'].get('scale_name')}, this run is {args.scale}")
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        db_path = args.db or Path(tmp) / "bench.db"
+        db, meta = _load_or_build(db_path, args.scale, args.seed)
+        ctx = _context(db, meta["project_id"])
+
+        def progress(name, m):
+            print(f"{name:<34} p50 {m['p50_ms']:>9.2f}ms  p95 {m['p95_ms']:>9.2f}ms  "
+                  f"{m['queries']:>5} queries  rss {m['peak_rss_mb']}MB")
+
+        results = harness.run_scenarios(ctx, names=args.only, skip=args.skip,
+                                        repeat=args.repeat,
+                                        progress=progress)
+
+    report = {"meta": {**meta, **harness.environment(), "repeat": args.repeat},
+              "results": results}
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.out}")
+    if baseline:
+        rows = harness.compare(baseline["results"], results, threshold=args.threshold)
+        if _print_comparison(rows, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
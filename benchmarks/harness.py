@@ -0,0 +1,166 @@
+"""Measure scenarios and compare results against a stored baseline.
+
+For every scenario: one untimed warm-up call, then ``repeat`` timed calls.
+Recorded per scenario:
+
+- p50_ms / p95_ms / mean_ms: wall-clock latency of the timed calls
+- queries: SQL statements executed per call (median), counted with a
+  trace callback on every connection the Database hands out
+- peak_rss_mb: the process's peak resident set size after the scenario,
+  and rss_growth_mb: how much this scenario raised it
+
+compare() flags scenarios whose p50 grew by more than ``threshold``
+(ignoring differences under ``min_delta_ms``, which are noise) or whose
+query count grew at all, since query counts are deterministic.
+"""
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_REPEAT = 20
+DEFAULT_THRESHOLD = 0.25        # fraction of the baseline p50
+DEFAULT_MIN_DELTA_MS = 2.0
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class QueryCounter:
+    """Counts SQL statements run on connections from ``db._get_conn``."""
+
+    def __init__(self, db):
+        self.count = 0
+        self._db = db
+        self._get_conn = db._get_conn
+
+    def _trace(self, _statement):
+        self.count += 1
+
+    def _counting_get_conn(self):
+        conn = self._get_conn()
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def __enter__(self):
+        # Instance attribute shadows the method, for _conn() and the app too
+        self._db._get_conn = self._counting_get_conn
+        return self
+
+    def __exit__(self, *exc):
+        del self._db._get_conn
+
+
+def measure(scenario, ctx, repeat=DEFAULT_REPEAT):
+    """Run *scenario* ``repeat`` times (after one warm-up); return its metrics."""
+    rss_before = _peak_rss_mb()
+    timings, queries = [], []
+    with QueryCounter(ctx.db) as counter:
+        for i in range(repeat + 1):
+            if scenario.setup:
+                scenario.setup(ctx)
+            counter.count = 0
+            start = time.perf_counter()
+            scenario.run(ctx)
+            elapsed = (time.perf_counter() - start) * 1000
+            if i:  # the first call warms caches and is not recorded
+                timings.append(elapsed)
+                queries.append(counter.count)
+    timings.sort()
+    rss_after = _peak_rss_mb()
+    return {
+        "runs": repeat,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": int(statistics.median(queries)),
+        "peak_rss_mb": rss_after,
+        "rss_growth_mb": (round(rss_after - rss_before, 1)
+                          if rss_after is not None else None),
+    }
+
+
+def _matches(name, patterns):
+    return any(name == p or name.startswith(p) for p in patterns)
+
+
+def run_scenarios(ctx, names=None, skip=None, repeat=DEFAULT_REPEAT, progress=None):
+    """Measure the named scenarios (default: all) in registry order.
+
+    Args:
+        ctx: scenarios.Context
+        names: Scenario names or name prefixes (e.g. "lens."); None for all
+        skip: Names or prefixes to leave out
+        repeat: Timed calls per scenario
+        progress: Optional callable(name, metrics) after each scenario
+
+    Returns:
+        {name: metrics}
+    """
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        if (names and not _matches(name, names)) or (skip and _matches(name, skip)):
+            continue
+        results[name] = measure(scenario, ctx, repeat)
+        if progress:
+            progress(name, results[name])
+    return results
+
+
+def environment():
+    """Where the numbers came from."""
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD,
+            min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """Per-scenario comparison of two result dicts ({name: metrics}).
+
+    Returns:
+        list of {scenario, baseline_p50_ms, current_p50_ms, change,
+        baseline_queries, current_queries, regressed} for the scenarios in
+        both, in *current*'s order
+    """
+    rows = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        base_p50, cur_p50 = before["p50_ms"], now["p50_ms"]
+        change = (cur_p50 - base_p50) / base_p50 if base_p50 else 0.0
+        slower = change > threshold and cur_p50 - base_p50 >= min_delta_ms
+        more_queries = now["queries"] > before["queries"]
+        rows.append({
+            "scenario": name,
+            "baseline_p50_ms": base_p50,
+            "current_p50_ms": cur_p50,
+            "change": round(change, 3),
+            "baseline_queries": before["queries"],
+            "current_queries": now["queries"],
+            "regressed": slower or more_queries,
+        })
+    return rows
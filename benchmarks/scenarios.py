@@ -0,0 +1,147 @@
+"""Named benchmark scenarios.
+
+Each scenario is one operation against a synthetic project (see
+benchmarks.synthetic): ``storage.*`` call Database methods or core
+functions directly, ``api.*`` and ``lens.*`` go through the Flask test
+client. ``setup`` runs untimed before every measured call; the lens
+scenarios use it to drop cached responses so they measure the
+computation, and ``*.cached`` variants measure the warm path instead.
+"""
+from collections import namedtuple
+from dataclasses import dataclass, field
+
+from web.response_cache import response_cache
+
+Scenario = namedtuple("Scenario", "name run setup", defaults=(None,))
+
+# name -> Scenario, in run order
+SCENARIOS = {}
+
+
+@dataclass
+class Context:
+    """What scenarios run against."""
+    db: object
+    client: object              # Flask test client for the same database
+    project_id: int
+    entity_ids: list = field(default_factory=list)     # sample for per-entity calls
+    category_id: int = None
+
+
+def scenario(name, setup=None):
+    """Register the decorated function(ctx) as scenario *name*."""
+    def register(fn):
+        SCENARIOS[name] = Scenario(name, fn, setup)
+        return fn
+    return register
+
+
+def _get(ctx, url):
+    response = ctx.client.get(url.format(pid=ctx.project_id))
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} returned {response.status_code}")
+    return response.get_data()
+
+
+def _drop_cached_responses(ctx):
+    response_cache.clear()
+    ctx.db.clear_response_cache(ctx.project_id)
+
+
+# ── Storage ──────────────────────────────────────────────────
+
+@scenario("storage.get_companies")
+def _get_companies(ctx):
+    ctx.db.get_companies(project_id=ctx.project_id, limit=50)
+
+
+@scenario("storage.get_companies.filtered")
+def _get_companies_filtered(ctx):
+    ctx.db.get_companies(project_id=ctx.project_id, category_id=ctx.category_id,
+                         search="health", sort_by="confidence", sort_dir="desc", limit=50)
+
+
+@scenario("storage.get_entities")
+def _get_entities(ctx):
+    ctx.db.get_entities(ctx.project_id, limit=50)
+
+
+@scenario("storage.current_attributes")
+def _current_attributes(ctx):
+    with ctx.db._conn() as conn:
+        for entity_id in ctx.entity_ids:
+            ctx.db._get_current_attributes(conn, entity_id)
+
+
+@scenario("storage.category_stats")
+def _category_stats(ctx):
+    ctx.db.get_category_stats(project_id=ctx.project_id)
+
+
+@scenario("storage.export_json")
+def _export_json(ctx):
+    from storage.export import iter_json
+    for _ in iter_json(ctx.db, project_id=ctx.project_id):
+        pass
+
+
+def _detector(name):
+    def run(ctx):
+        from web.blueprints.insights import detectors
+        with ctx.db._conn() as conn:
+            getattr(detectors, f"_detect_{name}")(conn, ctx.project_id)
+    return run
+
+
+# One scenario per insights detector, so a slow one shows up on its own
+for _name in ["feature_gaps", "pricing_outliers", "sparse_coverage", "stale_entities",
+              "feature_clusters", "duplicates", "attribute_coverage"]:
+    scenario(f"storage.insights.{_name}")(_detector(_name))
+
+
+
+def _drop_search_index(ctx):
+    ctx.db.clear_search_index(ctx.project_id)
+
+
+@scenario("storage.search.build", setup=_drop_search_index)
+def _search_build(ctx):
+    from core.search_index import refresh
+    refresh(ctx.db, ctx.project_id)
+
+
+@scenario("storage.search.retrieve")
+def _search_retrieve(ctx):
+    from core.search_index import retrieve
+    retrieve(ctx.db, ctx.project_id, "enterprise pricing for analytics platforms")
+
+# ── Endpoints ────────────────────────────────────────────────
+
+_ENDPOINTS = {
+    "api.companies": "/api/companies?project_id={pid}&limit=50",
+    "api.entities": "/api/entities?project_id={pid}&limit=50",
+    "api.stats": "/api/stats?project_id={pid}",
+}
+
+_LENS_ENDPOINTS = {
+    "lens.competitive_matrix": "/api/lenses/competitive/matrix?project_id={pid}",
+    "lens.market_map": ("/api/lenses/competitive/market-map?project_id={pid}"
+                       "&x_attr=employee_count&y_attr=founded_year&size_attr=price_max"),
+    "lens.product_pricing": "/api/lenses/product/pricing?project_id={pid}",
+    "lens.design_scoring": "/api/lenses/design/scoring?project_id={pid}",
+    "lens.signals_timeline": "/api/lenses/signals/timeline?project_id={pid}",
+    "lens.signals_trends": "/api/lenses/signals/trends?project_id={pid}",
+    "lens.signals_summary": "/api/lenses/signals/summary?project_id={pid}",
+}
+
+
+def _endpoint(url):
+    return lambda ctx: _get(ctx, url)
+
+
+for _name, _url in _ENDPOINTS.items():
+    scenario(_name)(_endpoint(_url))
+for _name, _url in _LENS_ENDPOINTS.items():
+    scenario(_name, setup=_drop_cached_responses)(_endpoint(_url))
+scenario("lens.competitive_matrix.cached")(
+    _endpoint(_LENS_ENDPOINTS["lens.competitive_matrix"]))
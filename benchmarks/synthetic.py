@@ -0,0 +1,269 @@
+"""Deterministic synthetic projects for benchmarking.
+
+build_project() fills a Database with one project at a named scale:
+companies with tags and categories, entities with several historical
+values per attribute, evidence rows and a monitoring change feed. The
+same seed always yields the same rows (ids, values and timestamps), so
+two runs of a benchmark measure the same data.
+
+Rows are written with executemany in batches straight into the tables
+rather than through the repository methods, so a 100k-entity project
+with millions of attribute rows builds in minutes, not hours. Triggers
+(version counters) still fire as they do for real writes.
+"""
+import json
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from web.blueprints.monitoring import _shared as monitoring_shared
+
+GENERATOR_VERSION = 1
+_BATCH_SIZE = 5000
+_EPOCH = datetime(2024, 1, 1)
+_SPAN_DAYS = 540
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Row counts for one synthetic project."""
+    entities: int
+    attributes: int             # attribute slugs set on every entity
+    history: int                # values captured per (entity, attribute)
+    companies: int
+    categories: int             # top-level; each gets 3 subcategories
+    evidence_per_entity: int
+    changes_per_entity: int
+
+
+SCALES = {
+    "tiny": Scale(entities=200, attributes=8, history=2, companies=200,
+                  categories=4, evidence_per_entity=1, changes_per_entity=1),
+    "10k": Scale(entities=10_000, attributes=12, history=3, companies=10_000,
+                 categories=12, evidence_per_entity=2, changes_per_entity=3),
+    "100k": Scale(entities=100_000, attributes=12, history=3, companies=100_000,
+                  categories=20, evidence_per_entity=2, changes_per_entity=3),
+}
+
+_TAGS = [
+    "ai", "b2b", "b2c", "saas", "marketplace", "hardware", "wearable", "telehealth",
+    "diagnostics", "mental-health", "fitness", "nutrition", "sleep", "pharmacy",
+    "insurance", "clinical-trials", "genomics", "imaging", "remote-monitoring", "payments",
+]
+_FEATURES = [
+    "SSO", "API", "Webhooks", "MFA", "Audit Log", "SAML", "SCIM", "Dark Mode",
+    "Mobile App", "Offline Mode", "Export CSV", "Custom Roles", "Slack Integration",
+    "HIPAA", "SOC 2", "Analytics Dashboard", "Public API", "White Label",
+]
+_PRICING_MODELS = ["freemium", "subscription", "usage_based", "per_seat", "tiered", "custom"]
+_CITIES = [("London", "UK"), ("Berlin", "DE"), ("Boston", "US"), ("San Francisco", "US"),
+           ("Paris", "FR"), ("Toronto", "CA"), ("Singapore", "SG"), ("Stockholm", "SE")]
+_STAGES = ["seed", "series_a", "series_b", "series_c", "growth", "public"]
+_SYLLABLES = [
+    "ak", "bel", "cor", "dyn", "ev", "fin", "gal", "hel", "ix", "jun", "kor", "lum",
+    "mer", "nov", "or", "pax", "qui", "ray", "sol", "tek", "ul", "vet", "wel", "xen",
+    "yor", "zen", "ami", "bio", "cla", "dor", "ena", "flo", "gen", "hal", "ivo", "mira",
+]
+_NAME_SUFFIXES = ["", "", "", " Health", " Labs", " AI", " Care", " Bio", " Systems", " Medical"]
+_CHANGE_TYPES = ["content_change", "pricing_change", "feature_change", "new_release"]
+_SEVERITIES = ["info", "info", "minor", "major", "critical"]
+
+# (slug, data_type, value factory)
+_ATTRIBUTES = [
+    ("features", "tags", lambda r: json.dumps(r.sample(_FEATURES, r.randint(2, 7)))),
+    ("pricing_model", "text", lambda r: r.choice(_PRICING_MODELS)),
+    ("price_min", "number", lambda r: str(r.choice([0, 9, 19, 29, 49, 99]))),
+    ("price_max", "number", lambda r: str(r.choice([99, 199, 299, 499, 999]))),
+    ("hq_city", "text", lambda r: r.choice(_CITIES)[0]),
+    ("hq_country", "text", lambda r: r.choice(_CITIES)[1]),
+    ("employee_count", "number", lambda r: str(r.randint(2, 5000))),
+    ("founded_year", "number", lambda r: str(r.randint(1995, 2024))),
+    ("funding_stage", "text", lambda r: r.choice(_STAGES)),
+    ("description", "text", lambda r: " ".join(r.choices(_TAGS + _FEATURES, k=24))),
+    ("design_patterns", "tags", lambda r: json.dumps(r.sample(
+        ["card-grid", "wizard", "table", "chart", "modal", "hero"], 2))),
+    ("ux_navigation", "text", lambda r: r.choice(["sidebar", "top-bar", "tabs", "hamburger"])),
+]
+
+ENTITY_SCHEMA = {
+    "version": 1,
+    "entity_types": [{
+        "name": "Company", "slug": "company", "description": "Synthetic company",
+        "icon": "building", "parent_type": None,
+        "attributes": [{"name": slug.replace("_", " ").title(), "slug": slug,
+                        "data_type": data_type} for slug, data_type, _ in _ATTRIBUTES],
+    }],
+    "relationships": [],
+}
+
+
+def _ensure_monitoring_tables(conn):
+    # The blueprint creates its tables once per process; this database may be new
+    monitoring_shared._TABLE_ENSURED = False
+    monitoring_shared._ensure_tables(conn)
+
+
+def _timestamp(rng):
+    moment = _EPOCH + timedelta(seconds=rng.randrange(_SPAN_DAYS * 86400))
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _names(rng, count):
+    """*count* distinct company-like names built from syllables."""
+    seen = set()
+    while len(seen) < count:
+        stem = "".join(rng.choices(_SYLLABLES, k=rng.randint(2, 3))).capitalize()
+        name = stem + rng.choice(_NAME_SUFFIXES)
+        if name not in seen:
+            seen.add(name)
+            yield name
+
+
+def _batched(rows, conn, sql):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= _BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def build_project(db, scale, seed=0, name=None):
+    """Create one synthetic project in *db*.
+
+    Args:
+        db: Database to write into
+        scale: Scale, or a key of SCALES
+        seed: Random seed; equal seeds give identical projects
+        name: Project name (default derived from scale and seed)
+
+    Returns:
+        dict with project_id, the scale, seed and the row counts written
+    """
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    rng = random.Random(seed)
+    project_id = db.create_project(
+        name=name or f"Benchmark {scale.entities} (seed {seed})",
+        purpose="Synthetic benchmark data", entity_schema=ENTITY_SCHEMA,
+    )
+    counts = {}
+
+    with db._conn() as conn:
+        # Categories: top-level plus three subcategories each
+        top_ids = []
+        for i in range(scale.categories):
+            cur = conn.execute(
+                "INSERT INTO categories (project_id, name, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (project_id, f"Category {i:03d}", _timestamp(rng), _timestamp(rng)))
+            top_ids.append(cur.lastrowid)
+        sub_ids = {}
+        for i, parent in enumerate(top_ids):
+            sub_ids[parent] = []
+            for j in range(3):
+                cur = conn.execute(
+                    "INSERT INTO categories (project_id, name, parent_id, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (project_id, f"Subcategory {i:03d}-{j}", parent,
+                     _timestamp(rng), _timestamp(rng)))
+                sub_ids[parent].append(cur.lastrowid)
+        counts["categories"] = len(top_ids) * 4
+
+        def companies():
+            for i, name in enumerate(_names(rng, scale.companies)):
+                category = rng.choice(top_ids)
+                city, country = rng.choice(_CITIES)
+                yield (
+                    project_id, f"company-{i:06d}", name,
+                    f"https://company-{i:06d}.example.com",
+                    " ".join(rng.choices(_TAGS + _FEATURES, k=12)),
+                    category, rng.choice(sub_ids[category]),
+                    json.dumps(rng.sample(_TAGS, rng.randint(1, 5))),
+                    city, country, rng.choice(_STAGES), rng.choice(_PRICING_MODELS),
+                    round(rng.random(), 3), int(rng.random() < 0.05),
+                    _timestamp(rng),
+                )
+        _batched(companies(), conn, """
+            INSERT INTO companies
+                (project_id, slug, name, url, what, category_id, subcategory_id, tags,
+                 hq_city, hq_country, funding_stage, pricing_model, confidence_score,
+                 is_starred, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""")
+        counts["companies"] = scale.companies
+
+        def entities():
+            for i, name in enumerate(_names(rng, scale.entities)):
+                created = _timestamp(rng)
+                yield (
+                    project_id, "company", name, f"entity-{i:06d}",
+                    rng.choice(top_ids), json.dumps(rng.sample(_TAGS, rng.randint(1, 4))),
+                    int(rng.random() < 0.05), created, created,
+                )
+        _batched(entities(), conn, """
+            INSERT INTO entities
+                (project_id, type_slug, name, slug, category_id, tags, is_starred,
+                 created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""")
+        entity_ids = [r[0] for r in conn.execute(
+            "SELECT id FROM entities WHERE project_id = ? ORDER BY id", (project_id,))]
+        counts["entities"] = scale.entities
+
+        attributes = _ATTRIBUTES[:scale.attributes]
+
+        def attribute_rows():
+            for eid in entity_ids:
+                for slug, _, factory in attributes:
+                    for _ in range(scale.history):
+                        yield (eid, slug, factory(rng), rng.choice(["ai", "manual", "import"]),
+                               round(rng.random(), 2), _timestamp(rng))
+        _batched(attribute_rows(), conn, """
+            INSERT INTO entity_attributes
+                (entity_id, attr_slug, value, source, confidence, captured_at)
+            VALUES (?, ?, ?, ?, ?, ?)""")
+        counts["entity_attributes"] = scale.entities * len(attributes) * scale.history
+
+        def evidence_rows():
+            for eid in entity_ids:
+                for k in range(scale.evidence_per_entity):
+                    ui_pattern = rng.choice(["form", "table", "chart", "hero", "wizard"])
+                    yield (eid, "screenshot", f"{project_id}/{eid}/shot-{k}.png",
+                           f"https://entity-{eid}.example.com/page-{k}",
+                           json.dumps({"ui_patterns": [ui_pattern],
+                                       "journey_stage": rng.choice(["landing", "pricing",
+                                                                    "dashboard"])}),
+                           _timestamp(rng))
+        _batched(evidence_rows(), conn, """
+            INSERT INTO evidence
+                (entity_id, evidence_type, file_path, source_url, metadata_json, captured_at)
+            VALUES (?, ?, ?, ?, ?, ?)""")
+        counts["evidence"] = scale.entities * scale.evidence_per_entity
+
+        _ensure_monitoring_tables(conn)
+
+        def change_rows():
+            for eid in entity_ids:
+                for k in range(scale.changes_per_entity):
+                    change_type = rng.choice(_CHANGE_TYPES)
+                    yield (project_id, eid, change_type, rng.choice(_SEVERITIES),
+                           f"{change_type.replace('_', ' ').title()} #{k}",
+                           json.dumps({"field": rng.choice(attributes)[0]}),
+                           _timestamp(rng))
+        _batched(change_rows(), conn, """
+            INSERT INTO change_feed
+                (project_id, entity_id, change_type, severity, title, details_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)""")
+        counts["change_feed"] = scale.entities * scale.changes_per_entity
+
+    with db._conn() as conn:
+        conn.execute("ANALYZE")
+
+    return {
+        "project_id": project_id,
+        "scale": asdict(scale),
+        "seed": seed,
+        "generator_version": GENERATOR_VERSION,
+        "counts": counts,
+    }
@@ -126,6 +126,10 @@ RATE_LIMIT_MAX_REQUESTS = {
     "read": 300,     # Read-only endpoints per window
 }
 
+# Request profiling (opt-in: APP_PROFILING=1; results at /api/_perf)
+PROFILING_ENABLED = os.environ.get("APP_PROFILING", "0") == "1"
+PROFILING_SLOW_QUERY_MS = float(os.environ.get("APP_PROFILING_SLOW_MS", "50"))
+
 # Taxonomy evolution thresholds
 MIN_COMPANIES_FOR_NEW_CATEGORY = 3
 MIN_COMPANIES_FOR_SPLIT = 8
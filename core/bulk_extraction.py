@@ -0,0 +1,308 @@
+"""Bulk extraction engine — project-wide extraction from captured evidence.
+
+Backfilling a freshly captured project used to mean one ad-hoc extraction
+job per entity/evidence pair. This module turns that into a single job:
+
+    1. Plan — list the project's (optionally filtered) text evidence in one
+       query, load each entity type definition once, and group pairs whose
+       evidence text and attribute set are identical into one task.
+    2. Run — send each task to the LLM once, with bounded concurrency,
+       honouring cancellation between tasks.
+    3. Write — fan each task's result out to every entity that shares the
+       evidence and flush jobs + results in large transactions via
+       Database.record_bulk_extractions.
+
+Grouping ignores the entity name because the extraction cache key does too
+(see core.extraction.extract_from_content): the same text with the same
+attribute set already returns the same cached result for every entity.
+"""
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+# (entity, evidence) outcomes buffered before each write transaction
+FLUSH_EVERY = 50
+
+
+@dataclass
+class ExtractionTarget:
+    """One (entity, evidence) pair that receives a task's results."""
+    entity_id: int
+    entity_name: str
+    evidence_id: int
+    source_ref: Optional[str] = None
+
+
+@dataclass
+class BulkTask:
+    """One LLM extraction: unique evidence text + attribute set."""
+    key: str
+    file_path: str              # representative evidence file (relative path)
+    evidence_type: str
+    entity_type: str
+    attributes: list
+    targets: list = field(default_factory=list)
+
+    @property
+    def source_description(self):
+        desc = f"captured {self.evidence_type}"
+        source_ref = self.targets[0].source_ref if self.targets else None
+        if source_ref:
+            desc += f" from {source_ref}"
+        return desc
+
+
+@dataclass
+class BulkPlan:
+    """Deduplicated set of tasks for a project."""
+    project_id: int
+    tasks: list = field(default_factory=list)
+    evidence_count: int = 0
+    skipped: list = field(default_factory=list)   # [{evidence_id, entity_id, reason}]
+
+    def summary(self):
+        targets = sum(len(t.targets) for t in self.tasks)
+        return {
+            "project_id": self.project_id,
+            "evidence_count": self.evidence_count,
+            "task_count": len(self.tasks),
+            "target_count": targets,
+            "deduplicated": targets - len(self.tasks),
+            "skipped": self.skipped,
+        }
+
+
+def _attribute_signature(attributes):
+    return ",".join(sorted(a["slug"] for a in attributes))
+
+
+def plan_bulk_extraction(db, project_id, entity_ids=None, evidence_ids=None,
+                         evidence_types=None, include_extracted=False):
+    """Plan extraction work across a project.
+
+    Args:
+        db: Database instance
+        project_id: Project to plan for
+        entity_ids: Restrict to these entities (optional)
+        evidence_ids: Restrict to these evidence items (optional)
+        evidence_types: Restrict to these evidence types (default: page_archive, document)
+        include_extracted: Re-extract evidence that already has a completed job
+
+    Returns:
+        BulkPlan
+    """
+    from core.capture import load_evidence_text
+
+    rows = db.get_evidence_for_extraction(
+        project_id, entity_ids=entity_ids, evidence_ids=evidence_ids,
+        evidence_types=evidence_types, include_extracted=include_extracted,
+    )
+    type_defs = {td["slug"]: td for td in db.get_entity_type_defs(project_id)}
+    plan = BulkPlan(project_id=project_id, evidence_count=len(rows))
+
+    tasks = {}
+    digests = {}   # file_path -> text digest (None if no text); read each file once
+    for row in rows:
+        type_def = type_defs.get(row["type_slug"])
+        attributes = (type_def or {}).get("attributes") or []
+        if not attributes:
+            plan.skipped.append({
+                "evidence_id": row["id"], "entity_id": row["entity_id"],
+                "reason": "no attributes defined for entity type",
+            })
+            continue
+
+        path = row["file_path"]
+        if path not in digests:
+            try:
+                text = load_evidence_text(path)
+            except ValueError:
+                text = None
+            digests[path] = hashlib.sha256(text.encode()).hexdigest() if text else None
+        digest = digests[path]
+        if digest is None:
+            plan.skipped.append({
+                "evidence_id": row["id"], "entity_id": row["entity_id"],
+                "reason": "no extractable text",
+            })
+            continue
+
+        key = f"{digest[:32]}:{_attribute_signature(attributes)}"
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = BulkTask(
+                key=key,
+                file_path=path,
+                evidence_type=row["evidence_type"],
+                entity_type=type_def.get("name", row["type_slug"]),
+                attributes=attributes,
+            )
+        task.targets.append(ExtractionTarget(
+            entity_id=row["entity_id"],
+            entity_name=row["entity_name"],
+            evidence_id=row["id"],
+            source_ref=row.get("source_url"),
+        ))
+
+    plan.tasks = list(tasks.values())
+    return plan
+
+
+class BulkExtractionJob:
+    """Runs a BulkPlan in the calling thread, with progress and cancellation.
+
+    Progress and status are safe to read from other threads via to_dict().
+    *on_progress*, if given, is called with the job after each finished task.
+    """
+
+    def __init__(self, db, plan, model=None, concurrency=DEFAULT_CONCURRENCY,
+                 timeout=120, flush_every=FLUSH_EVERY, on_progress=None):
+        self.db = db
+        self.plan = plan
+        self.model = model
+        self.concurrency = max(1, min(int(concurrency or DEFAULT_CONCURRENCY), MAX_CONCURRENCY))
+        self.timeout = timeout
+        self.flush_every = flush_every
+        self.on_progress = on_progress
+        self.status = "pending"
+        self.error = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._buffer = []
+        self.progress = {
+            "tasks_total": len(plan.tasks),
+            "tasks_done": 0,
+            "tasks_failed": 0,
+            "jobs_written": 0,
+            "results_written": 0,
+            "cost_usd": 0.0,
+        }
+
+    def cancel(self):
+        """Request cancellation. Running LLM calls finish; queued tasks are dropped."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "status": self.status,
+                "error": self.error,
+                "model": self.model,
+                "concurrency": self.concurrency,
+                "plan": self.plan.summary(),
+                "progress": dict(self.progress),
+            }
+
+    def _extract(self, task):
+        from core.capture import load_evidence_text
+        from core.extraction import extract_from_content, MAX_EVIDENCE_LENGTH
+
+        text = load_evidence_text(task.file_path)
+        if not text:
+            raise ValueError(f"Evidence text unavailable: {task.file_path}")
+        return extract_from_content(
+            content=text[:MAX_EVIDENCE_LENGTH],
+            entity_name=task.targets[0].entity_name,
+            entity_type=task.entity_type,
+            attributes=task.attributes,
+            source_description=task.source_description,
+            model=self.model,
+            timeout=self.timeout,
+        )
+
+    def _record(self, task, result=None, error=None):
+        """Buffer one finished task's outcome for every target."""
+        if result is not None and not result.success:
+            error = result.error or "Extraction failed"
+        for i, target in enumerate(task.targets):
+            item = {
+                "entity_id": target.entity_id,
+                "evidence_id": target.evidence_id,
+                "source_ref": target.source_ref,
+                "model": result.model if result else self.model,
+                # The LLM was called once; charge it to the first target only
+                "cost_usd": result.cost_usd if result and i == 0 else 0,
+                "duration_ms": result.duration_ms if result and i == 0 else 0,
+                "results": [] if error else result.extracted_attributes,
+                "error": error,
+            }
+            self._buffer.append(item)
+        with self._lock:
+            self.progress["tasks_done"] += 1
+            if error:
+                self.progress["tasks_failed"] += 1
+            if result:
+                self.progress["cost_usd"] += result.cost_usd
+        if len(self._buffer) >= self.flush_every:
+            self._flush()
+        if self.on_progress:
+            self.on_progress(self)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        items, self._buffer = self._buffer, []
+        self.db.record_bulk_extractions(self.plan.project_id, items)
+        with self._lock:
+            self.progress["jobs_written"] += len(items)
+            self.progress["results_written"] += sum(len(i["results"]) for i in items)
+
+    def run(self):
+        """Execute the plan. Returns the final to_dict() snapshot."""
+        with self._lock:
+            self.status = "running"
+        start = time.time()
+        queue = iter(self.plan.tasks)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                running = {}
+
+                def _fill():
+                    while len(running) < self.concurrency and not self.cancelled:
+                        task = next(queue, None)
+                        if task is None:
+                            return
+                        running[pool.submit(self._extract, task)] = task
+
+                _fill()
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task = running.pop(future)
+                        try:
+                            self._record(task, result=future.result())
+                        except Exception as e:
+                            logger.warning("Bulk extraction task %s failed: %s", task.key, e)
+                            self._record(task, error=str(e))
+                    _fill()
+            self._flush()
+        except Exception as e:
+            logger.error("Bulk extraction for project %s failed: %s", self.plan.project_id, e)
+            with self._lock:
+                self.status = "failed"
+                self.error = str(e)
+            return self.to_dict()
+
+        with self._lock:
+            self.status = "cancelled" if self.cancelled else "completed"
+            self.progress["duration_ms"] = int((time.time() - start) * 1000)
+        logger.info(
+            "Bulk extraction for project %s %s: %d/%d tasks, %d results",
+            self.plan.project_id, self.status, self.progress["tasks_done"],
+            self.progress["tasks_total"], self.progress["results_written"],
+        )
+        return self.to_dict()
@@ -0,0 +1,205 @@
+"""Bulk company import from CSV / XLSX — streaming parse, vectorised validation.
+
+Rows are read incrementally (csv module / openpyxl read-only mode), validated
+in pandas chunks, and written with one executemany transaction via
+Database.bulk_upsert_companies. Each rejected row is reported with its
+spreadsheet row number so the user can fix the file and re-import.
+"""
+import csv
+import io
+import logging
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".csv", ".xlsx"}
+
+# Rows validated per pandas pass
+VALIDATE_CHUNK_ROWS = 5000
+
+# Text columns and their maximum stored length
+TEXT_LIMITS = {
+    "name": 500, "url": 2000, "what": 2000, "target": 2000, "products": 2000,
+    "funding": 2000, "geography": 500, "tam": 2000, "employee_range": 100,
+    "funding_stage": 100, "hq_city": 200, "hq_country": 200, "linkedin_url": 500,
+}
+IMPORT_COLUMNS = list(TEXT_LIMITS) + ["tags", "founded_year", "total_funding_usd"]
+
+MAX_TAGS = 20
+MAX_TAG_LENGTH = 100
+
+_URL_PATTERN = r"^https?://[^\s/?#]+"
+
+
+def _normalise_header(value):
+    return re.sub(r"\s+", "_", str(value or "").strip().lower())
+
+
+def iter_rows(source, filename):
+    """Yield one dict per data row of a CSV or XLSX file, keyed by header.
+
+    Headers are lower-cased with spaces turned into underscores, and each
+    row's spreadsheet row number is added under ``_row``. *source* is a
+    path or a binary file object; nothing is loaded in full.
+
+    Raises:
+        ValueError: unsupported file extension
+    """
+    ext = Path(filename).suffix.lower()
+    if ext == ".csv":
+        yield from _iter_csv(source)
+    elif ext == ".xlsx":
+        yield from _iter_xlsx(source)
+    else:
+        raise ValueError(f"Unsupported file format: {ext}")
+
+
+def _iter_csv(source):
+    if isinstance(source, (str, Path)):
+        f = open(source, newline="", encoding="utf-8-sig", errors="replace")
+    else:
+        f = io.TextIOWrapper(source, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        reader = csv.reader(f)
+        header = [_normalise_header(h) for h in next(reader, [])]
+        for row_number, values in enumerate(reader, start=2):
+            if any(v.strip() for v in values):
+                yield {**dict(zip(header, values)), "_row": row_number}
+    finally:
+        if isinstance(source, (str, Path)):
+            f.close()
+        else:
+            f.detach()
+
+
+def _iter_xlsx(source):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [_normalise_header(h) for h in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if any(v not in (None, "") for v in values):
+                row = {h: ("" if v is None else v) for h, v in zip(header, values)}
+                yield {**row, "_row": row_number}
+    finally:
+        wb.close()
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _split_tags(value):
+    if isinstance(value, list):
+        tags = value
+    elif isinstance(value, str):
+        tags = value.split(",")
+    else:
+        return []
+    return [t.strip()[:MAX_TAG_LENGTH] for t in tags if str(t).strip()][:MAX_TAGS]
+
+
+def validate_chunk(rows, first_row=2):
+    """Validate a list of raw row dicts in vectorised pandas passes.
+
+    Args:
+        rows: Raw row dicts from iter_rows()
+        first_row: Row number of rows[0] for rows without ``_row``
+
+    Returns:
+        (records, errors) — company dicts ready for bulk_upsert_companies
+        (with their row number under ``_row``), and [{row, name, url, error}]
+        for rejected rows.
+    """
+    import pandas as pd  # heavy; only needed once an import actually runs
+
+    df = pd.DataFrame.from_records(rows).reindex(columns=IMPORT_COLUMNS)
+    df.index = [r.get("_row") or first_row + i for i, r in enumerate(rows)]
+
+    for col, limit in TEXT_LIMITS.items():
+        text = df[col].astype("string").str.strip().str.slice(0, limit)
+        df[col] = text.mask(text == "")
+
+    error = pd.Series(pd.NA, index=df.index, dtype="string")
+    valid_url = df["url"].str.match(_URL_PATTERN).fillna(False).astype(bool)
+    error = error.mask(~valid_url & df["url"].notna(), "Invalid URL (must be http or https)")
+    error = error.mask(df["url"].isna(), "Missing url")
+    error = error.mask(df["name"].isna(), "Missing name")
+
+    founded = pd.to_numeric(df["founded_year"], errors="coerce")
+    founded = founded.where((founded > -10000) & (founded < 100000))
+    df["founded_year"] = founded.astype("Float64").apply(
+        lambda v: int(v) if pd.notna(v) else None)
+    funding = pd.to_numeric(df["total_funding_usd"], errors="coerce")
+    df["total_funding_usd"] = funding.where((funding >= 0) & (funding < 1e12))
+
+    rejected = df[error.notna()]
+    errors = [
+        {"row": int(idx), "name": r["name"] if pd.notna(r["name"]) else None,
+         "url": r["url"] if pd.notna(r["url"]) else None, "error": err}
+        for (idx, r), err in zip(rejected.iterrows(), error[error.notna()])
+    ]
+
+    accepted = df[error.isna()].astype(object)
+    accepted = accepted.where(accepted.notna(), None)
+    records = accepted.to_dict("records")
+    for row_number, record in zip(accepted.index, records):
+        record["tags"] = _split_tags(record["tags"])
+        record["_row"] = int(row_number)
+    return records, errors
+
+
+def import_companies(db, project_id, rows, skip_existing=False, max_rows=None):
+    """Validate and upsert *rows* (from iter_rows) in a single transaction.
+
+    Args:
+        db: Database instance
+        project_id: Target project
+        rows: Iterable of raw row dicts
+        skip_existing: Report rows whose URL is already in the project
+            instead of updating them
+        max_rows: Stop with ValueError once more rows than this are read
+
+    Returns:
+        {"total_rows", "created", "updated", "skipped", "errors": [...]}
+        Rows repeating a URL earlier in the file update that company.
+    """
+    existing = db.get_company_urls(project_id)
+    report = {"total_rows": 0, "created": 0, "updated": 0, "skipped": 0, "errors": []}
+
+    def _records():
+        row_number = 2
+        for chunk in _chunks(rows, VALIDATE_CHUNK_ROWS):
+            report["total_rows"] += len(chunk)
+            if max_rows and report["total_rows"] > max_rows:
+                raise ValueError(f"Too many rows (max {max_rows:,})")
+            records, errors = validate_chunk(chunk, first_row=row_number)
+            row_number += len(chunk)
+            report["errors"].extend(errors)
+            for record in records:
+                if skip_existing and record["url"] in existing:
+                    report["errors"].append({
+                        "row": record["_row"], "name": record["name"], "url": record["url"],
+                        "error": "Already in project",
+                    })
+                    continue
+                yield record
+
+    result = db.bulk_upsert_companies(_records(), project_id, existing_urls=existing)
+    report.update(result)
+    report["errors"].sort(key=lambda e: e["row"])
+    report["skipped"] = len(report["errors"])
+    if report["skipped"]:
+        logger.info("Bulk import into project %s: %d created, %d updated, %d skipped",
+                    project_id, report["created"], report["updated"], report["skipped"])
+    return report
@@ -11,9 +11,11 @@ Supports:
     - PDF/HTML document download
     - Manual file upload (any type)
     - Thumbnail generation for screenshots
+    - Text sidecars ({filename}.text.md + .text.json) derived at store time
 """
 import asyncio
 import hashlib
+import json
 import mimetypes
 import re
 import threading
@@ -124,11 +126,14 @@ def store_file(project_id: int, entity_id: int, evidence_type: str,
 def delete_file(relative_path: str) -> bool:
     """Delete an evidence file from disk.
 
+    Also removes the file's text sidecars, if any.
     Returns True if file was deleted, False if it didn't exist.
     """
     abs_path = evidence_path_absolute(relative_path)
     if abs_path.exists():
         abs_path.unlink()
+        for suffix in (TEXT_SIDECAR_SUFFIX, TEXT_META_SUFFIX):
+            abs_path.with_name(abs_path.name + suffix).unlink(missing_ok=True)
         # Clean up empty parent directories
         for parent in [abs_path.parent, abs_path.parent.parent, abs_path.parent.parent.parent]:
             if parent != EVIDENCE_DIR and parent.exists() and not any(parent.iterdir()):
@@ -185,6 +190,244 @@ def get_mime_type(relative_path: str) -> str:
     return mime or "application/octet-stream"
 
 
+# ── Text Sidecars ─────────────────────────────────────────────
+#
+# Text is derived once, when evidence is stored, and written next to the
+# evidence file as ``{filename}.text.md`` (normalised markdown-ish text) plus
+# ``{filename}.text.json`` (language, word count, headings). Extraction and
+# classification read the sidecar instead of re-parsing the original file.
+
+TEXT_SIDECAR_SUFFIX = ".text.md"
+TEXT_META_SUFFIX = ".text.json"
+TEXT_DERIVABLE_EXTENSIONS = {
+    ".html", ".htm", ".pdf", ".docx",
+    ".txt", ".md", ".csv", ".json", ".xml",
+}
+_HTML_EXTENSIONS = {".html", ".htm"}
+_HTML_NOISE_TAGS = ["script", "style", "noscript", "svg", "path", "meta", "link",
+                    "nav", "footer", "template", "iframe"]
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MAX_SIDECAR_HEADINGS = 50
+
+# Small stopword sets — enough to tell the common research languages apart
+_LANGUAGE_STOPWORDS = {
+    "en": {"the", "and", "of", "to", "in", "is", "for", "with", "that", "on", "are", "this"},
+    "de": {"der", "die", "und", "das", "ist", "mit", "den", "von", "für", "nicht", "ein", "zu"},
+    "fr": {"le", "la", "les", "et", "des", "est", "une", "pour", "dans", "du", "que", "avec"},
+    "es": {"el", "la", "los", "y", "de", "que", "en", "es", "para", "con", "una", "por"},
+    "it": {"il", "di", "che", "e", "la", "per", "con", "una", "sono", "della", "non", "gli"},
+    "nl": {"de", "het", "een", "en", "van", "is", "dat", "voor", "met", "niet", "op", "zijn"},
+}
+
+
+def _html_soup(html: str):
+    """Parse HTML with lxml when installed, falling back to the stdlib parser."""
+    from bs4 import BeautifulSoup
+    try:
+        return BeautifulSoup(html, "lxml")
+    except Exception:
+        return BeautifulSoup(html, "html.parser")
+
+
+def _html_to_text(html: str) -> tuple[str, list[str]]:
+    """Convert HTML to markdown-ish text. Returns (text, headings)."""
+    soup = _html_soup(html)
+    for element in soup(_HTML_NOISE_TAGS):
+        element.decompose()
+
+    headings = []
+    for tag in soup.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
+        heading = tag.get_text(" ", strip=True)
+        if heading:
+            headings.append(heading)
+            tag.string = f"{'#' * int(tag.name[1])} {heading}"
+    for tag in soup.find_all("li"):
+        item = tag.get_text(" ", strip=True)
+        if item and not tag.find(["ul", "ol"]):
+            tag.string = f"- {item}"
+
+    text = soup.get_text(separator="\n", strip=True)
+    # Give headings breathing room so they split cleanly into chunks later
+    text = re.sub(r"\n(#{1,6} )", r"\n\n\1", text)
+    return text, headings
+
+
+def _pdf_to_text(data: bytes) -> Optional[str]:
+    """Extract text from a PDF. Requires the optional ``pypdf`` package."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.debug("pypdf not installed — skipping PDF text derivation")
+        return None
+
+    import io
+    reader = PdfReader(io.BytesIO(data))
+    pages = [(page.extract_text() or "").strip() for page in reader.pages]
+    return "\n\n".join(p for p in pages if p)
+
+
+def _docx_to_text(data: bytes) -> tuple[str, list[str]]:
+    """Extract paragraphs from a DOCX file. Headings become markdown headings."""
+    import io
+    import zipfile
+    from defusedxml import ElementTree
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        root = ElementTree.fromstring(zf.read("word/document.xml"))
+
+    lines, headings = [], []
+    for para in root.iter(f"{_DOCX_NS}p"):
+        text = "".join(node.text or "" for node in para.iter(f"{_DOCX_NS}t")).strip()
+        if not text:
+            continue
+        style = para.find(f"{_DOCX_NS}pPr/{_DOCX_NS}pStyle")
+        style_name = style.get(f"{_DOCX_NS}val", "") if style is not None else ""
+        level = re.match(r"Heading(\d)", style_name)
+        if level or style_name == "Title":
+            headings.append(text)
+            lines.append(f"{'#' * (int(level.group(1)) if level else 1)} {text}")
+        else:
+            lines.append(text)
+    return "\n\n".join(lines), headings
+
+
+def _detect_language(text: str) -> Optional[str]:
+    """Guess the language from stopword frequency. Returns None if unsure."""
+    words = re.findall(r"[^\W\d_]+", text[:20000].lower())
+    if len(words) < 20:
+        return None
+    scores = {
+        lang: sum(1 for w in words if w in stopwords)
+        for lang, stopwords in _LANGUAGE_STOPWORDS.items()
+    }
+    lang, score = max(scores.items(), key=lambda kv: kv[1])
+    return lang if score >= len(words) * 0.05 else None
+
+
+def derive_text(data: bytes, ext: str) -> Optional[dict]:
+    """Derive normalised text and metadata from raw evidence bytes.
+
+    Args:
+        data: Raw file bytes
+        ext: File extension including the dot (e.g. ".html")
+
+    Returns:
+        Dict with text, format, word_count, language, headings —
+        or None if the format is not text-derivable.
+    """
+    ext = ext.lower()
+    if ext not in TEXT_DERIVABLE_EXTENSIONS or not data:
+        return None
+
+    headings = []
+    if ext in _HTML_EXTENSIONS:
+        text, headings = _html_to_text(data.decode("utf-8", errors="replace"))
+        fmt = "html"
+    elif ext == ".pdf":
+        text = _pdf_to_text(data)
+        if text is None:
+            return None
+        fmt = "pdf"
+    elif ext == ".docx":
+        text, headings = _docx_to_text(data)
+        fmt = "docx"
+    else:
+        text = data.decode("utf-8", errors="replace")
+        if ext == ".md":
+            headings = re.findall(r"^#{1,6}\s+(.+?)\s*$", text, flags=re.MULTILINE)
+        fmt = ext.lstrip(".")
+
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return {
+        "text": text,
+        "format": fmt,
+        "word_count": len(text.split()),
+        "language": _detect_language(text),
+        "headings": headings[:_MAX_SIDECAR_HEADINGS],
+    }
+
+
+def text_sidecar_path(relative_path: str) -> Path:
+    """Absolute path of the text sidecar for an evidence file."""
+    abs_path = evidence_path_absolute(relative_path)
+    return abs_path.with_name(abs_path.name + TEXT_SIDECAR_SUFFIX)
+
+
+def _text_meta_path(relative_path: str) -> Path:
+    abs_path = evidence_path_absolute(relative_path)
+    return abs_path.with_name(abs_path.name + TEXT_META_SUFFIX)
+
+
+def write_text_sidecar(relative_path: str, data: bytes = None) -> Optional[dict]:
+    """Derive text for an evidence file and write its sidecars.
+
+    Never raises — a failed derivation must not fail the capture itself.
+
+    Args:
+        relative_path: Relative evidence path (as stored in DB)
+        data: Raw file bytes (read from disk if omitted)
+
+    Returns:
+        Sidecar metadata dict (without the text), or None if nothing was written
+    """
+    try:
+        if data is None:
+            data = evidence_path_absolute(relative_path).read_bytes()
+        derived = derive_text(data, Path(relative_path).suffix)
+        if derived is None:
+            return None
+        text = derived.pop("text")
+        text_sidecar_path(relative_path).write_text(text, encoding="utf-8")
+        _text_meta_path(relative_path).write_text(json.dumps(derived), encoding="utf-8")
+        return derived
+    except Exception as e:
+        logger.warning("Text derivation failed for {}: {}", relative_path, e)
+        return None
+
+
+def read_text_metadata(relative_path: str) -> Optional[dict]:
+    """Read the sidecar metadata for an evidence file, or None if absent."""
+    meta_path = _text_meta_path(relative_path)
+    if not meta_path.exists():
+        return None
+    try:
+        return json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def load_evidence_text(relative_path: str) -> Optional[str]:
+    """Return the derived text for an evidence file.
+
+    Reads the sidecar when it is present and newer than the evidence file;
+    otherwise derives the text now and writes the sidecar for next time
+    (backfills evidence captured before sidecars existed).
+
+    Returns None if the file is missing or its format is not text-derivable.
+    """
+    abs_path = evidence_path_absolute(relative_path)
+    if not abs_path.exists():
+        return None
+
+    sidecar = text_sidecar_path(relative_path)
+    if sidecar.exists() and sidecar.stat().st_mtime >= abs_path.stat().st_mtime:
+        return sidecar.read_text(encoding="utf-8", errors="replace")
+
+    if write_text_sidecar(relative_path) is None:
+        return None
+    return sidecar.read_text(encoding="utf-8", errors="replace")
+
+
+def _text_summary(sidecar_meta: Optional[dict]) -> dict:
+    """Fields from sidecar metadata worth copying onto the evidence record."""
+    if not sidecar_meta:
+        return {}
+    return {
+        "word_count": sidecar_meta["word_count"],
+        "language": sidecar_meta["language"],
+    }
+
+
 # ── Capture Results ───────────────────────────────────────────
 
 @dataclass
@@ -319,10 +562,13 @@ async def _capture_website_async(
                 project_id, entity_id, "page_archive",
                 html_bytes, html_name,
             )
+            text_summary = _text_summary(write_text_sidecar(html_path, html_bytes))
+            metadata.update(text_summary)
             evidence_paths.append(("page_archive", html_path, {
                 "format": "html",
                 "size": len(html_bytes),
                 "title": title,
+                **text_summary,
             }))
 
         return CaptureResult(
@@ -488,6 +734,7 @@ def capture_document(
     filename = _generate_filename(url_slug, ext)
 
     relative_path = store_file(project_id, entity_id, evidence_type, content, filename)
+    metadata.update(_text_summary(write_text_sidecar(relative_path, content)))
 
     result = CaptureResult(
         success=True, url=url,
@@ -589,6 +836,7 @@ def store_upload(
     }
 
     relative_path = store_file(project_id, entity_id, evidence_type, file_data, filename)
+    meta.update(_text_summary(write_text_sidecar(relative_path, file_data)))
 
     result = CaptureResult(
         success=True, url="",
@@ -9,6 +9,8 @@ Usage:
     from core.compat import project_uses_entities, entity_to_company, company_data_to_entity
 """
 from core.migration import _COMPANY_FIELD_MAP
+from storage.pagination import Keyset, Page
+from storage.repos.companies import COMPLETENESS_FIELDS
 
 # Reverse map: attribute slug → company column name
 _ATTR_TO_COMPANY = {v: k for k, v in _COMPANY_FIELD_MAP.items()}
@@ -18,33 +20,42 @@ def project_uses_entities(db, project_id):
     """Check whether a project has migrated to entity-based data.
 
     Returns True if the project has an entity_schema with entity_types
-    that include a "company" type_slug (or any multi-type schema).
+    that include a "company" type_slug (or any multi-type schema). The
+    answer is memoised by the database layer and reset when the schema
+    or the project's entities change.
     """
     if not project_id:
         return False
-    with db._get_conn() as conn:
-        row = conn.execute(
-            "SELECT entity_schema FROM projects WHERE id = ?",
-            (project_id,),
-        ).fetchone()
-        if not row or not row["entity_schema"]:
-            return False
-        import json
-        try:
-            schema = json.loads(row["entity_schema"])
-        except (json.JSONDecodeError, TypeError):
-            return False
-        entity_types = schema.get("entity_types", [])
-        # Multi-type schemas use entity system; single-type "company" schemas
-        # may or may not — check if entities actually exist
-        if len(entity_types) > 1:
-            return True
-        # For single-type, check if there are actual entities
-        count = conn.execute(
-            "SELECT COUNT(*) as cnt FROM entities WHERE project_id = ? AND is_deleted = 0",
-            (project_id,),
-        ).fetchone()["cnt"]
-        return count > 0
+    return db.project_uses_entities(project_id)
+
+
+# Largest IN (...) list sent to SQLite in one query
+_ID_BATCH = 500
+
+
+def load_current_attributes(conn, entity_ids):
+    """Latest value of every attribute for *entity_ids*, in one query per 500 ids.
+
+    Returns {entity_id: [{"attr_slug", "value"}, ...]}; entities without
+    attributes are absent.
+    """
+    current = {}
+    ids = list(entity_ids)
+    for i in range(0, len(ids), _ID_BATCH):
+        batch = ids[i:i + _ID_BATCH]
+        placeholders = ",".join("?" * len(batch))
+        rows = conn.execute(
+            f"""SELECT entity_id, attr_slug, value FROM entity_attributes
+                WHERE id IN (
+                    SELECT MAX(id) FROM entity_attributes
+                    WHERE entity_id IN ({placeholders})
+                    GROUP BY entity_id, attr_slug
+                )""",
+            batch,
+        ).fetchall()
+        for r in rows:
+            current.setdefault(r["entity_id"], []).append(r)
+    return current
 
 
 def entity_to_company(entity_row, attributes):
@@ -150,11 +161,49 @@ def company_data_to_entity(data, project_id):
     return entity_fields, attributes
 
 
-def list_entities_as_companies(db, project_id, **filters):
+def _current_value_sql(col):
+    """SQL for the current value of the attribute backing company column *col*."""
+    return ("(SELECT value FROM entity_attributes WHERE entity_id = e.id "
+            f"AND attr_slug = '{_COMPANY_FIELD_MAP[col]}' ORDER BY id DESC LIMIT 1)")
+
+
+# sort_by -> (SQL expression, NULL substitute for keyset cursors)
+_SORT_COLUMNS = {
+    "name": ("e.name", None),
+    "created_at": ("e.created_at", None),
+    "updated_at": ("e.updated_at", None),
+    "category": ("c.name", ""),
+    "confidence": ("e.confidence_score", -1.0),
+    "starred": ("e.is_starred", 0),
+    "geography": (_current_value_sql("geography"), ""),
+    "founded_year": (f"CAST({_current_value_sql('founded_year')} AS INTEGER)", -1),
+}
+
+
+def _company_keyset(sort_by, sort_dir):
+    """Keyset ordering for list_entities_as_companies (entity id breaks ties)."""
+    if sort_by not in _SORT_COLUMNS:
+        sort_by = "name"
+    desc = (sort_dir or "asc").lower() == "desc"
+    expr, null = _SORT_COLUMNS[sort_by]
+    return Keyset(f"entity-companies:{sort_by}:{'desc' if desc else 'asc'}",
+                  (expr, "sort_key", desc, null), ("e.id", "id"))
+
+
+def list_entities_as_companies(db, project_id, limit=200, **filters):
     """Query entities and return them formatted as company dicts.
 
-    Supports the same filter params as the company list endpoint.
+    Supports the same filter params as the company list endpoint
+    (Database.get_companies). Filters on attribute-backed columns
+    (geography, funding stage, relationship status) match each entity's
+    current value in SQL; current attributes for the page are then
+    loaded in one batched query. ``cursor`` continues after a previous
+    page's ``next_cursor``.
+
+    Returns: Page of company dicts
     """
+    keyset = _company_keyset(filters.get("sort_by", "name"), filters.get("sort_dir"))
+    cursor = filters.get("cursor")
     with db._get_conn() as conn:
         conditions = ["e.project_id = ?", "e.is_deleted = 0", "e.type_slug = 'company'"]
         params = [project_id]
@@ -167,36 +216,57 @@ def list_entities_as_companies(db, project_id, **filters):
             conditions.append("e.is_starred = 1")
 
         if filters.get("search"):
-            conditions.append("e.name LIKE ?")
-            params.append(f"%{filters['search']}%")
-
-        sort_by = filters.get("sort_by", "name")
-        sort_dir = "DESC" if filters.get("sort_dir", "asc").lower() == "desc" else "ASC"
-        sort_col = {
-            "name": "e.name",
-            "created_at": "e.created_at",
-            "updated_at": "e.updated_at",
-        }.get(sort_by, "e.name")
-
-        offset = filters.get("offset", 0)
-
-        sql = f"""SELECT e.* FROM entities e
+            term = f"%{filters['search']}%"
+            conditions.append(f"(e.name LIKE ? OR {_current_value_sql('what')} LIKE ? "
+                              f"OR {_current_value_sql('products')} LIKE ?)")
+            params.extend([term, term, term])
+
+        for tag in filters.get("tags") or []:
+            conditions.append("e.tags LIKE ?")
+            params.append(f'%"{tag}"%')
+
+        if filters.get("geography"):
+            conditions.append(f"{_current_value_sql('geography')} LIKE ?")
+            params.append(f"%{filters['geography']}%")
+
+        if filters.get("funding_stage"):
+            conditions.append(f"{_current_value_sql('funding_stage')} = ?")
+            params.append(filters["funding_stage"])
+
+        relationship_status = filters.get("relationship_status")
+        if relationship_status == "any":
+            conditions.append(f"{_current_value_sql('relationship_status')} IS NOT NULL")
+        elif relationship_status:
+            conditions.append(f"{_current_value_sql('relationship_status')} = ?")
+            params.append(relationship_status)
+
+        after, after_params = keyset.where(cursor)
+        if after:
+            conditions.append(after)
+            params.extend(after_params)
+
+        sql = f"""SELECT e.*, c.name as category_name, {keyset.keys[0].expr} as sort_key
+                  FROM entities e
+                  LEFT JOIN categories c ON e.category_id = c.id
                   WHERE {' AND '.join(conditions)}
-                  ORDER BY {sort_col} {sort_dir}
-                  LIMIT 200 OFFSET ?"""
-        params.append(offset)
+                  ORDER BY {keyset.order_by()}
+                  LIMIT ? OFFSET ?"""
+        params.extend([limit + 1, 0 if cursor else filters.get("offset", 0)])
 
-        entities = conn.execute(sql, params).fetchall()
+        entities = keyset.page(conn.execute(sql, params).fetchall(), limit)
+        attributes = load_current_attributes(conn, [e["id"] for e in entities])
 
-        result = []
-        for ent in entities:
-            attrs = conn.execute(
-                "SELECT attr_slug, value FROM entity_attributes WHERE entity_id = ?",
-                (ent["id"],),
-            ).fetchall()
-            result.append(entity_to_company(ent, attrs))
+    result = []
+    for ent in entities:
+        company = entity_to_company(ent, attributes.get(ent["id"], []))
+        company["category_name"] = ent["category_name"]
+        filled = sum(1 for f in COMPLETENESS_FIELDS if company.get(f))
+        company["completeness"] = round(filled / len(COMPLETENESS_FIELDS), 2)
+        result.append(company)
 
-        return result
+    if filters.get("needs_enrichment"):
+        result = [c for c in result if c["completeness"] < 0.5]
+    return Page(result, entities.next_cursor)
 
 
 def get_entity_as_company(db, entity_id):
@@ -208,10 +278,7 @@ def get_entity_as_company(db, entity_id):
         ).fetchone()
         if not entity:
             return None
-        attrs = conn.execute(
-            "SELECT attr_slug, value FROM entity_attributes WHERE entity_id = ?",
-            (entity_id,),
-        ).fetchall()
+        attrs = load_current_attributes(conn, [entity_id]).get(entity_id, [])
         return entity_to_company(entity, attrs)
 
 
@@ -250,7 +317,8 @@ def create_entity_from_company_data(db, data, project_id):
             )
 
         conn.commit()
-        return entity_id
+    db.invalidate_entity_mode(project_id)
+    return entity_id
 
 
 def update_entity_from_company_data(db, entity_id, fields):
@@ -0,0 +1,207 @@
+"""Entity graph queries and server-side force layout for the KG views.
+
+build_graph() assembles the /api/entity-graph payload from a handful of
+set-based queries (GraphMixin): one for the nodes, one for every edge
+between them, one for the projected attributes, plus a recursive CTE when
+the view is a k-hop neighbourhood around a focus entity.
+
+Layouts are computed here with a vectorised Fruchterman-Reingold pass and
+cached in graph_layouts under the project's graph version, so a large
+graph is laid out once per change rather than on every page load. A stale
+layout of the same view seeds the next one, which keeps existing nodes
+roughly where the user last saw them.
+"""
+import logging
+
+from storage.repos.graph import HIERARCHY_EDGE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRAPH_LIMIT = 200
+MAX_GRAPH_NODES = 5000
+MAX_GRAPH_DEPTH = 4
+
+# Force layout tuning
+LAYOUT_SPACING = 60.0          # ideal edge length, in layout units
+LAYOUT_ITERATIONS = 80
+LAYOUT_WARM_ITERATIONS = 25    # when seeded from a previous layout
+LAYOUT_GRAVITY = 0.02          # pull towards the origin; keeps components together
+# Above this many nodes, repulsion is estimated from a fresh random sample
+# of nodes each iteration instead of all n² pairs
+EXACT_REPULSION_NODES = 1000
+REPULSION_SAMPLE = 256
+_REPULSION_BLOCK = 512         # rows of the n×n repulsion computed at once
+
+
+def graph_key(type_slug=None, focus=None, depth=None, limit=None):
+    """Cache key identifying one graph view of a project."""
+    return (f"type={type_slug or ''};focus={focus or ''};"
+            f"depth={depth if focus else ''};limit={limit or ''}")
+
+
+def force_layout(node_ids, edges, seed_positions=None, iterations=None):
+    """Fruchterman-Reingold layout.
+
+    Args:
+        node_ids: Node identifiers, in a stable order
+        edges: (source, target) pairs of node ids; unknown ids are ignored
+        seed_positions: {node_id: (x, y)} to start from (e.g. a stale layout)
+        iterations: Override the iteration count
+
+    Returns: {node_id: (x, y)} centred on the origin.
+    """
+    import numpy as np  # only layouts need it; keeps app startup light
+
+    n = len(node_ids)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {node_ids[0]: (0.0, 0.0)}
+
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    pairs = np.array([(index[s], index[t]) for s, t in edges
+                      if s in index and t in index and s != t], dtype=np.int64)
+    pairs = pairs.reshape(-1, 2)
+
+    k = LAYOUT_SPACING
+    radius = k * np.sqrt(n)
+    rng = np.random.default_rng(n)
+    pos = rng.uniform(-radius / 2, radius / 2, size=(n, 2))
+    seeded = 0
+    if seed_positions:
+        for node_id, i in index.items():
+            if node_id in seed_positions:
+                pos[i] = seed_positions[node_id]
+                seeded += 1
+    if iterations is None:
+        iterations = LAYOUT_WARM_ITERATIONS if seeded > n // 2 else LAYOUT_ITERATIONS
+
+    temperature = radius / 10 if seeded <= n // 2 else k
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        disp = _repulsion(pos, k, rng)
+        if len(pairs):
+            delta = pos[pairs[:, 0]] - pos[pairs[:, 1]]
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+            pull = delta * (dist / k)[:, None]
+            np.subtract.at(disp, pairs[:, 0], pull)
+            np.add.at(disp, pairs[:, 1], pull)
+        disp -= pos * LAYOUT_GRAVITY * np.sqrt(n)
+
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 0.01)
+        pos += disp / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature = max(temperature - cooling, 1.0)
+
+    pos -= pos.mean(axis=0)
+    return {node_id: (round(float(pos[i, 0]), 2), round(float(pos[i, 1]), 2))
+            for node_id, i in index.items()}
+
+
+def _repulsion(pos, k, rng):
+    """Repulsive displacement k²/d for every node, exact or sampled."""
+    import numpy as np
+
+    n = len(pos)
+    others, scale = pos, 1.0
+    if n > EXACT_REPULSION_NODES:
+        others = pos[rng.choice(n, REPULSION_SAMPLE, replace=False)]
+        scale = n / REPULSION_SAMPLE
+    # With weights w = k²/|p - o|²: Σ w·(p - o) = p·Σw - W·o, all matrix products
+    others_sq = (others ** 2).sum(axis=1)
+    disp = np.empty_like(pos)
+    for start in range(0, n, _REPULSION_BLOCK):
+        block = pos[start:start + _REPULSION_BLOCK]
+        dist2 = (block ** 2).sum(axis=1)[:, None] + others_sq[None, :] - 2 * block @ others.T
+        weights = k * k / np.maximum(dist2, 0.01)
+        disp[start:start + _REPULSION_BLOCK] = (
+            block * weights.sum(axis=1)[:, None] - weights @ others)
+    return disp * scale
+
+
+def build_graph(db, project_id, type_slug=None, focus=None, depth=1,
+                limit=DEFAULT_GRAPH_LIMIT, attrs=(), layout=False):
+    """Graph payload for /api/entity-graph.
+
+    Args:
+        db: Database instance
+        project_id: Project ID
+        type_slug: Only entities of this type
+        focus: Entity id; restrict the graph to its *depth*-hop neighbourhood
+        depth: Hops from *focus* (clamped to 1..MAX_GRAPH_DEPTH)
+        limit: Max nodes (clamped to MAX_GRAPH_NODES); nearest first with *focus*
+        attrs: Attribute slugs to include as ``attr_<slug>``; None for all
+        layout: Add cached force-layout ``x``/``y`` to every node
+
+    Returns: {nodes, edges, version, truncated} (+ focus, depth; + layout info)
+    """
+    limit = max(1, min(limit or DEFAULT_GRAPH_LIMIT, MAX_GRAPH_NODES))
+    depth = max(1, min(depth or 1, MAX_GRAPH_DEPTH))
+    version = db.get_graph_version(project_id)
+
+    hops = None
+    if focus:
+        hops = db.get_entity_neighbourhood(project_id, focus, depth=depth, limit=limit + 1)
+        truncated = len(hops) > limit
+        hood = list(hops)[:limit]
+        rows = db.get_graph_nodes(project_id, type_slug=type_slug, entity_ids=hood)
+    else:
+        rows = db.get_graph_nodes(project_id, type_slug=type_slug, limit=limit + 1)
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+
+    ids = [r["id"] for r in rows]
+    projection = {}
+    if ids and (attrs is None or attrs):
+        projection = db.get_attribute_projection(ids, attrs)
+
+    nodes = []
+    for r in rows:
+        node = {
+            "id": f"entity-{r['id']}",
+            "entity_id": r["id"],
+            "name": r["name"],
+            "type": r["type_slug"],
+            "parent_entity_id": r["parent_entity_id"],
+            "child_count": r["child_count"],
+            "evidence_count": r["evidence_count"],
+            "is_starred": bool(r["is_starred"]),
+            "category_id": r["category_id"],
+        }
+        if hops is not None:
+            node["hops"] = hops[r["id"]]
+        for attr_slug, value in projection.get(r["id"], {}).items():
+            node[f"attr_{attr_slug}"] = value
+        nodes.append(node)
+
+    raw_edges = db.get_graph_edges(ids) if ids else []
+    edges = [{
+        "source": f"entity-{e['from_entity_id']}",
+        "target": f"entity-{e['to_entity_id']}",
+        "type": e["type"],
+        "label": "has" if e["type"] == HIERARCHY_EDGE else e["type"],
+    } for e in raw_edges]
+
+    result = {"nodes": nodes, "edges": edges, "version": version, "truncated": truncated}
+    if focus:
+        result.update({"focus": focus, "depth": depth})
+    if layout:
+        key = graph_key(type_slug, focus, depth, limit)
+        positions, cached = _cached_layout(db, project_id, key, version, ids, raw_edges)
+        for node in nodes:
+            node["x"], node["y"] = positions[node["entity_id"]]
+        result["layout"] = {"cached": cached, "version": version}
+    return result
+
+
+def _cached_layout(db, project_id, key, version, ids, raw_edges):
+    """Positions for *ids* from the layout cache, computing and storing on a miss."""
+    cached = db.get_graph_layout(project_id, key)
+    if cached and cached[0] == version and set(ids) <= cached[1].keys():
+        return cached[1], True
+
+    edge_pairs = [(e["from_entity_id"], e["to_entity_id"]) for e in raw_edges]
+    positions = force_layout(ids, edge_pairs, seed_positions=cached[1] if cached else None)
+    db.save_graph_layout(project_id, key, version, positions)
+    logger.debug("Laid out %d nodes for project %s (%s, version %s)",
+                 len(ids), project_id, key, version)
+    return positions, False
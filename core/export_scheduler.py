@@ -0,0 +1,99 @@
+"""Debounced auto-export of taxonomy_data.json / taxonomy_master.md.
+
+Pipeline batches and edits used to regenerate both files from scratch
+every time. They now call schedule_export(), which waits until writes
+have been quiet for EXPORT_DEBOUNCE_SECONDS (but never longer than
+EXPORT_MAX_DELAY_SECONDS after the first request) and then runs
+storage.export.export_incremental, which skips the export entirely if
+the project's data version hasn't moved.
+"""
+import logging
+import threading
+import time
+
+from storage.export import export_incremental
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DEBOUNCE_SECONDS = 10
+EXPORT_MAX_DELAY_SECONDS = 60
+
+
+class ExportScheduler:
+    """One pending export per (database, project), debounced."""
+
+    def __init__(self, delay=EXPORT_DEBOUNCE_SECONDS, max_delay=EXPORT_MAX_DELAY_SECONDS):
+        self.delay = delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._pending = {}   # (db_path, project_id) -> (timer, db, first_requested_at)
+
+    def schedule(self, db, project_id=None):
+        """Export *project_id* once writes settle. Returns immediately."""
+        key = (str(db.db_path), project_id)
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(key)
+            first = now
+            if pending:
+                timer, _, first = pending
+                if now - first >= self.max_delay:
+                    return  # already due; don't postpone it again
+                timer.cancel()
+            delay = min(self.delay, max(0.0, first + self.max_delay - now))
+            timer = threading.Timer(delay, self._run, args=(key,))
+            timer.daemon = True
+            self._pending[key] = (timer, db, first)
+            timer.start()
+
+    def _run(self, key):
+        with self._lock:
+            pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self._export(pending[1], key[1])
+
+    @staticmethod
+    def _export(db, project_id):
+        try:
+            result = export_incremental(db, project_id=project_id)
+            if result["exported"]:
+                logger.info("Auto-export for project %s at version %s (%d sections rebuilt)",
+                            project_id, result["version"], result["sections_rebuilt"])
+        except Exception:
+            logger.exception("Auto-export for project %s failed", project_id)
+
+    def flush(self):
+        """Run every pending export now (e.g. at shutdown)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for (_, project_id), (timer, db, _) in pending.items():
+            timer.cancel()
+            self._export(db, project_id)
+
+    def cancel(self):
+        """Drop every pending export without running it."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for timer, _, _ in pending.values():
+            timer.cancel()
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+
+_scheduler = ExportScheduler()
+
+
+def schedule_export(db, project_id=None):
+    """Request a debounced, incremental export for a project."""
+    _scheduler.schedule(db, project_id)
+
+
+def flush_exports():
+    _scheduler.flush()
+
+
+def cancel_pending_exports():
+    _scheduler.cancel()
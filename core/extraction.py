@@ -9,6 +9,7 @@ Supports:
     - Schema-aware extraction (attributes matched to entity type definition)
     - Confidence scoring per extracted value
     - Contradiction detection across multiple sources
+    - Chunked map-reduce extraction for content longer than one prompt
 """
 import hashlib
 import json
@@ -16,6 +17,7 @@ import logging
 import re
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
@@ -28,6 +30,14 @@ logger = logging.getLogger(__name__)
 # Maximum content length sent to LLM (characters)
 MAX_CONTENT_LENGTH = 80_000
 
+# Longer content is split into chunks of at most this many characters and
+# extracted in parallel (see extract_from_content_chunked)
+CHUNK_SIZE = 20_000
+CHUNK_WORKERS = 4
+
+# Upper bound on how much of an evidence file is read at all (characters)
+MAX_EVIDENCE_LENGTH = 2_000_000
+
 
 # ── HTML Stripping ────────────────────────────────────────────
 
@@ -56,9 +66,15 @@ def _strip_html(raw_content: str) -> str:
         return text
 
 
+_HTML_TAG_RE = re.compile(r"<(?:[a-zA-Z][a-zA-Z0-9]*|!doctype|!--)[\s>/]", re.IGNORECASE)
+
+
 def _maybe_strip_html(content: str) -> str:
-    """Strip HTML from content if it appears to be HTML, otherwise return as-is."""
-    if content and "<" in content[:1000]:
+    """Strip HTML from content if it appears to be HTML, otherwise return as-is.
+
+    Sidecar text is already stripped, so only content with real tags is parsed.
+    """
+    if content and _HTML_TAG_RE.search(content[:1000]):
         return _strip_html(content)
     return content
 
@@ -97,7 +113,7 @@ def _db_cache_get(key: str):
         conn = db._get_conn()
         try:
             _ensure_cache_table(conn)
-            data = mcp_cache_get(conn, key)
+            data = mcp_cache_get(conn, key, source="extraction")
             if data is not None:
                 logger.debug("Extraction DB cache hit: %s", key)
                 return data
@@ -310,13 +326,15 @@ def _build_extraction_schema(attributes):
     }
 
 
-def _read_evidence_content(evidence, max_length=MAX_CONTENT_LENGTH):
+def _read_evidence_content(evidence, max_length=MAX_EVIDENCE_LENGTH):
     """Read content from an evidence file for extraction.
 
-    Supports page_archive (HTML) and document types.
+    Supports page_archive (HTML) and document types (HTML, PDF, DOCX, text).
+    Reads the precomputed text sidecar written at capture time, deriving it
+    on first use for evidence captured before sidecars existed.
     Returns (content_string, content_type) or (None, None) if unreadable.
     """
-    from core.capture import evidence_path_absolute
+    from core.capture import evidence_path_absolute, load_evidence_text
 
     evidence_type = evidence["evidence_type"]
 
@@ -331,23 +349,23 @@ def _read_evidence_content(evidence, max_length=MAX_CONTENT_LENGTH):
 
     # Text-based evidence
     if evidence_type in ("page_archive", "document"):
-        ext = file_path.suffix.lower()
-        if ext in (".html", ".htm", ".txt", ".md", ".csv", ".json", ".xml"):
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="replace")
-                if len(content) > max_length:
-                    content = content[:max_length]
-                return content, "text"
-            except Exception as e:
-                logger.warning("Failed to read evidence file %s: %s", file_path, e)
-                return None, None
+        try:
+            content = load_evidence_text(evidence["file_path"])
+        except Exception as e:
+            logger.warning("Failed to read evidence file %s: %s", file_path, e)
+            return None, None
+        if content is None:
+            return None, None
+        if len(content) > max_length:
+            content = content[:max_length]
+        return content, "text"
 
     return None, None
 
 
 def extract_from_content(content, entity_name, entity_type, attributes,
                          source_description="captured content",
-                         model=None, timeout=120):
+                         model=None, timeout=120, chunked=None):
     """Extract structured attributes from text/HTML content.
 
     Args:
@@ -358,6 +376,9 @@ def extract_from_content(content, entity_name, entity_type, attributes,
         source_description: Human description of the source
         model: LLM model to use (default: claude-sonnet-4-6)
         timeout: LLM call timeout in seconds
+        chunked: True to force chunked extraction, False to truncate at
+            MAX_CONTENT_LENGTH, None (default) to chunk only when the
+            stripped content is longer than MAX_CONTENT_LENGTH
 
     Returns:
         ExtractionResult
@@ -382,6 +403,13 @@ def extract_from_content(content, entity_name, entity_type, attributes,
 
     # Strip HTML before sending to LLM to reduce token usage
     content = _maybe_strip_html(content)
+    if chunked is None:
+        chunked = len(content) > MAX_CONTENT_LENGTH
+    if chunked:
+        return extract_from_content_chunked(
+            content, entity_name, entity_type, attributes,
+            source_description=source_description, model=model, timeout=timeout,
+        )
     content = content[:MAX_CONTENT_LENGTH]
 
     # Check extraction cache
@@ -485,6 +513,256 @@ def extract_from_content(content, entity_name, entity_type, attributes,
     return result
 
 
+
+# ── Chunked (map-reduce) extraction ──────────────────────────
+#
+# Long content is split on structural boundaries (headings, blank lines),
+# chunks that mention none of the target attributes are skipped, the rest
+# are extracted in parallel through extract_from_content — so each chunk
+# hits the extraction cache on its own and a small page change only
+# re-extracts the chunks it touched — and per-attribute results are merged
+# by confidence-weighted vote.
+
+_HEADING_RE = re.compile(r"^(#{1,6}\s|[A-Z0-9][A-Z0-9 &/,.\-]{3,80}$)")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "the", "and", "for", "with", "has", "have", "are", "its", "this", "that",
+    "from", "type", "name", "value", "url", "count",
+})
+
+
+def _split_into_chunks(text, max_chars=CHUNK_SIZE):
+    """Split *text* into chunks of at most *max_chars* on structural boundaries.
+
+    Blocks are separated by blank lines; a heading-like line also starts a
+    new block.  Blocks are packed greedily into chunks, and a single block
+    longer than *max_chars* is split on line (then hard character) limits.
+    """
+    if not text:
+        return []
+
+    blocks = []
+    current = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        if current and _HEADING_RE.match(stripped):
+            blocks.append("\n".join(current))
+            current = []
+        current.append(stripped)
+    if current:
+        blocks.append("\n".join(current))
+
+    pieces = []
+    for block in blocks:
+        if len(block) <= max_chars:
+            pieces.append(block)
+            continue
+        buf = ""
+        for line in block.split("\n"):
+            while len(line) > max_chars:
+                if buf:
+                    pieces.append(buf)
+                    buf = ""
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+            if buf and len(buf) + 1 + len(line) > max_chars:
+                pieces.append(buf)
+                buf = line
+            else:
+                buf = f"{buf}\n{line}" if buf else line
+        if buf:
+            pieces.append(buf)
+
+    chunks = []
+    buf = ""
+    for piece in pieces:
+        if buf and len(buf) + 2 + len(piece) > max_chars:
+            chunks.append(buf)
+            buf = piece
+        else:
+            buf = f"{buf}\n\n{piece}" if buf else piece
+    if buf:
+        chunks.append(buf)
+    return chunks
+
+
+def _attribute_terms(attributes):
+    """Return the lowercase words that signal a chunk may hold one of *attributes*."""
+    terms = set()
+    for attr in attributes:
+        parts = [attr.get("name", ""), attr.get("slug", "").replace("_", " ")]
+        parts.extend(str(v) for v in attr.get("enum_values") or [])
+        for part in parts:
+            for word in _WORD_RE.findall(part.lower()):
+                if len(word) >= 3 and word not in _STOPWORDS:
+                    terms.add(word)
+    return terms
+
+
+def _chunk_is_relevant(chunk, terms):
+    """Cheap pre-filter: does *chunk* mention any of the attribute *terms*?"""
+    if not terms:
+        return True
+    words = set(_WORD_RE.findall(chunk.lower()))
+    # Match on prefixes too so "pricing" finds "price"/"prices" style stems
+    if words & terms:
+        return True
+    stems = {t[:5] for t in terms if len(t) >= 5}
+    return any(w[:5] in stems for w in words if len(w) >= 5)
+
+
+def _normalise_value(value):
+    """Normalise an extracted value for equality comparison."""
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, sort_keys=True)
+    return str(value).strip().lower() if value else ""
+
+
+def _find_conflicts(items, value_key):
+    """Group *items* by normalised ``item[value_key]`` per ``attr_slug``.
+
+    Returns ``{attr_slug: {normalised_value: [items]}}`` for every slug
+    whose items disagree (more than one distinct value).
+    """
+    by_attr = {}
+    for item in items:
+        groups = by_attr.setdefault(item["attr_slug"], {})
+        groups.setdefault(_normalise_value(item.get(value_key)), []).append(item)
+    return {slug: groups for slug, groups in by_attr.items() if len(groups) > 1}
+
+
+def _merge_chunk_results(chunk_results):
+    """Reduce per-chunk extraction results to one value per attribute.
+
+    For each attribute the candidate values are grouped (case-insensitive);
+    the group with the highest summed confidence wins and keeps its best
+    single reading.  Disagreements are reported in the same shape as
+    :func:`detect_contradictions`.
+
+    Returns (merged_attributes, contradictions).
+    """
+    items = []
+    for idx, result in chunk_results:
+        for attr in result.extracted_attributes:
+            items.append({**attr, "chunk": idx})
+
+    by_attr = {}
+    for item in items:
+        by_attr.setdefault(item["attr_slug"], []).append(item)
+
+    merged = []
+    for slug, candidates in by_attr.items():
+        groups = {}
+        for item in candidates:
+            groups.setdefault(_normalise_value(item.get("value")), []).append(item)
+        best_group = max(
+            groups.values(),
+            key=lambda g: (sum(i["confidence"] for i in g), max(i["confidence"] for i in g)),
+        )
+        best = max(best_group, key=lambda i: i["confidence"])
+        reasoning = best.get("reasoning", "")
+        if len(best_group) > 1:
+            reasoning = f"{reasoning} (agreed by {len(best_group)} sections)".strip()
+        merged.append({
+            "attr_slug": slug,
+            "value": best.get("value"),
+            "confidence": best["confidence"],
+            "reasoning": reasoning,
+        })
+
+    contradictions = [
+        {
+            "attr_slug": slug,
+            "values": [
+                {"value": i.get("value"), "confidence": i["confidence"], "chunk": i["chunk"]}
+                for group in groups.values() for i in group
+            ],
+        }
+        for slug, groups in _find_conflicts(items, "value").items()
+    ]
+    return merged, contradictions
+
+
+def extract_from_content_chunked(content, entity_name, entity_type, attributes,
+                                 source_description="captured content",
+                                 model=None, timeout=120,
+                                 chunk_size=CHUNK_SIZE, max_workers=CHUNK_WORKERS):
+    """Map-reduce extraction over long content.
+
+    Args are as for :func:`extract_from_content`; *content* should already
+    be stripped of HTML.  Chunks are extracted in parallel with up to
+    *max_workers* concurrent LLM calls.
+
+    Returns:
+        ExtractionResult whose metadata records chunk counts and any
+        cross-chunk contradictions
+    """
+    start = time.time()
+    model = model or DEFAULT_EXTRACTION_MODEL
+    chunks = _split_into_chunks(content, chunk_size)
+    terms = _attribute_terms(attributes)
+    selected = [(i, c) for i, c in enumerate(chunks) if _chunk_is_relevant(c, terms)]
+    if not selected and chunks:
+        selected = [(0, chunks[0])]
+
+    def _extract(item):
+        idx, chunk = item
+        result = extract_from_content(
+            chunk, entity_name, entity_type, attributes,
+            source_description=f"{source_description} (section {idx + 1} of {len(chunks)})",
+            model=model, timeout=timeout, chunked=False,
+        )
+        return idx, result
+
+    workers = max(1, min(max_workers, len(selected)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract_chunk") as pool:
+        outcomes = list(pool.map(_extract, selected))
+
+    succeeded = [(i, r) for i, r in outcomes if r.success]
+    errors = [r.error for _, r in outcomes if not r.success and r.error]
+    cost = sum(r.cost_usd or 0 for _, r in outcomes)
+    elapsed = int((time.time() - start) * 1000)
+
+    if not succeeded:
+        return ExtractionResult(
+            success=False,
+            entity_id=0,
+            error=errors[0] if errors else "No content chunks could be extracted",
+            model=model,
+            cost_usd=cost,
+            duration_ms=elapsed,
+            metadata={"chunked": True, "chunk_count": len(chunks),
+                      "chunks_extracted": len(selected)},
+        )
+
+    merged, contradictions = _merge_chunk_results(succeeded)
+    return ExtractionResult(
+        success=True,
+        entity_id=0,
+        extracted_attributes=merged,
+        model=model,
+        cost_usd=cost,
+        duration_ms=elapsed,
+        metadata={
+            "chunked": True,
+            "chunk_count": len(chunks),
+            "chunks_extracted": len(selected),
+            "chunks_failed": len(outcomes) - len(succeeded),
+            "entity_summary": next(
+                (r.metadata.get("entity_summary") for _, r in succeeded
+                 if r.metadata.get("entity_summary")), "",
+            ),
+            "contradictions": contradictions,
+            "valid_count": len(merged),
+        },
+    )
+
+
 def extract_from_evidence(evidence, entity, schema_type_def, db=None,
                           model=None, timeout=120):
     """Extract attributes from a single evidence item.
@@ -650,37 +928,19 @@ def detect_contradictions(entity_id, db):
     if not results:
         return []
 
-    # Group by attr_slug
-    by_attr = {}
-    for r in results:
-        slug = r["attr_slug"]
-        if slug not in by_attr:
-            by_attr[slug] = []
-        by_attr[slug].append(r)
-
     contradictions = []
-    for slug, items in by_attr.items():
-        if len(items) < 2:
-            continue
-
-        # Check if values actually differ
-        values = set()
-        for item in items:
-            v = item.get("extracted_value", "")
-            values.add(str(v).strip().lower() if v else "")
-
-        if len(values) > 1:
-            contradictions.append({
-                "attr_slug": slug,
-                "values": [
-                    {
-                        "value": item["extracted_value"],
-                        "confidence": item.get("confidence", 0.5),
-                        "job_id": item["job_id"],
-                        "result_id": item["id"],
-                    }
-                    for item in items
-                ],
-            })
+    for slug, groups in _find_conflicts(results, "extracted_value").items():
+        contradictions.append({
+            "attr_slug": slug,
+            "values": [
+                {
+                    "value": item["extracted_value"],
+                    "confidence": item.get("confidence", 0.5),
+                    "job_id": item["job_id"],
+                    "result_id": item["id"],
+                }
+                for group in groups.values() for item in group
+            ],
+        })
 
     return contradictions
@@ -3,6 +3,7 @@ import logging
 import re
 import subprocess
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -82,11 +83,80 @@ def sync_to_git(message=None):
         _sync_lock.release()
 
 
+# --- Coalesced background syncs ---
+
+GIT_SYNC_DEBOUNCE_SECONDS = 30
+GIT_SYNC_MAX_DELAY_SECONDS = 300
+
+_pending_lock = threading.Lock()
+_pending_messages = []
+_pending_timer = None
+_pending_since = None
+
+
+def _combined_message(messages):
+    if not messages:
+        return None
+    if len(messages) == 1:
+        return messages[0]
+    return f"{messages[0]} (+{len(messages) - 1} more)"
+
+
+def _run_pending():
+    global _pending_timer, _pending_since
+    with _pending_lock:
+        if _sync_lock.locked():
+            # A sync is still running; try again rather than drop these changes
+            _pending_timer = threading.Timer(GIT_SYNC_DEBOUNCE_SECONDS, _run_pending)
+            _pending_timer.daemon = True
+            _pending_timer.start()
+            return
+        messages = list(_pending_messages)
+        _pending_messages.clear()
+        _pending_timer = None
+        _pending_since = None
+    sync_to_git(_combined_message(messages))
+
+
+def schedule_git_sync(message=None, delay=GIT_SYNC_DEBOUNCE_SECONDS):
+    """Queue a sync; syncs requested within *delay* of each other become one commit.
+
+    A steady stream of requests still syncs at least every
+    GIT_SYNC_MAX_DELAY_SECONDS.
+    """
+    global _pending_timer, _pending_since
+    now = time.monotonic()
+    with _pending_lock:
+        if message:
+            _pending_messages.append(str(message))
+        if _pending_timer is not None:
+            if now - _pending_since >= GIT_SYNC_MAX_DELAY_SECONDS:
+                return  # already due; don't postpone it again
+            _pending_timer.cancel()
+        else:
+            _pending_since = now
+        delay = min(delay, max(0.0, _pending_since + GIT_SYNC_MAX_DELAY_SECONDS - now))
+        _pending_timer = threading.Timer(delay, _run_pending)
+        _pending_timer.daemon = True
+        _pending_timer.start()
+
+
+def cancel_git_sync():
+    """Drop any queued sync without running it."""
+    global _pending_timer, _pending_since
+    with _pending_lock:
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+            _pending_timer = None
+        _pending_since = None
+        _pending_messages.clear()
+
+
 def sync_to_git_async(message=None):
-    """Run sync_to_git in a background thread so it never blocks the UI."""
-    thread = threading.Thread(
-        target=sync_to_git,
-        args=(message,),
-        daemon=True,
-    )
-    thread.start()
+    """Sync in the background so it never blocks the UI.
+
+    Calls are coalesced: back-to-back events (e.g. consecutive batches)
+    produce a single commit once they have been quiet for
+    GIT_SYNC_DEBOUNCE_SECONDS.
+    """
+    schedule_git_sync(message)
@@ -20,6 +20,7 @@ Prompt caching:
   `run_sdk_cached()` sends multi-part messages with cache_control on the
   context block, reducing input token costs for repeated taxonomy/context.
 """
+import importlib.util
 import json
 import logging
 import os
@@ -38,20 +39,10 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
-# Optional imports — app works without these packages
-try:
-    import instructor as _instructor
-    INSTRUCTOR_AVAILABLE = True
-except ImportError:
-    _instructor = None
-    INSTRUCTOR_AVAILABLE = False
-
-try:
-    import anthropic as _anthropic
-    ANTHROPIC_SDK_AVAILABLE = True
-except ImportError:
-    _anthropic = None
-    ANTHROPIC_SDK_AVAILABLE = False
+# Optional packages — app works without them. Only probed here: importing
+# anthropic takes about a second, so they are imported on first use.
+INSTRUCTOR_AVAILABLE = importlib.util.find_spec("instructor") is not None
+ANTHROPIC_SDK_AVAILABLE = importlib.util.find_spec("anthropic") is not None
 
 LLM_BACKEND = os.environ.get("LLM_BACKEND", "cli").lower()
 
@@ -390,7 +381,10 @@ def run_instructor(prompt, model, response_model, timeout=120,
         RuntimeError on API errors.
         ValidationError if retries are exhausted.
     """
-    client = _instructor.from_anthropic(_anthropic.Anthropic())
+    import anthropic
+    import instructor
+
+    client = instructor.from_anthropic(anthropic.Anthropic())
     start = time.time()
 
     # Build messages with optional prompt caching
@@ -447,6 +441,48 @@ def run_instructor(prompt, model, response_model, timeout=120,
 
 # ---- SDK with prompt caching -------------------------------------------------
 
+def _cached_usage_cost(model, usage):
+    """USD cost of an SDK call whose usage may include prompt-cache tokens."""
+    if not usage:
+        return 0.0
+    # Check for cache-related usage fields
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    # Regular input = total input minus cached portions
+    regular_input = usage.input_tokens - cache_read - cache_write
+    output_tokens = usage.output_tokens
+
+    # Determine per-token rates based on model
+    # Cache read = 10% of input price, cache write = 125% of input price
+    if "haiku" in model:
+        input_rate = 0.80 / 1_000_000
+        output_rate = 4.0 / 1_000_000
+    elif "sonnet" in model:
+        input_rate = 3.0 / 1_000_000
+        output_rate = 15.0 / 1_000_000
+    elif "opus" in model:
+        input_rate = 15.0 / 1_000_000
+        output_rate = 75.0 / 1_000_000
+    else:
+        input_rate = 3.0 / 1_000_000   # default to Sonnet rates
+        output_rate = 15.0 / 1_000_000
+
+    cache_read_rate = input_rate * 0.1
+    cache_write_rate = input_rate * 1.25
+
+    # Log cache stats for observability
+    if cache_read or cache_write:
+        logger.info(
+            "Prompt cache: %d tokens read, %d tokens created (model=%s)",
+            cache_read, cache_write, model,
+        )
+
+    return (regular_input * input_rate +
+            cache_read * cache_read_rate +
+            cache_write * cache_write_rate +
+            output_tokens * output_rate)
+
+
 def run_sdk_cached(prompt, model, timeout, json_schema=None,
                    context=None, system=None, max_tokens=8192):
     """Call Claude SDK with prompt caching on the context block.
@@ -525,44 +561,7 @@ def run_sdk_cached(prompt, model, timeout, json_schema=None,
         elif block.type == "tool_use":
             structured_output = block.input
 
-    cost_usd = 0.0
-    if response.usage:
-        # Check for cache-related usage fields
-        cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
-        cache_write = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
-        # Regular input = total input minus cached portions
-        regular_input = response.usage.input_tokens - cache_read - cache_write
-        output_tokens = response.usage.output_tokens
-
-        # Determine per-token rates based on model
-        # Cache read = 10% of input price, cache write = 125% of input price
-        if "haiku" in model:
-            input_rate = 0.80 / 1_000_000
-            output_rate = 4.0 / 1_000_000
-        elif "sonnet" in model:
-            input_rate = 3.0 / 1_000_000
-            output_rate = 15.0 / 1_000_000
-        elif "opus" in model:
-            input_rate = 15.0 / 1_000_000
-            output_rate = 75.0 / 1_000_000
-        else:
-            input_rate = 3.0 / 1_000_000   # default to Sonnet rates
-            output_rate = 15.0 / 1_000_000
-
-        cache_read_rate = input_rate * 0.1
-        cache_write_rate = input_rate * 1.25
-
-        cost_usd = (regular_input * input_rate +
-                    cache_read * cache_read_rate +
-                    cache_write * cache_write_rate +
-                    output_tokens * output_rate)
-
-        # Log cache stats for observability
-        if cache_read or cache_write:
-            logger.info(
-                "Prompt cache: %d tokens read, %d tokens created (model=%s)",
-                cache_read, cache_write, model,
-            )
+    cost_usd = _cached_usage_cost(model, response.usage)
 
     return {
         "result": "\n".join(text_parts),
@@ -573,6 +572,59 @@ def run_sdk_cached(prompt, model, timeout, json_schema=None,
     }
 
 
+def stream_text(prompt, model, timeout, context=None, system=None,
+                max_tokens=4096, project_id=None, operation=None):
+    """Stream a plain-text answer, yielding text chunks as they arrive.
+
+    Uses the Claude SDK's streaming API with prompt caching on *context*,
+    like run_sdk_cached. Without the SDK (or for Gemini models) the whole
+    run_cli answer is yielded as a single chunk. The call's cost is logged
+    once the stream has finished.
+    """
+    if not sdk_available() or is_gemini_model(model):
+        full_prompt = f"{context}\n\n{prompt}" if context else prompt
+        response = run_cli(full_prompt, model, timeout, max_tokens=max_tokens,
+                           system=system, project_id=project_id, operation=operation)
+        if response.get("is_error"):
+            raise RuntimeError(response.get("result") or "LLM call failed")
+        yield response.get("result", "")
+        return
+
+    import anthropic
+    client = anthropic.Anthropic(timeout=timeout)
+    start = time.time()
+
+    if context:
+        user_content = [
+            {"type": "text", "text": context, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt},
+        ]
+    else:
+        user_content = prompt
+    kwargs = {
+        "model": model,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": user_content}],
+    }
+    if system:
+        kwargs["system"] = system
+
+    try:
+        with client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                yield text
+            usage = stream.get_final_message().usage
+    except anthropic.APITimeoutError:
+        raise subprocess.TimeoutExpired(cmd="anthropic-sdk-stream", timeout=timeout)
+    except anthropic.APIError as e:
+        raise RuntimeError(f"Anthropic API error: {e}")
+
+    log_cost(model, round(_cached_usage_cost(model, usage), 4),
+             int((time.time() - start) * 1000), project_id=project_id,
+             operation=operation, input_tokens=usage.input_tokens,
+             output_tokens=usage.output_tokens)
+
+
 # ---- Claude CLI --------------------------------------------------------------
 
 def _run_claude_cli(prompt, model, timeout, tools=None, json_schema=None,
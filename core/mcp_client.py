@@ -16,7 +16,9 @@ Supported sources:
 """
 import json
 import os
+import threading
 import urllib.parse
+import zlib
 from datetime import datetime, timedelta, timezone
 
 from loguru import logger
@@ -37,20 +39,71 @@ CREATE TABLE IF NOT EXISTS mcp_cache (
     source TEXT NOT NULL,
     data_json TEXT NOT NULL,
     fetched_at TEXT NOT NULL,
-    expires_at TEXT NOT NULL
+    expires_at TEXT NOT NULL,
+    data_blob BLOB,
+    size_bytes INTEGER DEFAULT 0,
+    last_hit_at TEXT
 )
 """
 
-_CACHE_TABLE_ENSURED = False
+# Columns added after the original table shipped (name, type)
+_CACHE_EXTRA_COLUMNS = [
+    ("data_blob", "BLOB"),
+    ("size_bytes", "INTEGER DEFAULT 0"),
+    ("last_hit_at", "TEXT"),
+]
+
+_CACHE_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_mcp_cache_source_expires ON mcp_cache(source, expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_mcp_cache_source_hit ON mcp_cache(source, last_hit_at)",
+]
+
+_STATS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS mcp_cache_stats (
+    source TEXT PRIMARY KEY,
+    hits INTEGER DEFAULT 0,
+    misses INTEGER DEFAULT 0,
+    updated_at TEXT
+)
+"""
+
+# Databases whose cache tables have been created/upgraded in this process,
+# keyed by file path so every database file gets its own upgrade check.
+_CACHE_TABLES_ENSURED = set()
+
+
+def _db_key(conn):
+    """Identify the database behind *conn* (its file path, or the connection for :memory:)."""
+    row = conn.execute("PRAGMA database_list").fetchone()
+    path = row[2] if row else ""
+    return path or f"memory:{id(conn)}"
 
 
 def _ensure_cache_table(conn):
-    """Create the mcp_cache table if it doesn't exist yet."""
-    global _CACHE_TABLE_ENSURED
-    if not _CACHE_TABLE_ENSURED:
-        conn.execute(_CACHE_TABLE_SQL)
-        conn.commit()
-        _CACHE_TABLE_ENSURED = True
+    """Create the mcp_cache tables (and upgrade older layouts) if needed."""
+    db_key = _db_key(conn)
+    if db_key in _CACHE_TABLES_ENSURED:
+        return
+    conn.execute(_CACHE_TABLE_SQL)
+    conn.execute(_STATS_TABLE_SQL)
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(mcp_cache)").fetchall()}
+    for col_name, col_type in _CACHE_EXTRA_COLUMNS:
+        if col_name not in cols:
+            conn.execute(f"ALTER TABLE mcp_cache ADD COLUMN {col_name} {col_type}")
+    # Backfill rows written before size / hit tracking existed
+    if "size_bytes" not in cols:
+        conn.execute("UPDATE mcp_cache SET size_bytes = length(CAST(data_json AS BLOB))")
+    if "last_hit_at" not in cols:
+        conn.execute("UPDATE mcp_cache SET last_hit_at = fetched_at WHERE last_hit_at IS NULL")
+    for sql in _CACHE_INDEXES_SQL:
+        conn.execute(sql)
+    conn.commit()
+    # Drop accounting buffered for an earlier database that had the same key
+    # (in-memory connection ids get reused)
+    with _accounting_lock:
+        _pending_touches.pop(db_key, None)
+        _pending_counts.pop(db_key, None)
+    _CACHE_TABLES_ENSURED.add(db_key)
 
 
 def _now_iso():
@@ -69,22 +122,106 @@ def _parse_iso(dt_str):
 
 
 # ── Cache Helpers ─────────────────────────────────────────────
+#
+# Payloads larger than ``_COMPRESS_THRESHOLD`` bytes are zlib-compressed
+# into ``data_blob`` (``data_json`` is left empty).
+#
+# Reads never write: hit timestamps (which drive LRU eviction) and
+# per-source hit/miss counts are buffered in memory per database and
+# flushed by the next ``_cache_set`` or maintenance run, so a read can't
+# commit a transaction the caller has open on the same connection.
+
+_COMPRESS_THRESHOLD = 4096
+_COMPRESS_LEVEL = 6
+
+_accounting_lock = threading.Lock()
+_pending_touches = {}  # db key -> {row id: last hit ISO timestamp}
+_pending_counts = {}   # db key -> {source: [hits, misses]}
+
+
+def _record_cache_access(conn, source, hit, row_id=None):
+    """Buffer a hit/miss for *source* and, on a hit, the row's new hit time."""
+    db_key = _db_key(conn)
+    with _accounting_lock:
+        counts = _pending_counts.setdefault(db_key, {}).setdefault(source, [0, 0])
+        counts[0 if hit else 1] += 1
+        if row_id is not None:
+            _pending_touches.setdefault(db_key, {})[row_id] = _now_iso()
+
+
+def _pending_counts_for(conn):
+    """Return a copy of the unflushed hit/miss counts for *conn*'s database."""
+    with _accounting_lock:
+        pending = _pending_counts.get(_db_key(conn), {})
+        return {source: list(v) for source, v in pending.items()}
+
 
-def _cache_get(conn, key):
-    """Return parsed JSON if cached entry exists and is not expired, else None."""
+def flush_cache_accounting(conn):
+    """Write buffered hit timestamps and hit/miss counts to the database.
+
+    Does not commit — callers commit as part of their own write.
+    """
+    db_key = _db_key(conn)
+    with _accounting_lock:
+        touches = _pending_touches.pop(db_key, {})
+        counts = _pending_counts.pop(db_key, {})
+    if touches:
+        conn.executemany(
+            "UPDATE mcp_cache SET last_hit_at = ? WHERE id = ?",
+            [(ts, row_id) for row_id, ts in touches.items()],
+        )
+    if counts:
+        now = _now_iso()
+        conn.executemany(
+            """INSERT INTO mcp_cache_stats (source, hits, misses, updated_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(source) DO UPDATE SET
+                   hits = hits + excluded.hits,
+                   misses = misses + excluded.misses,
+                   updated_at = excluded.updated_at""",
+            [(source, h, m, now) for source, (h, m) in counts.items()],
+        )
+
+
+def _encode_payload(data):
+    """Serialise *data* for storage.  Returns (data_json, data_blob, size_bytes)."""
+    payload = json.dumps(data)
+    raw = payload.encode("utf-8")
+    if len(raw) > _COMPRESS_THRESHOLD:
+        blob = zlib.compress(raw, _COMPRESS_LEVEL)
+        return "", blob, len(blob)
+    return payload, None, len(raw)
+
+
+def _decode_payload(data_json, data_blob):
+    """Inverse of :func:`_encode_payload`."""
+    if data_blob is not None:
+        return json.loads(zlib.decompress(data_blob).decode("utf-8"))
+    return json.loads(data_json)
+
+
+def _cache_get(conn, key, source=None):
+    """Return parsed JSON if cached entry exists and is not expired, else None.
+
+    *source* attributes the hit/miss in cache statistics; when omitted a
+    hit is counted against the row's own source.
+    """
     _ensure_cache_table(conn)
     row = conn.execute(
-        "SELECT data_json, expires_at FROM mcp_cache WHERE cache_key = ?",
+        "SELECT id, source, data_json, data_blob, expires_at "
+        "FROM mcp_cache WHERE cache_key = ?",
         (key,),
     ).fetchone()
     if row is None:
+        _record_cache_access(conn, source or "unknown", hit=False)
         return None
-    expires_at = _parse_iso(row["expires_at"] if hasattr(row, "keys") else row[1])
-    now = datetime.now(timezone.utc)
-    if now >= expires_at:
+    row_id, row_source, data_json, data_blob, expires_raw = tuple(row)
+    if datetime.now(timezone.utc) >= _parse_iso(expires_raw):
+        _record_cache_access(conn, source or row_source, hit=False)
         return None
-    data_json = row["data_json"] if hasattr(row, "keys") else row[0]
-    return json.loads(data_json)
+    data = _decode_payload(data_json, data_blob)
+    _record_cache_access(conn, source or row_source, hit=True, row_id=row_id)
+    return data
 
 
 def _cache_set(conn, key, source, data, ttl_hours=_DEFAULT_TTL_HOURS):
@@ -92,25 +229,205 @@ def _cache_set(conn, key, source, data, ttl_hours=_DEFAULT_TTL_HOURS):
     _ensure_cache_table(conn)
     now = datetime.now(timezone.utc)
     expires = now + timedelta(hours=ttl_hours)
+    data_json, data_blob, size_bytes = _encode_payload(data)
+    now_str = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+    flush_cache_accounting(conn)
     conn.execute(
-        """INSERT INTO mcp_cache (cache_key, source, data_json, fetched_at, expires_at)
-           VALUES (?, ?, ?, ?, ?)
+        """INSERT INTO mcp_cache (cache_key, source, data_json, fetched_at, expires_at,
+                                  data_blob, size_bytes, last_hit_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
            ON CONFLICT(cache_key) DO UPDATE SET
                source = excluded.source,
                data_json = excluded.data_json,
                fetched_at = excluded.fetched_at,
-               expires_at = excluded.expires_at""",
+               expires_at = excluded.expires_at,
+               data_blob = excluded.data_blob,
+               size_bytes = excluded.size_bytes,
+               last_hit_at = excluded.last_hit_at""",
         (
             key,
             source,
-            json.dumps(data),
-            now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            data_json,
+            now_str,
             expires.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            data_blob,
+            size_bytes,
+            now_str,
         ),
     )
     conn.commit()
 
 
+# ── Cache Maintenance ─────────────────────────────────────────
+#
+# Expired rows are deleted in small batches so a sweep never holds the
+# write lock for long.  Each source also has a byte budget; when a source
+# exceeds it, the least-recently-hit rows are evicted until it fits.
+
+_SWEEP_BATCH_SIZE = 200
+_SWEEP_MAX_BATCHES = 50
+_DEFAULT_SOURCE_BUDGET_BYTES = 16 * 1024 * 1024
+_SOURCE_BUDGET_BYTES = {
+    "extraction": 64 * 1024 * 1024,
+}
+
+
+def _source_budget(source):
+    """Return the byte budget for *source*."""
+    return _SOURCE_BUDGET_BYTES.get(source, _DEFAULT_SOURCE_BUDGET_BYTES)
+
+
+def sweep_expired_cache(conn, batch_size=_SWEEP_BATCH_SIZE,
+                        max_batches=_SWEEP_MAX_BATCHES):
+    """Delete expired cache rows in batches of *batch_size*.
+
+    Walks the ``(source, expires_at)`` index one source at a time and
+    commits after every batch.  Stops after *max_batches* so a single
+    sweep stays short; the next sweep picks up where this one left off.
+
+    Returns the number of rows deleted.
+    """
+    _ensure_cache_table(conn)
+    now = _now_iso()
+    sources = [r[0] for r in conn.execute(
+        "SELECT DISTINCT source FROM mcp_cache"
+    ).fetchall()]
+    deleted = 0
+    batches = 0
+    for source in sources:
+        while batches < max_batches:
+            cur = conn.execute(
+                """DELETE FROM mcp_cache WHERE id IN (
+                       SELECT id FROM mcp_cache
+                       WHERE source = ? AND expires_at <= ?
+                       LIMIT ?
+                   )""",
+                (source, now, batch_size),
+            )
+            conn.commit()
+            batches += 1
+            deleted += cur.rowcount
+            if cur.rowcount < batch_size:
+                break
+    return deleted
+
+
+def evict_cache_over_budget(conn, source, budget_bytes=None,
+                            batch_size=_SWEEP_BATCH_SIZE):
+    """Evict least-recently-hit rows of *source* until it fits its budget.
+
+    Candidates are read in ``last_hit_at`` order straight off the
+    ``(source, last_hit_at)`` index.  Returns the number of rows evicted.
+    """
+    _ensure_cache_table(conn)
+    budget = _source_budget(source) if budget_bytes is None else budget_bytes
+    total = conn.execute(
+        "SELECT COALESCE(SUM(size_bytes), 0) FROM mcp_cache WHERE source = ?",
+        (source,),
+    ).fetchone()[0]
+    evicted = 0
+    while total > budget:
+        rows = conn.execute(
+            """SELECT id, size_bytes FROM mcp_cache
+               WHERE source = ?
+               ORDER BY last_hit_at ASC
+               LIMIT ?""",
+            (source, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        victims = []
+        for row_id, size in (tuple(r) for r in rows):
+            if total <= budget:
+                break
+            victims.append(row_id)
+            total -= size or 0
+        placeholders = ",".join("?" * len(victims))
+        conn.execute(f"DELETE FROM mcp_cache WHERE id IN ({placeholders})", victims)
+        conn.commit()
+        evicted += len(victims)
+    return evicted
+
+
+def run_cache_maintenance(conn):
+    """Flush hit accounting, sweep expired rows, then enforce per-source budgets.
+
+    Returns ``{"expired_deleted": int, "evicted": {source: int}}``.
+    """
+    _ensure_cache_table(conn)
+    flush_cache_accounting(conn)
+    conn.commit()
+    expired = sweep_expired_cache(conn)
+    evicted = {}
+    for (source,) in conn.execute("SELECT DISTINCT source FROM mcp_cache").fetchall():
+        n = evict_cache_over_budget(conn, source)
+        if n:
+            evicted[source] = n
+    if expired or evicted:
+        logger.info("mcp_cache maintenance: {} expired, evicted {}", expired, evicted)
+    return {"expired_deleted": expired, "evicted": evicted}
+
+
+def get_cache_stats(conn):
+    """Return entries, bytes and hit rate per source.
+
+    Hit/miss counts combine the persisted ``mcp_cache_stats`` totals with
+    whatever this process has buffered but not yet flushed.
+    """
+    _ensure_cache_table(conn)
+    now = _now_iso()
+    by_source = {}
+
+    def _entry(source):
+        return by_source.setdefault(source, {
+            "entries": 0,
+            "bytes": 0,
+            "compressed_entries": 0,
+            "expired_entries": 0,
+            "budget_bytes": _source_budget(source),
+            "hits": 0,
+            "misses": 0,
+        })
+
+    for r in conn.execute(
+        """SELECT source,
+                  COUNT(*) AS entries,
+                  COALESCE(SUM(size_bytes), 0) AS bytes,
+                  SUM(CASE WHEN data_blob IS NOT NULL THEN 1 ELSE 0 END) AS compressed,
+                  SUM(CASE WHEN expires_at <= ? THEN 1 ELSE 0 END) AS expired
+           FROM mcp_cache GROUP BY source""",
+        (now,),
+    ).fetchall():
+        source, entries, size, compressed, expired = tuple(r)
+        entry = _entry(source)
+        entry["entries"] = entries
+        entry["bytes"] = size
+        entry["compressed_entries"] = compressed or 0
+        entry["expired_entries"] = expired or 0
+
+    for source, hits, misses in (tuple(r) for r in conn.execute(
+        "SELECT source, hits, misses FROM mcp_cache_stats"
+    ).fetchall()):
+        entry = _entry(source)
+        entry["hits"] += hits or 0
+        entry["misses"] += misses or 0
+
+    for source, (hits, misses) in _pending_counts_for(conn).items():
+        entry = _entry(source)
+        entry["hits"] += hits
+        entry["misses"] += misses
+
+    for entry in by_source.values():
+        lookups = entry["hits"] + entry["misses"]
+        entry["hit_rate"] = round(entry["hits"] / lookups, 4) if lookups else 0.0
+
+    return {
+        "total_entries": sum(s["entries"] for s in by_source.values()),
+        "total_bytes": sum(s["bytes"] for s in by_source.values()),
+        "by_source": dict(sorted(by_source.items(), key=lambda kv: -kv[1]["bytes"])),
+    }
+
+
 # ── 1. Hacker News (Algolia) ─────────────────────────────────
 
 def search_hackernews(query, num_results=10, timeout=_REQUEST_TIMEOUT, conn=None):
@@ -125,7 +442,7 @@ def search_hackernews(query, num_results=10, timeout=_REQUEST_TIMEOUT, conn=None
     cache_key = f"hn:{query}:{num_results}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="hackernews")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -180,7 +497,7 @@ def search_news(query, num_results=10, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"news:{query}:{num_results}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="duckduckgo_news")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -232,7 +549,7 @@ def get_domain_rank(domain, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"traffic:{domain}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="cloudflare_radar")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -296,7 +613,7 @@ def search_patents(assignee, num_results=10, timeout=_REQUEST_TIMEOUT, conn=None
     cache_key = f"patent:{assignee}:{num_results}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="patentsview")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -364,7 +681,7 @@ def search_sec_filings(company, filing_type="10-K", num_results=5,
     cache_key = f"sec:{company}:{filing_type}:{num_results}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="sec_edgar")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -438,7 +755,7 @@ def search_companies_house(name, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"ch:{name}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="companies_house")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -508,7 +825,7 @@ def search_wikipedia(query, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"wiki:{query}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="wikipedia")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -594,7 +911,7 @@ def search_wayback(url_query, limit=5, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"wayback:{url_query}:{limit}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="wayback_machine")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -661,7 +978,7 @@ def search_fca_register(name, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"fca:{name}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="fca_register")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -715,7 +1032,7 @@ def search_gleif(name, timeout=_REQUEST_TIMEOUT, conn=None):
     cache_key = f"gleif:{name}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="gleif")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -782,7 +1099,7 @@ def search_cooper_hewitt(query, has_images=True, timeout=_REQUEST_TIMEOUT, conn=
     cache_key = f"cooperhewitt:{query}:{has_images}"
     if conn is not None:
         try:
-            cached = _cache_get(conn, cache_key)
+            cached = _cache_get(conn, cache_key, source="cooper_hewitt")
             if cached is not None:
                 return cached
         except Exception as exc:
@@ -612,7 +612,7 @@ def _record_health(conn, server_name, success):
     try:
         from core.mcp_client import _cache_get, _cache_set
         key = f"health:{server_name}"
-        existing = _cache_get(conn, key)
+        existing = _cache_get(conn, key, source="health")
         if existing is None:
             existing = {"last_success": None, "last_failure": None, "consecutive_failures": 0}
         now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -636,7 +636,7 @@ def get_server_health(conn, server_name):
         return {"last_success": None, "last_failure": None, "consecutive_failures": 0}
     try:
         from core.mcp_client import _cache_get
-        result = _cache_get(conn, f"health:{server_name}")
+        result = _cache_get(conn, f"health:{server_name}", source="health")
         return result or {"last_success": None, "last_failure": None, "consecutive_failures": 0}
     except Exception:
         return {"last_success": None, "last_failure": None, "consecutive_failures": 0}
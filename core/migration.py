@@ -209,6 +209,9 @@ def migrate_companies_to_entities(db, project_id, dry_run=False):
         if not dry_run:
             conn.commit()
 
+    if not dry_run:
+        db.invalidate_entity_mode(project_id)
+
     logger.info(
         "Migration complete: %d companies → %d entities, %d attributes, %d evidence, %d skipped, %d errors",
         stats["companies_found"],
@@ -13,7 +13,8 @@ from core.researcher import research_company
 from core.taxonomy import evolve_taxonomy
 from core.url_resolver import resolve_and_validate
 from storage.db import Database
-from storage.export import export_json, export_markdown
+from core.export_scheduler import schedule_export
+from storage.export import export_incremental
 
 
 def _process_one_company(url, source_url, model, taxonomy_tree):
@@ -55,11 +56,21 @@ def _process_one_company(url, source_url, model, taxonomy_tree):
 
 
 class Pipeline:
-    def __init__(self, db=None, workers=DEFAULT_WORKERS, model=DEFAULT_MODEL, project_id=None):
+    def __init__(self, db=None, workers=DEFAULT_WORKERS, model=DEFAULT_MODEL, project_id=None,
+                 defer_export=False):
         self.db = db or Database()
         self.workers = workers
         self.model = model
         self.project_id = project_id
+        # Web batches defer to the debounced export scheduler; the CLI exports inline
+        self.defer_export = defer_export
+
+    def _export(self):
+        """Refresh the JSON/Markdown exports if this project's data changed."""
+        if self.defer_export:
+            schedule_export(self.db, project_id=self.project_id)
+            return None
+        return export_incremental(self.db, project_id=self.project_id)
 
     def run(self, urls, batch_id, force=False, dry_run=False):
         """Full pipeline: resolve -> sub-batch research+classify -> evolve -> export."""
@@ -148,10 +159,15 @@ class Pipeline:
 
         # Stage 5: Export
         print(f"\n[4/4] Exporting data...")
-        json_path = export_json(self.db, project_id=self.project_id)
-        md_path = export_markdown(self.db, project_id=self.project_id)
-        print(f"  JSON: {json_path}")
-        print(f"  Markdown: {md_path}")
+        export = self._export()
+        if export is None:
+            print("  Export scheduled.")
+        elif export["exported"]:
+            print(f"  JSON: {export['json']}")
+            print(f"  Markdown: {export['markdown']} "
+                  f"({export['sections_rebuilt']} sections rebuilt)")
+        else:
+            print("  No changes since the last export.")
 
         # Summary
         stats = self.db.get_stats(project_id=self.project_id)
@@ -320,8 +336,7 @@ class Pipeline:
         # Evolve + export
         evolve_taxonomy(self.db, batch_id, model="claude-opus-4-6",
                         project_id=self.project_id)
-        export_json(self.db, project_id=self.project_id)
-        export_markdown(self.db, project_id=self.project_id)
+        self._export()
 
     def retry_failed(self, batch_id=None):
         """Retry all failed jobs."""
@@ -396,5 +411,4 @@ class Pipeline:
             except Exception as e:
                 print(f"  FAIL: {company['name']} -> {e}")
 
-        export_json(self.db, project_id=self.project_id)
-        export_markdown(self.db, project_id=self.project_id)
+        self._export()
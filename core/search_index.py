@@ -0,0 +1,236 @@
+"""Lexical retrieval for AI chat over a per-project BM25 index.
+
+The index (SearchMixin, an FTS5 table) holds one document per company,
+entity and evidence file:
+
+- company: name; description fields, category, tags and user notes
+- entity: name; type, category, tags and every current attribute value
+- evidence: "<entity> — <type>"; source and the derived text sidecar
+
+Writes only queue the changed rows (triggers in schema.sql). refresh()
+applies the queue in batches before a query, so a chat question sees
+every change without the write paths paying for indexing, and the first
+question in a project builds its whole index once.
+
+retrieve() turns a question into an FTS5 query, takes the best BM25
+matches and packs passages into a token budget: short documents whole,
+long ones as the snippet around the matched terms.
+"""
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+REFRESH_BATCH_SIZE = 2000
+MAX_DOC_CHARS = 8000            # company / entity documents
+MAX_EVIDENCE_CHARS = 20000      # evidence text sidecars
+DEFAULT_TOKEN_BUDGET = 3000
+PASSAGE_MAX_TOKENS = 300        # longer documents are represented by their snippet
+CANDIDATES = 40                 # BM25 matches considered before budgeting
+MAX_QUERY_TERMS = 24
+
+_COMPANY_FIELDS = [
+    ("Description", "what"), ("Target", "target"), ("Products", "products"),
+    ("Funding", "funding"), ("Funding stage", "funding_stage"),
+    ("Geography", "geography"), ("TAM", "tam"), ("Business model", "business_model"),
+    ("Focus", "primary_focus"), ("Pricing", "pricing_model"),
+    ("Pricing notes", "pricing_notes"), ("Relationship", "relationship_note"),
+]
+
+_STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been
+before being between both but by can could did do does doing down during each
+few for from further had has have having he her here hers how i if in into is
+it its itself just me more most my no nor not now of off on once only or other
+our out over own same she should so some such than that the their them then
+there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your show tell
+list give find compare which many much
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W_][\w'-]*", re.UNICODE)
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _tags_text(value):
+    if not value:
+        return ""
+    try:
+        tags = json.loads(value) if isinstance(value, str) else value
+    except (json.JSONDecodeError, TypeError):
+        return str(value)
+    return ", ".join(str(t) for t in tags) if isinstance(tags, list) else str(tags)
+
+
+def _value_text(value):
+    """Attribute values are stored as text; JSON lists read better joined."""
+    if value is None:
+        return ""
+    if value[:1] in ("[", "{"):
+        try:
+            parsed = json.loads(value)
+        except json.JSONDecodeError:
+            return value
+        if isinstance(parsed, list):
+            return ", ".join(str(v) for v in parsed)
+        if isinstance(parsed, dict):
+            return "; ".join(f"{k}: {v}" for k, v in parsed.items())
+    return value
+
+
+# ── Documents ────────────────────────────────────────────────
+
+def _company_doc(row):
+    lines = []
+    category = " / ".join(n for n in (row["category_name"], row["subcategory_name"]) if n)
+    if category:
+        lines.append(f"Category: {category}")
+    for label, key in _COMPANY_FIELDS:
+        if row[key]:
+            lines.append(f"{label}: {row[key]}")
+    hq = ", ".join(p for p in (row["hq_city"], row["hq_country"]) if p)
+    if hq:
+        lines.append(f"HQ: {hq}")
+    tags = _tags_text(row["tags"])
+    if tags:
+        lines.append(f"Tags: {tags}")
+    if row["notes"]:
+        lines.append(f"Notes: {row['notes']}")
+    return row["name"], "\n".join(lines)[:MAX_DOC_CHARS]
+
+
+def _entity_doc(row, attributes):
+    lines = [f"Type: {row['type_slug']}"]
+    if row["category_name"]:
+        lines.append(f"Category: {row['category_name']}")
+    tags = _tags_text(row["tags"])
+    if tags:
+        lines.append(f"Tags: {tags}")
+    for slug, value in attributes.items():
+        text = _value_text(value)
+        if text:
+            lines.append(f"{slug.replace('_', ' ').capitalize()}: {text}")
+    return row["name"], "\n".join(lines)[:MAX_DOC_CHARS]
+
+
+def _evidence_text(file_path):
+    """Derived text of an evidence file, if its sidecar exists (never derived here)."""
+    from core.capture import text_sidecar_path
+    try:
+        sidecar = text_sidecar_path(file_path)
+        if sidecar.exists():
+            with open(sidecar, encoding="utf-8", errors="replace") as f:
+                return f.read(MAX_EVIDENCE_CHARS)
+    except (OSError, ValueError):
+        logger.debug("Unreadable text sidecar for %s", file_path)
+    return ""
+
+
+def _evidence_doc(row):
+    title = f"{row['entity_name']} — {row['evidence_type']}"
+    lines = [f"Source: {p}" for p in (row["source_name"], row["source_url"]) if p]
+    text = _evidence_text(row["file_path"])
+    if text:
+        lines.append(text)
+    return title, "\n".join(lines)
+
+
+def _build_docs(db, conn, batch):
+    """(kind, ref_id, title, body) for the rows in *batch* that still exist."""
+    ids = {"company": [], "entity": [], "evidence": []}
+    for kind, ref_id in batch:
+        ids[kind].append(ref_id)
+    docs = []
+    if ids["company"]:
+        for row in db._search_company_sources(conn, ids["company"]):
+            docs.append(("company", row["id"], *_company_doc(row)))
+    if ids["entity"]:
+        rows, attributes = db._search_entity_sources(conn, ids["entity"])
+        for row in rows:
+            docs.append(("entity", row["id"], *_entity_doc(row, attributes.get(row["id"], {}))))
+    if ids["evidence"]:
+        for row in db._search_evidence_sources(conn, ids["evidence"]):
+            docs.append(("evidence", row["id"], *_evidence_doc(row)))
+    return docs
+
+
+def refresh(db, project_id, batch_size=REFRESH_BATCH_SIZE):
+    """Bring a project's index up to date; returns the number of rows applied.
+
+    Each batch is read, rebuilt and written in one immediate transaction,
+    so concurrent refreshes of the same project cannot interleave.
+    """
+    applied = 0
+    with db._conn() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if db._search_backfill(conn, project_id):
+            logger.info("Building search index for project %d", project_id)
+    while True:
+        with db._conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            batch = db._search_dirty_batch(conn, project_id, batch_size)
+            if not batch:
+                return applied
+            db._search_write(conn, project_id, batch, _build_docs(db, conn, batch))
+        applied += len(batch)
+
+
+# ── Queries ──────────────────────────────────────────────────
+
+def match_query(question):
+    """FTS5 expression matching any meaningful term of *question*, or None.
+
+    Terms are quoted so user text can never be read as FTS5 syntax.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(question.lower()):
+        token = token.strip("'-")
+        if len(token) > 1 and token not in _STOPWORDS and token not in terms:
+            terms.append(token)
+    if not terms:
+        return None
+    return " OR ".join('"{}"'.format(t.replace('"', "")) for t in terms[:MAX_QUERY_TERMS])
+
+
+def select_passages(matches, token_budget=DEFAULT_TOKEN_BUDGET,
+                    passage_max_tokens=PASSAGE_MAX_TOKENS):
+    """Pack ranked matches into *token_budget*, best first.
+
+    A match is used whole when it is short and as its snippet otherwise;
+    one that does not fit is skipped so smaller ones further down can.
+    """
+    passages, used = [], 0
+    for m in matches:
+        text = m["body"] if estimate_tokens(m["body"]) <= passage_max_tokens else m["snippet"]
+        cost = estimate_tokens(m["title"]) + estimate_tokens(text) + 4
+        if used + cost > token_budget:
+            continue
+        passages.append({"kind": m["kind"], "ref_id": m["ref_id"], "title": m["title"],
+                         "text": text, "score": round(m["score"], 4)})
+        used += cost
+    return passages
+
+
+def retrieve(db, project_id, question, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Passages from a project most relevant to *question*, within *token_budget*.
+
+    Returns: [{kind, ref_id, title, text, score}], most relevant first;
+    empty when nothing matches.
+    """
+    refresh(db, project_id)
+    query = match_query(question)
+    if not query:
+        return []
+    return select_passages(db.search_documents(project_id, query, limit=CANDIDATES),
+                           token_budget)
+
+
+def format_passages(passages):
+    """Passages as a numbered context block for the prompt."""
+    return "\n\n".join(f"[{i}] ({p['kind']}) {p['title']}\n{p['text']}"
+                       for i, p in enumerate(passages, start=1))
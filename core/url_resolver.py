@@ -2,9 +2,6 @@
 import re
 from pathlib import Path
 
-import requests
-from bs4 import BeautifulSoup
-
 SHORTENER_PATTERNS = [
     r'bit\.ly', r'tinyurl\.com', r'linktr\.ee', r'linkin\.bio',
     r'beacons\.ai', r'msha\.ke', r'heylink\.me', r't\.co',
@@ -97,6 +94,9 @@ def resolve_shortened_url(url, _depth=0):
 
     Recursively follows aggregator-to-aggregator chains (max depth 3).
     """
+    import requests
+    from bs4 import BeautifulSoup
+
     MAX_DEPTH = 3
     if _depth >= MAX_DEPTH:
         return url, False
@@ -160,6 +160,8 @@ def validate_url(url):
     Tries HEAD first (cheap), falls back to GET if HEAD returns 405 (Method Not
     Allowed) — common on enterprise SaaS sites that block HEAD requests.
     """
+    import requests
+
     try:
         response = requests.head(url, timeout=10, allow_redirects=True, headers=HEADERS)
         if response.status_code == 405:
@@ -225,6 +227,21 @@ def extract_urls_from_text(text):
     return list(set(cleaned))
 
 
+def _url_column(rows):
+    """Values of the url/link/website column (else the first column), streamed."""
+    urls = []
+    column = None
+    for row in rows:
+        if column is None:
+            headers = [h for h in row if h != "_row"]
+            column = next((h for h in ("url", "link", "website") if h in headers),
+                          headers[0] if headers else None)
+        value = row.get(column)
+        if value not in (None, ""):
+            urls.append(str(value).strip())
+    return urls
+
+
 def parse_file(filepath):
     """Parse URLs from various file formats."""
     path = Path(filepath)
@@ -234,15 +251,11 @@ def parse_file(filepath):
         text = path.read_text(encoding='utf-8')
         return extract_urls_from_text(text)
 
-    elif ext == '.csv':
-        import pandas as pd
-        df = pd.read_csv(path)
-        for col_name in ['url', 'link', 'URL', 'Link', 'website']:
-            if col_name in df.columns:
-                return df[col_name].dropna().tolist()
-        return df.iloc[:, 0].dropna().tolist()
+    elif ext in ['.csv', '.xlsx']:
+        from core.bulk_import import iter_rows
+        return _url_column(iter_rows(path, path.name))
 
-    elif ext in ['.xlsx', '.xls']:
+    elif ext == '.xls':
         import pandas as pd
         df = pd.read_excel(path)
         for col_name in ['url', 'link', 'URL', 'Link', 'website']:
@@ -1432,7 +1432,14 @@ def _graceful_shutdown(window):
     # 1b. Remove menu bar status item
     _remove_status_item()
 
-    # 2. Git sync (with configurable timeout)
+    # 2. Write out debounced exports, then git sync (with configurable timeout)
+    try:
+        from core.export_scheduler import flush_exports
+        from core.git_sync import cancel_git_sync
+        flush_exports()
+        cancel_git_sync()  # the sync below commits everything
+    except Exception:
+        logger.exception("Flushing pending exports failed")
     settings = load_app_settings()
     if settings.get("git_sync_enabled", True):
         git_timeout = settings.get("git_sync_timeout", 10)
@@ -0,0 +1,307 @@
+"""Columnar analytics export of the entity-attribute store (Parquet / Feather).
+
+Writes typed pandas tables for notebook analysis, partitioned by project:
+
+    DATA_DIR/analytics/<table>/project_id=<id>/part-*.parquet
+
+Tables:
+    entities            one row per entity, current attributes pivoted
+                        into typed columns (entity × attribute)
+    attribute_history   every attribute value ever captured (long format,
+                        with snapshot ids)
+    extraction_results  AI extraction results with job model/source
+    evidence            evidence metadata
+    change_feed         monitoring change feed
+
+attribute_history is append-only in the database, so incremental exports
+write only rows with an id above the last exported one as a new part
+file. The other tables are derived or mutable and are rewritten each
+time. Parquet needs pyarrow (or fastparquet); Feather needs pyarrow.
+"""
+import importlib.util
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from config import DATA_DIR
+
+ANALYTICS_DIR = "analytics"
+FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+# Any one of these packages can write the format
+ENGINES = {"parquet": ("pyarrow", "fastparquet"), "feather": ("pyarrow",)}
+TABLES = ("entities", "attribute_history", "extraction_results", "evidence", "change_feed")
+
+# Incremental history parts are compacted into one file past this many
+HISTORY_COMPACT_PARTS = 32
+
+ENTITY_COLUMNS = [
+    "entity_id", "type_slug", "name", "slug", "parent_entity_id", "category_id",
+    "category_name", "status", "is_starred", "is_deleted", "confidence_score",
+    "source", "created_at", "updated_at",
+]
+HISTORY_COLUMNS = [
+    "id", "entity_id", "type_slug", "attr_slug", "value", "source", "confidence",
+    "captured_at", "snapshot_id",
+]
+EXTRACTION_COLUMNS = [
+    "id", "job_id", "entity_id", "attr_slug", "extracted_value", "confidence", "status",
+    "reviewed_value", "reviewed_at", "needs_evidence", "source_evidence_id", "created_at",
+    "model", "source_type", "source_ref",
+]
+EVIDENCE_COLUMNS = [
+    "id", "entity_id", "evidence_type", "file_path", "source_url", "source_name",
+    "metadata_json", "captured_at",
+]
+CHANGE_FEED_COLUMNS = [
+    "id", "entity_id", "monitor_id", "check_id", "change_type", "severity", "title",
+    "description", "source_url", "is_read", "is_dismissed", "created_at",
+]
+
+_INT_COLUMNS = {"id", "entity_id", "job_id", "parent_entity_id", "category_id",
+                "snapshot_id", "source_evidence_id", "monitor_id", "check_id"}
+_FLOAT_COLUMNS = {"confidence", "confidence_score"}
+_BOOL_COLUMNS = {"is_starred", "is_deleted", "needs_evidence", "is_read", "is_dismissed"}
+_DATE_COLUMNS = {"created_at", "updated_at", "captured_at", "reviewed_at"}
+
+_TRUE = {"1", "true", "yes", "y", "t"}
+_FALSE = {"0", "false", "no", "n", "f"}
+
+
+def require_engine(fmt):
+    """Raise ImportError unless a writer for *fmt* is installed; ValueError if unknown."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown analytics format '{fmt}' (use parquet or feather)")
+    if not any(importlib.util.find_spec(e) for e in ENGINES[fmt]):
+        raise ImportError(
+            f"{fmt.title()} export requires pyarrow. Install with: pip install pyarrow"
+        )
+
+
+# ── Typing ───────────────────────────────────────────────────
+
+def _to_bool(series):
+    lowered = series.astype("string").str.strip().str.lower()
+    out = pd.Series(pd.NA, index=series.index, dtype="boolean")
+    out[lowered.isin(_TRUE)] = True
+    out[lowered.isin(_FALSE)] = False
+    return out
+
+
+def _to_datetime(series):
+    return pd.to_datetime(series, errors="coerce", format="ISO8601")
+
+
+def coerce_attribute(series, data_type):
+    """Type a column of text attribute values by its schema data_type."""
+    if data_type in ("number", "currency"):
+        return pd.to_numeric(series, errors="coerce").astype("Float64")
+    if data_type == "boolean":
+        return _to_bool(series)
+    if data_type == "date":
+        return _to_datetime(series)
+    return series.astype("string")
+
+
+def _typed(df):
+    """Apply the standard column types to a table read from SQLite."""
+    for col in df.columns:
+        if col in _INT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col in _FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Float64")
+        elif col in _BOOL_COLUMNS:
+            df[col] = _to_bool(df[col])
+        elif col in _DATE_COLUMNS:
+            df[col] = _to_datetime(df[col])
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def _frame(rows, columns):
+    return _typed(pd.DataFrame.from_records(list(rows), columns=columns))
+
+
+def _attribute_types(db, project_id):
+    """{attr_slug: data_type} across the project's entity types (first wins)."""
+    types = {}
+    for type_def in db.get_entity_type_defs(project_id):
+        for attr in type_def.get("attributes") or []:
+            types.setdefault(attr["slug"], attr.get("data_type", "text"))
+    return types
+
+
+# ── Table builders ───────────────────────────────────────────
+
+def entities_frame(db, project_id):
+    """Entities with their current attribute values pivoted into typed columns.
+
+    Attribute columns are named by slug; a slug that clashes with an
+    entity column is prefixed with ``attr_``.
+    """
+    entities = _frame(db.iter_analytics_entities(project_id), ENTITY_COLUMNS)
+    current = pd.DataFrame.from_records(
+        list(db.iter_current_attributes(project_id)),
+        columns=["entity_id", "attr_slug", "value"],
+    )
+    if current.empty:
+        return entities
+
+    wide = current.pivot(index="entity_id", columns="attr_slug", values="value")
+    types = _attribute_types(db, project_id)
+    for slug in wide.columns:
+        wide[slug] = coerce_attribute(wide[slug], types.get(slug, "text"))
+    wide = wide.rename(columns={s: f"attr_{s}" for s in wide.columns if s in ENTITY_COLUMNS})
+    wide.columns.name = None
+    wide.index = wide.index.astype("Int64")
+    return entities.merge(wide, how="left", left_on="entity_id", right_index=True)
+
+
+def attribute_history_frame(db, project_id, after_id=0):
+    """Long-format attribute history (id > *after_id*), with a numeric view of each value."""
+    df = _frame(db.iter_attribute_history(project_id, after_id=after_id), HISTORY_COLUMNS)
+    df["value_number"] = pd.to_numeric(df["value"], errors="coerce").astype("Float64")
+    return df
+
+
+def build_frame(db, project_id, table):
+    """Build one analytics table as a typed DataFrame."""
+    if table == "entities":
+        return entities_frame(db, project_id)
+    if table == "attribute_history":
+        return attribute_history_frame(db, project_id)
+    if table == "extraction_results":
+        return _frame(db.iter_analytics_extraction_results(project_id), EXTRACTION_COLUMNS)
+    if table == "evidence":
+        return _frame(db.iter_analytics_evidence(project_id), EVIDENCE_COLUMNS)
+    if table == "change_feed":
+        return _frame(db.iter_change_feed(project_id), CHANGE_FEED_COLUMNS)
+    raise ValueError(f"Unknown analytics table '{table}'")
+
+
+# ── Files ────────────────────────────────────────────────────
+
+def _root(root=None):
+    return Path(root) if root else DATA_DIR / ANALYTICS_DIR
+
+
+def _partition(root, table, project_id):
+    return root / table / f"project_id={project_id}"
+
+
+def _write_frame(df, path, fmt):
+    """Write *df* to *path* via a temp file, replacing it atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    df = df.reset_index(drop=True)
+    if fmt == "parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_feather(tmp_path)
+    tmp_path.replace(path)
+
+
+def _clear_partition(partition):
+    if partition.exists():
+        for part in partition.iterdir():
+            part.unlink()
+
+
+def _load_manifest(root):
+    try:
+        return json.loads((root / "_manifest.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(root, manifest):
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_path = root / "_manifest.json.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    tmp_path.replace(root / "_manifest.json")
+
+
+def _export_history(db, project_id, root, fmt, state, full):
+    """Append new attribute rows as a part file; rewrite on *full* or compaction."""
+    partition = _partition(root, "attribute_history", project_id)
+    ext = FORMATS[fmt]
+    existing = sorted(partition.glob(f"part-*{ext}")) if partition.exists() else []
+    last_id = state.get("last_id", 0)
+    if full or not existing or len(existing) >= HISTORY_COMPACT_PARTS:
+        last_id = 0
+
+    new = attribute_history_frame(db, project_id, after_id=last_id)
+    if last_id == 0:
+        _clear_partition(partition)
+        _write_frame(new, partition / f"part-{0:012d}{ext}", fmt)
+        parts, mode = 1, "rewrite"
+    elif new.empty:
+        parts, mode = len(existing), "unchanged"
+    else:
+        _write_frame(new, partition / f"part-{int(new['id'].iloc[0]):012d}{ext}", fmt)
+        parts, mode = len(existing) + 1, "append"
+
+    if not new.empty:
+        last_id = int(new["id"].iloc[-1])
+    state.update({"last_id": last_id, "parts": parts})
+    return {"rows": len(new), "mode": mode, "last_id": last_id, "parts": parts}
+
+
+def export_columnar(db, project_id, fmt="parquet", root=None, full=False):
+    """Write every analytics table for a project.
+
+    Args:
+        db: Database instance
+        project_id: Project to export
+        fmt: "parquet" or "feather"
+        root: Output root (default DATA_DIR/analytics)
+        full: Rewrite attribute_history instead of appending new rows
+
+    Returns:
+        {"project_id", "format", "path", "tables": {table: {rows, mode}}}
+
+    Raises:
+        ValueError: unknown format
+        ImportError: no writer installed for the format
+    """
+    require_engine(fmt)
+    root = _root(root)
+    manifest = _load_manifest(root)
+    state = manifest.get(str(project_id), {})
+    if state.get("format") != fmt:
+        state = {"format": fmt}
+        full = True
+
+    tables = {}
+    for table in TABLES:
+        if table == "attribute_history":
+            tables[table] = _export_history(
+                db, project_id, root, fmt, state.setdefault("attribute_history", {}), full)
+            continue
+        df = build_frame(db, project_id, table)
+        partition = _partition(root, table, project_id)
+        _clear_partition(partition)
+        _write_frame(df, partition / f"part-0{FORMATS[fmt]}", fmt)
+        tables[table] = {"rows": len(df), "mode": "rewrite"}
+
+    state["exported_at"] = datetime.now().isoformat()
+    manifest[str(project_id)] = state
+    _save_manifest(root, manifest)
+    return {"project_id": project_id, "format": fmt, "path": str(root), "tables": tables}
+
+
+def load_table(table, project_id, root=None):
+    """Read an exported table back into one DataFrame (parts in id order)."""
+    if table not in TABLES:
+        raise ValueError(f"Unknown analytics table '{table}'")
+    root = _root(root)
+    fmt = _load_manifest(root).get(str(project_id), {}).get("format", "parquet")
+    partition = _partition(root, table, project_id)
+    parts = sorted(partition.glob(f"part-*{FORMATS[fmt]}")) if partition.exists() else []
+    if not parts:
+        raise FileNotFoundError(f"No {table} export for project {project_id} in {root}")
+    read = pd.read_parquet if fmt == "parquet" else pd.read_feather
+    frames = [read(p) for p in parts]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
@@ -7,6 +7,7 @@ project CRUD while allowing each feature area to be edited independently.
 import json
 import re
 import sqlite3
+import zlib
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -15,15 +16,23 @@ from config import DB_PATH, SEED_CATEGORIES
 from storage.repos import (
     CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixin,
     ResearchMixin, CanvasMixin, TemplateMixin, DimensionsMixin, DiscoveryMixin,
-    EntityMixin, ExtractionMixin,
+    EntityMixin, ExtractionMixin, ExportMixin, GraphMixin, ResponseCacheMixin,
+    SearchMixin,
 )
 from storage.repos.features import FeaturesMixin
 
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
+
 
 class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixin,
                ResearchMixin, CanvasMixin, TemplateMixin, DimensionsMixin, DiscoveryMixin,
-               EntityMixin, ExtractionMixin, FeaturesMixin):
+               EntityMixin, ExtractionMixin, FeaturesMixin, ExportMixin, GraphMixin,
+               ResponseCacheMixin, SearchMixin):
     _wal_set = False  # class-level: WAL only needs to be set once per DB file
+    # sqlite3.Connection subclass used by _get_conn (web.profiling swaps in
+    # an instrumented one)
+    connection_factory = sqlite3.Connection
+    _fingerprint = None  # see _schema_fingerprint
 
     def __init__(self, db_path=None):
         self.db_path = db_path or DB_PATH
@@ -41,7 +50,8 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
         Direct assignment (``conn = db._get_conn()``) is still valid for
         callers that manage their own ``try/finally conn.close()`` block.
         """
-        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn = sqlite3.connect(str(self.db_path), timeout=10,
+                               factory=self.connection_factory)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys=ON")
         conn.execute("PRAGMA busy_timeout=10000")
@@ -70,10 +80,33 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
         finally:
             conn.close()
 
+    @classmethod
+    def _schema_fingerprint(cls):
+        """Checksum of schema.sql and this module's migration code (0 if unreadable).
+
+        Stored in ``PRAGMA user_version`` once a file is initialised, so
+        later constructions can tell the file is already up to date.
+        """
+        if cls._fingerprint is None:
+            try:
+                source = SCHEMA_PATH.read_bytes() + Path(__file__).read_bytes()
+                cls._fingerprint = zlib.crc32(source) & 0x7FFFFFFF
+            except OSError:
+                cls._fingerprint = 0
+        return cls._fingerprint
+
     def _init_db(self):
-        """Initialize database, migrating existing data if needed."""
+        """Initialize database, migrating existing data if needed.
+
+        Skipped entirely when the file was initialised by the same schema
+        and migration code, which makes opening a Database nearly free.
+        """
         conn = self._get_conn()
         try:
+            fingerprint = self._schema_fingerprint()
+            if fingerprint and conn.execute("PRAGMA user_version").fetchone()[0] == fingerprint:
+                return
+
             tables = {r[0] for r in conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table'"
             ).fetchall()}
@@ -105,8 +138,8 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
 
             conn.commit()
 
-            schema_path = Path(__file__).parent / "schema.sql"
-            conn.executescript(schema_path.read_text())
+            conn.executescript(SCHEMA_PATH.read_text())
+            conn.execute(f"PRAGMA user_version = {fingerprint}")
         finally:
             conn.close()
 
@@ -419,6 +452,8 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
             conn.execute(
                 f"UPDATE projects SET {set_clause} WHERE id = ?", values
             )
+        if "entity_schema" in safe_fields:
+            self.invalidate_entity_mode(project_id)
 
     def delete_project(self, project_id):
         """Delete a project and ALL associated data. Irreversible.
@@ -456,7 +491,11 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
                 "map_layouts", "saved_views", "share_tokens",
                 "activity_log", "notification_prefs", "canvases",
                 "research_dimensions", "project_contexts",
-                "discovery_analyses",
+                "discovery_analyses", "graph_layouts", "graph_versions",
+                "response_cache",
+                # after entities/companies, whose deletes queue search work
+                "search_index", "search_dirty", "search_index_state",
+                "data_versions",  # last: deletes above bump it via triggers
             ]
             for table in _always_tables:
                 conn.execute(
@@ -494,6 +533,11 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
                 except sqlite3.OperationalError:
                     pass  # table may not exist yet
 
+            # After every table whose triggers bump it
+            conn.execute(
+                "DELETE FROM project_versions WHERE project_id = ?", (project_id,)
+            )
+
             # Cross-project: entity_links cleaned by entity cascade.
             # cross_project_insights stores project_ids as JSON text.
             # Parse JSON properly to avoid LIKE '%N%' matching project IDs
@@ -524,7 +568,8 @@ class Database(CompanyMixin, TaxonomyMixin, JobsMixin, SocialMixin, SettingsMixi
             conn.execute(
                 "DELETE FROM projects WHERE id = ?", (project_id,)
             )
-            return True
+        self.invalidate_entity_mode(project_id)
+        return True
 
     # --- Helpers ---
 
@@ -1,6 +1,8 @@
 """Export taxonomy data to JSON, Markdown, and CSV."""
 import csv
+import io
 import json
+import threading
 from collections import Counter
 from datetime import datetime
 from pathlib import Path
@@ -8,68 +10,86 @@ from pathlib import Path
 from config import DATA_DIR
 
 
-def export_json(db, output_path=None, project_id=None):
-    """Export full taxonomy to JSON including all related tables."""
-    output_path = output_path or (DATA_DIR / "taxonomy_data.json")
-    companies = db.get_companies(project_id=project_id)
-    categories = db.get_categories(project_id=project_id)
-    stats = db.get_stats(project_id=project_id)
+CSV_FIELDNAMES = [
+    "name", "url", "category_name", "subcategory_name", "what", "target",
+    "products", "funding", "geography", "tam", "tags", "confidence_score",
+    "employee_range", "founded_year", "funding_stage", "total_funding_usd",
+    "hq_city", "hq_country", "linkedin_url", "is_starred", "completeness",
+    "processed_at",
+]
 
-    # Collect notes and events per company
-    for c in companies:
-        try:
-            c["notes"] = db.get_notes(c["id"])
-            c["events"] = db.get_events(c["id"])
-        except Exception:
-            pass  # graceful if methods not available
-
-    # Additional tables
-    taxonomy_history = []
-    reports = []
-    activity = []
-    saved_views = []
-    try:
-        taxonomy_history = db.get_taxonomy_history(project_id=project_id, limit=500)
-    except Exception:
-        pass
-    try:
-        reports = db.get_reports(project_id=project_id)
-    except Exception:
-        pass
-    try:
-        activity = db.get_activity(project_id, limit=500) if project_id else []
-    except Exception:
-        pass
+# Rows rendered per chunk when streaming CSV
+CSV_CHUNK_ROWS = 200
+
+
+def _write_chunks(output_path, chunks):
+    """Write text *chunks* to *output_path* via a temp file, replacing it atomically."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w", newline="") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    tmp_path.replace(output_path)
+    return output_path
+
+
+def _json_array(items, indent="  "):
+    """Yield a JSON array one item per line."""
+    first = True
+    for item in items:
+        yield ("[\n" if first else ",\n") + indent + "  " + json.dumps(item, default=str)
+        first = False
+    yield "[]" if first else "\n" + indent + "]"
+
+
+def _safe(fn, default):
+    """Optional export sections: an unavailable table yields *default*."""
     try:
-        saved_views = db.get_saved_views(project_id) if project_id else []
+        return fn()
     except Exception:
-        pass
-
-    data = {
-        "metadata": {
-            "last_updated": datetime.now().isoformat(),
-            "total_companies": stats["total_companies"],
-            "total_categories": stats["total_categories"],
-            "exported_at": datetime.now().isoformat(),
-        },
-        "categories": categories,
-        "companies": companies,
-        "taxonomy_history": taxonomy_history,
-        "reports": reports,
-        "activity_log": activity,
-        "saved_views": saved_views,
+        return default
+
+
+def iter_json(db, project_id=None):
+    """Yield the full taxonomy JSON export as text chunks.
+
+    Companies (with notes and events), taxonomy history and activity are
+    streamed from the database, so memory stays flat however large the
+    project is.
+    """
+    stats = db.get_stats(project_id=project_id)
+    now = datetime.now().isoformat()
+    metadata = {
+        "last_updated": now,
+        "total_companies": stats["total_companies"],
+        "total_categories": stats["total_categories"],
+        "exported_at": now,
     }
+    sections = [
+        ("categories", db.get_categories(project_id=project_id)),
+        ("companies", db.iter_export_companies(project_id=project_id)),
+        ("taxonomy_history", db.iter_taxonomy_history(project_id=project_id)),
+        ("reports", _safe(lambda: db.get_reports(project_id=project_id), [])),
+        ("activity_log", db.iter_activity(project_id) if project_id else []),
+        ("saved_views", _safe(lambda: db.get_saved_views(project_id), []) if project_id else []),
+    ]
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
-    return output_path
+    yield '{\n  "metadata": ' + json.dumps(metadata)
+    for key, items in sections:
+        yield f',\n  "{key}": '
+        yield from _json_array(items)
+    yield "\n}\n"
 
 
-def export_markdown(db, output_path=None, project_id=None):
-    """Export taxonomy as LLM-optimized markdown for Claude/FigJam."""
-    output_path = output_path or (DATA_DIR / "taxonomy_master.md")
-    companies = db.get_companies(project_id=project_id)
+def export_json(db, output_path=None, project_id=None):
+    """Export full taxonomy to JSON including all related tables."""
+    output_path = output_path or (DATA_DIR / "taxonomy_data.json")
+    return _write_chunks(output_path, iter_json(db, project_id=project_id))
+
+
+def _markdown_header(db, project_id=None):
+    """Metadata, taxonomy tree and summary statistics (sections 1-4)."""
     stats = db.get_stats(project_id=project_id)
     category_stats = db.get_category_stats(project_id=project_id)
 
@@ -134,15 +154,11 @@ def export_markdown(db, output_path=None, project_id=None):
     lines.append("")
 
     # Tag distribution
-    all_tags = []
-    for c in companies:
-        tags = c.get("tags", [])
-        if isinstance(tags, str):
-            tags = json.loads(tags)
-        all_tags.extend(tags)
-
-    if all_tags:
-        tag_counts = Counter(all_tags)
+    tag_counts = Counter()
+    for tags in db.iter_export_tags(project_id=project_id):
+        tag_counts.update(tags)
+
+    if tag_counts:
         lines.append("### Tag Distribution")
         lines.append("")
         lines.append("| Tag | Count |")
@@ -155,46 +171,46 @@ def export_markdown(db, output_path=None, project_id=None):
     lines.append("## Companies by Category")
     lines.append("")
 
-    by_category = {}
-    for company in companies:
-        cat = company.get("category_name") or "Uncategorized"
-        by_category.setdefault(cat, []).append(company)
+    return "\n".join(lines)
 
-    for category in sorted(by_category.keys()):
-        cat_companies = sorted(by_category[category], key=lambda x: x["name"])
-        lines.append(f"### {category} ({len(cat_companies)} companies)")
-        lines.append("")
 
-        for company in cat_companies:
-            tags = company.get("tags", [])
-            if isinstance(tags, str):
-                tags = json.loads(tags)
-            tag_str = ", ".join(tags) if tags else "none"
-            confidence = (
-                f"{company['confidence_score'] * 100:.0f}%"
-                if company.get("confidence_score") is not None
-                else "N/A"
-            )
-
-            lines.append(f"#### {company['name']}")
-            lines.append("")
-            lines.append(f"- **URL**: {company['url']}")
-            lines.append(
-                f"- **Category**: {company.get('category_name', 'N/A')}"
-                f" > {company.get('subcategory_name', 'N/A')}"
-            )
-            lines.append(f"- **Tags**: {tag_str}")
-            lines.append(f"- **Confidence**: {confidence}")
-            lines.append(f"- **What**: {company.get('what', 'N/A')}")
-            lines.append(f"- **Target**: {company.get('target', 'N/A')}")
-            lines.append(f"- **Products**: {company.get('products', 'N/A')}")
-            lines.append(f"- **Funding**: {company.get('funding', 'N/A')}")
-            lines.append(f"- **Geography**: {company.get('geography', 'N/A')}")
-            lines.append(f"- **TAM**: {company.get('tam', 'N/A')}")
-            lines.append(f"- **Processed**: {company.get('processed_at', 'N/A')}")
-            lines.append("")
+def _markdown_category_heading(category):
+    return f"### {category['category']} ({category['company_count']} companies)\n"
+
+
+def _markdown_card(company):
+    lines = []
+    tags = company["tags"]
+    tag_str = ", ".join(tags) if tags else "none"
+    confidence = (
+        f"{company['confidence_score'] * 100:.0f}%"
+        if company.get("confidence_score") is not None
+        else "N/A"
+    )
 
+    lines.append(f"#### {company['name']}")
+    lines.append("")
+    lines.append(f"- **URL**: {company['url']}")
+    lines.append(
+        f"- **Category**: {company.get('category_name', 'N/A')}"
+        f" > {company.get('subcategory_name', 'N/A')}"
+    )
+    lines.append(f"- **Tags**: {tag_str}")
+    lines.append(f"- **Confidence**: {confidence}")
+    lines.append(f"- **What**: {company.get('what', 'N/A')}")
+    lines.append(f"- **Target**: {company.get('target', 'N/A')}")
+    lines.append(f"- **Products**: {company.get('products', 'N/A')}")
+    lines.append(f"- **Funding**: {company.get('funding', 'N/A')}")
+    lines.append(f"- **Geography**: {company.get('geography', 'N/A')}")
+    lines.append(f"- **TAM**: {company.get('tam', 'N/A')}")
+    lines.append(f"- **Processed**: {company.get('processed_at', 'N/A')}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _markdown_footer():
     # === Section 6: Visualization Instructions ===
+    lines = []
     lines.append("---")
     lines.append("")
     lines.append("## Visualization Instructions")
@@ -218,32 +234,141 @@ def export_markdown(db, output_path=None, project_id=None):
         'across categories"'
     )
     lines.append("")
+    return "\n".join(lines)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        f.write("\n".join(lines))
-    return output_path
+
+def iter_markdown(db, project_id=None):
+    """Yield the LLM-optimized markdown export as text chunks.
+
+    Company cards are streamed in category order; only per-category and
+    per-tag counts are held in memory.
+    """
+    yield _markdown_header(db, project_id=project_id)
+    categories = {c["category_id"]: c for c in db.get_export_categories(project_id=project_id)}
+    current = None
+    for company in db.iter_export_companies(project_id=project_id, order="category",
+                                            with_related=False):
+        category_id = company["category_id"] or -1
+        if category_id != current:
+            current = category_id
+            yield "\n" + _markdown_category_heading(categories[category_id])
+        yield "\n" + _markdown_card(company)
+    yield "\n" + _markdown_footer()
+
+
+def export_markdown(db, output_path=None, project_id=None):
+    """Export taxonomy as LLM-optimized markdown for Claude/FigJam."""
+    output_path = output_path or (DATA_DIR / "taxonomy_master.md")
+    return _write_chunks(output_path, iter_markdown(db, project_id=project_id))
+
+
+def iter_csv(db, project_id=None):
+    """Yield the CSV export as text chunks of CSV_CHUNK_ROWS rows."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDNAMES, extrasaction="ignore")
+    writer.writeheader()
+    for i, company in enumerate(db.iter_export_companies(project_id=project_id,
+                                                         with_related=False), 1):
+        row = dict(company)
+        row["tags"] = ", ".join(row.get("tags", []))
+        writer.writerow(row)
+        if i % CSV_CHUNK_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
 
 
 def export_csv(db, output_path=None, project_id=None):
     """Export taxonomy as CSV."""
     output_path = output_path or (DATA_DIR / "taxonomy_export.csv")
-    companies = db.get_companies(project_id=project_id)
-
-    fieldnames = [
-        "name", "url", "category_name", "subcategory_name", "what", "target",
-        "products", "funding", "geography", "tam", "tags", "confidence_score",
-        "employee_range", "founded_year", "funding_stage", "total_funding_usd",
-        "hq_city", "hq_country", "linkedin_url", "is_starred", "completeness",
-        "processed_at",
-    ]
+    return _write_chunks(output_path, iter_csv(db, project_id=project_id))
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        for company in companies:
-            row = dict(company)
-            row["tags"] = ", ".join(row.get("tags", []))
-            writer.writerow(row)
-    return output_path
+
+# --- Incremental export ---
+
+EXPORT_CACHE_DIR = ".export_cache"
+
+_export_lock = threading.Lock()
+
+
+def _load_manifest(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _iter_markdown_sections(db, project_id, cache_dir, manifest, stats):
+    """Yield the company sections, rebuilding only categories whose version moved."""
+    versions = db.get_category_versions(project_id=project_id)
+    cached = manifest.get("sections", {})
+    sections = {}
+    for category in db.get_export_categories(project_id=project_id):
+        scope = category["category_id"]
+        version = versions.get(scope, 0)
+        section_path = cache_dir / f"{scope}.md"
+        key = str(scope)
+        # The heading carries the company count, so it is part of the cache key too
+        stamp = [version, category["category"], category["company_count"]]
+        if cached.get(key) != stamp or not section_path.exists():
+            chunks = [_markdown_category_heading(category)]
+            for company in db.iter_export_companies(project_id=project_id, order="category",
+                                                    with_related=False, category_id=scope):
+                chunks.append(_markdown_card(company))
+            _write_chunks(section_path, ("\n" + c for c in chunks))
+            stats["sections_rebuilt"] += 1
+        sections[key] = stamp
+        with open(section_path) as f:
+            yield from iter(lambda: f.read(65536), "")
+    for stale in set(cached) - set(sections):
+        (cache_dir / f"{stale}.md").unlink(missing_ok=True)
+    manifest["sections"] = sections
+
+
+def export_incremental(db, project_id=None, json_path=None, md_path=None, force=False):
+    """Refresh taxonomy_data.json and taxonomy_master.md if the data changed.
+
+    Compares the project's data version (see ExportMixin.get_data_version)
+    with the one recorded at the last export and does nothing if it hasn't
+    moved. Otherwise the JSON is rewritten and the markdown is reassembled
+    from cached per-category sections, regenerating only the sections whose
+    category version moved.
+
+    Returns {"exported", "version", "sections_rebuilt", "json", "markdown"}.
+    """
+    json_path = Path(json_path or DATA_DIR / "taxonomy_data.json")
+    md_path = Path(md_path or DATA_DIR / "taxonomy_master.md")
+    cache_dir = DATA_DIR / EXPORT_CACHE_DIR / (str(project_id) if project_id else "all")
+    manifest_path = cache_dir / "manifest.json"
+
+    with _export_lock:
+        manifest = _load_manifest(manifest_path)
+        if manifest.get("db") != str(db.db_path):
+            manifest = {"db": str(db.db_path)}
+        version = db.get_data_version(project_id=project_id)
+        # Exports for other projects write the same files, so check who wrote them last
+        outputs = {"json": str(json_path), "markdown": str(md_path)}
+        written = _load_manifest(DATA_DIR / EXPORT_CACHE_DIR / "outputs.json")
+        owner = [str(db.db_path), project_id, version]
+        result = {"exported": False, "version": version, "sections_rebuilt": 0, **outputs}
+        if (not force and manifest.get("version") == version
+                and all(written.get(p) == owner for p in outputs.values())
+                and json_path.exists() and md_path.exists()):
+            return result
+
+        export_json(db, output_path=json_path, project_id=project_id)
+
+        def _markdown():
+            yield _markdown_header(db, project_id=project_id)
+            yield from _iter_markdown_sections(db, project_id, cache_dir, manifest, result)
+            yield "\n" + _markdown_footer()
+
+        _write_chunks(md_path, _markdown())
+
+        manifest["version"] = version
+        _write_chunks(manifest_path, [json.dumps(manifest)])
+        written.update({p: owner for p in outputs.values()})
+        _write_chunks(DATA_DIR / EXPORT_CACHE_DIR / "outputs.json", [json.dumps(written)])
+        result["exported"] = True
+        return result
@@ -0,0 +1,109 @@
+"""Keyset (cursor) pagination shared by the list queries.
+
+A Keyset names a total ordering: sort keys ending in a unique id. Instead
+of skipping ``offset`` rows, the next page continues strictly after the
+last row of the previous one, so page 200 costs one index seek like
+page 1, and rows inserted meanwhile don't shift later pages.
+
+Cursors are opaque url-safe tokens holding the ordering's name and the
+last row's key values. Query methods that take ``cursor=`` return a Page,
+a plain list that also carries ``next_cursor`` (None on the last page).
+"""
+import base64
+import binascii
+import json
+from collections import namedtuple
+
+# expr: SQL expression; field: row key holding its value; desc: sort
+# descending; null: substitute for NULL (the expression is wrapped in
+# COALESCE), so NULLs still sort first ascending / last descending.
+Key = namedtuple("Key", "expr field desc null", defaults=(False, None))
+
+
+class InvalidCursor(ValueError):
+    """Malformed cursor, or one issued for a different ordering."""
+
+
+class Page(list):
+    """A page of rows plus the cursor of the page after it."""
+
+    def __init__(self, rows=(), next_cursor=None):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+
+class Keyset:
+    """A total ordering usable for keyset pagination.
+
+    Args:
+        name: Identifies the ordering inside its cursors
+        *keys: Key tuples, most significant first; the last must be unique
+    """
+
+    def __init__(self, name, *keys):
+        self.name = name
+        self.keys = [Key(*k) for k in keys]
+
+    def _sql(self, key):
+        if key.null is None:
+            return key.expr
+        # COLLATE binds tighter than COALESCE; keep it on the outside
+        expr, _, collate = key.expr.partition(" COLLATE ")
+        sql = f"COALESCE({expr}, {key.null!r})"
+        return f"{sql} COLLATE {collate}" if collate else sql
+
+    def order_by(self):
+        """ORDER BY clause body."""
+        return ", ".join(f"{self._sql(k)} {'DESC' if k.desc else 'ASC'}" for k in self.keys)
+
+    def where(self, cursor):
+        """(SQL condition, params) selecting rows after *cursor*; ("", []) for no cursor.
+
+        Raises:
+            InvalidCursor: malformed cursor or one from another ordering
+        """
+        if not cursor:
+            return "", []
+        values = self.decode(cursor)
+        exprs = [self._sql(k) for k in self.keys]
+        if len({k.desc for k in self.keys}) == 1:
+            # One direction: a row-value comparison SQLite can seek an index with
+            op = "<" if self.keys[0].desc else ">"
+            marks = ", ".join("?" * len(values))
+            return f"({', '.join(exprs)}) {op} ({marks})", list(values)
+
+        # Mixed directions: k1 after v1, or k1 = v1 and the rest after theirs
+        clauses, params = [], []
+        for i, key in enumerate(self.keys):
+            equal = [f"{e} = ?" for e in exprs[:i]]
+            clauses.append(" AND ".join(equal + [f"{exprs[i]} {'<' if key.desc else '>'} ?"]))
+            params.extend(values[:i] + [values[i]])
+        # Leading bound lets an index on the first key skip ahead
+        first_op = "<=" if self.keys[0].desc else ">="
+        sql = f"{exprs[0]} {first_op} ? AND ({' OR '.join(f'({c})' for c in clauses)})"
+        return sql, [values[0]] + params
+
+    def encode(self, row):
+        """Cursor pointing just after *row*."""
+        values = [row[k.field] if row[k.field] is not None or k.null is None else k.null
+                  for k in self.keys]
+        raw = json.dumps([self.name, values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor):
+        """Key values stored in *cursor*."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            name, values = json.loads(raw)
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursor("Invalid cursor") from None
+        if name != self.name or not isinstance(values, list) or len(values) != len(self.keys):
+            raise InvalidCursor("Cursor does not match this listing's sort order")
+        return values
+
+    def page(self, rows, limit):
+        """Page of the first *limit* rows, given up to limit + 1 fetched rows."""
+        rows = list(rows)
+        if limit and len(rows) > limit:
+            return Page(rows[:limit], self.encode(rows[limit - 1]))
+        return Page(rows)
@@ -10,3 +10,7 @@ from storage.repos.dimensions import DimensionsMixin
 from storage.repos.discovery import DiscoveryMixin
 from storage.repos.entities import EntityMixin
 from storage.repos.extraction import ExtractionMixin
+from storage.repos.export import ExportMixin
+from storage.repos.graph import GraphMixin
+from storage.repos.cache import ResponseCacheMixin
+from storage.repos.search import SearchMixin
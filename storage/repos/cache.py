@@ -0,0 +1,126 @@
+"""Response cache mixin — project versions and persisted cached responses.
+
+project_versions holds one change counter per project, bumped by triggers
+on every table the lens and report endpoints read (see schema.sql and the
+monitoring tables). A cached response is stored with the version it was
+computed at and is only served while the project is still at that
+version, so writes invalidate it without any explicit purge.
+
+response_cache is the persisted tier behind web.response_cache's
+in-process LRU: it survives restarts and is shared between workers. It is
+kept under a byte budget by evicting the least-recently-hit rows.
+"""
+import json
+
+# Byte budget for persisted responses across all projects
+RESPONSE_CACHE_BUDGET_BYTES = 64 * 1024 * 1024
+_EVICT_BATCH_SIZE = 200
+
+
+class ResponseCacheMixin:
+    """Project change counters and the persisted response cache."""
+
+    def get_project_version(self, project_id):
+        """Change counter covering everything the cached endpoints read."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT version FROM project_versions WHERE project_id = ?",
+                (project_id,),
+            ).fetchone()
+            return row["version"] if row else 0
+
+    def get_cached_response(self, cache_key, version):
+        """Return {etag, body} cached for *cache_key* at *version*, or None.
+
+        A hit refreshes the row's last_hit_at so it survives eviction.
+        """
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT etag, body FROM response_cache WHERE cache_key = ? AND version = ?",
+                (cache_key, str(version)),
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                """UPDATE response_cache SET hits = hits + 1, last_hit_at = datetime('now')
+                   WHERE cache_key = ?""",
+                (cache_key,),
+            )
+            return {"etag": row["etag"], "body": row["body"]}
+
+    def put_cached_response(self, cache_key, project_id, endpoint, version, etag, body,
+                            budget_bytes=RESPONSE_CACHE_BUDGET_BYTES):
+        """Store *body* for *cache_key*, replacing any older version of it.
+
+        Returns the number of rows evicted to stay within *budget_bytes*.
+        """
+        size = len(body.encode())
+        if size > budget_bytes:
+            return 0
+        with self._get_conn() as conn:
+            conn.execute(
+                """INSERT INTO response_cache
+                       (cache_key, project_id, endpoint, version, etag, body, size_bytes)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(cache_key) DO UPDATE SET
+                       version = excluded.version, etag = excluded.etag,
+                       body = excluded.body, size_bytes = excluded.size_bytes,
+                       created_at = datetime('now'), last_hit_at = datetime('now'),
+                       hits = 0""",
+                (cache_key, project_id, endpoint, str(version), etag, body, size),
+            )
+            return self._evict_responses_over_budget(conn, budget_bytes)
+
+    def _evict_responses_over_budget(self, conn, budget_bytes):
+        """Delete least-recently-hit responses until the table fits *budget_bytes*."""
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM response_cache"
+        ).fetchone()[0]
+        evicted = 0
+        while total > budget_bytes:
+            rows = conn.execute(
+                """SELECT cache_key, size_bytes FROM response_cache
+                   ORDER BY last_hit_at ASC LIMIT ?""",
+                (_EVICT_BATCH_SIZE,),
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for row in rows:
+                if total <= budget_bytes:
+                    break
+                victims.append(row["cache_key"])
+                total -= row["size_bytes"]
+            conn.execute(
+                "DELETE FROM response_cache WHERE cache_key IN (SELECT value FROM json_each(?))",
+                (json.dumps(victims),),
+            )
+            evicted += len(victims)
+        return evicted
+
+    def clear_response_cache(self, project_id=None):
+        """Drop persisted responses (one project's, or all). Returns rows deleted."""
+        with self._get_conn() as conn:
+            if project_id is None:
+                cur = conn.execute("DELETE FROM response_cache")
+            else:
+                cur = conn.execute(
+                    "DELETE FROM response_cache WHERE project_id = ?", (project_id,))
+            return cur.rowcount
+
+    def get_response_cache_stats(self):
+        """Persisted entries, bytes and hits per endpoint."""
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """SELECT endpoint, COUNT(*) AS entries,
+                          COALESCE(SUM(size_bytes), 0) AS bytes,
+                          COALESCE(SUM(hits), 0) AS hits
+                   FROM response_cache GROUP BY endpoint ORDER BY endpoint"""
+            ).fetchall()
+        return {
+            "entries": sum(r["entries"] for r in rows),
+            "bytes": sum(r["bytes"] for r in rows),
+            "budget_bytes": RESPONSE_CACHE_BUDGET_BYTES,
+            "endpoints": {r["endpoint"]: {"entries": r["entries"], "bytes": r["bytes"],
+                                          "hits": r["hits"]} for r in rows},
+        }
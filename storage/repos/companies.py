@@ -4,8 +4,87 @@ import logging
 from datetime import datetime
 from urllib.parse import urlparse
 
+from storage.pagination import Keyset, Page
+
 logger = logging.getLogger(__name__)
 
+# Fields counted towards a company's "completeness" score
+COMPLETENESS_FIELDS = [
+    "what", "target", "products", "funding", "geography", "tam",
+    "employee_range", "founded_year", "funding_stage", "hq_city",
+    "hq_country", "linkedin_url",
+]
+
+# get_companies sort keys: (expression, row field, NULL substitute)
+_COMPANY_SORTS = {
+    "name": ("co.name", "name", None),
+    "category": ("c.name", "category_name", ""),
+    "confidence": ("co.confidence_score", "confidence_score", -1.0),
+    "geography": ("co.geography", "geography", ""),
+    "founded_year": ("co.founded_year", "founded_year", -1),
+    "updated_at": ("co.updated_at", "updated_at", None),
+    "starred": ("co.is_starred", "is_starred", 0),
+}
+
+
+def _company_keyset(sort_by, sort_dir):
+    """Keyset ordering for a get_companies sort (id breaks ties)."""
+    if sort_by not in _COMPANY_SORTS:
+        sort_by = "name"
+    desc = sort_dir.lower() == "desc"
+    expr, field, null = _COMPANY_SORTS[sort_by]
+    return Keyset(f"companies:{sort_by}:{'desc' if desc else 'asc'}",
+                  (expr, field, desc, null), ("co.id", "id", desc))
+
+
+# Insert-or-merge for one company; empty incoming fields keep existing values
+_UPSERT_SQL = """INSERT INTO companies
+    (project_id, slug, name, url, what, target, products, funding,
+     geography, tam, category_id, subcategory_id, tags, raw_research,
+     source_url, processed_at, confidence_score,
+     logo_url, employee_range, founded_year, funding_stage,
+     total_funding_usd, hq_city, hq_country, linkedin_url,
+     last_verified_at,
+     pricing_model, pricing_b2c_low, pricing_b2c_high,
+     pricing_b2b_low, pricing_b2b_high, has_free_tier,
+     revenue_model, pricing_tiers, pricing_notes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(project_id, url) DO UPDATE SET
+    name=excluded.name, slug=excluded.slug,
+    what=COALESCE(excluded.what, companies.what),
+    target=COALESCE(excluded.target, companies.target),
+    products=COALESCE(excluded.products, companies.products),
+    funding=COALESCE(excluded.funding, companies.funding),
+    geography=COALESCE(excluded.geography, companies.geography),
+    tam=COALESCE(excluded.tam, companies.tam),
+    category_id=COALESCE(excluded.category_id, companies.category_id),
+    subcategory_id=COALESCE(excluded.subcategory_id, companies.subcategory_id),
+    tags=excluded.tags,
+    raw_research=COALESCE(excluded.raw_research, companies.raw_research),
+    confidence_score=COALESCE(excluded.confidence_score, companies.confidence_score),
+    updated_at=excluded.processed_at,
+    logo_url=COALESCE(excluded.logo_url, companies.logo_url),
+    employee_range=COALESCE(excluded.employee_range, companies.employee_range),
+    founded_year=COALESCE(excluded.founded_year, companies.founded_year),
+    funding_stage=COALESCE(excluded.funding_stage, companies.funding_stage),
+    total_funding_usd=COALESCE(excluded.total_funding_usd, companies.total_funding_usd),
+    hq_city=COALESCE(excluded.hq_city, companies.hq_city),
+    hq_country=COALESCE(excluded.hq_country, companies.hq_country),
+    linkedin_url=COALESCE(excluded.linkedin_url, companies.linkedin_url),
+    last_verified_at=excluded.last_verified_at,
+    pricing_model=COALESCE(excluded.pricing_model, companies.pricing_model),
+    pricing_b2c_low=COALESCE(excluded.pricing_b2c_low, companies.pricing_b2c_low),
+    pricing_b2c_high=COALESCE(excluded.pricing_b2c_high, companies.pricing_b2c_high),
+    pricing_b2b_low=COALESCE(excluded.pricing_b2b_low, companies.pricing_b2b_low),
+    pricing_b2b_high=COALESCE(excluded.pricing_b2b_high, companies.pricing_b2b_high),
+    has_free_tier=COALESCE(excluded.has_free_tier, companies.has_free_tier),
+    revenue_model=COALESCE(excluded.revenue_model, companies.revenue_model),
+    pricing_tiers=COALESCE(excluded.pricing_tiers, companies.pricing_tiers),
+    pricing_notes=COALESCE(excluded.pricing_notes, companies.pricing_notes)
+"""
+
 
 class CompanyMixin:
 
@@ -30,83 +109,38 @@ class CompanyMixin:
         except Exception:
             return None
 
-    def upsert_company(self, data):
-        """Upsert a company using INSERT ... ON CONFLICT to avoid race conditions."""
-        slug = self._make_slug(data["name"])
-        tags_json = json.dumps(data.get("tags", []))
-        now = datetime.now().isoformat()
-        project_id = data.get("project_id", 1)
-        logo_url = data.get("logo_url") or self._derive_logo_url(data.get("url", ""))
+    @classmethod
+    def _upsert_params(cls, data, now):
+        """Parameters for _UPSERT_SQL from a company dict."""
+        logo_url = data.get("logo_url") or cls._derive_logo_url(data.get("url", ""))
         pricing_tiers = data.get("pricing_tiers")
         if pricing_tiers is not None and not isinstance(pricing_tiers, str):
             pricing_tiers = json.dumps(pricing_tiers)
+        return (
+            data.get("project_id", 1), cls._make_slug(data["name"]),
+            data["name"], data["url"], data.get("what"),
+            data.get("target"), data.get("products"), data.get("funding"),
+            data.get("geography"), data.get("tam"), data.get("category_id"),
+            data.get("subcategory_id"), json.dumps(data.get("tags", [])),
+            data.get("raw_research"),
+            data.get("source_url"), now, data.get("confidence_score"),
+            logo_url, data.get("employee_range"),
+            data.get("founded_year"), data.get("funding_stage"),
+            data.get("total_funding_usd"), data.get("hq_city"),
+            data.get("hq_country"), data.get("linkedin_url"), now,
+            data.get("pricing_model"), data.get("pricing_b2c_low"),
+            data.get("pricing_b2c_high"), data.get("pricing_b2b_low"),
+            data.get("pricing_b2b_high"),
+            1 if data.get("has_free_tier") else (0 if data.get("has_free_tier") is not None else None),
+            data.get("revenue_model"), pricing_tiers,
+            data.get("pricing_notes"),
+        )
 
+    def upsert_company(self, data):
+        """Upsert a company using INSERT ... ON CONFLICT to avoid race conditions."""
+        project_id = data.get("project_id", 1)
         with self._get_conn() as conn:
-            cursor = conn.execute(
-                """INSERT INTO companies
-                    (project_id, slug, name, url, what, target, products, funding,
-                     geography, tam, category_id, subcategory_id, tags, raw_research,
-                     source_url, processed_at, confidence_score,
-                     logo_url, employee_range, founded_year, funding_stage,
-                     total_funding_usd, hq_city, hq_country, linkedin_url,
-                     last_verified_at,
-                     pricing_model, pricing_b2c_low, pricing_b2c_high,
-                     pricing_b2b_low, pricing_b2b_high, has_free_tier,
-                     revenue_model, pricing_tiers, pricing_notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                        ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(project_id, url) DO UPDATE SET
-                    name=excluded.name, slug=excluded.slug,
-                    what=COALESCE(excluded.what, companies.what),
-                    target=COALESCE(excluded.target, companies.target),
-                    products=COALESCE(excluded.products, companies.products),
-                    funding=COALESCE(excluded.funding, companies.funding),
-                    geography=COALESCE(excluded.geography, companies.geography),
-                    tam=COALESCE(excluded.tam, companies.tam),
-                    category_id=COALESCE(excluded.category_id, companies.category_id),
-                    subcategory_id=COALESCE(excluded.subcategory_id, companies.subcategory_id),
-                    tags=excluded.tags,
-                    raw_research=COALESCE(excluded.raw_research, companies.raw_research),
-                    confidence_score=COALESCE(excluded.confidence_score, companies.confidence_score),
-                    updated_at=excluded.processed_at,
-                    logo_url=COALESCE(excluded.logo_url, companies.logo_url),
-                    employee_range=COALESCE(excluded.employee_range, companies.employee_range),
-                    founded_year=COALESCE(excluded.founded_year, companies.founded_year),
-                    funding_stage=COALESCE(excluded.funding_stage, companies.funding_stage),
-                    total_funding_usd=COALESCE(excluded.total_funding_usd, companies.total_funding_usd),
-                    hq_city=COALESCE(excluded.hq_city, companies.hq_city),
-                    hq_country=COALESCE(excluded.hq_country, companies.hq_country),
-                    linkedin_url=COALESCE(excluded.linkedin_url, companies.linkedin_url),
-                    last_verified_at=excluded.last_verified_at,
-                    pricing_model=COALESCE(excluded.pricing_model, companies.pricing_model),
-                    pricing_b2c_low=COALESCE(excluded.pricing_b2c_low, companies.pricing_b2c_low),
-                    pricing_b2c_high=COALESCE(excluded.pricing_b2c_high, companies.pricing_b2c_high),
-                    pricing_b2b_low=COALESCE(excluded.pricing_b2b_low, companies.pricing_b2b_low),
-                    pricing_b2b_high=COALESCE(excluded.pricing_b2b_high, companies.pricing_b2b_high),
-                    has_free_tier=COALESCE(excluded.has_free_tier, companies.has_free_tier),
-                    revenue_model=COALESCE(excluded.revenue_model, companies.revenue_model),
-                    pricing_tiers=COALESCE(excluded.pricing_tiers, companies.pricing_tiers),
-                    pricing_notes=COALESCE(excluded.pricing_notes, companies.pricing_notes)
-                """,
-                (
-                    project_id, slug, data["name"], data["url"], data.get("what"),
-                    data.get("target"), data.get("products"), data.get("funding"),
-                    data.get("geography"), data.get("tam"), data.get("category_id"),
-                    data.get("subcategory_id"), tags_json, data.get("raw_research"),
-                    data.get("source_url"), now, data.get("confidence_score"),
-                    logo_url, data.get("employee_range"),
-                    data.get("founded_year"), data.get("funding_stage"),
-                    data.get("total_funding_usd"), data.get("hq_city"),
-                    data.get("hq_country"), data.get("linkedin_url"), now,
-                    data.get("pricing_model"), data.get("pricing_b2c_low"),
-                    data.get("pricing_b2c_high"), data.get("pricing_b2b_low"),
-                    data.get("pricing_b2b_high"),
-                    1 if data.get("has_free_tier") else (0 if data.get("has_free_tier") is not None else None),
-                    data.get("revenue_model"), pricing_tiers,
-                    data.get("pricing_notes"),
-                ),
-            )
+            cursor = conn.execute(_UPSERT_SQL, self._upsert_params(data, datetime.now().isoformat()))
             return cursor.lastrowid or conn.execute(
                 "SELECT id FROM companies WHERE url = ? AND project_id = ?",
                 (data["url"], project_id),
@@ -116,13 +150,19 @@ class CompanyMixin:
                       starred_only=False, needs_enrichment=False,
                       sort_by="name", sort_dir="asc", limit=500, offset=0,
                       tags=None, geography=None, funding_stage=None,
-                      relationship_status=None):
-        completeness_fields = [
-            "what", "target", "products", "funding", "geography", "tam",
-            "employee_range", "founded_year", "funding_stage", "hq_city",
-            "hq_country", "linkedin_url",
-        ]
+                      relationship_status=None, cursor=None):
+        """List live companies, filtered and sorted.
 
+        Pass the previous page's ``next_cursor`` as *cursor* to continue
+        after it (offset is then ignored).
+
+        Returns: Page of company dicts
+
+        Raises:
+            InvalidCursor: cursor from another sort order or malformed
+        """
+        keyset = _company_keyset(sort_by, sort_dir)
+        after, after_params = keyset.where(cursor)
         with self._get_conn() as conn:
             query = """
                 SELECT co.*,
@@ -164,33 +204,25 @@ class CompanyMixin:
                     query += " AND co.relationship_status = ?"
                     params.append(relationship_status)
 
-            allowed_sorts = {
-                "name": "co.name",
-                "category": "c.name",
-                "confidence": "co.confidence_score",
-                "geography": "co.geography",
-                "founded_year": "co.founded_year",
-                "updated_at": "co.updated_at",
-                "starred": "co.is_starred",
-            }
-            sort_col = allowed_sorts.get(sort_by, "co.name")
-            direction = "DESC" if sort_dir.lower() == "desc" else "ASC"
-            query += f" ORDER BY {sort_col} {direction} LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            if after:
+                query += f" AND {after}"
+                params.extend(after_params)
+            query += f" ORDER BY {keyset.order_by()} LIMIT ? OFFSET ?"
+            params.extend([limit + 1, 0 if cursor else offset])
 
-            rows = conn.execute(query, params).fetchall()
+            page = keyset.page(conn.execute(query, params).fetchall(), limit)
             results = []
-            for r in rows:
+            for r in page:
                 d = dict(r)
                 d["tags"] = json.loads(d["tags"]) if d["tags"] else []
-                filled = sum(1 for f in completeness_fields if d.get(f))
-                d["completeness"] = round(filled / len(completeness_fields), 2)
+                filled = sum(1 for f in COMPLETENESS_FIELDS if d.get(f))
+                d["completeness"] = round(filled / len(COMPLETENESS_FIELDS), 2)
                 results.append(d)
 
             if needs_enrichment:
                 results = [r for r in results if r["completeness"] < 0.5]
 
-            return results
+            return Page(results, page.next_cursor)
 
     def get_companies_by_subcategory(self, subcategory_id, project_id=None):
         """Get companies assigned to a specific subcategory."""
@@ -436,8 +468,50 @@ class CompanyMixin:
         except Exception:
             return False
 
+    def get_company_urls(self, project_id):
+        """Every company URL in a project (deleted ones included), as a set."""
+        with self._get_conn() as conn:
+            return {r[0] for r in conn.execute(
+                "SELECT url FROM companies WHERE project_id = ?", (project_id,))}
+
+    def bulk_upsert_companies(self, records, project_id, existing_urls=None,
+                              source_type="import"):
+        """Upsert many companies in one transaction with executemany.
+
+        *records* may be any iterable (including a generator) of company
+        dicts. URLs are checked against *existing_urls* (loaded once if not
+        given) to count creates and updates; each new company gets its URL
+        recorded in company_sources as *source_type*.
+
+        Returns: {"created": int, "updated": int}
+        """
+        now = datetime.now().isoformat()
+        created = []
+        counts = {"updated": 0}
+        with self._get_conn() as conn:
+            if existing_urls is None:
+                existing_urls = {r[0] for r in conn.execute(
+                    "SELECT url FROM companies WHERE project_id = ?", (project_id,))}
+
+            def _params():
+                for data in records:
+                    if data["url"] in existing_urls:
+                        counts["updated"] += 1
+                    else:
+                        existing_urls.add(data["url"])
+                        created.append(data["url"])
+                    yield self._upsert_params({**data, "project_id": project_id}, now)
+
+            conn.executemany(_UPSERT_SQL, _params())
+            conn.executemany(
+                """INSERT INTO company_sources (company_id, url, source_type, added_at)
+                   SELECT id, url, ?, ? FROM companies WHERE project_id = ? AND url = ?""",
+                ((source_type, now, project_id, url) for url in created),
+            )
+        return {"created": len(created), "updated": counts["updated"]}
+
     def import_companies_from_rows(self, rows, project_id):
-        imported = 0
+        records = []
         skipped = 0
         for row in rows:
             url = row.get("url", "").strip()[:2000]
@@ -450,7 +524,6 @@ class CompanyMixin:
                 skipped += 1
                 continue
             data = {
-                "project_id": project_id,
                 "name": name,
                 "url": url,
                 "what": (row.get("what") or "")[:2000] or None,
@@ -469,12 +542,9 @@ class CompanyMixin:
                 "hq_country": (row.get("hq_country") or "")[:200] or None,
                 "linkedin_url": (row.get("linkedin_url") or "")[:500] or None,
             }
-            try:
-                self.upsert_company(data)
-                imported += 1
-            except Exception as e:
-                logger.warning("CSV import: failed to upsert %s: %s", name[:50], e)
-                skipped += 1
+            records.append(data)
+        result = self.bulk_upsert_companies(records, project_id)
+        imported = result["created"] + result["updated"]
         if skipped:
             logger.info("CSV import: %d imported, %d skipped", imported, skipped)
         return imported
@@ -11,10 +11,65 @@ Handles CRUD for the flexible entity system:
 import json
 from datetime import datetime
 
+from storage.pagination import Keyset
+
+# (db_path, project_id) -> whether the project's companies live in the
+# entity system. Shared by every Database on the same file; writes that
+# change the answer call invalidate_entity_mode().
+_ENTITY_MODE = {}
+
+# get_entities sort orders; id breaks ties so every row has a unique position
+_ENTITY_SORTS = {
+    "name": Keyset("entities:name", ("e.name", "name"), ("e.id", "id")),
+    "created_at": Keyset("entities:created_at", ("e.created_at", "created_at", True),
+                         ("e.id", "id", True)),
+    "updated_at": Keyset("entities:updated_at", ("e.updated_at", "updated_at", True),
+                         ("e.id", "id", True)),
+}
+
 
 class EntityMixin:
     """Database operations for the entity system."""
 
+    # ── Project Mode ─────────────────────────────────────────────
+
+    def project_uses_entities(self, project_id):
+        """Whether a project's companies are stored as entities (memoised).
+
+        True for multi-type schemas, and for single-type schemas once the
+        project has live entities. Cached until the schema or the set of
+        entities changes.
+        """
+        key = (str(self.db_path), project_id)
+        cached = _ENTITY_MODE.get(key)
+        if cached is not None:
+            return cached
+
+        with self._get_conn() as conn:
+            row = conn.execute(
+                """SELECT entity_schema,
+                          EXISTS(SELECT 1 FROM entities
+                                 WHERE project_id = ? AND is_deleted = 0) as has_entities
+                   FROM projects WHERE id = ?""",
+                (project_id, project_id),
+            ).fetchone()
+        uses = False
+        if row and row["entity_schema"]:
+            try:
+                entity_types = json.loads(row["entity_schema"]).get("entity_types", [])
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                entity_types = []
+            uses = bool(entity_types) and (len(entity_types) > 1 or bool(row["has_entities"]))
+        _ENTITY_MODE[key] = uses
+        return uses
+
+    def invalidate_entity_mode(self, project_id=None):
+        """Forget the memoised project mode (for every project if None)."""
+        path = str(self.db_path)
+        for key in [k for k in _ENTITY_MODE if k[0] == path
+                    and (project_id is None or k[1] == project_id)]:
+            _ENTITY_MODE.pop(key, None)
+
     # ── Entity Type Definitions ──────────────────────────────────
 
     def sync_entity_types(self, project_id, schema):
@@ -28,6 +83,7 @@ class EntityMixin:
 
     def _sync_entity_types_with_conn(self, conn, project_id, schema):
         """Internal: sync entity types using an existing connection."""
+        self.invalidate_entity_mode(project_id)
         for et in schema.get("entity_types", []):
             conn.execute("""
                 INSERT INTO entity_type_defs (project_id, slug, name, description, icon,
@@ -133,7 +189,8 @@ class EntityMixin:
                         self._set_attribute(conn, entity_id, attr_slug, value,
                                             source=source, captured_at=now)
 
-            return entity_id
+        self.invalidate_entity_mode(project_id)
+        return entity_id
 
     def get_entity(self, entity_id):
         """Get a single entity with its current attribute values."""
@@ -162,7 +219,7 @@ class EntityMixin:
 
     def get_entities(self, project_id, type_slug=None, parent_entity_id=None,
                      category_id=None, search=None, sort_by="name",
-                     include_attributes=True, limit=None, offset=None):
+                     include_attributes=True, limit=None, offset=None, cursor=None):
         """Get entities with filtering, sorting, and pagination.
 
         Args:
@@ -174,9 +231,13 @@ class EntityMixin:
             sort_by: 'name', 'created_at', 'updated_at'
             include_attributes: Whether to load current attributes
             limit: Max results
-            offset: Skip N results
+            offset: Skip N results (ignored with *cursor*)
+            cursor: Continue after a previous page's next_cursor
 
-        Returns: list of entity dicts
+        Returns: Page of entity dicts (next_cursor set when *limit* cut it short)
+
+        Raises:
+            InvalidCursor: cursor from another sort order or malformed
         """
         conditions = ["e.project_id = ?", "e.is_deleted = 0"]
         params = [project_id]
@@ -199,14 +260,14 @@ class EntityMixin:
             conditions.append("e.name LIKE ?")
             params.append(f"%{search}%")
 
-        where = " AND ".join(conditions)
+        keyset = _ENTITY_SORTS.get(sort_by, _ENTITY_SORTS["name"])
+        after, after_params = keyset.where(cursor)
+        if after:
+            conditions.append(after)
+            params.extend(after_params)
 
-        sort_map = {
-            "name": "e.name ASC",
-            "created_at": "e.created_at DESC",
-            "updated_at": "e.updated_at DESC",
-        }
-        order = sort_map.get(sort_by, "e.name ASC")
+        where = " AND ".join(conditions)
+        order = keyset.order_by()
 
         sql = f"""
             SELECT e.*, etd.name as type_name, etd.icon as type_icon,
@@ -223,14 +284,14 @@ class EntityMixin:
 
         if limit:
             sql += " LIMIT ?"
-            params.append(limit)
-            if offset:
+            params.append(limit + 1)
+            if offset and not cursor:
                 sql += " OFFSET ?"
                 params.append(offset)
 
         with self._get_conn() as conn:
             rows = conn.execute(sql, params).fetchall()
-            entities = [dict(r) for r in rows]
+            entities = keyset.page([dict(r) for r in rows], limit)
 
             if include_attributes and entities:
                 # Batch-load attributes for all entities at once (avoids N+1)
@@ -294,6 +355,7 @@ class EntityMixin:
         now = datetime.now().isoformat()
         with self._get_conn() as conn:
             self._delete_entity_recursive(conn, entity_id, now, cascade)
+        self.invalidate_entity_mode()
 
     def _delete_entity_recursive(self, conn, entity_id, now, cascade):
         """Internal: recursive soft-delete using an existing connection."""
@@ -317,6 +379,7 @@ class EntityMixin:
                 UPDATE entities SET is_deleted = 0, deleted_at = NULL
                 WHERE id = ?
             """, (entity_id,))
+        self.invalidate_entity_mode()
 
     # ── Entity Attributes (Temporal) ─────────────────────────────
 
@@ -0,0 +1,304 @@
+"""Streaming reads for exports: companies with notes/events, history, activity,
+and the entity/attribute tables behind the columnar analytics export.
+
+Exports used to load every company with get_companies() (capped at 500)
+and then query notes and events once per company. These generators run
+one ordered query per table instead and yield rows as they are read, so
+an export of tens of thousands of companies needs a handful of queries
+and constant memory.
+"""
+import json
+
+from storage.repos.companies import COMPLETENESS_FIELDS
+
+FETCH_SIZE = 500
+
+# Company orderings exports can stream in. Each is a full, deterministic
+# sort key so the notes/events queries can follow the same order.
+_COMPANY_ORDERS = {
+    "name": "co.name, co.id",
+    "category": "COALESCE(c.name, 'Uncategorized'), co.category_id, co.name, co.id",
+}
+
+
+def _iter_cursor(cursor, transform=dict):
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            return
+        for r in rows:
+            yield transform(r)
+
+
+def _company_row(row):
+    d = dict(row)
+    d["tags"] = json.loads(d["tags"]) if d["tags"] else []
+    filled = sum(1 for f in COMPLETENESS_FIELDS if d.get(f))
+    d["completeness"] = round(filled / len(COMPLETENESS_FIELDS), 2)
+    return d
+
+
+class ExportMixin:
+
+    def _company_scope(self, project_id, category_id=None):
+        where = "co.is_deleted = 0"
+        params = []
+        if project_id:
+            where += " AND co.project_id = ?"
+            params.append(project_id)
+        if category_id == -1:
+            where += " AND co.category_id IS NULL"
+        elif category_id is not None:
+            where += " AND co.category_id = ?"
+            params.append(category_id)
+        return where, params
+
+    def iter_export_companies(self, project_id=None, order="name", with_related=True,
+                              category_id=None):
+        """Yield every live company, in *order*, with its notes and events.
+
+        With *with_related*, notes and events come from one query each,
+        sorted by the same company key, and are merged into the company
+        stream in step — no per-company lookups.
+
+        Args:
+            project_id: Restrict to one project (default: all)
+            order: "name" or "category" (category name, then company name)
+            with_related: Attach ``notes`` and ``events`` lists
+            category_id: Restrict to one category (-1: uncategorized)
+        """
+        order_by = _COMPANY_ORDERS[order]
+        where, params = self._company_scope(project_id, category_id)
+        join = """FROM companies co
+                  LEFT JOIN categories c ON co.category_id = c.id
+                  LEFT JOIN categories sc ON co.subcategory_id = sc.id"""
+
+        conn = self._get_conn()
+        try:
+            companies = _iter_cursor(conn.execute(
+                f"""SELECT co.*, c.name as category_name, sc.name as subcategory_name,
+                        (SELECT COUNT(*) FROM company_sources cs
+                         WHERE cs.company_id = co.id) as source_count
+                    {join} WHERE {where} ORDER BY {order_by}""",
+                params,
+            ), _company_row)
+            if not with_related:
+                yield from companies
+                return
+
+            notes = _iter_cursor(conn.execute(
+                f"""SELECT n.* {join} JOIN company_notes n ON n.company_id = co.id
+                    WHERE {where}
+                    ORDER BY {order_by}, n.is_pinned DESC, n.created_at DESC""",
+                params,
+            ))
+            events = _iter_cursor(conn.execute(
+                f"""SELECT e.* {join} JOIN company_events e ON e.company_id = co.id
+                    WHERE {where}
+                    ORDER BY {order_by}, COALESCE(e.event_date, e.created_at) DESC""",
+                params,
+            ))
+            next_note = next(notes, None)
+            next_event = next(events, None)
+            for company in companies:
+                company["notes"] = []
+                while next_note is not None and next_note["company_id"] == company["id"]:
+                    company["notes"].append(next_note)
+                    next_note = next(notes, None)
+                company["events"] = []
+                while next_event is not None and next_event["company_id"] == company["id"]:
+                    company["events"].append(next_event)
+                    next_event = next(events, None)
+                yield company
+        finally:
+            conn.close()
+
+    def get_export_categories(self, project_id=None):
+        """Categories that have companies, in export order, with company counts.
+
+        Returns [{category_id, category, company_count}]; uncategorized
+        companies are grouped under category_id -1, "Uncategorized".
+        """
+        where, params = self._company_scope(project_id)
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"""SELECT COALESCE(co.category_id, -1) as category_id,
+                           COALESCE(c.name, 'Uncategorized') as category,
+                           COUNT(*) as company_count
+                    FROM companies co LEFT JOIN categories c ON co.category_id = c.id
+                    WHERE {where} GROUP BY co.category_id
+                    ORDER BY COALESCE(c.name, 'Uncategorized'), co.category_id""",
+                params,
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def get_data_version(self, project_id=None):
+        """Change counter for a project's exported data (all projects if None).
+
+        Bumped by triggers on every write to companies, categories, notes,
+        events, taxonomy history and the activity log.
+        """
+        query = "SELECT COALESCE(SUM(version), 0) FROM data_versions WHERE scope = 0"
+        params = []
+        if project_id:
+            query += " AND project_id = ?"
+            params.append(project_id)
+        with self._get_conn() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def get_category_versions(self, project_id=None):
+        """Change counters per category id (-1: uncategorized companies)."""
+        query = "SELECT scope, SUM(version) as version FROM data_versions WHERE scope != 0"
+        params = []
+        if project_id:
+            query += " AND project_id = ?"
+            params.append(project_id)
+        with self._get_conn() as conn:
+            rows = conn.execute(query + " GROUP BY scope", params).fetchall()
+            return {r["scope"]: r["version"] for r in rows}
+
+    def iter_export_tags(self, project_id=None):
+        """Yield each live company's tag list."""
+        where, params = self._company_scope(project_id)
+        conn = self._get_conn()
+        try:
+            cursor = conn.execute(
+                f"SELECT co.tags FROM companies co WHERE {where} "
+                "AND co.tags IS NOT NULL AND co.tags != '[]'",
+                params,
+            )
+            yield from _iter_cursor(cursor, lambda r: json.loads(r["tags"]))
+        finally:
+            conn.close()
+
+    def iter_taxonomy_history(self, project_id=None):
+        """Yield every taxonomy change, newest first."""
+        query = "SELECT * FROM taxonomy_changes"
+        params = []
+        if project_id:
+            query += " WHERE project_id = ?"
+            params.append(project_id)
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(query + " ORDER BY created_at DESC", params))
+        finally:
+            conn.close()
+
+    def iter_activity(self, project_id):
+        """Yield a project's whole activity log, newest first."""
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                "SELECT * FROM activity_log WHERE project_id = ? ORDER BY created_at DESC",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
+
+    # ── Analytics (entity-attribute store) ───────────────────────
+
+    def iter_analytics_entities(self, project_id):
+        """Yield a project's entities (deleted ones included, flagged)."""
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                """SELECT e.id as entity_id, e.type_slug, e.name, e.slug,
+                          e.parent_entity_id, e.category_id, c.name as category_name,
+                          e.status, e.is_starred, e.is_deleted, e.confidence_score,
+                          e.source, e.created_at, e.updated_at
+                   FROM entities e LEFT JOIN categories c ON e.category_id = c.id
+                   WHERE e.project_id = ? ORDER BY e.id""",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
+
+    def iter_current_attributes(self, project_id):
+        """Yield the current (latest) value of every entity attribute."""
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                """SELECT a.entity_id, a.attr_slug, a.value
+                   FROM entity_attributes a
+                   WHERE a.id IN (
+                       SELECT MAX(a2.id) FROM entity_attributes a2
+                       JOIN entities e ON e.id = a2.entity_id
+                       WHERE e.project_id = ?
+                       GROUP BY a2.entity_id, a2.attr_slug
+                   )
+                   ORDER BY a.entity_id""",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
+
+    def iter_attribute_history(self, project_id, after_id=0):
+        """Yield a project's attribute rows with id > *after_id*, in id order.
+
+        Attribute rows are append-only, so the highest id seen is a
+        complete resume point for incremental exports.
+        """
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                """SELECT a.id, a.entity_id, e.type_slug, a.attr_slug, a.value,
+                          a.source, a.confidence, a.captured_at, a.snapshot_id
+                   FROM entity_attributes a JOIN entities e ON e.id = a.entity_id
+                   WHERE e.project_id = ? AND a.id > ?
+                   ORDER BY a.id""",
+                (project_id, after_id),
+            ))
+        finally:
+            conn.close()
+
+    def iter_analytics_extraction_results(self, project_id):
+        """Yield a project's extraction results with their job's model and source."""
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                """SELECT r.id, r.job_id, r.entity_id, r.attr_slug, r.extracted_value,
+                          r.confidence, r.status, r.reviewed_value, r.reviewed_at,
+                          r.needs_evidence, r.source_evidence_id, r.created_at,
+                          j.model, j.source_type, j.source_ref
+                   FROM extraction_results r JOIN extraction_jobs j ON j.id = r.job_id
+                   WHERE j.project_id = ? ORDER BY r.id""",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
+
+    def iter_analytics_evidence(self, project_id):
+        """Yield a project's evidence metadata (no file contents)."""
+        conn = self._get_conn()
+        try:
+            yield from _iter_cursor(conn.execute(
+                """SELECT ev.id, ev.entity_id, ev.evidence_type, ev.file_path,
+                          ev.source_url, ev.source_name, ev.metadata_json, ev.captured_at
+                   FROM evidence ev JOIN entities e ON e.id = ev.entity_id
+                   WHERE e.project_id = ? ORDER BY ev.id""",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
+
+    def iter_change_feed(self, project_id):
+        """Yield a project's monitoring change feed, oldest first.
+
+        The change_feed table is created lazily by the monitoring
+        blueprint; nothing is yielded before it exists.
+        """
+        conn = self._get_conn()
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_feed'"
+            ).fetchone()
+            if not exists:
+                return
+            yield from _iter_cursor(conn.execute(
+                """SELECT id, entity_id, monitor_id, check_id, change_type, severity,
+                          title, description, source_url, is_read, is_dismissed, created_at
+                   FROM change_feed WHERE project_id = ? ORDER BY id""",
+                (project_id,),
+            ))
+        finally:
+            conn.close()
@@ -6,6 +6,23 @@ Manages extraction jobs (AI analysis requests) and extraction results
 import json
 from datetime import datetime
 
+from storage.pagination import Keyset, Page
+
+# Review queue: most confident first, oldest first within a confidence
+_QUEUE_ORDER = Keyset(
+    "extraction-queue",
+    ("er.confidence", "confidence", True, 0.0),
+    ("er.created_at", "created_at"),
+    ("er.id", "id"),
+)
+# Grouped review queue: entity by entity, queue order within each
+_GROUPED_QUEUE_ORDER = Keyset(
+    "extraction-queue-grouped",
+    ("e.name", "entity_name"),
+    ("er.entity_id", "entity_id"),
+    *_QUEUE_ORDER.keys,
+)
+
 
 class ExtractionMixin:
     """Database methods for extraction jobs and results."""
@@ -88,6 +105,49 @@ class ExtractionMixin:
         with self._get_conn() as conn:
             conn.execute("DELETE FROM extraction_jobs WHERE id = ?", (job_id,))
 
+    def get_evidence_for_extraction(self, project_id, entity_ids=None,
+                                    evidence_ids=None, evidence_types=None,
+                                    include_extracted=False):
+        """List text evidence in a project, joined with its entity, for bulk extraction.
+
+        Args:
+            entity_ids: Restrict to these entities
+            evidence_ids: Restrict to these evidence items
+            evidence_types: Restrict to these types (default: page_archive, document)
+            include_extracted: Also return evidence that already has a completed
+                extraction job for its entity
+
+        Returns: list[dict] with evidence columns plus entity_name, type_slug
+        """
+        clauses = ["e.project_id = ?", "e.is_deleted = 0"]
+        params = [project_id]
+        types = list(evidence_types or ("page_archive", "document"))
+        clauses.append(f"ev.evidence_type IN ({','.join('?' * len(types))})")
+        params.extend(types)
+        if entity_ids:
+            clauses.append(f"ev.entity_id IN ({','.join('?' * len(entity_ids))})")
+            params.extend(entity_ids)
+        if evidence_ids:
+            clauses.append(f"ev.id IN ({','.join('?' * len(evidence_ids))})")
+            params.extend(evidence_ids)
+        if not include_extracted:
+            clauses.append("""NOT EXISTS (
+                SELECT 1 FROM extraction_jobs j
+                WHERE j.evidence_id = ev.id AND j.entity_id = ev.entity_id
+                  AND j.status = 'completed')""")
+
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"""SELECT ev.id, ev.entity_id, ev.evidence_type, ev.file_path,
+                           ev.source_url, e.name AS entity_name, e.type_slug
+                    FROM evidence ev
+                    JOIN entities e ON e.id = ev.entity_id
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY ev.id""",
+                params,
+            ).fetchall()
+            return [dict(r) for r in rows]
+
     # ── Extraction Results ───────────────────────────────────────
 
     def create_extraction_result(self, job_id, entity_id, attr_slug,
@@ -125,27 +185,73 @@ class ExtractionMixin:
 
         Returns: list of result_ids
         """
-        ids = []
         with self._get_conn() as conn:
-            for r in results:
-                value = r.get("value")
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                elif isinstance(value, bool):
-                    value = "1" if value else "0"
-                elif value is not None:
-                    value = str(value)
+            return self._insert_extraction_results(
+                conn, job_id, entity_id, results, source_evidence_id,
+            )
+
+    def record_bulk_extractions(self, project_id, items):
+        """Create finished extraction jobs and their results in one transaction.
+
+        Used by the bulk extraction engine to flush many (entity, evidence)
+        outcomes at once instead of one transaction per job and per result.
+
+        Args:
+            items: list of dicts with keys: entity_id, evidence_id, source_ref,
+                model, cost_usd, duration_ms, results (list as accepted by
+                create_extraction_results_batch), error (optional)
 
+        Returns: list of job_ids, in item order
+        """
+        now = datetime.now().isoformat()
+        job_ids = []
+        with self._get_conn() as conn:
+            for item in items:
+                results = item.get("results") or []
                 cursor = conn.execute(
-                    """INSERT INTO extraction_results
-                       (job_id, entity_id, attr_slug, extracted_value, confidence,
-                        reasoning, source_evidence_id, status)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')""",
-                    (job_id, entity_id, r["attr_slug"], value,
-                     r.get("confidence", 0.5), r.get("reasoning"),
-                     source_evidence_id),
+                    """INSERT INTO extraction_jobs
+                       (project_id, entity_id, evidence_id, source_type, source_ref,
+                        status, model, cost_usd, duration_ms, result_count, error,
+                        completed_at)
+                       VALUES (?, ?, ?, 'evidence', ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (project_id, item["entity_id"], item.get("evidence_id"),
+                     item.get("source_ref"),
+                     "failed" if item.get("error") else "completed",
+                     item.get("model"), item.get("cost_usd", 0),
+                     item.get("duration_ms", 0), len(results),
+                     item.get("error"), now),
                 )
-                ids.append(cursor.lastrowid)
+                job_id = cursor.lastrowid
+                self._insert_extraction_results(
+                    conn, job_id, item["entity_id"], results, item.get("evidence_id"),
+                )
+                job_ids.append(job_id)
+        return job_ids
+
+    @staticmethod
+    def _insert_extraction_results(conn, job_id, entity_id, results,
+                                   source_evidence_id=None):
+        """Insert extraction results on an open connection. Returns result_ids."""
+        ids = []
+        for r in results:
+            value = r.get("value")
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            elif isinstance(value, bool):
+                value = "1" if value else "0"
+            elif value is not None:
+                value = str(value)
+
+            cursor = conn.execute(
+                """INSERT INTO extraction_results
+                   (job_id, entity_id, attr_slug, extracted_value, confidence,
+                    reasoning, source_evidence_id, status)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')""",
+                (job_id, entity_id, r["attr_slug"], value,
+                 r.get("confidence", 0.5), r.get("reasoning"),
+                 source_evidence_id),
+            )
+            ids.append(cursor.lastrowid)
         return ids
 
     def get_extraction_result(self, result_id):
@@ -191,27 +297,30 @@ class ExtractionMixin:
             ).fetchall()
             return [dict(r) for r in rows]
 
-    def get_extraction_queue(self, project_id, limit=100, offset=0):
+    def get_extraction_queue(self, project_id, limit=100, offset=0, cursor=None):
         """Get pending extraction results for a project (review queue).
 
         Joins with extraction_jobs to filter by project, returns results
-        with job and entity context.
+        with job and entity context. *cursor* (a previous page's
+        next_cursor) replaces *offset*.
 
-        Returns: list[dict]
+        Returns: Page of dicts
         """
+        after, after_params = _QUEUE_ORDER.where(cursor)
         with self._get_conn() as conn:
             rows = conn.execute(
-                """SELECT er.*, ej.project_id, ej.source_type, ej.source_ref,
+                f"""SELECT er.*, ej.project_id, ej.source_type, ej.source_ref,
                           e.name AS entity_name, e.type_slug AS entity_type
                    FROM extraction_results er
                    JOIN extraction_jobs ej ON ej.id = er.job_id
                    JOIN entities e ON e.id = er.entity_id
                    WHERE ej.project_id = ? AND er.status = 'pending'
-                   ORDER BY er.confidence DESC, er.created_at ASC
+                         {"AND " + after if after else ""}
+                   ORDER BY {_QUEUE_ORDER.order_by()}
                    LIMIT ? OFFSET ?""",
-                (project_id, limit, offset),
+                [project_id, *after_params, limit + 1, 0 if cursor else offset],
             ).fetchall()
-            return [dict(r) for r in rows]
+            return _QUEUE_ORDER.page([dict(r) for r in rows], limit)
 
     def review_extraction_result(self, result_id, action, edited_value=None):
         """Review an extraction result: accept, reject, or edit.
@@ -335,10 +444,14 @@ class ExtractionMixin:
 
     def get_review_queue_grouped(self, project_id, min_confidence=None,
                                   max_confidence=None, entity_id=None,
-                                  limit=200, offset=0):
+                                  limit=200, offset=0, cursor=None):
         """Get pending extraction results grouped by entity for review UI.
 
-        Returns: list of entity groups, each with entity info and pending results.
+        *limit* counts results, not groups; *cursor* (a previous page's
+        next_cursor) replaces *offset*, and an entity cut off at a page
+        boundary continues as the first group of the next page.
+
+        Returns: Page of entity groups, each with entity info and pending results.
         """
         clauses = ["ej.project_id = ?", "er.status = 'pending'"]
         params = [project_id]
@@ -353,8 +466,13 @@ class ExtractionMixin:
             clauses.append("er.entity_id = ?")
             params.append(entity_id)
 
+        after, after_params = _GROUPED_QUEUE_ORDER.where(cursor)
+        if after:
+            clauses.append(after)
+            params.extend(after_params)
+
         where = " AND ".join(clauses)
-        params.extend([limit, offset])
+        params.extend([limit + 1, 0 if cursor else offset])
 
         with self._get_conn() as conn:
             rows = conn.execute(
@@ -369,10 +487,11 @@ class ExtractionMixin:
                    JOIN entities e ON e.id = er.entity_id
                    LEFT JOIN evidence ev ON ev.id = er.source_evidence_id
                    WHERE {where}
-                   ORDER BY e.name ASC, er.confidence DESC, er.created_at ASC
+                   ORDER BY {_GROUPED_QUEUE_ORDER.order_by()}
                    LIMIT ? OFFSET ?""",
                 params,
             ).fetchall()
+            rows = _GROUPED_QUEUE_ORDER.page(rows, limit)
 
             # Group by entity
             entities = {}
@@ -387,7 +506,7 @@ class ExtractionMixin:
                     }
                 entities[eid]["results"].append(dict(r))
 
-            return list(entities.values())
+            return Page(entities.values(), rows.next_cursor)
 
     def flag_needs_evidence(self, result_id, needs=True):
         """Flag an extraction result as needing more evidence.
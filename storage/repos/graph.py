@@ -0,0 +1,207 @@
+"""Graph query mixin — entity graph nodes, edges, neighbourhoods and layouts.
+
+Reads the entity store as a graph: entities are nodes, hierarchy links
+(parent_entity_id) and entity_relationships are edges. Id sets are passed
+to SQLite as one JSON array (json_each) rather than a placeholder per id,
+so node sets of any size load in a single query.
+
+graph_versions is bumped by triggers whenever a node or edge changes, and
+keys the cached force-layout coordinates in graph_layouts.
+"""
+import json
+
+# Edge type used for parent → child links
+HIERARCHY_EDGE = "has_child"
+
+# Undirected adjacency of live entities in one project: both directions of
+# every relationship and every parent link.
+_ADJACENCY_CTE = """
+    adjacency(a, b) AS (
+        SELECT r.from_entity_id, r.to_entity_id
+        FROM entity_relationships r
+        JOIN entities f ON f.id = r.from_entity_id
+        JOIN entities t ON t.id = r.to_entity_id
+        WHERE f.project_id = :pid AND f.is_deleted = 0 AND t.is_deleted = 0
+        UNION ALL
+        SELECT r.to_entity_id, r.from_entity_id
+        FROM entity_relationships r
+        JOIN entities f ON f.id = r.from_entity_id
+        JOIN entities t ON t.id = r.to_entity_id
+        WHERE f.project_id = :pid AND f.is_deleted = 0 AND t.is_deleted = 0
+        UNION ALL
+        SELECT c.parent_entity_id, c.id
+        FROM entities c JOIN entities p ON p.id = c.parent_entity_id
+        WHERE c.project_id = :pid AND c.is_deleted = 0 AND p.is_deleted = 0
+        UNION ALL
+        SELECT c.id, c.parent_entity_id
+        FROM entities c JOIN entities p ON p.id = c.parent_entity_id
+        WHERE c.project_id = :pid AND c.is_deleted = 0 AND p.is_deleted = 0
+    )"""
+
+
+class GraphMixin:
+    """Set-based graph reads over the entity tables."""
+
+    def get_graph_version(self, project_id):
+        """Change counter for a project's entity graph (nodes and edges)."""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT version FROM graph_versions WHERE project_id = ?",
+                (project_id,),
+            ).fetchone()
+            return row["version"] if row else 0
+
+    def get_graph_nodes(self, project_id, type_slug=None, entity_ids=None, limit=None):
+        """Live entities as graph nodes, ordered by name.
+
+        Args:
+            project_id: Project ID
+            type_slug: Only entities of this type
+            entity_ids: Only these entities
+            limit: Max nodes
+
+        Returns: list of {id, name, type_slug, parent_entity_id, category_id,
+                 is_starred, child_count, evidence_count}
+        """
+        conditions = ["e.project_id = ?", "e.is_deleted = 0"]
+        params = [project_id]
+        if type_slug:
+            conditions.append("e.type_slug = ?")
+            params.append(type_slug)
+        if entity_ids is not None:
+            conditions.append("e.id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(entity_ids)))
+        sql = f"""
+            SELECT e.id, e.name, e.type_slug, e.parent_entity_id, e.category_id,
+                   e.is_starred,
+                   (SELECT COUNT(*) FROM entities c
+                    WHERE c.parent_entity_id = e.id AND c.is_deleted = 0) as child_count,
+                   (SELECT COUNT(*) FROM evidence ev
+                    WHERE ev.entity_id = e.id) as evidence_count
+            FROM entities e
+            WHERE {" AND ".join(conditions)}
+            ORDER BY e.name ASC, e.id ASC
+        """
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._get_conn() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def get_graph_edges(self, entity_ids):
+        """Hierarchy and relationship edges with both ends in *entity_ids*.
+
+        Returns: list of {from_entity_id, to_entity_id, type}; hierarchy
+        edges come first and have type HIERARCHY_EDGE.
+        """
+        ids = json.dumps(list(entity_ids))
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """SELECT parent_entity_id as from_entity_id, id as to_entity_id,
+                          :hierarchy as type, 0 as kind, id as ord
+                   FROM entities
+                   WHERE id IN (SELECT value FROM json_each(:ids))
+                     AND parent_entity_id IN (SELECT value FROM json_each(:ids))
+                   UNION ALL
+                   SELECT from_entity_id, to_entity_id, relationship_type, 1, id
+                   FROM entity_relationships
+                   WHERE from_entity_id IN (SELECT value FROM json_each(:ids))
+                     -- unary + keeps the planner from probing the
+                     -- (from, to) index once per id pair
+                     AND +to_entity_id IN (SELECT value FROM json_each(:ids))
+                   ORDER BY kind, ord""",
+                {"ids": ids, "hierarchy": HIERARCHY_EDGE},
+            ).fetchall()
+            return [{"from_entity_id": r["from_entity_id"],
+                     "to_entity_id": r["to_entity_id"],
+                     "type": r["type"]} for r in rows]
+
+    def get_entity_neighbourhood(self, project_id, entity_id, depth=1, limit=None):
+        """Entities within *depth* hops of *entity_id* (edges taken undirected).
+
+        Walks hierarchy links and relationships with a recursive CTE.
+
+        Returns: {entity_id: hops}, nearest first, including the focus
+        entity at 0; empty if the focus is missing or deleted.
+        """
+        sql = f"""
+            WITH RECURSIVE {_ADJACENCY_CTE},
+            hood(id, hops) AS (
+                SELECT id, 0 FROM entities
+                WHERE id = :focus AND project_id = :pid AND is_deleted = 0
+                UNION
+                SELECT adjacency.b, hood.hops + 1
+                FROM hood JOIN adjacency ON adjacency.a = hood.id
+                WHERE hood.hops < :depth
+            )
+            SELECT id, MIN(hops) as hops FROM hood
+            GROUP BY id ORDER BY hops, id
+        """
+        params = {"pid": project_id, "focus": entity_id, "depth": depth}
+        if limit:
+            sql += " LIMIT :limit"
+            params["limit"] = limit
+        with self._get_conn() as conn:
+            return {r["id"]: r["hops"] for r in conn.execute(sql, params).fetchall()}
+
+    def get_attribute_projection(self, entity_ids, attr_slugs=None):
+        """Current attribute values for a set of entities.
+
+        Args:
+            entity_ids: Entities to load
+            attr_slugs: Only these attributes (None: all)
+
+        Returns: {entity_id: {attr_slug: value}}
+        """
+        params = {"ids": json.dumps(list(entity_ids))}
+        slug_filter = ""
+        if attr_slugs is not None:
+            slug_filter = "AND attr_slug IN (SELECT value FROM json_each(:slugs))"
+            params["slugs"] = json.dumps(list(attr_slugs))
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"""SELECT ea.entity_id, ea.attr_slug, ea.value
+                    FROM entity_attributes ea
+                    JOIN (SELECT MAX(id) as id FROM entity_attributes
+                          WHERE entity_id IN (SELECT value FROM json_each(:ids))
+                          {slug_filter}
+                          GROUP BY entity_id, attr_slug) latest ON latest.id = ea.id""",
+                params,
+            ).fetchall()
+        projection = {}
+        for r in rows:
+            projection.setdefault(r["entity_id"], {})[r["attr_slug"]] = r["value"]
+        return projection
+
+    # ── Layout cache ─────────────────────────────────────────────
+
+    def get_graph_layout(self, project_id, graph_key):
+        """Cached layout for a graph view as (version, {entity_id: (x, y)}), or None.
+
+        The version may be older than the current graph version; callers
+        decide whether to reuse the positions or only seed a new layout.
+        """
+        with self._get_conn() as conn:
+            row = conn.execute(
+                """SELECT version, positions_json FROM graph_layouts
+                   WHERE project_id = ? AND graph_key = ?""",
+                (project_id, graph_key),
+            ).fetchone()
+        if not row:
+            return None
+        positions = {int(k): tuple(v) for k, v in json.loads(row["positions_json"]).items()}
+        return row["version"], positions
+
+    def save_graph_layout(self, project_id, graph_key, version, positions):
+        """Store layout coordinates for a graph view, replacing older versions."""
+        with self._get_conn() as conn:
+            conn.execute(
+                """INSERT INTO graph_layouts (project_id, graph_key, version, positions_json)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(project_id, graph_key) DO UPDATE SET
+                       version = excluded.version,
+                       positions_json = excluded.positions_json,
+                       created_at = datetime('now')""",
+                (project_id, graph_key, version,
+                 json.dumps({str(k): list(xy) for k, xy in positions.items()})),
+            )
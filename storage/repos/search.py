@@ -0,0 +1,176 @@
+"""Search index mixin — the per-project BM25 index that grounds AI chat.
+
+search_index is an FTS5 table holding one document per company, entity
+and evidence file, ranked with FTS5's built-in bm25(). Documents are not
+rebuilt on the write path: triggers on the source tables (schema.sql)
+only record the changed (kind, ref_id) in search_dirty, and
+core.search_index applies the queue before the next query. A project is
+backfilled the first time it is searched (search_index_state records
+that it has been).
+
+Document rowids encode the source row (ref_id * 4 + kind code), so a
+document is replaced or removed by rowid without scanning the index.
+"""
+import json
+
+# kind -> rowid code
+SEARCH_KINDS = {"company": 1, "entity": 2, "evidence": 3}
+
+
+def search_rowid(kind, ref_id):
+    """FTS rowid of the document for one source row."""
+    return ref_id * 4 + SEARCH_KINDS[kind]
+
+
+class SearchMixin:
+    """FTS5 document index over companies, entities and evidence."""
+
+    # ── Change queue ─────────────────────────────────────────────
+
+    def _search_backfill(self, conn, project_id):
+        """Queue every document of a never-indexed project; True if it was queued."""
+        if conn.execute("SELECT 1 FROM search_index_state WHERE project_id = ?",
+                        (project_id,)).fetchone():
+            return False
+        conn.execute(
+            """INSERT OR IGNORE INTO search_dirty (project_id, kind, ref_id)
+               SELECT project_id, 'company', id FROM companies
+               WHERE project_id = ? AND is_deleted = 0""", (project_id,))
+        conn.execute(
+            """INSERT OR IGNORE INTO search_dirty (project_id, kind, ref_id)
+               SELECT project_id, 'entity', id FROM entities
+               WHERE project_id = ? AND is_deleted = 0""", (project_id,))
+        conn.execute(
+            """INSERT OR IGNORE INTO search_dirty (project_id, kind, ref_id)
+               SELECT e.project_id, 'evidence', ev.id
+               FROM evidence ev JOIN entities e ON e.id = ev.entity_id
+               WHERE e.project_id = ? AND e.is_deleted = 0""", (project_id,))
+        conn.execute("INSERT INTO search_index_state (project_id) VALUES (?)", (project_id,))
+        return True
+
+    def _search_dirty_batch(self, conn, project_id, limit):
+        """Up to *limit* queued (kind, ref_id) pairs for a project."""
+        return [(r["kind"], r["ref_id"]) for r in conn.execute(
+            "SELECT kind, ref_id FROM search_dirty WHERE project_id = ? LIMIT ?",
+            (project_id, limit))]
+
+    # ── Source rows ──────────────────────────────────────────────
+
+    def _search_company_sources(self, conn, company_ids):
+        """Live companies among *company_ids*, with category names and notes."""
+        return conn.execute(
+            """SELECT c.id, c.name, c.url, c.what, c.target, c.products, c.funding,
+                      c.geography, c.tam, c.hq_city, c.hq_country, c.funding_stage,
+                      c.business_model, c.primary_focus, c.pricing_model,
+                      c.pricing_notes, c.relationship_note, c.tags,
+                      cat.name AS category_name, sub.name AS subcategory_name,
+                      (SELECT group_concat(n.content, char(10)) FROM company_notes n
+                       WHERE n.company_id = c.id) AS notes
+               FROM companies c
+               LEFT JOIN categories cat ON cat.id = c.category_id
+               LEFT JOIN categories sub ON sub.id = c.subcategory_id
+               WHERE c.id IN (SELECT value FROM json_each(?)) AND c.is_deleted = 0""",
+            (json.dumps(company_ids),)).fetchall()
+
+    def _search_entity_sources(self, conn, entity_ids):
+        """Live entities among *entity_ids* and their current attribute values.
+
+        Returns: (rows, {entity_id: {attr_slug: value}})
+        """
+        ids = json.dumps(entity_ids)
+        rows = conn.execute(
+            """SELECT e.id, e.name, e.type_slug, e.tags, cat.name AS category_name
+               FROM entities e
+               LEFT JOIN categories cat ON cat.id = e.category_id
+               WHERE e.id IN (SELECT value FROM json_each(?)) AND e.is_deleted = 0""",
+            (ids,)).fetchall()
+        attributes = {}
+        for r in conn.execute(
+                """SELECT ea.entity_id, ea.attr_slug, ea.value
+                   FROM entity_attributes ea
+                   JOIN (SELECT MAX(id) AS id FROM entity_attributes
+                         WHERE entity_id IN (SELECT value FROM json_each(?))
+                         GROUP BY entity_id, attr_slug) latest ON latest.id = ea.id
+                   ORDER BY ea.entity_id, ea.attr_slug""", (ids,)):
+            attributes.setdefault(r["entity_id"], {})[r["attr_slug"]] = r["value"]
+        return rows, attributes
+
+    def _search_evidence_sources(self, conn, evidence_ids):
+        """Evidence among *evidence_ids* whose entity is live."""
+        return conn.execute(
+            """SELECT ev.id, ev.entity_id, ev.evidence_type, ev.file_path,
+                      ev.source_url, ev.source_name, e.name AS entity_name
+               FROM evidence ev JOIN entities e ON e.id = ev.entity_id
+               WHERE ev.id IN (SELECT value FROM json_each(?)) AND e.is_deleted = 0""",
+            (json.dumps(evidence_ids),)).fetchall()
+
+    # ── Index writes ─────────────────────────────────────────────
+
+    def _search_write(self, conn, project_id, batch, docs):
+        """Replace the documents for *batch* with *docs* and dequeue the batch.
+
+        Args:
+            batch: (kind, ref_id) pairs taken from search_dirty
+            docs: [(kind, ref_id, title, body)] for the pairs that still
+                exist; pairs without a doc are removed from the index
+        """
+        conn.executemany("DELETE FROM search_index WHERE rowid = ?",
+                         [(search_rowid(kind, ref_id),) for kind, ref_id in batch])
+        conn.executemany(
+            """INSERT INTO search_index (rowid, title, body, project_id, kind, ref_id)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(search_rowid(kind, ref_id), title, body, project_id, kind, ref_id)
+             for kind, ref_id, title, body in docs])
+        conn.executemany(
+            "DELETE FROM search_dirty WHERE project_id = ? AND kind = ? AND ref_id = ?",
+            [(project_id, kind, ref_id) for kind, ref_id in batch])
+
+    def clear_search_index(self, project_id):
+        """Drop a project's documents; the next search rebuilds them."""
+        with self._get_conn() as conn:
+            self._clear_search_index(conn, project_id)
+
+    def _clear_search_index(self, conn, project_id):
+        conn.execute("DELETE FROM search_index WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM search_dirty WHERE project_id = ?", (project_id,))
+        conn.execute("DELETE FROM search_index_state WHERE project_id = ?", (project_id,))
+
+    # ── Queries ──────────────────────────────────────────────────
+
+    def search_documents(self, project_id, match, limit=40, snippet_tokens=48):
+        """Best BM25 matches for an FTS5 *match* expression in one project.
+
+        Titles weigh five times as much as bodies.
+
+        Returns: [{kind, ref_id, title, body, snippet, score}], best first
+        (lower score is better, as bm25() returns it)
+        """
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                """SELECT kind, ref_id, title, body,
+                          snippet(search_index, 1, '', '', ' … ', ?) AS snippet,
+                          bm25(search_index, 5.0, 1.0) AS score
+                   FROM search_index
+                   WHERE search_index MATCH ? AND project_id = ?
+                   ORDER BY score LIMIT ?""",
+                (snippet_tokens, match, project_id, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    def get_search_index_stats(self, project_id):
+        """Indexed document counts by kind and the pending change count."""
+        with self._get_conn() as conn:
+            documents = {r["kind"]: r["n"] for r in conn.execute(
+                """SELECT kind, COUNT(*) AS n FROM search_index
+                   WHERE project_id = ? GROUP BY kind""", (project_id,))}
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM search_dirty WHERE project_id = ?",
+                (project_id,)).fetchone()[0]
+            built = conn.execute(
+                "SELECT built_at FROM search_index_state WHERE project_id = ?",
+                (project_id,)).fetchone()
+        return {
+            "documents": documents,
+            "total_documents": sum(documents.values()),
+            "pending": pending,
+            "built_at": built["built_at"] if built else None,
+        }
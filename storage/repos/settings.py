@@ -2,6 +2,11 @@
 import json
 from datetime import datetime
 
+from storage.pagination import Keyset
+
+# Newest first; id orders entries logged within the same second
+_ACTIVITY_ORDER = Keyset("activity", ("created_at", "created_at", True), ("id", "id", True))
+
 
 class SettingsMixin:
 
@@ -127,13 +132,19 @@ class SettingsMixin:
                 (project_id, action, description, entity_type, entity_id),
             )
 
-    def get_activity(self, project_id, limit=50, offset=0):
+    def get_activity(self, project_id, limit=50, offset=0, cursor=None):
+        """Activity log entries, newest first, as a Page.
+
+        *cursor* (a previous page's next_cursor) replaces *offset*.
+        """
+        after, params = _ACTIVITY_ORDER.where(cursor)
         with self._get_conn() as conn:
             rows = conn.execute(
-                "SELECT * FROM activity_log WHERE project_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
-                (project_id, limit, offset),
+                f"""SELECT * FROM activity_log WHERE project_id = ? {"AND " + after if after else ""}
+                    ORDER BY {_ACTIVITY_ORDER.order_by()} LIMIT ? OFFSET ?""",
+                [project_id, *params, limit + 1, 0 if cursor else offset],
             ).fetchall()
-            return [dict(r) for r in rows]
+            return _ACTIVITY_ORDER.page([dict(r) for r in rows], limit)
 
     # --- Notification Prefs ---
 
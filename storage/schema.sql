@@ -296,6 +296,7 @@ CREATE INDEX IF NOT EXISTS idx_share_tokens_token ON share_tokens(token);
 CREATE INDEX IF NOT EXISTS idx_share_tokens_project ON share_tokens(project_id);
 CREATE INDEX IF NOT EXISTS idx_activity_project ON activity_log(project_id);
 CREATE INDEX IF NOT EXISTS idx_activity_created ON activity_log(created_at);
+CREATE INDEX IF NOT EXISTS idx_activity_project_created ON activity_log(project_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_reports_project ON reports(project_id);
 CREATE INDEX IF NOT EXISTS idx_reports_report_id ON reports(report_id);
 
@@ -373,6 +374,9 @@ CREATE INDEX IF NOT EXISTS idx_analyses_type ON discovery_analyses(analysis_type
 
 -- Composite indexes for common query patterns
 CREATE INDEX IF NOT EXISTS idx_companies_active ON companies(project_id, is_deleted, category_id);
+-- Keyset pagination of company lists (rowid id is the implicit last column)
+CREATE INDEX IF NOT EXISTS idx_companies_project_name ON companies(project_id, is_deleted, name);
+CREATE INDEX IF NOT EXISTS idx_companies_project_updated ON companies(project_id, is_deleted, updated_at);
 CREATE INDEX IF NOT EXISTS idx_companies_subcategory ON companies(subcategory_id);
 CREATE INDEX IF NOT EXISTS idx_jobs_batch_status ON jobs(batch_id, status);
 CREATE INDEX IF NOT EXISTS idx_notes_company_pinned ON company_notes(company_id, is_pinned);
@@ -482,15 +486,27 @@ CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(project_id, type_slug);
 CREATE INDEX IF NOT EXISTS idx_entities_parent ON entities(parent_entity_id);
 CREATE INDEX IF NOT EXISTS idx_entities_category ON entities(category_id);
 CREATE INDEX IF NOT EXISTS idx_entities_active ON entities(project_id, is_deleted, type_slug);
+-- Keyset pagination of entity lists and the competitive matrix
+CREATE INDEX IF NOT EXISTS idx_entities_project_name ON entities(project_id, is_deleted, name);
+CREATE INDEX IF NOT EXISTS idx_entities_type_name ON entities(project_id, is_deleted, type_slug, name);
+CREATE INDEX IF NOT EXISTS idx_entities_project_name_nocase
+    ON entities(project_id, is_deleted, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_entities_type_name_nocase
+    ON entities(project_id, is_deleted, type_slug, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_entities_project_created ON entities(project_id, is_deleted, created_at);
+CREATE INDEX IF NOT EXISTS idx_entities_project_updated ON entities(project_id, is_deleted, updated_at);
 CREATE INDEX IF NOT EXISTS idx_entity_attrs_entity ON entity_attributes(entity_id);
 CREATE INDEX IF NOT EXISTS idx_entity_attrs_slug ON entity_attributes(entity_id, attr_slug);
 CREATE INDEX IF NOT EXISTS idx_entity_attrs_captured ON entity_attributes(entity_id, attr_slug, captured_at);
 CREATE INDEX IF NOT EXISTS idx_entity_attrs_snapshot ON entity_attributes(snapshot_id);
+-- Signals timeline: newest events first
+CREATE INDEX IF NOT EXISTS idx_entity_attrs_time ON entity_attributes(captured_at);
 CREATE INDEX IF NOT EXISTS idx_entity_rels_from ON entity_relationships(from_entity_id);
 CREATE INDEX IF NOT EXISTS idx_entity_rels_to ON entity_relationships(to_entity_id);
 CREATE INDEX IF NOT EXISTS idx_entity_snapshots_project ON entity_snapshots(project_id);
 CREATE INDEX IF NOT EXISTS idx_evidence_entity ON evidence(entity_id);
 CREATE INDEX IF NOT EXISTS idx_evidence_type ON evidence(entity_id, evidence_type);
+CREATE INDEX IF NOT EXISTS idx_evidence_time ON evidence(captured_at);
 
 -- ═══════════════════════════════════════════════════════════════
 -- RESEARCH WORKBENCH: Extraction System (Phase 3)
@@ -541,6 +557,9 @@ CREATE INDEX IF NOT EXISTS idx_extraction_results_entity ON extraction_results(e
 CREATE INDEX IF NOT EXISTS idx_extraction_results_status ON extraction_results(entity_id, status);
 CREATE INDEX IF NOT EXISTS idx_extraction_results_attr ON extraction_results(entity_id, attr_slug);
 CREATE INDEX IF NOT EXISTS idx_extraction_results_evidence ON extraction_results(source_evidence_id);
+-- Review queue order (matches the keyset ORDER BY expression)
+CREATE INDEX IF NOT EXISTS idx_extraction_results_queue
+    ON extraction_results(status, COALESCE(confidence, 0.0) DESC, created_at, id);
 
 -- ═══════════════════════════════════════════════════════════
 -- Feature Standardisation: Canonical vocabulary per project
@@ -569,3 +588,499 @@ CREATE TABLE IF NOT EXISTS feature_mappings (
 
 CREATE INDEX IF NOT EXISTS idx_canonical_features_project ON canonical_features(project_id, attr_slug);
 CREATE INDEX IF NOT EXISTS idx_feature_mappings_canonical ON feature_mappings(canonical_feature_id);
+
+-- Data versions: change counters bumped by triggers, so exports can tell
+-- whether anything moved since they last ran. scope 0 counts every change
+-- to the project's exported data; scope = category id (-1 = uncategorized)
+-- counts changes to that category's companies or the category itself.
+CREATE TABLE IF NOT EXISTS data_versions (
+    project_id INTEGER NOT NULL,
+    scope INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, scope)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_version_company_insert AFTER INSERT ON companies BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (NEW.project_id, 0, 1), (NEW.project_id, COALESCE(NEW.category_id, -1), 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_company_update AFTER UPDATE ON companies BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (NEW.project_id, 0, 1), (NEW.project_id, COALESCE(NEW.category_id, -1), 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT OLD.project_id, COALESCE(OLD.category_id, -1), 1
+    WHERE COALESCE(OLD.category_id, -1) != COALESCE(NEW.category_id, -1)
+       OR OLD.project_id != NEW.project_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_company_delete AFTER DELETE ON companies BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (OLD.project_id, 0, 1), (OLD.project_id, COALESCE(OLD.category_id, -1), 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_category_insert AFTER INSERT ON categories BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (NEW.project_id, 0, 1), (NEW.project_id, NEW.id, 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_category_update AFTER UPDATE ON categories BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (NEW.project_id, 0, 1), (NEW.project_id, NEW.id, 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+    -- Company cards show their subcategory's name under the parent's section
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT NEW.project_id, NEW.parent_id, 1 WHERE NEW.parent_id IS NOT NULL
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_category_delete AFTER DELETE ON categories BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    VALUES (OLD.project_id, 0, 1), (OLD.project_id, OLD.id, 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+-- Notes, events, history and activity only appear in the JSON export
+CREATE TRIGGER IF NOT EXISTS trg_version_note_insert AFTER INSERT ON company_notes BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT project_id, 0, 1 FROM companies WHERE id = NEW.company_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_note_update AFTER UPDATE ON company_notes BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT project_id, 0, 1 FROM companies WHERE id = NEW.company_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_note_delete AFTER DELETE ON company_notes BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT project_id, 0, 1 FROM companies WHERE id = OLD.company_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_event_insert AFTER INSERT ON company_events BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT project_id, 0, 1 FROM companies WHERE id = NEW.company_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_event_delete AFTER DELETE ON company_events BEGIN
+    INSERT INTO data_versions (project_id, scope, version)
+    SELECT project_id, 0, 1 FROM companies WHERE id = OLD.company_id
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_taxonomy_change AFTER INSERT ON taxonomy_changes
+WHEN NEW.project_id IS NOT NULL BEGIN
+    INSERT INTO data_versions (project_id, scope, version) VALUES (NEW.project_id, 0, 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_version_activity AFTER INSERT ON activity_log BEGIN
+    INSERT INTO data_versions (project_id, scope, version) VALUES (NEW.project_id, 0, 1)
+    ON CONFLICT(project_id, scope) DO UPDATE SET version = version + 1;
+END;
+
+-- Graph versions: change counter per project for the entity graph (nodes,
+-- hierarchy and relationships), bumped by triggers. Keys graph_layouts.
+CREATE TABLE IF NOT EXISTS graph_versions (
+    project_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+-- Graph layouts: cached force-layout coordinates per graph view
+CREATE TABLE IF NOT EXISTS graph_layouts (
+    project_id INTEGER NOT NULL,
+    graph_key TEXT NOT NULL,            -- view parameters (type, focus, depth, limit)
+    version INTEGER NOT NULL,           -- graph_versions.version it was computed at
+    positions_json TEXT NOT NULL,       -- {entity_id: [x, y]}
+    created_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (project_id, graph_key)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_entity_insert AFTER INSERT ON entities BEGIN
+    INSERT INTO graph_versions (project_id, version) VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_entity_update
+AFTER UPDATE OF name, type_slug, parent_entity_id, is_deleted, project_id ON entities BEGIN
+    INSERT INTO graph_versions (project_id, version) VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_entity_delete AFTER DELETE ON entities BEGIN
+    INSERT INTO graph_versions (project_id, version) VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_relationship_insert AFTER INSERT ON entity_relationships BEGIN
+    INSERT INTO graph_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.from_entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_graph_relationship_delete AFTER DELETE ON entity_relationships BEGIN
+    INSERT INTO graph_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = OLD.from_entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+-- Project versions: one change counter per project, bumped by triggers on
+-- every table the lens and report endpoints read. Cached responses are
+-- keyed by it (response_cache below), so any write invalidates them
+-- without the write paths having to know the cache exists. The monitoring
+-- tables are created lazily and get their triggers there.
+CREATE TABLE IF NOT EXISTS project_versions (
+    project_id INTEGER PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_projects_update AFTER UPDATE ON projects BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_categories_insert AFTER INSERT ON categories BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_categories_update AFTER UPDATE ON categories BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_categories_delete AFTER DELETE ON categories BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_type_defs_insert AFTER INSERT ON entity_type_defs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_type_defs_update AFTER UPDATE ON entity_type_defs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_type_defs_delete AFTER DELETE ON entity_type_defs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entities_insert AFTER INSERT ON entities BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entities_update AFTER UPDATE ON entities BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entities_delete AFTER DELETE ON entities BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_snapshots_insert AFTER INSERT ON entity_snapshots BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_snapshots_update AFTER UPDATE ON entity_snapshots BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_snapshots_delete AFTER DELETE ON entity_snapshots BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_canonical_features_insert AFTER INSERT ON canonical_features BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_canonical_features_update AFTER UPDATE ON canonical_features BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_canonical_features_delete AFTER DELETE ON canonical_features BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_jobs_insert AFTER INSERT ON extraction_jobs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_jobs_update AFTER UPDATE ON extraction_jobs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (NEW.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_jobs_delete AFTER DELETE ON extraction_jobs BEGIN
+    INSERT INTO project_versions (project_id, version)
+    VALUES (OLD.project_id, 1)
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_attributes_insert AFTER INSERT ON entity_attributes BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_attributes_update AFTER UPDATE ON entity_attributes BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_attributes_delete AFTER DELETE ON entity_attributes BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = OLD.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_evidence_insert AFTER INSERT ON evidence BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_evidence_update AFTER UPDATE ON evidence BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_evidence_delete AFTER DELETE ON evidence BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = OLD.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_relationships_insert AFTER INSERT ON entity_relationships BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.from_entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_relationships_update AFTER UPDATE ON entity_relationships BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.from_entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_entity_relationships_delete AFTER DELETE ON entity_relationships BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = OLD.from_entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_results_insert AFTER INSERT ON extraction_results BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_results_update AFTER UPDATE ON extraction_results BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = NEW.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_extraction_results_delete AFTER DELETE ON extraction_results BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM entities WHERE id = OLD.entity_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_feature_mappings_insert AFTER INSERT ON feature_mappings BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM canonical_features WHERE id = NEW.canonical_feature_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_feature_mappings_update AFTER UPDATE ON feature_mappings BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM canonical_features WHERE id = NEW.canonical_feature_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_version_feature_mappings_delete AFTER DELETE ON feature_mappings BEGIN
+    INSERT INTO project_versions (project_id, version)
+    SELECT project_id, 1 FROM canonical_features WHERE id = OLD.canonical_feature_id
+    ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+END;
+
+-- Response cache: persisted lens/report responses, valid while their
+-- project_versions.version is unchanged (see storage/repos/cache.py)
+CREATE TABLE IF NOT EXISTS response_cache (
+    cache_key TEXT PRIMARY KEY,         -- sha256 of endpoint + parameters
+    project_id INTEGER NOT NULL,
+    endpoint TEXT NOT NULL,
+    version TEXT NOT NULL,              -- project version (plus time bucket) it was computed at
+    etag TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TEXT DEFAULT (datetime('now')),
+    last_hit_at TEXT DEFAULT (datetime('now')),
+    hits INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_response_cache_lru ON response_cache(last_hit_at);
+CREATE INDEX IF NOT EXISTS idx_response_cache_project ON response_cache(project_id);
+
+-- Search index: per-project BM25 documents for AI chat retrieval (see
+-- storage/repos/search.py). Triggers only queue changed rows in
+-- search_dirty, and only for projects already indexed (search_index_state);
+-- core.search_index applies the queue before the next query.
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, body,
+    project_id UNINDEXED, kind UNINDEXED, ref_id UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+
+CREATE TABLE IF NOT EXISTS search_dirty (
+    project_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,                 -- company | entity | evidence
+    ref_id INTEGER NOT NULL,
+    PRIMARY KEY (project_id, kind, ref_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS search_index_state (
+    project_id INTEGER PRIMARY KEY,
+    built_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_search_company_insert AFTER INSERT ON companies
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = NEW.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (NEW.project_id, 'company', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_company_update AFTER UPDATE ON companies
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = NEW.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (NEW.project_id, 'company', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_company_delete AFTER DELETE ON companies
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = OLD.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (OLD.project_id, 'company', OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_note_insert AFTER INSERT ON company_notes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT c.project_id, 'company', c.id FROM companies c
+    JOIN search_index_state s ON s.project_id = c.project_id WHERE c.id = NEW.company_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_note_update AFTER UPDATE OF content ON company_notes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT c.project_id, 'company', c.id FROM companies c
+    JOIN search_index_state s ON s.project_id = c.project_id WHERE c.id = NEW.company_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_note_delete AFTER DELETE ON company_notes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT c.project_id, 'company', c.id FROM companies c
+    JOIN search_index_state s ON s.project_id = c.project_id WHERE c.id = OLD.company_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_category_rename AFTER UPDATE OF name ON categories
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = NEW.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT project_id, 'company', id FROM companies
+    WHERE category_id = NEW.id OR subcategory_id = NEW.id;
+    INSERT OR IGNORE INTO search_dirty
+    SELECT project_id, 'entity', id FROM entities WHERE category_id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_insert AFTER INSERT ON entities
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = NEW.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (NEW.project_id, 'entity', NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_update
+AFTER UPDATE OF name, type_slug, category_id, tags, is_deleted, project_id ON entities
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = NEW.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (NEW.project_id, 'entity', NEW.id);
+    -- evidence titles carry the entity name and vanish with the entity
+    INSERT OR IGNORE INTO search_dirty
+    SELECT NEW.project_id, 'evidence', id FROM evidence
+    WHERE entity_id = NEW.id
+      AND (OLD.name != NEW.name OR OLD.is_deleted != NEW.is_deleted);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_delete AFTER DELETE ON entities
+WHEN EXISTS (SELECT 1 FROM search_index_state WHERE project_id = OLD.project_id) BEGIN
+    INSERT OR IGNORE INTO search_dirty VALUES (OLD.project_id, 'entity', OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_attributes_insert AFTER INSERT ON entity_attributes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'entity', e.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = NEW.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_attributes_update AFTER UPDATE ON entity_attributes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'entity', e.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = NEW.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_entity_attributes_delete AFTER DELETE ON entity_attributes BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'entity', e.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = OLD.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_evidence_insert AFTER INSERT ON evidence BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'evidence', NEW.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = NEW.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_evidence_update AFTER UPDATE ON evidence BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'evidence', NEW.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = NEW.entity_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_evidence_delete AFTER DELETE ON evidence BEGIN
+    INSERT OR IGNORE INTO search_dirty
+    SELECT e.project_id, 'evidence', OLD.id FROM entities e
+    JOIN search_index_state s ON s.project_id = e.project_id WHERE e.id = OLD.entity_id;
+END;
@@ -101,6 +101,45 @@ def seeded_project(tmp_db, project_id, category_ids):
     }
 
 
+# ---------------------------------------------------------------------------
+# Keep the suite from writing into the real data directory or git repo
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True, scope="session")
+def isolate_data_dir(tmp_path_factory):
+    """Redirect the database, logs, exports, backups and async results to a temp dir.
+
+    Also disables git auto-sync, which would otherwise commit the working
+    tree whenever a test triggers an import, batch or report.
+    """
+    data_dir = tmp_path_factory.mktemp("data")
+    logs_dir = data_dir / "logs"
+    mp = pytest.MonkeyPatch()
+    mp.setattr("web.app.DATA_DIR", data_dir)
+    mp.setattr("web.app.LOGS_DIR", logs_dir)
+    mp.setattr("web.app.LOG_FILE", logs_dir / "app.log")
+    mp.setattr("web.async_jobs.DATA_DIR", data_dir)
+    mp.setattr("storage.export.DATA_DIR", data_dir)
+    mp.setattr("config.APP_SETTINGS_FILE", data_dir / ".app_settings.json")
+    mp.setattr("storage.db.DB_PATH", data_dir / "taxonomy.db")
+    mp.setattr("core.llm.DB_PATH", data_dir / "taxonomy.db")
+    mp.setattr("web.blueprints.settings.DATA_DIR", data_dir)
+    mp.setattr("web.blueprints.settings.DB_PATH", data_dir / "taxonomy.db")
+    mp.setattr("web.blueprints.settings.BACKUP_DIR", data_dir / "backups")
+    mp.setattr("web.blueprints.settings.LOGS_DIR", logs_dir)
+    mp.setattr("core.git_sync.sync_to_git", lambda message=None: None)
+    yield data_dir
+    # Let queued background jobs finish before their data dir is restored,
+    # and drop debounced exports/git syncs that would fire after it
+    from core.export_scheduler import cancel_pending_exports
+    from core.git_sync import cancel_git_sync
+    from web.async_jobs import shutdown_pool
+    shutdown_pool(wait=True)
+    cancel_pending_exports()
+    cancel_git_sync()
+    mp.undo()
+
+
 # ---------------------------------------------------------------------------
 # Central _TABLE_ENSURED reset — prevents stale flags across test suites
 # ---------------------------------------------------------------------------
@@ -146,17 +185,15 @@ def reset_all_table_flags():
         _modules.append((llm_mod, "_COST_TABLE_ENSURED"))
     except ImportError:
         pass
-    try:
-        from core import mcp_client as mcp_mod
-        _modules.append((mcp_mod, "_CACHE_TABLE_ENSURED"))
-    except ImportError:
-        pass
+    from core import mcp_client as mcp_mod
 
     for mod, attr in _modules:
         setattr(mod, attr, False)
+    mcp_mod._CACHE_TABLES_ENSURED.clear()
     yield
     for mod, attr in _modules:
         setattr(mod, attr, False)
+    mcp_mod._CACHE_TABLES_ENSURED.clear()
 
 
 # ---------------------------------------------------------------------------
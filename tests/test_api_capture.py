@@ -5,6 +5,7 @@ Covers:
 - POST /api/capture/document (mocked HTTP)
 - POST /api/evidence/upload (multipart file upload)
 - GET  /api/evidence/<id>/file (serve evidence file)
+- GET  /api/evidence/<id>/text (derived text sidecar)
 - DELETE /api/evidence/<id>/file (delete file + record)
 - GET  /api/evidence/stats (storage statistics)
 - GET  /api/capture/jobs (background job listing)
@@ -240,6 +241,44 @@ class TestEvidenceServe:
         assert "not found on disk" in r.get_json()["error"]
 
 
+class TestEvidenceText:
+    """CAP-TXT: Derived text endpoint tests."""
+
+    def test_text_of_uploaded_html(self, capture_project):
+        c = capture_project["client"]
+        data = {
+            "file": (io.BytesIO(b"<html><body><h1>TestCo</h1><p>Widgets for teams.</p></body></html>"),
+                     "page.html"),
+            "entity_id": str(capture_project["entity_id"]),
+            "project_id": str(capture_project["project_id"]),
+        }
+        r = c.post("/api/evidence/upload",
+                    data=data, content_type="multipart/form-data")
+        ev_id = r.get_json()["evidence_ids"][0]
+
+        r2 = c.get(f"/api/evidence/{ev_id}/text")
+        assert r2.status_code == 200
+        body = r2.get_json()
+        assert "# TestCo" in body["text"]
+        assert body["metadata"]["headings"] == ["TestCo"]
+
+    def test_text_of_image_is_unprocessable(self, capture_project):
+        c = capture_project["client"]
+        data = {
+            "file": (io.BytesIO(b"\x89PNG test image data"), "test.png"),
+            "entity_id": str(capture_project["entity_id"]),
+            "project_id": str(capture_project["project_id"]),
+        }
+        r = c.post("/api/evidence/upload",
+                    data=data, content_type="multipart/form-data")
+        ev_id = r.get_json()["evidence_ids"][0]
+        assert c.get(f"/api/evidence/{ev_id}/text").status_code == 422
+
+    def test_text_nonexistent_evidence(self, capture_project):
+        r = capture_project["client"].get("/api/evidence/99999/text")
+        assert r.status_code == 404
+
+
 # ═══════════════════════════════════════════════════════════════
 # Evidence File Deletion
 # ═══════════════════════════════════════════════════════════════
@@ -35,6 +35,41 @@ class TestExportJSON:
         assert "saved_views" in data
 
 
+    def test_export_json_has_no_row_cap(self, api_project):
+        c = api_project["client"]
+        pid = api_project["id"]
+        for i in range(520):
+            c.db.upsert_company({"url": f"https://co{i:03d}.example", "name": f"Co {i:03d}",
+                                 "project_id": pid})
+        data = json.loads(c.get(f"/api/export/json?project_id={pid}").data)
+        assert len(data["companies"]) == 520
+        assert data["metadata"]["total_companies"] == 520
+        assert [co["name"] for co in data["companies"]][:2] == ["Co 000", "Co 001"]
+
+    def test_export_json_attaches_notes_and_events(self, api_project_with_companies):
+        c = api_project_with_companies["client"]
+        pid = api_project_with_companies["project_id"]
+        first, second, third = api_project_with_companies["company_ids"]
+        c.db.add_note(first, "note one")
+        c.db.add_note(third, "note three")
+        c.db.add_event(third, "funding", "Raised", "2024-01-01")
+        r = c.get(f"/api/export/json?project_id={pid}")
+        assert "attachment" in r.headers["Content-Disposition"]
+        by_id = {co["id"]: co for co in json.loads(r.data)["companies"]}
+        assert [n["content"] for n in by_id[first]["notes"]] == ["note one"]
+        assert by_id[second]["notes"] == [] and by_id[second]["events"] == []
+        assert [e["event_type"] for e in by_id[third]["events"]] == ["funding"]
+
+    def test_export_json_file_matches_stream(self, api_project_with_companies, tmp_path):
+        from storage.export import export_json
+        c = api_project_with_companies["client"]
+        pid = api_project_with_companies["project_id"]
+        path = export_json(c.db, output_path=tmp_path / "out.json", project_id=pid)
+        data = json.loads(path.read_text())
+        assert len(data["companies"]) == 3
+        assert not (tmp_path / "out.json.tmp").exists()
+
+
 class TestExportCSV:
     """DATA-EXP-CSV: CSV export via GET /api/export/csv."""
 
@@ -61,6 +96,19 @@ class TestExportMarkdown:
         r = c.get(f"/api/export/md?project_id={api_project['id']}")
         assert r.status_code == 200
 
+    def test_export_md_groups_companies_by_category(self, api_project_with_companies):
+        c = api_project_with_companies["client"]
+        pid = api_project_with_companies["project_id"]
+        c.db.upsert_company({"url": "https://loose.example", "name": "Loose Co",
+                             "project_id": pid})
+        text = c.get(f"/api/export/md?project_id={pid}").data.decode()
+        cat = api_project_with_companies["categories"][0]["name"]
+        assert f"### {cat} (3 companies)" in text
+        assert "### Uncategorized (1 companies)" in text
+        positions = [text.index(f"#### {name}")
+                     for name in ("Demo Inc", "Sample Ltd", "Test Corp")]
+        assert positions == sorted(positions)
+
 
 # ---------------------------------------------------------------------------
 # Import
@@ -101,6 +149,94 @@ class TestImportCSV:
         assert r.status_code == 400
 
 
+    def test_import_reports_row_errors(self, api_project):
+        c = api_project["client"]
+        pid = api_project["id"]
+        csv_data = ("Name,URL,Founded Year,Tags\n"
+                    "Good Co,https://good.example,2015,\"ai, fintech\"\n"
+                    ",https://noname.example,,\n"
+                    "\n"
+                    "Bad Url,ftp://bad.example,,\n")
+        r = c.post("/api/import/csv", content_type="multipart/form-data", data={
+            "project_id": str(pid), "file": (io.BytesIO(csv_data.encode()), "mixed.csv"),
+        })
+        body = r.get_json()
+        assert body["created"] == 1
+        assert body["skipped"] == 2
+        assert [(e["row"], e["error"]) for e in body["errors"]] == [
+            (3, "Missing name"), (5, "Invalid URL (must be http or https)")]
+        company = c._app.db.get_company_by_url("https://good.example", project_id=pid)
+        assert company["founded_year"] == 2015
+        assert json.loads(company["tags"]) == ["ai", "fintech"]
+        assert c._app.db.get_company_sources(company["id"])[0]["source_type"] == "import"
+
+    def test_import_updates_or_skips_existing(self, api_project):
+        c = api_project["client"]
+        pid = api_project["id"]
+
+        def _post(csv_data, **form):
+            return c.post("/api/import/csv", content_type="multipart/form-data", data={
+                "project_id": str(pid), **form,
+                "file": (io.BytesIO(csv_data.encode()), "co.csv"),
+            }).get_json()
+
+        _post("name,url,what\nOld,https://same.example,First\n")
+        body = _post("name,url,what\nNew,https://same.example,Second\n"
+                     "Fresh,https://fresh.example,\n")
+        assert (body["created"], body["updated"]) == (1, 1)
+        company = c._app.db.get_company_by_url("https://same.example", project_id=pid)
+        assert company["what"] == "Second"
+
+        body = _post("name,url\nAgain,https://same.example\n", skip_existing="1")
+        assert body["imported"] == 0
+        assert body["errors"][0]["error"] == "Already in project"
+
+    def test_import_xlsx(self, api_project):
+        from openpyxl import Workbook
+        wb = Workbook()
+        wb.active.append(["name", "url", "total_funding_usd"])
+        wb.active.append(["Sheet Co", "https://sheet.example", 1500000])
+        buf = io.BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        c = api_project["client"]
+        r = c.post("/api/import/csv", content_type="multipart/form-data", data={
+            "project_id": str(api_project["id"]), "file": (buf, "companies.xlsx"),
+        })
+        assert r.get_json()["created"] == 1
+        company = c._app.db.get_company_by_url("https://sheet.example",
+                                               project_id=api_project["id"])
+        assert company["total_funding_usd"] == 1500000
+
+    def test_import_rejects_unsupported_type(self, api_project):
+        r = api_project["client"].post("/api/import/csv", content_type="multipart/form-data",
+                                       data={"project_id": str(api_project["id"]),
+                                             "file": (io.BytesIO(b"x"), "notes.txt")})
+        assert r.status_code == 400
+
+
+class TestBulkImportEngine:
+    """DATA-IMP-BULK: core.bulk_import validation and single-transaction writes."""
+
+    def test_large_import_is_one_executemany(self, tmp_db, project_id):
+        from unittest.mock import patch
+        from core.bulk_import import import_companies
+        rows = [{"name": f"Co {i}", "url": f"https://co{i}.example", "_row": i + 2}
+                for i in range(12000)]
+        with patch.object(tmp_db, "upsert_company") as single:
+            report = import_companies(tmp_db, project_id, rows)
+        single.assert_not_called()
+        assert report["created"] == 12000
+        assert tmp_db.get_stats(project_id=project_id)["total_companies"] == 12000
+
+    def test_row_limit_rolls_back(self, tmp_db, project_id):
+        from core.bulk_import import import_companies
+        rows = ({"name": f"Co {i}", "url": f"https://co{i}.example"} for i in range(30))
+        with pytest.raises(ValueError):
+            import_companies(tmp_db, project_id, rows, max_rows=10)
+        assert tmp_db.get_company_urls(project_id) == set()
+
+
 # ---------------------------------------------------------------------------
 # Stats & Charts
 # ---------------------------------------------------------------------------
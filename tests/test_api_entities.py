@@ -1714,16 +1714,26 @@ class TestEntityGraphView:
         assert len(rel_edges) == 1
 
     def test_entity_graph_node_attributes(self, entity_with_company):
-        """Graph nodes include flattened attributes."""
+        """Graph nodes include the requested attributes, flattened."""
         c = entity_with_company["client"]
         pid = entity_with_company["id"]
 
-        r = c.get(f"/api/entity-graph?project_id={pid}")
+        r = c.get(f"/api/entity-graph?project_id={pid}&attrs=url")
         nodes = r.get_json()["nodes"]
         company_node = next(n for n in nodes if n["type"] == "company")
 
         assert company_node["name"] == "Acme Corp"
         assert company_node.get("attr_url") == "https://acme.com"
+        assert "attr_what" not in company_node
+
+    def test_entity_graph_attributes_opt_in(self, entity_with_company):
+        c = entity_with_company["client"]
+        pid = entity_with_company["id"]
+
+        bare = c.get(f"/api/entity-graph?project_id={pid}").get_json()["nodes"][0]
+        assert not any(k.startswith("attr_") for k in bare)
+        full = c.get(f"/api/entity-graph?project_id={pid}&attrs=*").get_json()["nodes"][0]
+        assert full["attr_url"] == "https://acme.com"
 
     def test_entity_graph_filter_by_type(self, entity_hierarchy):
         """Graph can filter by entity type."""
@@ -1738,6 +1748,104 @@ class TestEntityGraphView:
         r = client.get("/api/entity-graph")
         assert r.status_code == 400
 
+    def test_entity_graph_truncates_at_limit(self, entity_hierarchy):
+        c = entity_hierarchy["client"]
+        pid = entity_hierarchy["id"]
+
+        data = c.get(f"/api/entity-graph?project_id={pid}&limit=1").get_json()
+        assert len(data["nodes"]) == 1
+        assert data["truncated"] is True
+        assert data["edges"] == []
+
+
+@pytest.fixture
+def entity_chain(entity_project):
+    """Companies A - B - C - D linked by relationships, plus a loose E."""
+    c = entity_project["client"]
+    db = c.db
+    pid = entity_project["id"]
+    ids = {name: db.create_entity(pid, "company", name) for name in "ABCDE"}
+    for a, b in ("AB", "BC", "CD"):
+        db.create_entity_relationship(ids[a], ids[b], "partners_with")
+    return {**entity_project, "ids": ids}
+
+
+class TestEntityGraphQueries:
+    """ENT-GRAPH-Q: Set-based graph queries, neighbourhoods and layout cache."""
+
+    def test_neighbourhood_follows_edges_both_ways(self, entity_chain):
+        db, ids = entity_chain["client"].db, entity_chain["ids"]
+        pid = entity_chain["id"]
+
+        hood = db.get_entity_neighbourhood(pid, ids["B"], depth=1)
+        assert hood == {ids["B"]: 0, ids["A"]: 1, ids["C"]: 1}
+        hood = db.get_entity_neighbourhood(pid, ids["A"], depth=3)
+        assert hood[ids["D"]] == 3
+        assert ids["E"] not in hood
+
+    def test_neighbourhood_skips_deleted_entities(self, entity_chain):
+        db, ids = entity_chain["client"].db, entity_chain["ids"]
+        db.delete_entity(ids["B"])
+        assert db.get_entity_neighbourhood(entity_chain["id"], ids["A"], depth=3) == \
+            {ids["A"]: 0}
+
+    def test_focus_endpoint(self, entity_chain):
+        c, ids = entity_chain["client"], entity_chain["ids"]
+        pid = entity_chain["id"]
+
+        data = c.get(f"/api/entity-graph?project_id={pid}&focus={ids['B']}&depth=2").get_json()
+        hops = {n["name"]: n["hops"] for n in data["nodes"]}
+        assert hops == {"A": 1, "B": 0, "C": 1, "D": 2}
+        assert len(data["edges"]) == 3
+        assert data["depth"] == 2
+
+    def test_edges_load_in_one_query(self, entity_chain, monkeypatch):
+        db, ids = entity_chain["client"].db, entity_chain["ids"]
+        statements = []
+        original = db._get_conn
+
+        def traced():
+            conn = original()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        monkeypatch.setattr(db, "_get_conn", traced)
+        edges = db.get_graph_edges(list(ids.values()))
+        assert len(edges) == 3
+        assert len([s for s in statements if "entity_relationships" in s]) == 1
+
+    def test_layout_cached_until_graph_changes(self, entity_chain):
+        c, ids = entity_chain["client"], entity_chain["ids"]
+        pid = entity_chain["id"]
+        url = f"/api/entity-graph?project_id={pid}&layout=1"
+
+        first = c.get(url).get_json()
+        assert first["layout"]["cached"] is False
+        assert all(isinstance(n["x"], float) for n in first["nodes"])
+        again = c.get(url).get_json()
+        assert again["layout"]["cached"] is True
+        assert [(n["x"], n["y"]) for n in again["nodes"]] == \
+            [(n["x"], n["y"]) for n in first["nodes"]]
+
+        c.db.create_entity_relationship(ids["D"], ids["E"], "partners_with")
+        changed = c.get(url).get_json()
+        assert changed["version"] > first["version"]
+        assert changed["layout"]["cached"] is False
+
+    def test_attribute_writes_keep_layout(self, entity_chain):
+        c, ids = entity_chain["client"], entity_chain["ids"]
+        pid = entity_chain["id"]
+        version = c.db.get_graph_version(pid)
+        c.db.set_entity_attribute(ids["A"], "url", "https://a.example")
+        assert c.db.get_graph_version(pid) == version
+
+    def test_force_layout_separates_nodes(self):
+        from core.entity_graph import force_layout
+        positions = force_layout([1, 2, 3], [(1, 2), (2, 3)])
+        points = list(positions.values())
+        assert len(set(points)) == 3
+        assert force_layout([], []) == {}
+
 
 class TestEntityLocations:
     """ENT-LOC: Entity locations for map views."""
@@ -229,3 +229,98 @@ class TestUpdateCheck:
         assert r.status_code == 200
         data = r.get_json()
         assert "current_version" in data
+
+
+# ---------------------------------------------------------------------------
+# Event Stream (SSE)
+# ---------------------------------------------------------------------------
+
+class TestEventBus:
+    """SET-SSE-BUS: Ring buffers, replay and coalescing in web.notifications."""
+
+    @pytest.fixture
+    def bus(self):
+        from web.notifications import EventBus
+        return EventBus(buffer_size=4, max_streams=2)
+
+    def test_ids_increase_and_replay(self, bus):
+        first = bus.publish(1, "company_added", {"n": 1})
+        second = bus.publish(1, "company_added", {"n": 2})
+        bus.publish(2, "company_added", {"n": 3})
+        assert second > first
+        events, gap = bus.events_since(1, first)
+        assert [e[0] for e in events] == [second]
+        assert gap is False
+
+    def test_buffer_is_bounded(self, bus):
+        first = bus.publish(1, "company_added", {"n": 0})
+        for i in range(10):
+            bus.publish(1, "company_added", {"n": i})
+        assert len(bus.events_since(1, 0)[0]) == 4
+        # A client whose last event was evicted must resync
+        assert bus.events_since(1, first) == ([], True)
+
+    def test_stale_id_from_previous_process_resyncs(self, bus):
+        bus.publish(1, "company_added", {})
+        assert bus.events_since(1, 12345)[1] is True
+
+    def test_progress_events_coalesce(self, bus):
+        bus.publish(1, "job_progress", {"job_id": "a", "progress": 0.1})
+        bus.publish(1, "company_added", {})
+        for p in (0.2, 0.3, 0.4, 0.5, 0.6):
+            bus.publish(1, "job_progress", {"job_id": "a", "progress": p})
+        bus.publish(1, "job_progress", {"job_id": "b", "progress": 0.9})
+        events, gap = bus.events_since(1, 0)
+        assert [e[1] for e in events] == ["company_added", "job_progress", "job_progress"]
+        assert '"progress": 0.6' in events[1][3]
+        assert gap is False
+
+    def test_stream_slots_are_capped(self, bus):
+        assert bus.acquire_stream() and bus.acquire_stream()
+        assert bus.acquire_stream() is False
+        bus.release_stream()
+        assert bus.acquire_stream() is True
+
+    def test_stream_replays_after_last_id(self, bus):
+        first = bus.publish(1, "company_added", {"n": 1})
+        bus.publish(1, "taxonomy_changed", {"n": 2})
+        frames = bus.stream(1, last_id=first, max_seconds=0.2, keepalive=0.1)
+        assert next(frames).startswith("retry:")
+        assert "event: taxonomy_changed" in next(frames)
+
+
+class TestEventStream:
+    """SET-SSE-STREAM: GET /api/events/stream."""
+
+    def test_requires_project(self, client):
+        assert client.get("/api/events/stream").status_code == 400
+        assert client.get("/api/events/stream?project_id=999").status_code == 404
+
+    def test_replays_with_last_event_id(self, api_project, monkeypatch):
+        from web.notifications import EventBus, notify_sse
+        bus = EventBus()
+        monkeypatch.setattr("web.notifications.event_bus", bus)
+        monkeypatch.setattr("web.blueprints.settings.event_bus", bus)
+        pid = api_project["id"]
+        first = bus.publish(pid, "company_added", {"n": 1})
+        notify_sse(pid, "company_updated", {"n": 2})
+
+        r = api_project["client"].get(f"/api/events/stream?project_id={pid}",
+                                      headers={"Last-Event-ID": str(first)})
+        assert r.status_code == 200
+        frames = iter(r.response)
+        next(frames)
+        frame = next(frames)
+        frame = frame.decode() if isinstance(frame, bytes) else frame
+        assert "event: company_updated" in frame
+        assert bus.stream_count == 1
+        r.close()
+        assert bus.stream_count == 0
+
+    def test_rejects_when_streams_exhausted(self, api_project, monkeypatch):
+        from web.notifications import EventBus
+        bus = EventBus(max_streams=0)
+        monkeypatch.setattr("web.blueprints.settings.event_bus", bus)
+        r = api_project["client"].get(f"/api/events/stream?project_id={api_project['id']}")
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "10"
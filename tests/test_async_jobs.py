@@ -1,10 +1,14 @@
 """Tests for the async job helper module."""
 import json
+import threading
 import time
 import pytest
 
+from web import async_jobs
 from web.async_jobs import (
     make_job_id, start_async_job, write_result, poll_result, run_in_thread,
+    submit_job, report_progress, cancel_job, get_job, list_jobs, recover_jobs,
+    register_handler, purge_finished_jobs, JobCancelled,
 )
 from config import DATA_DIR
 
@@ -106,3 +110,221 @@ class TestRunInThread:
         run_in_thread(worker, 42)
         time.sleep(0.1)
         assert results == [42]
+
+
+def _wait_for(job_id, states=("complete", "error", "cancelled", "interrupted")):
+    for _ in range(100):
+        job = get_job(job_id)
+        if job and job["state"] in states:
+            return job
+        time.sleep(0.02)
+    return get_job(job_id)
+
+
+class TestJobQueue:
+    def test_job_row_tracks_lifecycle(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+
+        def worker(job_id):
+            report_progress(job_id, 0.5, "halfway")
+            write_result("calc", job_id, {"status": "complete", "value": 1})
+
+        jid = submit_job("calc", worker, project_id=7)
+        job = _wait_for(jid)
+        assert job["state"] == "complete"
+        assert job["prefix"] == "calc"
+        assert job["project_id"] == 7
+        assert job["progress"] == 0.5
+        assert job["progress_message"] == "halfway"
+        assert job["attempts"] == 1
+        assert job["finished_at"] is not None
+        assert [j["id"] for j in list_jobs(project_id=7)] == [jid]
+
+    def test_poll_reports_progress_while_running(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        release = threading.Event()
+
+        def worker(job_id):
+            report_progress(job_id, 0.25, "1/4")
+            release.wait(5)
+            write_result("slow", job_id, {"status": "complete"})
+
+        jid = submit_job("slow", worker)
+        for _ in range(100):
+            result = poll_result("slow", jid)
+            if "progress" in result:
+                break
+            time.sleep(0.02)
+        release.set()
+        assert result == {"status": "pending", "progress": 0.25, "progress_message": "1/4"}
+        assert _wait_for(jid)["state"] == "complete"
+
+    def test_initial_result_is_polled_until_replaced(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        release = threading.Event()
+
+        def worker(job_id):
+            release.wait(5)
+
+        jid = submit_job("init", worker, initial_result={"status": "running", "n": 3})
+        assert poll_result("init", jid) == {"status": "running", "n": 3}
+        release.set()
+        assert _wait_for(jid)["state"] == "complete"
+
+    def test_cancel_queued_job_never_runs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        ran = []
+        pool = async_jobs._WorkerPool("test", 1)
+        monkeypatch.setitem(async_jobs._pools, "test", pool)
+        release = threading.Event()
+
+        blocker = submit_job("block", lambda job_id: release.wait(5), job_class="test")
+        victim = submit_job("victim", lambda job_id: ran.append(job_id), job_class="test")
+        assert cancel_job(victim) is True
+        release.set()
+        assert _wait_for(blocker)["state"] == "complete"
+        pool.shutdown()
+
+        assert ran == []
+        assert get_job(victim)["state"] == "cancelled"
+        assert poll_result("victim", victim)["status"] == "cancelled"
+        assert cancel_job(victim) is False
+
+    def test_cancel_running_job_stops_at_progress(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        started = threading.Event()
+        steps = []
+
+        def worker(job_id):
+            started.set()
+            for i in range(100):
+                steps.append(i)
+                report_progress(job_id, i / 100)
+                time.sleep(0.01)
+            write_result("loop", job_id, {"status": "complete"})
+
+        jid = submit_job("loop", worker)
+        started.wait(5)
+        assert cancel_job(jid) is True
+        job = _wait_for(jid)
+        time.sleep(0.05)
+        assert job["state"] == "cancelled"
+        assert len(steps) < 100
+
+    def test_priority_orders_queued_jobs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        order = []
+        pool = async_jobs._WorkerPool("test", 1)
+        monkeypatch.setitem(async_jobs._pools, "test", pool)
+        release = threading.Event()
+
+        blocker = submit_job("block", lambda job_id: release.wait(5), job_class="test")
+        low = submit_job("low", lambda job_id: order.append("low"),
+                         job_class="test", priority=async_jobs.PRIORITY_LOW)
+        high = submit_job("high", lambda job_id: order.append("high"),
+                          job_class="test", priority=async_jobs.PRIORITY_HIGH)
+        release.set()
+        for jid in (blocker, low, high):
+            _wait_for(jid)
+        pool.shutdown()
+        assert order == ["high", "low"]
+
+    def test_unknown_job_class_rejected(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        with pytest.raises(ValueError):
+            submit_job("x", lambda job_id: None, job_class="gpu")
+
+    def test_report_progress_raises_after_cancel(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        write_result("manual", "abcdef0123456789", {"status": "running"})
+        cancel_job("abcdef0123456789")
+        with pytest.raises(JobCancelled):
+            report_progress("abcdef0123456789", 0.5)
+        # Late results from the worker don't resurrect the job
+        write_result("manual", "abcdef0123456789", {"status": "complete"})
+        assert get_job("abcdef0123456789")["state"] == "cancelled"
+
+    def test_purge_finished_jobs(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        write_result("old", "aaaa", {"status": "complete"})
+        write_result("new", "bbbb", {"status": "complete"})
+        async_jobs._execute("UPDATE async_jobs SET finished_at = 0 WHERE id = 'aaaa'")
+        assert purge_finished_jobs(max_age_days=7) == 1
+        assert get_job("aaaa") is None
+        assert get_job("bbbb") is not None
+
+
+class TestRecovery:
+    def _orphan(self, job_id, prefix, handler=None, args=(), attempts=1):
+        """Insert a running job owned by a dead process."""
+        async_jobs._execute(
+            """INSERT INTO async_jobs
+               (id, prefix, job_class, state, handler, args_json, attempts,
+                owner, heartbeat_at, created_at)
+               VALUES (?, ?, 'llm', 'running', ?, ?, ?, 'dead-process', 0, 0)""",
+            (job_id, prefix, handler,
+             json.dumps({"args": list(args), "kwargs": {}}) if handler else None,
+             attempts),
+        )
+
+    def test_requeues_handler_jobs_and_interrupts_others(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        seen = []
+
+        @register_handler("test_recover")
+        def _handler(job_id, value):
+            seen.append(value)
+            write_result("test_recover", job_id, {"status": "complete", "value": value})
+
+        self._orphan("aaaa", "test_recover", handler="test_recover", args=(5,))
+        self._orphan("bbbb", "plain")
+        self._orphan("cccc", "test_recover", handler="test_recover", args=(6,),
+                     attempts=async_jobs.MAX_ATTEMPTS)
+
+        assert recover_jobs() == {"requeued": 1, "interrupted": 2}
+        assert _wait_for("aaaa")["state"] == "complete"
+        assert seen == [5]
+        assert get_job("aaaa")["attempts"] == 2
+        assert get_job("bbbb")["state"] == "interrupted"
+        assert poll_result("plain", "bbbb")["status"] == "error"
+        assert get_job("cccc")["state"] == "interrupted"
+
+    def test_ignores_jobs_with_fresh_heartbeat(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+        self._orphan("dddd", "plain")
+        async_jobs._execute("UPDATE async_jobs SET heartbeat_at = ? WHERE id = 'dddd'",
+                            (time.time(),))
+        assert recover_jobs() == {"requeued": 0, "interrupted": 0}
+        assert get_job("dddd")["state"] == "running"
+
+
+class TestJobEndpoints:
+    @pytest.fixture(autouse=True)
+    def _jobs_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("web.async_jobs.DATA_DIR", tmp_path)
+
+    def test_list_and_get(self, client):
+        write_result("report", "abcd1234abcd1234", {"status": "complete"})
+        r = client.get("/api/async-jobs?prefix=report")
+        assert r.status_code == 200
+        assert [j["id"] for j in r.get_json()] == ["abcd1234abcd1234"]
+
+        r = client.get("/api/async-jobs/abcd1234abcd1234")
+        assert r.status_code == 200
+        assert r.get_json()["state"] == "complete"
+        assert r.get_json()["result"] == {"status": "complete"}
+
+    def test_invalid_state_filter(self, client):
+        assert client.get("/api/async-jobs?state=bogus").status_code == 400
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/async-jobs/ffffffffffffffff").status_code == 404
+        assert client.post("/api/async-jobs/ffffffffffffffff/cancel").status_code == 404
+
+    def test_cancel(self, client):
+        write_result("report", "abcd1234abcd1234", {"status": "running"})
+        r = client.post("/api/async-jobs/abcd1234abcd1234/cancel")
+        assert r.status_code == 200
+        assert get_job("abcd1234abcd1234")["state"] == "cancelled"
+        # Already finished
+        assert client.post("/api/async-jobs/abcd1234abcd1234/cancel").status_code == 409
@@ -0,0 +1,138 @@
+"""Tests for the benchmark harness (benchmarks/).
+
+Covers:
+- Synthetic generator: deterministic rows for a seed, counts as reported
+- Scenarios: every registered scenario runs against a tiny project
+- Harness: metrics shape, query counting, baseline comparison
+
+Run: pytest tests/test_benchmarks.py -v
+Markers: db, benchmarks
+"""
+import pytest
+
+from benchmarks import harness
+from benchmarks.scenarios import SCENARIOS, Context, Scenario
+from benchmarks.synthetic import SCALES, Scale, build_project
+from storage.db import Database
+
+pytestmark = [pytest.mark.db, pytest.mark.benchmarks]
+
+MICRO = Scale(entities=30, attributes=4, history=2, companies=25, categories=2,
+              evidence_per_entity=1, changes_per_entity=1)
+
+
+def _dump(db, table, columns):
+    with db._conn() as conn:
+        return conn.execute(f"SELECT {columns} FROM {table} ORDER BY id").fetchall()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Synthetic generator
+# ═══════════════════════════════════════════════════════════════
+
+class TestSyntheticProject:
+
+    def test_same_seed_same_rows(self, tmp_path):
+        a = Database(db_path=tmp_path / "a.db")
+        b = Database(db_path=tmp_path / "b.db")
+        build_project(a, MICRO, seed=7)
+        build_project(b, MICRO, seed=7)
+        for table, columns in [
+            ("entities", "name, category_id, tags, created_at"),
+            ("entity_attributes", "entity_id, attr_slug, value, captured_at"),
+            ("companies", "name, category_id, subcategory_id, tags, confidence_score"),
+            ("evidence", "entity_id, file_path, metadata_json"),
+            ("change_feed", "entity_id, change_type, title, created_at"),
+        ]:
+            assert [tuple(r) for r in _dump(a, table, columns)] == \
+                [tuple(r) for r in _dump(b, table, columns)], table
+
+    def test_other_seed_differs(self, tmp_path):
+        a = Database(db_path=tmp_path / "a.db")
+        b = Database(db_path=tmp_path / "b.db")
+        build_project(a, MICRO, seed=1)
+        build_project(b, MICRO, seed=2)
+        columns = "entity_id, attr_slug, value"
+        assert [tuple(r) for r in _dump(a, "entity_attributes", columns)] != \
+            [tuple(r) for r in _dump(b, "entity_attributes", columns)]
+
+    def test_counts_match_tables(self, tmp_db):
+        info = build_project(tmp_db, MICRO)
+        pid = info["project_id"]
+        with tmp_db._conn() as conn:
+            def count(sql):
+                return conn.execute(sql, (pid,)).fetchone()[0]
+            assert count("SELECT COUNT(*) FROM entities WHERE project_id = ?") == 30
+            assert count("SELECT COUNT(*) FROM companies WHERE project_id = ?") == 25
+            assert count("SELECT COUNT(*) FROM categories WHERE project_id = ?") == 8
+            assert count("""SELECT COUNT(*) FROM entity_attributes a
+                            JOIN entities e ON e.id = a.entity_id
+                            WHERE e.project_id = ?""") == 30 * 4 * 2
+            assert count("SELECT COUNT(*) FROM change_feed WHERE project_id = ?") == 30
+        assert info["counts"]["entity_attributes"] == 240
+
+    def test_named_scales(self):
+        assert SCALES["10k"].entities == 10_000
+        assert SCALES["100k"].entities * SCALES["100k"].attributes \
+            * SCALES["100k"].history >= 1_000_000
+
+
+# ═══════════════════════════════════════════════════════════════
+# Scenarios + harness
+# ═══════════════════════════════════════════════════════════════
+
+@pytest.fixture
+def bench_ctx(client):
+    info = build_project(client.db, MICRO)
+    with client.db._conn() as conn:
+        entity_ids = [r[0] for r in conn.execute(
+            "SELECT id FROM entities WHERE project_id = ? LIMIT 5", (info["project_id"],))]
+    return Context(db=client.db, client=client, project_id=info["project_id"],
+                   entity_ids=entity_ids)
+
+
+class TestHarness:
+
+    def test_every_scenario_runs(self, bench_ctx):
+        results = harness.run_scenarios(bench_ctx, repeat=1)
+        assert list(results) == list(SCENARIOS)
+        for name, metrics in results.items():
+            assert metrics["runs"] == 1
+            assert metrics["p95_ms"] >= metrics["p50_ms"] >= 0
+            assert metrics["queries"] > 0, name
+
+    def test_prefix_selection(self, bench_ctx):
+        results = harness.run_scenarios(bench_ctx, names=["storage.get_"], repeat=1)
+        assert set(results) == {n for n in SCENARIOS if n.startswith("storage.get_")}
+
+    def test_counts_queries_and_restores_connection(self, tmp_db):
+        def three_queries(ctx):
+            with ctx.db._conn() as conn:
+                for _ in range(3):
+                    conn.execute("SELECT 1")
+
+        ctx = Context(db=tmp_db, client=None, project_id=1)
+        metrics = harness.measure(Scenario("q", three_queries), ctx, repeat=3)
+        # the connection's own PRAGMAs run before tracing starts
+        assert metrics["queries"] == 3
+        assert "_get_conn" not in vars(tmp_db)
+
+    def test_compare_flags_slowdowns_and_extra_queries(self):
+        baseline = {
+            "fast": {"p50_ms": 10.0, "queries": 3},
+            "noisy": {"p50_ms": 0.5, "queries": 3},
+            "chatty": {"p50_ms": 10.0, "queries": 3},
+            "gone": {"p50_ms": 1.0, "queries": 1},
+        }
+        current = {
+            "fast": {"p50_ms": 14.0, "queries": 3},      # +40%, 4ms
+            "noisy": {"p50_ms": 1.0, "queries": 3},      # +100%, under the noise floor
+            "chatty": {"p50_ms": 10.0, "queries": 4},
+            "new": {"p50_ms": 1.0, "queries": 1},
+        }
+        rows = {r["scenario"]: r for r in harness.compare(baseline, current, threshold=0.25)}
+        assert set(rows) == {"fast", "noisy", "chatty"}
+        assert rows["fast"]["regressed"] and rows["fast"]["change"] == 0.4
+        assert not rows["noisy"]["regressed"]
+        assert rows["chatty"]["regressed"]
+        assert not harness.compare(baseline, current, threshold=0.5)[0]["regressed"]
@@ -0,0 +1,256 @@
+"""Tests for the bulk extraction engine — planning, deduplication, concurrency, writes.
+
+Covers:
+- ExtractionMixin: get_evidence_for_extraction, record_bulk_extractions
+- plan_bulk_extraction: filtering, already-extracted skipping, content dedupe
+- BulkExtractionJob: fan-out of shared results, bounded concurrency,
+  batched flushes, failure recording, cancellation
+- API: /api/extract/bulk, /api/extract/bulk/<key>, /api/extract/bulk/<key>/cancel
+
+Run: pytest tests/test_bulk_extraction.py -v
+Markers: db, extraction
+"""
+import threading
+import time
+
+import pytest
+from unittest.mock import patch
+
+from core.bulk_extraction import BulkExtractionJob, plan_bulk_extraction
+from core.capture import store_file
+from core.extraction import clear_extraction_cache
+
+pytestmark = [pytest.mark.db, pytest.mark.extraction]
+
+SCHEMA = {
+    "version": 1,
+    "entity_types": [
+        {
+            "name": "Company",
+            "slug": "company",
+            "description": "A company",
+            "icon": "building",
+            "parent_type": None,
+            "attributes": [
+                {"name": "Description", "slug": "description", "data_type": "text"},
+                {"name": "Founded Year", "slug": "founded_year", "data_type": "number"},
+            ],
+        },
+        {
+            "name": "Tag",
+            "slug": "tag",
+            "description": "No attributes",
+            "icon": "tag",
+            "parent_type": None,
+            "attributes": [],
+        },
+    ],
+    "relationships": [],
+}
+
+SHARED_PAGE = b"<html><body><h1>Group</h1><p>Founded in 2015.</p></body></html>"
+
+
+def _llm_response(prompt, **kwargs):
+    return {
+        "result": "", "cost_usd": 0.01, "duration_ms": 5, "is_error": False,
+        "structured_output": {"extracted_attributes": [
+            {"attr_slug": "founded_year", "value": 2015, "confidence": 0.9,
+             "reasoning": "Stated"},
+        ]},
+    }
+
+
+@pytest.fixture
+def bulk_project(tmp_path, monkeypatch):
+    """Project where the same page is attached to two entities plus one unique page."""
+    import core.capture as capture_mod
+    from storage.db import Database
+    monkeypatch.setattr(capture_mod, "EVIDENCE_DIR", tmp_path / "evidence")
+    clear_extraction_cache()
+
+    db = Database(db_path=tmp_path / "test.db")
+    pid = db.create_project(name="Bulk", purpose="Testing", entity_schema=SCHEMA)
+    a = db.create_entity(pid, "company", "Alpha")
+    b = db.create_entity(pid, "company", "Beta")
+    c = db.create_entity(pid, "company", "Gamma")
+    tag = db.create_entity(pid, "tag", "Misc")
+
+    evidence = {}
+    for name, eid, data in [
+        ("alpha", a, SHARED_PAGE),
+        ("beta", b, SHARED_PAGE),
+        ("gamma", c, b"<html><body><p>Gamma was founded in 2020.</p></body></html>"),
+        ("tag", tag, SHARED_PAGE),
+    ]:
+        rel = store_file(pid, eid, "page_archive", data, f"{name}.html")
+        evidence[name] = db.add_evidence(eid, "page_archive", rel,
+                                         source_url=f"https://{name}.example")
+    shot = store_file(pid, a, "screenshot", b"\x89PNG", "alpha.png")
+    db.add_evidence(a, "screenshot", shot)
+
+    return {"db": db, "project_id": pid, "entities": {"alpha": a, "beta": b, "gamma": c},
+            "evidence": evidence}
+
+
+class TestPlanning:
+
+    def test_plan_dedupes_identical_content(self, bulk_project):
+        plan = plan_bulk_extraction(bulk_project["db"], bulk_project["project_id"])
+        summary = plan.summary()
+        assert summary["evidence_count"] == 4
+        assert summary["task_count"] == 2
+        assert summary["target_count"] == 3
+        assert summary["deduplicated"] == 1
+        assert [s["reason"] for s in summary["skipped"]] == [
+            "no attributes defined for entity type"]
+
+    def test_plan_filters_entities(self, bulk_project):
+        plan = plan_bulk_extraction(
+            bulk_project["db"], bulk_project["project_id"],
+            entity_ids=[bulk_project["entities"]["gamma"]],
+        )
+        assert len(plan.tasks) == 1
+        assert plan.tasks[0].targets[0].entity_name == "Gamma"
+
+    def test_plan_skips_missing_files(self, bulk_project):
+        db = bulk_project["db"]
+        db.add_evidence(bulk_project["entities"]["gamma"], "document",
+                        f"{bulk_project['project_id']}/1/document/gone.pdf")
+        plan = plan_bulk_extraction(db, bulk_project["project_id"])
+        assert "no extractable text" in [s["reason"] for s in plan.skipped]
+
+
+class TestBulkRun:
+
+    @patch("core.llm.run_cli", side_effect=_llm_response)
+    def test_run_fans_out_shared_results(self, mock_llm, bulk_project):
+        db = bulk_project["db"]
+        plan = plan_bulk_extraction(db, bulk_project["project_id"])
+        final = BulkExtractionJob(db, plan).run()
+
+        assert final["status"] == "completed"
+        assert mock_llm.call_count == 2
+        assert final["progress"]["jobs_written"] == 3
+        assert final["progress"]["results_written"] == 3
+
+        for name in ("alpha", "beta", "gamma"):
+            results = db.get_extraction_results(entity_id=bulk_project["entities"][name])
+            assert len(results) == 1
+            assert results[0]["source_evidence_id"] == bulk_project["evidence"][name]
+
+        jobs = db.get_extraction_jobs(project_id=bulk_project["project_id"])
+        assert {j["status"] for j in jobs} == {"completed"}
+        # The shared LLM call is charged once
+        assert sum(j["cost_usd"] for j in jobs) == pytest.approx(0.02)
+
+    @patch("core.llm.run_cli", side_effect=_llm_response)
+    def test_rerun_skips_extracted_evidence(self, mock_llm, bulk_project):
+        db = bulk_project["db"]
+        pid = bulk_project["project_id"]
+        BulkExtractionJob(db, plan_bulk_extraction(db, pid)).run()
+
+        assert plan_bulk_extraction(db, pid).tasks == []
+        assert len(plan_bulk_extraction(db, pid, include_extracted=True).tasks) == 2
+
+    def test_failures_are_recorded_and_retried(self, bulk_project):
+        db = bulk_project["db"]
+        pid = bulk_project["project_id"]
+        with patch("core.llm.run_cli", side_effect=RuntimeError("boom")):
+            final = BulkExtractionJob(db, plan_bulk_extraction(db, pid)).run()
+
+        assert final["status"] == "completed"
+        assert final["progress"]["tasks_failed"] == 2
+        jobs = db.get_extraction_jobs(project_id=pid)
+        assert len(jobs) == 3
+        assert {j["status"] for j in jobs} == {"failed"}
+        # Failed pairs are planned again next time
+        assert len(plan_bulk_extraction(db, pid).tasks) == 2
+
+    def test_concurrency_is_bounded(self, bulk_project):
+        db = bulk_project["db"]
+        pid = bulk_project["project_id"]
+        for i in range(6):
+            rel = store_file(pid, bulk_project["entities"]["gamma"], "document",
+                             f"Distinct document number {i}".encode(), f"doc{i}.txt")
+            db.add_evidence(bulk_project["entities"]["gamma"], "document", rel)
+
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def _slow_llm(prompt, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return _llm_response(prompt)
+
+        with patch("core.llm.run_cli", side_effect=_slow_llm):
+            final = BulkExtractionJob(db, plan_bulk_extraction(db, pid),
+                                      concurrency=2).run()
+
+        assert final["progress"]["tasks_done"] == 8
+        assert active["max"] == 2
+
+    @patch("core.llm.run_cli", side_effect=_llm_response)
+    def test_writes_are_batched(self, mock_llm, bulk_project):
+        db = bulk_project["db"]
+        plan = plan_bulk_extraction(db, bulk_project["project_id"])
+        with patch.object(db, "record_bulk_extractions",
+                          wraps=db.record_bulk_extractions) as spy:
+            BulkExtractionJob(db, plan, flush_every=100).run()
+        spy.assert_called_once()
+        assert len(spy.call_args[0][1]) == 3
+
+    @patch("core.llm.run_cli", side_effect=_llm_response)
+    def test_cancel_before_start(self, mock_llm, bulk_project):
+        db = bulk_project["db"]
+        job = BulkExtractionJob(db, plan_bulk_extraction(db, bulk_project["project_id"]))
+        job.cancel()
+        final = job.run()
+        assert final["status"] == "cancelled"
+        assert final["progress"]["tasks_done"] == 0
+        mock_llm.assert_not_called()
+
+
+class TestBulkAPI:
+
+    @pytest.fixture
+    def api_bulk(self, client, bulk_project):
+        client._app.db = bulk_project["db"]
+        return {**bulk_project, "client": client}
+
+    def test_dry_run(self, api_bulk):
+        r = api_bulk["client"].post("/api/extract/bulk", json={
+            "project_id": api_bulk["project_id"], "dry_run": True,
+        })
+        assert r.status_code == 200
+        assert r.get_json()["plan"]["task_count"] == 2
+
+    @patch("core.llm.run_cli", side_effect=_llm_response)
+    def test_run_and_poll(self, mock_llm, api_bulk):
+        c = api_bulk["client"]
+        r = c.post("/api/extract/bulk", json={"project_id": api_bulk["project_id"]})
+        assert r.status_code == 202
+        job_key = r.get_json()["job_key"]
+
+        for _ in range(100):
+            body = c.get(f"/api/extract/bulk/{job_key}").get_json()
+            if body["status"] not in ("pending", "running"):
+                break
+            time.sleep(0.02)
+        assert body["status"] == "completed"
+        assert body["progress"]["results_written"] == 3
+
+        r2 = c.post("/api/extract/bulk", json={"project_id": api_bulk["project_id"]})
+        assert r2.get_json()["status"] == "nothing_to_do"
+
+    def test_requires_project(self, client):
+        assert client.post("/api/extract/bulk", json={}).status_code == 400
+        assert client.post("/api/extract/bulk", json={"project_id": 999}).status_code == 404
+
+    def test_unknown_job(self, client):
+        assert client.get("/api/extract/bulk/nope").status_code == 404
+        assert client.post("/api/extract/bulk/nope/cancel").status_code == 404
@@ -7,6 +7,7 @@ Covers:
 - Document download (mocked HTTP)
 - Manual upload flow
 - Evidence get_by_id DB method
+- Text sidecars (HTML/DOCX/text derivation, backfill, deletion)
 - Capture result dataclass
 
 Run: pytest tests/test_capture.py -v
@@ -40,6 +41,11 @@ from core.capture import (
     MAX_UPLOAD_SIZE,
     _content_type_to_ext,
     _type_from_path,
+    derive_text,
+    load_evidence_text,
+    read_text_metadata,
+    text_sidecar_path,
+    write_text_sidecar,
 )
 
 pytestmark = [pytest.mark.db, pytest.mark.capture]
@@ -547,6 +553,145 @@ class TestCaptureDocument:
         assert "too large" in result.error.lower()
 
 
+# ═══════════════════════════════════════════════════════════════
+# Text Sidecars
+# ═══════════════════════════════════════════════════════════════
+
+_SIDECAR_HTML = b"""<html><head><title>Acme</title><script>var tracking = 1;</script></head>
+<body><nav><a href="/">Home</a></nav>
+<h1>Acme Platform</h1>
+<p>The platform is built for the teams that manage supply chains and it is used
+in the largest retailers in the world. Pricing is available on request for
+enterprise customers with more than fifty seats.</p>
+<h2>Pricing</h2>
+<ul><li>Starter plan</li><li>Enterprise plan</li></ul>
+</body></html>"""
+
+
+def _make_docx(paragraphs):
+    """Build a minimal DOCX from [(style_or_None, text), ...]."""
+    import io
+    import zipfile
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = ""
+    for style, text in paragraphs:
+        ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        body += f"<w:p>{ppr}<w:r><w:t>{text}</w:t></w:r></w:p>"
+    xml = f'<?xml version="1.0"?><w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>'
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+class TestTextSidecars:
+    """Text derivation at store time and sidecar reads."""
+
+    def test_derive_html(self):
+        derived = derive_text(_SIDECAR_HTML, ".html")
+        assert derived["format"] == "html"
+        assert "# Acme Platform" in derived["text"]
+        assert "## Pricing" in derived["text"]
+        assert "- Starter plan" in derived["text"]
+        assert "tracking" not in derived["text"]
+        assert "Home" not in derived["text"]
+        assert derived["headings"] == ["Acme Platform", "Pricing"]
+        assert derived["language"] == "en"
+        assert derived["word_count"] > 30
+
+    def test_derive_docx(self):
+        data = _make_docx([
+            ("Title", "Annual Report"),
+            ("Heading2", "Revenue"),
+            (None, "Revenue grew to 12 million."),
+        ])
+        derived = derive_text(data, ".docx")
+        assert derived["format"] == "docx"
+        assert derived["headings"] == ["Annual Report", "Revenue"]
+        assert "# Annual Report" in derived["text"]
+        assert "## Revenue" in derived["text"]
+        assert "Revenue grew to 12 million." in derived["text"]
+
+    def test_derive_pdf_without_pypdf(self, monkeypatch):
+        import sys
+        monkeypatch.setitem(sys.modules, "pypdf", None)
+        assert derive_text(b"%PDF-1.4 fake", ".pdf") is None
+
+    def test_derive_unsupported_format(self):
+        assert derive_text(b"\x89PNG data", ".png") is None
+
+    def test_detects_german(self):
+        text = ("Die Firma ist ein Anbieter von Software und der Markt ist "
+                "für das Unternehmen nicht neu. ") * 5
+        assert derive_text(text.encode(), ".txt")["language"] == "de"
+
+    def test_upload_writes_sidecar(self, evidence_tmpdir):
+        result = store_upload(
+            project_id=1, entity_id=10,
+            file_data=_SIDECAR_HTML,
+            original_filename="page.html",
+        )
+        rel = result.evidence_paths[0]
+        assert text_sidecar_path(rel).exists()
+        assert result.metadata["language"] == "en"
+        assert result.metadata["word_count"] > 30
+        assert read_text_metadata(rel)["headings"] == ["Acme Platform", "Pricing"]
+
+    def test_upload_image_has_no_sidecar(self, evidence_tmpdir):
+        result = store_upload(
+            project_id=1, entity_id=10,
+            file_data=b"\x89PNG data",
+            original_filename="shot.png",
+        )
+        assert not text_sidecar_path(result.evidence_paths[0]).exists()
+        assert "word_count" not in result.metadata
+
+    def test_load_reads_sidecar_without_reparsing(self, evidence_tmpdir):
+        rel = store_file(1, 10, "page_archive", _SIDECAR_HTML, "page.html")
+        write_text_sidecar(rel)
+        with patch("core.capture._html_to_text") as mock_parse:
+            text = load_evidence_text(rel)
+        mock_parse.assert_not_called()
+        assert "# Acme Platform" in text
+
+    def test_load_backfills_missing_sidecar(self, evidence_tmpdir):
+        rel = store_file(1, 10, "page_archive", _SIDECAR_HTML, "page.html")
+        assert not text_sidecar_path(rel).exists()
+        text = load_evidence_text(rel)
+        assert "# Acme Platform" in text
+        assert text_sidecar_path(rel).exists()
+
+    def test_load_missing_file(self, evidence_tmpdir):
+        assert load_evidence_text("1/10/document/missing.txt") is None
+
+    def test_write_never_raises(self, evidence_tmpdir):
+        rel = store_file(1, 10, "document", b"not a zip", "broken.docx")
+        assert write_text_sidecar(rel) is None
+
+    def test_delete_removes_sidecars(self, evidence_tmpdir):
+        rel = store_file(1, 10, "page_archive", _SIDECAR_HTML, "page.html")
+        write_text_sidecar(rel)
+        assert delete_file(rel)
+        assert not text_sidecar_path(rel).exists()
+        assert not (evidence_tmpdir / "1").exists()
+
+    def test_capture_document_writes_sidecar(self, evidence_tmpdir):
+        mock_resp = MagicMock()
+        mock_resp.status_code = 200
+        mock_resp.headers = {"Content-Type": "text/html"}
+        mock_resp.iter_content = MagicMock(return_value=[_SIDECAR_HTML])
+        mock_resp.raise_for_status = MagicMock()
+
+        with patch("core.capture.requests.get", return_value=mock_resp):
+            result = capture_document(
+                url="https://example.com/pricing",
+                project_id=1, entity_id=10,
+            )
+        assert result.success
+        assert text_sidecar_path(result.evidence_paths[0]).exists()
+        assert result.metadata["word_count"] > 30
+
+
 # ═══════════════════════════════════════════════════════════════
 # DB: get_evidence_by_id
 # ═══════════════════════════════════════════════════════════════
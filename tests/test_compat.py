@@ -478,6 +478,88 @@ class TestListEntitiesAsCompanies:
         assert c["url"] == "https://full.co"
         assert c["what"] == "A full company"
 
+    def test_uses_latest_attribute_value(self, app):
+        """Only the most recent value of each attribute is returned."""
+        db = app.db
+        pid = _create_entity_project(db)
+        _insert_entity(db, pid, "History Co", attrs=[
+            ("geography", "UK"), ("geography", "EU"), ("geography", "Global"),
+        ])
+        [company] = list_entities_as_companies(db, pid)
+        assert company["geography"] == "Global"
+
+    def test_attributes_loaded_in_one_query(self, app):
+        """Attribute loading does not grow with the number of entities."""
+        db = app.db
+        pid = _create_entity_project(db)
+        for i in range(25):
+            _insert_entity(db, pid, f"Co {i}", attrs=[("website", f"https://co{i}.com")])
+
+        statements = []
+        real_get_conn = db._get_conn
+
+        def _traced_conn():
+            conn = real_get_conn()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        db._get_conn = _traced_conn
+        try:
+            companies = list_entities_as_companies(db, pid)
+        finally:
+            del db._get_conn
+        assert len(companies) == 25
+        attr_queries = [q for q in statements if "FROM entity_attributes" in q
+                        and "SELECT e.*" not in q]
+        assert len(attr_queries) == 1
+
+    def test_tag_geography_and_funding_stage_filters(self, app):
+        """The full company filter set is applied in SQL."""
+        db = app.db
+        pid = _create_entity_project(db)
+        _insert_entity(db, pid, "Fintech UK", tags=json.dumps(["fintech"]),
+                       attrs=[("geography", "UK"), ("funding_stage", "Seed")])
+        _insert_entity(db, pid, "Fintech US", tags=json.dumps(["fintech"]),
+                       attrs=[("geography", "UK"), ("geography", "US"),
+                              ("funding_stage", "Series A")])
+        _insert_entity(db, pid, "Health UK", tags=json.dumps(["health"]),
+                       attrs=[("geography", "UK"), ("funding_stage", "Seed")])
+
+        def names(**filters):
+            return sorted(c["name"] for c in list_entities_as_companies(db, pid, **filters))
+
+        assert names(tags=["fintech"]) == ["Fintech UK", "Fintech US"]
+        # Matches the current geography only, not historical values
+        assert names(geography="UK") == ["Fintech UK", "Health UK"]
+        assert names(funding_stage="Seed", tags=["fintech"]) == ["Fintech UK"]
+
+    def test_mode_is_memoised_and_reset_by_entity_writes(self, app):
+        """project_uses_entities caches its answer until entities or schema change."""
+        db = app.db
+        single_schema = {"entity_types": [MULTI_TYPE_SCHEMA["entity_types"][0]]}
+        pid = db.create_project(name="Memo", purpose="Test", entity_schema=single_schema)
+        assert project_uses_entities(db, pid) is False
+
+        statements = []
+        real_get_conn = db._get_conn
+
+        def _traced_conn():
+            conn = real_get_conn()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        db._get_conn = _traced_conn
+        try:
+            assert project_uses_entities(db, pid) is False
+        finally:
+            del db._get_conn
+        assert statements == []
+
+        db.create_entity(pid, "company", "First Co")
+        assert project_uses_entities(db, pid) is True
+        db.update_project(pid, {"entity_schema": None})
+        assert project_uses_entities(db, pid) is False
+
 
 # ═══════════════════════════════════════════════════════════════
 # get_entity_as_company()
@@ -6,6 +6,7 @@ Covers:
 - Budget CRUD (get/set)
 - Cost logging function (log_cost)
 - Edge cases: missing params, invalid budget values
+- mcp_cache stats and maintenance endpoints
 
 Run: pytest tests/test_costs.py -v
 Markers: db, api
@@ -321,3 +322,37 @@ class TestLogCost:
                 cost_usd=0.001,
                 duration_ms=100,
             )
+
+
+# ═══════════════════════════════════════════════════════════════
+# mcp_cache stats
+# ═══════════════════════════════════════════════════════════════
+
+class TestCacheStats:
+    """GET /api/costs/cache, POST /api/costs/cache/maintenance"""
+
+    def test_cache_stats_by_source(self, client):
+        from core.mcp_client import _cache_get, _cache_set
+        conn = client.db._get_conn()
+        try:
+            _cache_set(conn, "hn:q:10", "hackernews", [{"title": "x"}])
+            _cache_set(conn, "extraction:abc", "extraction", {"text": "y" * 10000})
+            _cache_get(conn, "hn:q:10", source="hackernews")
+            _cache_get(conn, "hn:other:10", source="hackernews")
+        finally:
+            conn.close()
+
+        r = client.get("/api/costs/cache")
+        assert r.status_code == 200
+        data = r.get_json()
+        assert data["total_entries"] == 2
+        assert data["by_source"]["extraction"]["compressed_entries"] == 1
+        assert data["by_source"]["hackernews"]["bytes"] > 0
+        assert data["by_source"]["hackernews"]["hit_rate"] == 0.5
+
+    def test_cache_maintenance_endpoint(self, client):
+        r = client.post("/api/costs/cache/maintenance")
+        assert r.status_code == 200
+        data = r.get_json()
+        assert data["status"] == "ok"
+        assert data["expired_deleted"] == 0
@@ -0,0 +1,249 @@
+"""Tests for incremental exports — data versions, cached sections, debouncing.
+
+Covers:
+- data_versions triggers: project and per-category change counters
+- export_incremental: skip when unchanged, rebuild only changed sections
+- ExportScheduler: debounced exports
+- git_sync.schedule_git_sync: coalesced commits
+
+Run: pytest tests/test_export.py -v
+Markers: db, data
+"""
+import time
+
+import pytest
+
+from core import git_sync
+from core.export_scheduler import ExportScheduler
+from storage.export import export_incremental, iter_markdown
+
+pytestmark = [pytest.mark.db, pytest.mark.data]
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    out = tmp_path / "exports"
+    monkeypatch.setattr("storage.export.DATA_DIR", out)
+    return out
+
+
+def _add(db, project_id, name, category_id=None):
+    return db.upsert_company({"url": f"https://{name.lower()}.example", "name": name,
+                              "project_id": project_id, "category_id": category_id})
+
+
+class TestDataVersions:
+
+    def test_writes_bump_project_version(self, tmp_db, project_id):
+        v0 = tmp_db.get_data_version(project_id)
+        cid = _add(tmp_db, project_id, "Acme")
+        v1 = tmp_db.get_data_version(project_id)
+        tmp_db.add_note(cid, "hello")
+        v2 = tmp_db.get_data_version(project_id)
+        assert v0 < v1 < v2
+
+    def test_other_projects_unaffected(self, tmp_db, project_id):
+        other = tmp_db.create_project(name="Other", purpose="x")
+        before = tmp_db.get_data_version(project_id)
+        _add(tmp_db, other, "Elsewhere")
+        assert tmp_db.get_data_version(project_id) == before
+
+    def test_moving_a_company_bumps_both_categories(self, tmp_db, project_id, category_ids):
+        a, b = category_ids["Cat A"], category_ids["Cat B"]
+        cid = _add(tmp_db, project_id, "Mover", category_id=a)
+        before = tmp_db.get_category_versions(project_id)
+        tmp_db.update_company(cid, {"category_id": b})
+        after = tmp_db.get_category_versions(project_id)
+        assert after[a] > before[a]
+        assert after[b] > before.get(b, 0)
+        assert after[category_ids["Cat C"]] == before[category_ids["Cat C"]]
+
+
+class TestIncrementalExport:
+
+    def test_skips_when_unchanged(self, tmp_db, project_id, category_ids, export_dir):
+        _add(tmp_db, project_id, "Acme", category_id=category_ids["Cat A"])
+        first = export_incremental(tmp_db, project_id=project_id)
+        assert first["exported"] is True
+        assert first["sections_rebuilt"] == 1
+        again = export_incremental(tmp_db, project_id=project_id)
+        assert again["exported"] is False
+
+    def test_rebuilds_only_changed_sections(self, tmp_db, project_id, category_ids, export_dir):
+        _add(tmp_db, project_id, "Acme", category_id=category_ids["Cat A"])
+        beta = _add(tmp_db, project_id, "Beta", category_id=category_ids["Cat B"])
+        _add(tmp_db, project_id, "Loose")
+        assert export_incremental(tmp_db, project_id=project_id)["sections_rebuilt"] == 3
+
+        tmp_db.update_company(beta, {"what": "Now does something else"})
+        result = export_incremental(tmp_db, project_id=project_id)
+        assert result["exported"] is True
+        assert result["sections_rebuilt"] == 1
+
+        text = (export_dir / "taxonomy_master.md").read_text()
+        assert "Now does something else" in text
+        full = "".join(iter_markdown(tmp_db, project_id=project_id))
+        marker = "## Companies by Category"
+        assert text.split(marker)[1] == full.split(marker)[1]
+
+    def test_note_changes_refresh_json_only(self, tmp_db, project_id, category_ids, export_dir):
+        cid = _add(tmp_db, project_id, "Acme", category_id=category_ids["Cat A"])
+        export_incremental(tmp_db, project_id=project_id)
+        tmp_db.add_note(cid, "fresh note")
+        result = export_incremental(tmp_db, project_id=project_id)
+        assert result["exported"] is True
+        assert result["sections_rebuilt"] == 0
+        assert "fresh note" in (export_dir / "taxonomy_data.json").read_text()
+
+    def test_reexports_after_another_project_overwrote_files(self, tmp_db, project_id,
+                                                             export_dir):
+        other = tmp_db.create_project(name="Other", purpose="x")
+        _add(tmp_db, project_id, "Mine")
+        _add(tmp_db, other, "Theirs")
+        export_incremental(tmp_db, project_id=project_id)
+        export_incremental(tmp_db, project_id=other)
+        result = export_incremental(tmp_db, project_id=project_id)
+        assert result["exported"] is True
+        assert "Mine" in (export_dir / "taxonomy_master.md").read_text()
+
+
+class TestExportScheduler:
+
+    def test_debounces_bursts(self, tmp_db, project_id, monkeypatch):
+        calls = []
+        monkeypatch.setattr("core.export_scheduler.export_incremental",
+                            lambda db, project_id=None: calls.append(project_id) or
+                            {"exported": False})
+        scheduler = ExportScheduler(delay=0.05, max_delay=5)
+        for _ in range(5):
+            scheduler.schedule(tmp_db, project_id)
+        assert scheduler.pending_count == 1
+        time.sleep(0.2)
+        assert calls == [project_id]
+
+    def test_flush_runs_pending_now(self, tmp_db, project_id, monkeypatch):
+        calls = []
+        monkeypatch.setattr("core.export_scheduler.export_incremental",
+                            lambda db, project_id=None: calls.append(project_id) or
+                            {"exported": False})
+        scheduler = ExportScheduler(delay=60)
+        scheduler.schedule(tmp_db, project_id)
+        scheduler.flush()
+        assert calls == [project_id]
+        assert scheduler.pending_count == 0
+
+
+class TestGitSyncCoalescing:
+
+    def test_burst_becomes_one_commit(self, monkeypatch):
+        messages = []
+        monkeypatch.setattr("core.git_sync.sync_to_git", messages.append)
+        try:
+            for i in range(3):
+                git_sync.schedule_git_sync(f"Batch {i}", delay=0.05)
+            time.sleep(0.2)
+        finally:
+            git_sync.cancel_git_sync()
+        assert messages == ["Batch 0 (+2 more)"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Columnar analytics export
+# ═══════════════════════════════════════════════════════════════
+
+ANALYTICS_SCHEMA = {
+    "version": 1,
+    "entity_types": [{
+        "name": "Company", "slug": "company", "description": "", "icon": "building",
+        "parent_type": None,
+        "attributes": [
+            {"name": "Founded", "slug": "founded_year", "data_type": "number"},
+            {"name": "Free tier", "slug": "has_free_tier", "data_type": "boolean"},
+            {"name": "Status", "slug": "status", "data_type": "text"},
+        ],
+    }],
+    "relationships": [],
+}
+
+
+@pytest.fixture
+def entity_project(tmp_db):
+    pid = tmp_db.create_project(name="Analytics", purpose="x", entity_schema=ANALYTICS_SCHEMA)
+    a = tmp_db.create_entity(pid, "company", "Alpha")
+    b = tmp_db.create_entity(pid, "company", "Beta")
+    snap = tmp_db.create_snapshot(pid, "first pass")
+    tmp_db.set_entity_attributes(a, {"founded_year": "2010", "has_free_tier": True,
+                                     "status": "private"}, snapshot_id=snap)
+    tmp_db.set_entity_attribute(a, "founded_year", "2011")
+    tmp_db.set_entity_attribute(b, "founded_year", "unknown")
+    return {"db": tmp_db, "project_id": pid, "alpha": a, "beta": b, "snapshot": snap}
+
+
+class TestColumnarFrames:
+
+    def test_entities_pivot_current_typed_values(self, entity_project):
+        from storage.columnar import entities_frame
+        df = entities_frame(entity_project["db"], entity_project["project_id"]).set_index("name")
+        assert str(df["founded_year"].dtype) == "Float64"
+        assert df.loc["Alpha", "founded_year"] == 2011
+        assert df["founded_year"].isna()["Beta"]
+        assert str(df["has_free_tier"].dtype) == "boolean"
+        assert bool(df.loc["Alpha", "has_free_tier"]) is True
+        # A slug clashing with an entity column keeps both
+        assert df.loc["Alpha", "status"] == "active"
+        assert df.loc["Alpha", "attr_status"] == "private"
+
+    def test_history_is_long_format_and_resumable(self, entity_project):
+        from storage.columnar import attribute_history_frame
+        db, pid = entity_project["db"], entity_project["project_id"]
+        df = attribute_history_frame(db, pid)
+        assert len(df) == 5
+        assert list(df["id"]) == sorted(df["id"])
+        assert set(df["snapshot_id"].dropna()) == {entity_project["snapshot"]}
+        assert str(df["captured_at"].dtype).startswith("datetime64")
+
+        tail = attribute_history_frame(db, pid, after_id=int(df["id"].iloc[2]))
+        assert list(tail["id"]) == list(df["id"].iloc[3:])
+
+    def test_change_feed_empty_before_monitoring_table(self, entity_project):
+        from storage.columnar import build_frame
+        df = build_frame(entity_project["db"], entity_project["project_id"], "change_feed")
+        assert df.empty
+        assert "change_type" in df.columns
+
+
+class TestColumnarFiles:
+
+    def test_incremental_append_and_reload(self, entity_project, tmp_path):
+        pytest.importorskip("pyarrow")
+        from storage.columnar import export_columnar, load_table
+        db, pid = entity_project["db"], entity_project["project_id"]
+        root = tmp_path / "analytics"
+
+        first = export_columnar(db, pid, root=root)
+        assert first["tables"]["attribute_history"]["mode"] == "rewrite"
+        assert export_columnar(db, pid, root=root)["tables"]["attribute_history"]["mode"] \
+            == "unchanged"
+
+        db.set_entity_attribute(entity_project["beta"], "founded_year", "2020")
+        history_result = export_columnar(db, pid, root=root)["tables"]["attribute_history"]
+        assert history_result["mode"] == "append"
+        assert history_result["rows"] == 1
+        assert history_result["parts"] == 2
+
+        history = load_table("attribute_history", pid, root=root)
+        assert len(history) == 6
+        entities = load_table("entities", pid, root=root).set_index("name")
+        assert entities.loc["Beta", "founded_year"] == 2020
+
+    def test_api_reports_missing_engine(self, client, monkeypatch):
+        from storage import columnar
+        monkeypatch.setitem(columnar.ENGINES, "parquet", ("no_such_parquet_engine",))
+        r = client.post("/api/export/analytics", json={"project_id": 1})
+        assert r.status_code == 501
+        assert "pyarrow" in r.get_json()["error"]
+
+    def test_api_validates_input(self, client):
+        assert client.post("/api/export/analytics", json={}).status_code == 400
+        r = client.post("/api/export/analytics", json={"project_id": 1, "format": "xlsx"})
+        assert r.status_code == 400
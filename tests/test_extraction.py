@@ -5,6 +5,7 @@ Covers:
 - Extraction engine: prompt building, schema building, content extraction (mocked LLM)
 - Evidence reading and extraction flow
 - Contradiction detection
+- Chunked map-reduce extraction for long content
 
 Run: pytest tests/test_extraction.py -v
 Markers: db, extraction
@@ -20,7 +21,12 @@ from core.extraction import (
     _build_extraction_schema,
     _read_evidence_content,
     extract_from_content,
+    extract_from_content_chunked,
     detect_contradictions,
+    _split_into_chunks,
+    _attribute_terms,
+    _chunk_is_relevant,
+    _merge_chunk_results,
     clear_extraction_cache,
     MAX_CONTENT_LENGTH,
     DEFAULT_EXTRACTION_MODEL,
@@ -233,6 +239,34 @@ class TestEvidenceReading:
         assert content_type == "text"
         assert "Acme Corp" in content
 
+    def test_read_html_evidence_uses_sidecar(self, extraction_with_evidence):
+        from core.capture import text_sidecar_path
+        db = extraction_with_evidence["db"]
+        evidence = db.get_evidence_by_id(extraction_with_evidence["evidence_id"])
+
+        content, _ = _read_evidence_content(evidence)
+        assert "<p>" not in content
+        assert "# Acme Corp" in content
+        assert text_sidecar_path(evidence["file_path"]).exists()
+
+    def test_read_docx_evidence(self, extraction_with_evidence, tmp_path):
+        import io
+        import zipfile
+        from core.capture import store_file
+        ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+        xml = (f'<w:document xmlns:w="{ns}"><w:body>'
+               "<w:p><w:r><w:t>Acme employs 150 people.</w:t></w:r></w:p>"
+               "</w:body></w:document>")
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("word/document.xml", xml)
+        rel = store_file(1, 1, "document", buf.getvalue(), "report.docx")
+
+        content, content_type = _read_evidence_content(
+            {"file_path": rel, "evidence_type": "document"})
+        assert content_type == "text"
+        assert "Acme employs 150 people." in content
+
     def test_read_nonexistent_file(self):
         evidence = {
             "file_path": "999/999/page_archive/nonexistent.html",
@@ -397,6 +431,127 @@ class TestContentExtraction:
         assert len(result.extracted_attributes) == 1
 
 
+# ═══════════════════════════════════════════════════════════════
+# Chunked Extraction
+# ═══════════════════════════════════════════════════════════════
+
+def _llm_by_section(answers):
+    """Build a run_cli side effect that answers according to prompt content.
+
+    *answers* maps a marker string to the extracted_attributes list returned
+    when that marker appears in the prompt.
+    """
+    calls = []
+
+    def _run_cli(prompt, **kwargs):
+        calls.append(prompt)
+        extracted = []
+        for marker, attrs in answers.items():
+            if marker in prompt:
+                extracted.extend(attrs)
+        return {
+            "result": "", "cost_usd": 0.001, "duration_ms": 10, "is_error": False,
+            "structured_output": {"extracted_attributes": extracted},
+        }
+
+    return _run_cli, calls
+
+
+class TestChunkedExtraction:
+    """EXT-CHUNK: chunk splitting, pre-filtering and map-reduce merging."""
+
+    def setup_method(self):
+        clear_extraction_cache()
+
+    def test_split_respects_max_size_and_headings(self):
+        text = "\n\n".join(f"## Section {i}\n" + ("word " * 50) for i in range(20))
+        chunks = _split_into_chunks(text, max_chars=600)
+        assert len(chunks) > 1
+        assert all(len(c) <= 600 for c in chunks)
+        # Chunks start on a section heading rather than mid-paragraph
+        assert all(c.startswith("## Section") for c in chunks)
+        assert "".join(chunks).count("## Section") == 20
+
+    def test_split_hard_wraps_oversized_lines(self):
+        chunks = _split_into_chunks("x" * 2500, max_chars=1000)
+        assert [len(c) for c in chunks] == [1000, 1000, 500]
+
+    def test_prefilter_skips_unrelated_chunks(self):
+        attrs = SAMPLE_SCHEMA["entity_types"][0]["attributes"]
+        terms = _attribute_terms(attrs)
+        assert _chunk_is_relevant("Our pricing is freemium", terms)
+        assert _chunk_is_relevant("Headquarters: Berlin", terms)
+        assert not _chunk_is_relevant("Cookie banner. Accept all. Reject all.", terms)
+
+    def test_merge_confidence_weighted(self):
+        r1 = ExtractionResult(success=True, entity_id=0, extracted_attributes=[
+            {"attr_slug": "headquarters", "value": "Berlin", "confidence": 0.6, "reasoning": "a"},
+        ])
+        r2 = ExtractionResult(success=True, entity_id=0, extracted_attributes=[
+            {"attr_slug": "headquarters", "value": "berlin", "confidence": 0.5, "reasoning": "b"},
+        ])
+        r3 = ExtractionResult(success=True, entity_id=0, extracted_attributes=[
+            {"attr_slug": "headquarters", "value": "London", "confidence": 0.9, "reasoning": "c"},
+        ])
+        merged, contradictions = _merge_chunk_results([(0, r1), (1, r2), (2, r3)])
+        assert len(merged) == 1
+        # Two agreeing readings (0.6 + 0.5) outweigh one stronger reading (0.9)
+        assert merged[0]["value"] == "Berlin"
+        assert merged[0]["confidence"] == 0.6
+        assert contradictions[0]["attr_slug"] == "headquarters"
+        assert len(contradictions[0]["values"]) == 3
+
+    @patch("core.llm.run_cli")
+    def test_long_content_is_chunked_not_truncated(self, mock_llm):
+        filler = "\n\n".join("Customer story paragraph. " * 40 for _ in range(200))
+        content = filler + "\n\n## Pricing\nPricing model: subscription, billed monthly."
+        assert len(content) > MAX_CONTENT_LENGTH
+        side_effect, calls = _llm_by_section({
+            "billed monthly": [{"attr_slug": "pricing_model", "value": "subscription",
+                                "confidence": 0.9, "reasoning": "Pricing section"}],
+        })
+        mock_llm.side_effect = side_effect
+
+        attrs = SAMPLE_SCHEMA["entity_types"][0]["attributes"]
+        result = extract_from_content(content, "Acme", "Company", attrs)
+
+        assert result.success is True
+        assert result.metadata["chunked"] is True
+        assert result.extracted_attributes[0]["value"] == "subscription"
+        # Filler chunks mention no attribute and are never sent to the LLM
+        assert len(calls) == 1
+        assert result.metadata["chunks_extracted"] == 1
+        assert result.metadata["chunk_count"] > 1
+
+    @patch("core.llm.run_cli")
+    def test_rechunk_only_reprocesses_changed_chunks(self, mock_llm):
+        sections = [f"## Part {i}\nHeadquarters mentioned in part {i}. " + "pad " * 200
+                    for i in range(6)]
+        side_effect, calls = _llm_by_section({})
+        mock_llm.side_effect = side_effect
+        attrs = SAMPLE_SCHEMA["entity_types"][0]["attributes"]
+
+        extract_from_content_chunked("\n\n".join(sections), "Acme", "Company", attrs,
+                                     chunk_size=1200)
+        first_calls = len(calls)
+        assert first_calls == 6
+
+        sections[3] = sections[3].replace("part 3", "part three")
+        extract_from_content_chunked("\n\n".join(sections), "Acme", "Company", attrs,
+                                     chunk_size=1200)
+        assert len(calls) - first_calls == 1
+
+    @patch("core.llm.run_cli")
+    def test_all_chunks_failing_returns_error(self, mock_llm):
+        mock_llm.return_value = {"result": "boom", "is_error": True, "cost_usd": 0}
+        attrs = SAMPLE_SCHEMA["entity_types"][0]["attributes"]
+        result = extract_from_content_chunked(
+            "Headquarters: Berlin\n\nFounded 2019", "Acme", "Company", attrs,
+        )
+        assert result.success is False
+        assert result.error == "boom"
+
+
 # ═══════════════════════════════════════════════════════════════
 # Extraction Job CRUD (DB Layer)
 # ═══════════════════════════════════════════════════════════════
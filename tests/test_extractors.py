@@ -355,6 +355,11 @@ class TestExtractorsAPI:
         assert r.status_code == 400
         assert "content" in r.get_json()["error"]
 
+    @pytest.mark.api
+    def test_classify_unknown_evidence(self, client):
+        r = client.post("/api/extract/classify", json={"evidence_id": 99999})
+        assert r.status_code == 404
+
     @pytest.mark.api
     @patch("core.llm.run_cli")
     def test_classify_with_forced_extractor(self, mock_llm, client):
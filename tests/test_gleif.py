@@ -17,9 +17,9 @@ pytestmark = [pytest.mark.enrichment, pytest.mark.db]
 @pytest.fixture(autouse=True)
 def _reset_cache_flag():
     import core.mcp_client as mod
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
     yield
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
 
 
 @pytest.fixture
@@ -54,9 +54,9 @@ def mem_conn():
 @pytest.fixture(autouse=True)
 def _reset_cache_flag():
     import core.mcp_client as mod
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
     yield
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
 
 
 @pytest.fixture
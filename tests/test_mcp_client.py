@@ -14,15 +14,19 @@ from core.mcp_client import (
     _cache_get,
     _cache_set,
     _ensure_cache_table,
+    evict_cache_over_budget,
+    get_cache_stats,
     get_domain_rank,
     list_available_sources,
+    flush_cache_accounting,
+    run_cache_maintenance,
     search_companies_house,
     search_hackernews,
     search_news,
     search_patents,
     search_sec_filings,
     search_wikipedia,
-    _CACHE_TABLE_ENSURED,
+    sweep_expired_cache,
 )
 
 
@@ -30,11 +34,11 @@ from core.mcp_client import (
 
 @pytest.fixture(autouse=True)
 def _reset_cache_flag():
-    """Reset the module-level _CACHE_TABLE_ENSURED flag before each test."""
+    """Forget which databases have had their cache tables ensured."""
     import core.mcp_client as mod
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
     yield
-    mod._CACHE_TABLE_ENSURED = False
+    mod._CACHE_TABLES_ENSURED.clear()
 
 
 @pytest.fixture
@@ -114,6 +118,218 @@ class TestCacheTable:
         assert result is None
 
 
+class TestCacheMaintenance:
+
+    def _insert_expired(self, conn, key, source="test"):
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        conn.execute(
+            """INSERT INTO mcp_cache (cache_key, source, data_json, fetched_at, expires_at)
+               VALUES (?, ?, ?, ?, ?)""",
+            (key, source, "{}", past.strftime("%Y-%m-%dT%H:%M:%SZ"),
+             past.strftime("%Y-%m-%dT%H:%M:%SZ")),
+        )
+        conn.commit()
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_large_payload_compressed_roundtrip(self, mem_conn):
+        payload = {"text": "pricing tier " * 2000}
+        _cache_set(mem_conn, "big_key", "extraction", payload)
+        row = mem_conn.execute(
+            "SELECT data_json, data_blob, size_bytes FROM mcp_cache WHERE cache_key = ?",
+            ("big_key",),
+        ).fetchone()
+        assert row["data_json"] == ""
+        assert row["data_blob"] is not None
+        assert row["size_bytes"] < len(json.dumps(payload))
+        assert _cache_get(mem_conn, "big_key") == payload
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_small_payload_stored_plain(self, mem_conn):
+        _cache_set(mem_conn, "small_key", "src", {"a": 1})
+        row = mem_conn.execute(
+            "SELECT data_json, data_blob FROM mcp_cache WHERE cache_key = ?",
+            ("small_key",),
+        ).fetchone()
+        assert json.loads(row["data_json"]) == {"a": 1}
+        assert row["data_blob"] is None
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_upgrades_legacy_table(self, mem_conn):
+        mem_conn.execute("""
+            CREATE TABLE mcp_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cache_key TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )
+        """)
+        mem_conn.execute(
+            "INSERT INTO mcp_cache (cache_key, source, data_json, fetched_at, expires_at) "
+            "VALUES ('old', 'src', '{\"v\": 1}', '2026-01-01T00:00:00Z', '2999-01-01T00:00:00Z')"
+        )
+        mem_conn.commit()
+        _ensure_cache_table(mem_conn)
+        cols = {r[1] for r in mem_conn.execute("PRAGMA table_info(mcp_cache)").fetchall()}
+        assert {"data_blob", "size_bytes", "last_hit_at"} <= cols
+        indexes = {r[1] for r in mem_conn.execute("PRAGMA index_list(mcp_cache)").fetchall()}
+        assert "idx_mcp_cache_source_expires" in indexes
+        assert _cache_get(mem_conn, "old") == {"v": 1}
+        size = mem_conn.execute(
+            "SELECT size_bytes FROM mcp_cache WHERE cache_key = 'old'"
+        ).fetchone()[0]
+        assert size == len('{"v": 1}')
+        last_hit = mem_conn.execute(
+            "SELECT last_hit_at FROM mcp_cache WHERE cache_key = 'old'"
+        ).fetchone()[0]
+        assert last_hit == "2026-01-01T00:00:00Z"
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_sweep_deletes_expired_in_batches(self, mem_conn):
+        _ensure_cache_table(mem_conn)
+        for i in range(7):
+            self._insert_expired(mem_conn, f"exp_{i}")
+        _cache_set(mem_conn, "fresh", "test", {"ok": True})
+        deleted = sweep_expired_cache(mem_conn, batch_size=3)
+        assert deleted == 7
+        keys = [r[0] for r in mem_conn.execute("SELECT cache_key FROM mcp_cache").fetchall()]
+        assert keys == ["fresh"]
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_sweep_respects_max_batches(self, mem_conn):
+        _ensure_cache_table(mem_conn)
+        for i in range(10):
+            self._insert_expired(mem_conn, f"exp_{i}")
+        deleted = sweep_expired_cache(mem_conn, batch_size=2, max_batches=2)
+        assert deleted == 4
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_evict_least_recently_hit_first(self, mem_conn):
+        _ensure_cache_table(mem_conn)
+        for i in range(4):
+            _cache_set(mem_conn, f"k{i}", "src", {"i": i})
+        # Make k0 the most recently hit, k1 the least
+        stamps = {"k0": "2026-05-04", "k1": "2026-05-01", "k2": "2026-05-02", "k3": "2026-05-03"}
+        for key, day in stamps.items():
+            mem_conn.execute(
+                "UPDATE mcp_cache SET last_hit_at = ? WHERE cache_key = ?",
+                (f"{day}T00:00:00Z", key),
+            )
+        mem_conn.commit()
+        row_size = mem_conn.execute("SELECT size_bytes FROM mcp_cache LIMIT 1").fetchone()[0]
+        evicted = evict_cache_over_budget(mem_conn, "src", budget_bytes=row_size * 2)
+        assert evicted == 2
+        keys = {r[0] for r in mem_conn.execute("SELECT cache_key FROM mcp_cache").fetchall()}
+        assert keys == {"k0", "k3"}
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_cache_stats_keyed_by_source(self, mem_conn):
+        _cache_set(mem_conn, "hn:a", "hackernews", {"a": 1})
+        _cache_get(mem_conn, "hn:a", source="hackernews")
+        _cache_get(mem_conn, "hn:missing", source="hackernews")
+        stats = get_cache_stats(mem_conn)
+        assert stats["total_entries"] == 1
+        hn = stats["by_source"]["hackernews"]
+        assert hn["bytes"] > 0
+        assert (hn["hits"], hn["misses"], hn["hit_rate"]) == (1, 1, 0.5)
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_hit_counts_persist_after_flush(self, mem_conn):
+        _cache_set(mem_conn, "hn:a", "hackernews", {"a": 1})
+        _cache_get(mem_conn, "hn:a", source="hackernews")
+        flush_cache_accounting(mem_conn)
+        mem_conn.commit()
+        row = mem_conn.execute(
+            "SELECT hits, misses FROM mcp_cache_stats WHERE source = 'hackernews'"
+        ).fetchone()
+        assert tuple(row) == (1, 0)
+        # Flushed counts are not double-counted
+        assert get_cache_stats(mem_conn)["by_source"]["hackernews"]["hits"] == 1
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_cache_get_does_not_commit_caller_transaction(self, tmp_path):
+        db_file = tmp_path / "cache.db"
+        conn = sqlite3.connect(str(db_file))
+        conn.row_factory = sqlite3.Row
+        try:
+            _cache_set(conn, "k", "src", {"v": 1})
+            conn.execute("CREATE TABLE scratch (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO scratch VALUES (1)")
+            assert _cache_get(conn, "k", source="src") == {"v": 1}
+            conn.rollback()
+            assert conn.execute("SELECT COUNT(*) FROM scratch").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_hit_refreshes_lru_order_on_flush(self, mem_conn):
+        _cache_set(mem_conn, "old", "src", {"v": 1})
+        _cache_set(mem_conn, "new", "src", {"v": 2})
+        mem_conn.execute(
+            "UPDATE mcp_cache SET last_hit_at = '2026-01-01T00:00:00Z' WHERE cache_key = 'old'"
+        )
+        mem_conn.execute(
+            "UPDATE mcp_cache SET last_hit_at = '2026-01-02T00:00:00Z' WHERE cache_key = 'new'"
+        )
+        mem_conn.commit()
+        _cache_get(mem_conn, "old", source="src")
+        flush_cache_accounting(mem_conn)
+        mem_conn.commit()
+        row_size = mem_conn.execute("SELECT size_bytes FROM mcp_cache LIMIT 1").fetchone()[0]
+        evict_cache_over_budget(mem_conn, "src", budget_bytes=row_size)
+        keys = [r[0] for r in mem_conn.execute("SELECT cache_key FROM mcp_cache").fetchall()]
+        assert keys == ["old"]
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_upgrade_tracked_per_database(self, tmp_path):
+        legacy_sql = """
+            CREATE TABLE mcp_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                cache_key TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                expires_at TEXT NOT NULL
+            )
+        """
+        conns = []
+        for name in ("a.db", "b.db"):
+            conn = sqlite3.connect(str(tmp_path / name))
+            conn.row_factory = sqlite3.Row
+            conn.execute(legacy_sql)
+            conn.commit()
+            conns.append(conn)
+        try:
+            for conn in conns:
+                _cache_set(conn, "k", "src", {"v": 1})
+                assert _cache_get(conn, "k") == {"v": 1}
+        finally:
+            for conn in conns:
+                conn.close()
+
+    @pytest.mark.db
+    @pytest.mark.enrichment
+    def test_run_cache_maintenance(self, mem_conn):
+        _ensure_cache_table(mem_conn)
+        self._insert_expired(mem_conn, "gone")
+        summary = run_cache_maintenance(mem_conn)
+        assert summary["expired_deleted"] == 1
+        assert summary["evicted"] == {}
+
+
 # ══════════════════════════════════════════════════════════════
 # Hacker News tests
 # ══════════════════════════════════════════════════════════════
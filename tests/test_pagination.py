@@ -0,0 +1,236 @@
+"""Tests for keyset (cursor) pagination — storage.pagination and the list endpoints.
+
+Covers:
+- Keyset: cursor round-trip, mixed directions, NULL keys, bad cursors
+- Database list methods: walking every page, stability under inserts
+- API: X-Next-Cursor / next_cursor on companies, entities, activity,
+  extraction queue, change feed and competitive matrix
+
+Run: pytest tests/test_pagination.py -v
+Markers: db, api
+"""
+import sqlite3
+
+import pytest
+
+from storage.pagination import InvalidCursor, Keyset, Page
+
+pytestmark = [pytest.mark.db, pytest.mark.api]
+
+ENTITY_SCHEMA = {
+    "version": 1,
+    "entity_types": [{
+        "name": "Company", "slug": "company", "description": "", "icon": "building",
+        "parent_type": None,
+        "attributes": [{"name": "Features", "slug": "features", "data_type": "text"}],
+    }],
+    "relationships": [],
+}
+
+
+def _walk(fetch):
+    """Follow next_cursor from the first page; return pages as lists."""
+    pages, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        pages.append(list(page))
+        cursor = page.next_cursor
+        if not cursor:
+            return pages
+
+
+@pytest.fixture
+def scores():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, score REAL, name TEXT)")
+    conn.executemany("INSERT INTO t (score, name) VALUES (?, ?)", [
+        (0.9, "a"), (None, "b"), (0.5, "c"), (0.9, "d"), (0.5, "e"), (None, "f"), (0.1, "g"),
+    ])
+    yield conn
+    conn.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+# Keyset
+# ═══════════════════════════════════════════════════════════════
+
+class TestKeyset:
+
+    def _fetch(self, conn, keyset, limit):
+        def fetch(cursor):
+            after, params = keyset.where(cursor)
+            rows = conn.execute(
+                f"SELECT * FROM t {'WHERE ' + after if after else ''} "
+                f"ORDER BY {keyset.order_by()} LIMIT ?", params + [limit + 1]).fetchall()
+            return keyset.page([dict(r) for r in rows], limit)
+        return fetch
+
+    def test_mixed_directions_with_nulls_match_full_order(self, scores):
+        keyset = Keyset("t", ("score", "score", True, -1.0), ("name", "name"))
+        expected = [r["name"] for r in scores.execute(
+            f"SELECT name FROM t ORDER BY {keyset.order_by()}")]
+        pages = _walk(self._fetch(scores, keyset, 2))
+        assert [len(p) for p in pages] == [2, 2, 2, 1]
+        assert [r["name"] for p in pages for r in p] == expected == \
+            ["a", "d", "c", "e", "g", "b", "f"]
+
+    def test_single_direction_uses_row_values(self, scores):
+        keyset = Keyset("t", ("name", "name", True), ("id", "id", True))
+        sql, params = keyset.where(keyset.encode({"name": "c", "id": 3}))
+        assert sql == "(name, id) < (?, ?)"
+        assert params == ["c", 3]
+        assert [r["name"] for p in _walk(self._fetch(scores, keyset, 3)) for r in p] == \
+            list("gfedcba")
+
+    def test_last_full_page_has_no_cursor(self, scores):
+        keyset = Keyset("t", ("id", "id"))
+        pages = _walk(self._fetch(scores, keyset, 7))
+        assert len(pages) == 1
+
+    def test_rejects_foreign_and_garbled_cursors(self):
+        a = Keyset("a", ("id", "id"))
+        b = Keyset("b", ("id", "id"))
+        with pytest.raises(InvalidCursor):
+            b.where(a.encode({"id": 1}))
+        with pytest.raises(InvalidCursor):
+            a.where("not a cursor!")
+        assert isinstance(InvalidCursor("x"), ValueError)
+
+    def test_page_is_a_list(self):
+        page = Page([1, 2], "abc")
+        assert page == [1, 2]
+        assert page.next_cursor == "abc"
+        assert Page().next_cursor is None
+
+
+# ═══════════════════════════════════════════════════════════════
+# Database list methods
+# ═══════════════════════════════════════════════════════════════
+
+class TestListMethods:
+
+    def test_companies_walk_every_sort(self, tmp_db, project_id):
+        for i in range(7):
+            tmp_db.upsert_company({"url": f"https://c{i}.example", "name": f"Co {i % 3}",
+                                   "project_id": project_id,
+                                   "confidence_score": None if i % 2 else i / 10})
+        for sort_by, sort_dir in [("name", "asc"), ("confidence", "desc"), ("category", "asc")]:
+            full = tmp_db.get_companies(project_id=project_id, sort_by=sort_by,
+                                        sort_dir=sort_dir, limit=100)
+            pages = _walk(lambda c: tmp_db.get_companies(
+                project_id=project_id, sort_by=sort_by, sort_dir=sort_dir, limit=3, cursor=c))
+            assert [r["id"] for p in pages for r in p] == [r["id"] for r in full]
+
+    def test_entities_cursor_ignores_rows_inserted_before_it(self, tmp_db):
+        pid = tmp_db.create_project(name="Ents", purpose="x", entity_schema=ENTITY_SCHEMA)
+        for name in ["Delta", "Alpha", "Echo", "Bravo"]:
+            tmp_db.create_entity(pid, "company", name)
+        first = tmp_db.get_entities(pid, limit=2)
+        assert [e["name"] for e in first] == ["Alpha", "Bravo"]
+        # A new row sorting before the cursor must not shift the next page
+        tmp_db.create_entity(pid, "company", "Aardvark")
+        second = tmp_db.get_entities(pid, limit=2, cursor=first.next_cursor)
+        assert [e["name"] for e in second] == ["Delta", "Echo"]
+        assert second.next_cursor is None
+
+    def test_unpaginated_entities_have_no_cursor(self, tmp_db):
+        pid = tmp_db.create_project(name="Ents", purpose="x", entity_schema=ENTITY_SCHEMA)
+        tmp_db.create_entity(pid, "company", "Only")
+        assert tmp_db.get_entities(pid).next_cursor is None
+
+    def test_activity_newest_first(self, tmp_db, project_id):
+        for i in range(5):
+            tmp_db.log_activity(project_id, "test", f"event {i}")
+        pages = _walk(lambda c: tmp_db.get_activity(project_id, limit=2, cursor=c))
+        assert [r["description"] for p in pages for r in p] == \
+            [f"event {i}" for i in reversed(range(5))]
+
+    def test_grouped_queue_continues_split_entity(self, tmp_db):
+        pid = tmp_db.create_project(name="Queue", purpose="x", entity_schema=ENTITY_SCHEMA)
+        a = tmp_db.create_entity(pid, "company", "Alpha")
+        b = tmp_db.create_entity(pid, "company", "Beta")
+        for eid in (a, a, a, b):
+            job = tmp_db.create_extraction_job(pid, eid)
+            tmp_db.create_extraction_result(job, eid, "features", "x", confidence=0.5)
+
+        first = tmp_db.get_review_queue_grouped(pid, limit=2)
+        assert [(g["entity_name"], len(g["results"])) for g in first] == [("Alpha", 2)]
+        second = tmp_db.get_review_queue_grouped(pid, limit=2, cursor=first.next_cursor)
+        assert [(g["entity_name"], len(g["results"])) for g in second] == \
+            [("Alpha", 1), ("Beta", 1)]
+
+
+# ═══════════════════════════════════════════════════════════════
+# API
+# ═══════════════════════════════════════════════════════════════
+
+class TestCursorAPI:
+
+    def test_companies_header_cursor(self, api_project_with_companies):
+        c = api_project_with_companies["client"]
+        pid = api_project_with_companies["project_id"]
+
+        r = c.get(f"/api/companies?project_id={pid}&limit=2")
+        names = [co["name"] for co in r.get_json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        while cursor:
+            r = c.get(f"/api/companies?project_id={pid}&cursor={cursor}")
+            names += [co["name"] for co in r.get_json()]
+            cursor = r.headers.get("X-Next-Cursor")
+        assert names == sorted(names)
+        assert len(names) == 3
+
+    def test_bad_cursor_is_400(self, client):
+        pid = client.db.create_project(name="Bad", purpose="x", entity_schema=ENTITY_SCHEMA)
+        assert client.get(f"/api/entities?project_id={pid}&cursor=zzz").status_code == 400
+        assert client.get(f"/api/activity?project_id={pid}&cursor=zzz").status_code == 400
+        assert client.get(f"/api/extract/queue?project_id={pid}&cursor=zzz").status_code == 400
+        assert client.get(
+            f"/api/monitoring/feed?project_id={pid}&cursor=zzz").status_code == 400
+        assert client.get(
+            f"/api/lenses/competitive/matrix?project_id={pid}&cursor=zzz").status_code == 400
+
+    def test_entities_and_matrix_pages(self, client):
+        db = client.db
+        pid = db.create_project(name="Matrix", purpose="x", entity_schema=ENTITY_SCHEMA)
+        for name in ["beta", "Alpha", "gamma"]:
+            db.set_entity_attribute(db.create_entity(pid, "company", name), "features", "SSO")
+
+        r = client.get(f"/api/entities?project_id={pid}&limit=2")
+        assert len(r.get_json()) == 2
+        r = client.get(f"/api/entities?project_id={pid}&limit=2"
+                       f"&cursor={r.headers['X-Next-Cursor']}")
+        assert [e["name"] for e in r.get_json()] == ["gamma"]
+        assert "X-Next-Cursor" not in r.headers
+
+        url = f"/api/lenses/competitive/matrix?project_id={pid}&limit=2"
+        first = client.get(url).get_json()
+        assert [e["name"] for e in first["entities"]] == ["Alpha", "beta"]
+        cursor = first["pagination"]["next_cursor"]
+        second = client.get(f"{url}&cursor={cursor}").get_json()
+        assert [e["name"] for e in second["entities"]] == ["gamma"]
+        assert second["pagination"]["next_cursor"] is None
+
+    def test_change_feed_next_cursor(self, client):
+        from web.blueprints.monitoring._shared import _ensure_tables
+        db = client.db
+        pid = db.create_project(name="Feed", purpose="x", entity_schema=ENTITY_SCHEMA)
+        eid = db.create_entity(pid, "company", "Alpha")
+        with db._get_conn() as conn:
+            _ensure_tables(conn)
+            conn.executemany(
+                """INSERT INTO change_feed (project_id, entity_id, change_type, title)
+                   VALUES (?, ?, 'content_change', ?)""",
+                [(pid, eid, f"Change {i}") for i in range(5)])
+
+        titles, cursor = [], None
+        while True:
+            url = f"/api/monitoring/feed?project_id={pid}&limit=2"
+            data = client.get(url + (f"&cursor={cursor}" if cursor else "")).get_json()
+            titles += [item["title"] for item in data["items"]]
+            assert data["total"] == 5
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        assert titles == [f"Change {i}" for i in reversed(range(5))]
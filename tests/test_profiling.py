@@ -0,0 +1,145 @@
+"""Tests for the opt-in request profiler (web.profiling).
+
+Covers:
+- SQL normalisation for the slow-query log
+- ProfiledConnection: statements, fetch time and rows charged to the request
+- Middleware: off by default, Server-Timing header, /api/_perf aggregates,
+  slow-query log with the calling storage method, reset
+
+Run: pytest tests/test_profiling.py -v
+Markers: db, api
+"""
+import pytest
+
+from web import profiling
+from web.profiling import ProfiledConnection, RequestStats, normalize_sql, profiler
+
+pytestmark = [pytest.mark.db, pytest.mark.api]
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiler():
+    slow_query_ms = profiler.slow_query_ms
+    profiler.reset()
+    yield
+    profiler.reset()
+    profiler.slow_query_ms = slow_query_ms
+
+
+@pytest.fixture
+def profiled(client):
+    client._app.config["PROFILING"] = True
+    pid = client.db.create_project(name="Perf", purpose="x")
+    for name in ("Alpha", "Beta", "Gamma"):
+        client.db.create_entity(pid, "company", name)
+    return client, pid
+
+
+# ═══════════════════════════════════════════════════════════════
+# Normalisation and connection instrumentation
+# ═══════════════════════════════════════════════════════════════
+
+class TestNormalizeSql:
+
+    def test_literals_and_whitespace(self):
+        sql = "SELECT *\n  FROM entities WHERE name = 'O''Brien' AND id > 42"
+        assert normalize_sql(sql) == "SELECT * FROM entities WHERE name = ? AND id > ?"
+
+    def test_in_lists_collapse(self):
+        assert normalize_sql("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == \
+            normalize_sql("SELECT 1 FROM t WHERE id IN (?,?)")
+
+    def test_identifiers_with_digits_kept(self):
+        assert normalize_sql("SELECT t1.x FROM t1") == "SELECT t1.x FROM t1"
+
+
+class TestProfiledConnection:
+
+    def test_counts_statements_and_rows(self, tmp_db):
+        tmp_db.connection_factory = ProfiledConnection
+        stats = RequestStats("test", profiler)
+        with tmp_db._conn() as conn:
+            # after the connection's own PRAGMAs
+            token = profiling._current.set(stats)
+            try:
+                conn.execute("CREATE TABLE t (x INTEGER)")
+                conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+                assert len(conn.execute("SELECT x FROM t").fetchall()) == 5
+                assert sum(1 for _ in conn.execute("SELECT x FROM t WHERE x < 3")) == 3
+                conn.execute("SELECT COUNT(*) FROM t").fetchone()
+            finally:
+                profiling._current.reset(token)
+        assert stats.statements == 5
+        assert stats.rows == 5 + 3 + 1
+        assert stats.sql_ms > 0
+
+    def test_outside_a_request_nothing_is_recorded(self, tmp_db):
+        tmp_db.connection_factory = ProfiledConnection
+        with tmp_db._conn() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+        assert profiler.snapshot()["endpoints"] == []
+
+
+# ═══════════════════════════════════════════════════════════════
+# Middleware and /api/_perf
+# ═══════════════════════════════════════════════════════════════
+
+class TestMiddleware:
+
+    def test_disabled_by_default(self, client):
+        resp = client.get("/api/projects")
+        assert "Server-Timing" not in resp.headers
+        assert client.get("/api/_perf").status_code == 404
+
+    def test_server_timing_header(self, profiled):
+        client, pid = profiled
+        resp = client.get(f"/api/entities?project_id={pid}")
+        assert resp.status_code == 200
+        timing = resp.headers["Server-Timing"]
+        assert timing.startswith("total;dur=")
+        assert "sql;dur=" in timing and " queries, " in timing
+        assert "app;dur=" in timing
+
+    def test_perf_aggregates_per_endpoint(self, profiled):
+        client, pid = profiled
+        for _ in range(3):
+            client.get(f"/api/entities?project_id={pid}")
+        client.get("/api/projects")
+
+        data = client.get("/api/_perf").get_json()
+        endpoints = {e["endpoint"]: e for e in data["endpoints"]}
+        entities = endpoints["GET /api/entities"]
+        assert entities["requests"] == 3
+        assert sum(entities["histogram"].values()) == 3
+        assert entities["sql_statements_per_request"] > 0
+        assert entities["rows_per_request"] >= 3
+        assert entities["p95_ms"] >= entities["p50_ms"] > 0
+        assert endpoints["GET /api/projects"]["requests"] == 1
+        # /api/_perf does not profile itself
+        assert not any("_perf" in e for e in endpoints)
+
+    def test_slow_query_log_names_the_repo_method(self, profiled):
+        client, pid = profiled
+        profiler.slow_query_ms = 0
+        client.get(f"/api/entities?project_id={pid}")
+
+        slow = client.get("/api/_perf").get_json()["slow_queries"]
+        assert slow
+        callers = {q["caller"] for q in slow}
+        assert any(c and c.startswith("storage.") and "get_entities" in c for c in callers)
+        entry = slow[0]
+        assert entry["endpoint"] == "GET /api/entities"
+        assert "'" not in entry["sql"] and "\n" not in entry["sql"]
+
+    def test_slow_log_is_bounded(self, profiled):
+        client, pid = profiled
+        profiler.slow_query_ms = 0
+        for _ in range(60):
+            client.get(f"/api/entities?project_id={pid}")
+        assert len(client.get("/api/_perf").get_json()["slow_queries"]) == profiling.SLOW_LOG_SIZE
+
+    def test_reset(self, profiled):
+        client, pid = profiled
+        client.get(f"/api/entities?project_id={pid}")
+        assert client.delete("/api/_perf").get_json()["status"] == "ok"
+        assert client.get("/api/_perf").get_json()["endpoints"] == []
@@ -0,0 +1,242 @@
+"""Tests for the versioned response cache (web.response_cache).
+
+Covers:
+- project_versions: bumped by triggers on entity-store and monitoring writes
+- Lens responses: hit/miss, strong ETag + 304, invalidation on write,
+  persisted tier surviving a memory clear, per-parameter keys, ttl buckets
+- Report gathers: shared between generate calls until the project changes
+- ResponseCache LRU bounds and /api/costs/cache/responses stats
+
+Run: pytest tests/test_response_cache.py -v
+Markers: db, api
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from web.response_cache import ResponseCache, response_cache
+
+pytestmark = [pytest.mark.db, pytest.mark.api]
+
+SCHEMA = {
+    "version": 1,
+    "entity_types": [{
+        "name": "Company", "slug": "company", "description": "", "icon": "building",
+        "parent_type": None,
+        "attributes": [
+            {"name": "Features", "slug": "features", "data_type": "tags"},
+            {"name": "Pricing", "slug": "pricing_model", "data_type": "text"},
+        ],
+    }],
+    "relationships": [],
+}
+
+PRICING = "/api/lenses/product/pricing"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    response_cache.clear()
+    response_cache.reset_stats()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture
+def project(client):
+    db = client.db
+    pid = db.create_project(name="Cache", purpose="x", entity_schema=SCHEMA)
+    eid = db.create_entity(pid, "company", "Alpha")
+    db.set_entity_attribute(eid, "features", json.dumps(["SSO", "API"]))
+    db.set_entity_attribute(eid, "pricing_model", "subscription")
+    return {"client": client, "db": db, "project_id": pid, "entity_id": eid}
+
+
+# ═══════════════════════════════════════════════════════════════
+# Project versions
+# ═══════════════════════════════════════════════════════════════
+
+class TestProjectVersion:
+
+    def test_bumped_by_entity_store_writes(self, tmp_db):
+        pid = tmp_db.create_project(name="V", purpose="x", entity_schema=SCHEMA)
+        other = tmp_db.create_project(name="W", purpose="x", entity_schema=SCHEMA)
+        v0 = tmp_db.get_project_version(pid)
+
+        eid = tmp_db.create_entity(pid, "company", "Alpha")
+        v1 = tmp_db.get_project_version(pid)
+        tmp_db.set_entity_attribute(eid, "pricing_model", "free")
+        v2 = tmp_db.get_project_version(pid)
+        tmp_db.update_project(pid, {"description": "changed"})
+        v3 = tmp_db.get_project_version(pid)
+        assert v0 < v1 < v2 < v3
+
+        other_before = tmp_db.get_project_version(other)
+        tmp_db.create_entity(other, "company", "Beta")
+        assert tmp_db.get_project_version(pid) == v3
+        assert tmp_db.get_project_version(other) > other_before
+
+    def test_bumped_by_change_feed(self, tmp_db):
+        from web.blueprints.monitoring._shared import _ensure_tables
+        pid = tmp_db.create_project(name="V", purpose="x", entity_schema=SCHEMA)
+        eid = tmp_db.create_entity(pid, "company", "Alpha")
+        before = tmp_db.get_project_version(pid)
+        with tmp_db._get_conn() as conn:
+            _ensure_tables(conn)
+            conn.execute(
+                """INSERT INTO change_feed (project_id, entity_id, change_type, title)
+                   VALUES (?, ?, 'content_change', 'Changed')""", (pid, eid))
+        assert tmp_db.get_project_version(pid) == before + 1
+
+    def test_delete_project_clears_version_and_cache(self, tmp_db):
+        pid = tmp_db.create_project(name="V", purpose="x", entity_schema=SCHEMA)
+        tmp_db.create_entity(pid, "company", "Alpha")
+        tmp_db.put_cached_response("k", pid, "ep", "1", "etag", "{}")
+        tmp_db.delete_project(pid)
+        assert tmp_db.get_project_version(pid) == 0
+        assert tmp_db.get_response_cache_stats()["entries"] == 0
+
+
+# ═══════════════════════════════════════════════════════════════
+# Cached lens responses
+# ═══════════════════════════════════════════════════════════════
+
+class TestCachedResponse:
+
+    def test_second_request_hits_with_same_etag(self, project):
+        c, pid = project["client"], project["project_id"]
+        first = c.get(f"{PRICING}?project_id={pid}")
+        second = c.get(f"{PRICING}?project_id={pid}")
+        assert first.headers["X-Cache"] == "miss"
+        assert second.headers["X-Cache"] == "hit"
+        assert first.get_json() == second.get_json()
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert not first.headers["ETag"].startswith("W/")
+
+    def test_if_none_match_returns_304(self, project):
+        c, pid = project["client"], project["project_id"]
+        etag = c.get(f"{PRICING}?project_id={pid}").headers["ETag"]
+        r = c.get(f"{PRICING}?project_id={pid}", headers={"If-None-Match": etag})
+        assert r.status_code == 304
+        assert r.data == b""
+        assert response_cache.stats()["endpoints"]["lenses.product_pricing"]["not_modified"] == 1
+
+    def test_write_invalidates(self, project):
+        c, db, pid = project["client"], project["db"], project["project_id"]
+        etag = c.get(f"{PRICING}?project_id={pid}").headers["ETag"]
+        eid = db.create_entity(pid, "company", "Beta")
+        db.set_entity_attribute(eid, "pricing_model", "freemium")
+
+        r = c.get(f"{PRICING}?project_id={pid}", headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["X-Cache"] == "miss"
+        assert r.headers["ETag"] != etag
+        assert {e["entity_name"] for e in r.get_json()["entities"]} == {"Alpha", "Beta"}
+
+    def test_persisted_tier_survives_memory_clear(self, project):
+        c, pid = project["client"], project["project_id"]
+        body = c.get(f"{PRICING}?project_id={pid}").get_json()
+        response_cache.clear()
+        r = c.get(f"{PRICING}?project_id={pid}")
+        assert r.headers["X-Cache"] == "hit"
+        assert r.get_json() == body
+        counters = response_cache.stats()["endpoints"]["lenses.product_pricing"]
+        assert counters["store_hits"] == 1
+        assert counters["misses"] == 1
+
+    def test_query_parameters_are_part_of_the_key(self, project):
+        c, pid = project["client"], project["project_id"]
+        url = f"/api/lenses/competitive/matrix?project_id={pid}"
+        c.get(url)
+        r = c.get(url + "&attr_slug=pricing_model")
+        assert r.headers["X-Cache"] == "miss"
+        assert c.get(url).headers["X-Cache"] == "hit"
+
+    def test_errors_are_not_cached(self, project):
+        c, pid = project["client"], project["project_id"]
+        r = c.get(f"/api/lenses/competitive/matrix?project_id={pid}&cursor=zzz")
+        assert r.status_code == 400
+        assert "X-Cache" not in r.headers
+
+    def test_ttl_bucket_expires_entry(self, project, monkeypatch):
+        import web.response_cache as rc
+        c, pid = project["client"], project["project_id"]
+        url = f"/api/lenses/signals/summary?project_id={pid}"
+        monkeypatch.setattr(rc, "time", SimpleNamespace(time=lambda: 1_000_000.0))
+        c.get(url)
+        assert c.get(url).headers["X-Cache"] == "hit"
+        monkeypatch.setattr(rc, "time", SimpleNamespace(time=lambda: 1_000_000.0 + 3600))
+        assert c.get(url).headers["X-Cache"] == "miss"
+
+
+# ═══════════════════════════════════════════════════════════════
+# Report gathers
+# ═══════════════════════════════════════════════════════════════
+
+class TestReportGather:
+
+    def test_gather_shared_until_project_changes(self, project, monkeypatch):
+        from web.blueprints.reports import generation
+        c, db, pid = project["client"], project["db"], project["project_id"]
+        calls = []
+        gather, build = generation._TEMPLATE_HANDLERS["market_overview"]
+
+        def counting_gather(conn, project_id, entity_ids=None):
+            calls.append(project_id)
+            return gather(conn, project_id, entity_ids)
+
+        monkeypatch.setitem(generation._TEMPLATE_HANDLERS, "market_overview",
+                            (counting_gather, build))
+        body = {"project_id": pid, "template": "market_overview"}
+        first = c.post("/api/synthesis/generate", json=body).get_json()
+        second = c.post("/api/synthesis/generate", json=body).get_json()
+        assert len(calls) == 1
+        assert first["sections"] == second["sections"]
+
+        db.create_entity(pid, "company", "Beta")
+        c.post("/api/synthesis/generate", json=body)
+        assert len(calls) == 2
+
+
+# ═══════════════════════════════════════════════════════════════
+# Memory tier + stats
+# ═══════════════════════════════════════════════════════════════
+
+class TestMemoryTier:
+
+    def test_lru_bounded_by_entries_and_bytes(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        cache.put("a", "1", "ea", b"aaaa")
+        cache.put("b", "1", "eb", b"bbbb")
+        assert cache.get("a", "1") == ("ea", b"aaaa")   # a is now most recent
+        cache.put("c", "1", "ec", b"cccc")
+        assert cache.get("b", "1") is None
+        cache.put("d", "1", "ed", b"dddddddd")          # 12 bytes > 10: evicts a, c
+        assert cache.get("a", "1") is None and cache.get("c", "1") is None
+        assert cache.stats()["memory"]["evictions"] == 3
+
+    def test_other_version_is_a_miss(self):
+        cache = ResponseCache()
+        cache.put("a", "1", "ea", b"x")
+        assert cache.get("a", "2") is None
+        cache.put("a", "2", "ea2", b"y")
+        assert cache.stats()["memory"]["entries"] == 1
+
+    def test_store_budget_evicts_least_recently_hit(self, tmp_db):
+        tmp_db.put_cached_response("old", 1, "ep", "1", "e", "x" * 60)
+        with tmp_db._get_conn() as conn:
+            conn.execute("UPDATE response_cache SET last_hit_at = '2000-01-01'")
+        tmp_db.put_cached_response("new", 1, "ep", "1", "e", "y" * 60, budget_bytes=100)
+        assert tmp_db.get_cached_response("old", "1") is None
+        assert tmp_db.get_cached_response("new", "1")["body"] == "y" * 60
+
+    def test_stats_endpoint(self, project):
+        c, pid = project["client"], project["project_id"]
+        c.get(f"{PRICING}?project_id={pid}")
+        c.get(f"{PRICING}?project_id={pid}")
+        stats = c.get("/api/costs/cache/responses").get_json()
+        assert stats["endpoints"]["lenses.product_pricing"]["hit_rate"] == 0.5
+        assert stats["totals"]["memory_hits"] == 1
+        assert stats["store"]["entries"] == 1
+        assert stats["store"]["endpoints"]["lenses.product_pricing"]["entries"] == 1
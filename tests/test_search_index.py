@@ -0,0 +1,260 @@
+"""Tests for the per-project BM25 search index behind AI chat.
+
+Covers:
+- Backfill on first search, and retrieval beyond the first 200 companies
+- Incremental updates through the change queue: edits, notes, category
+  renames, attributes, soft and hard deletes, project isolation
+- Evidence documents from existing text sidecars
+- Query building and token-budgeted passage selection
+- /api/ai/chat and /api/ai/chat/stream grounded in retrieved passages
+
+Run: pytest tests/test_search_index.py -v
+Markers: db, api, ai
+"""
+import json
+
+import pytest
+
+from core import search_index
+from core.search_index import match_query, refresh, retrieve, select_passages
+
+pytestmark = [pytest.mark.db, pytest.mark.api, pytest.mark.ai]
+
+
+def _company(db, pid, name, what="", **fields):
+    return db.upsert_company({
+        "project_id": pid, "url": f"https://{name.lower().replace(' ', '')}.example",
+        "name": name, "what": what, **fields,
+    })
+
+
+def _titles(db, pid, question):
+    return [p["title"] for p in retrieve(db, pid, question)]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Indexing
+# ═══════════════════════════════════════════════════════════════
+
+class TestBackfill:
+
+    def test_first_search_indexes_project(self, tmp_db, project_id):
+        _company(tmp_db, project_id, "Acme", "Payroll software for restaurants")
+        tmp_db.create_entity(project_id, "company", "Globex")
+        assert tmp_db.get_search_index_stats(project_id)["built_at"] is None
+
+        assert refresh(tmp_db, project_id) == 2
+        stats = tmp_db.get_search_index_stats(project_id)
+        assert stats["documents"] == {"company": 1, "entity": 1}
+        assert stats["pending"] == 0
+        assert stats["built_at"]
+
+    def test_finds_company_past_first_200(self, tmp_db, project_id):
+        for i in range(250):
+            _company(tmp_db, project_id, f"Company {i:03d}", "Generic software vendor")
+        _company(tmp_db, project_id, "Zzyzx Labs", "Cryogenic freezer telemetry")
+        titles = _titles(tmp_db, project_id, "Who does cryogenic telemetry?")
+        assert titles[0] == "Zzyzx Labs"
+
+    def test_unindexed_project_queues_nothing(self, tmp_db, project_id):
+        _company(tmp_db, project_id, "Acme")
+        assert tmp_db.get_search_index_stats(project_id)["pending"] == 0
+
+
+class TestIncrementalUpdates:
+
+    @pytest.fixture
+    def indexed(self, tmp_db, project_id):
+        cid = _company(tmp_db, project_id, "Acme", "Payroll software")
+        refresh(tmp_db, project_id)
+        return cid
+
+    def test_company_edit_is_queued_and_applied(self, tmp_db, project_id, indexed):
+        tmp_db.update_company(indexed, {"what": "Quantum annealing consultancy"})
+        assert tmp_db.get_search_index_stats(project_id)["pending"] == 1
+        assert _titles(tmp_db, project_id, "quantum annealing") == ["Acme"]
+        assert _titles(tmp_db, project_id, "payroll") == []
+
+    def test_note_is_searchable(self, tmp_db, project_id, indexed):
+        tmp_db.add_note(indexed, "Met their CFO at Lisbon summit")
+        assert _titles(tmp_db, project_id, "lisbon") == ["Acme"]
+
+    def test_category_rename_reindexes_members(self, tmp_db, project_id, category_ids):
+        _company(tmp_db, project_id, "Acme", category_id=category_ids["Cat A"])
+        refresh(tmp_db, project_id)
+        tmp_db.rename_category("Cat A", "Observability", project_id=project_id)
+        assert _titles(tmp_db, project_id, "observability") == ["Acme"]
+
+    def test_soft_and_hard_delete_remove_documents(self, tmp_db, project_id, indexed):
+        other = _company(tmp_db, project_id, "Initech", "Payroll outsourcing")
+        assert set(_titles(tmp_db, project_id, "payroll")) == {"Acme", "Initech"}
+        tmp_db.delete_company(indexed)
+        with tmp_db._get_conn() as conn:
+            conn.execute("DELETE FROM companies WHERE id = ?", (other,))
+        assert _titles(tmp_db, project_id, "payroll") == []
+
+    def test_entity_attributes(self, tmp_db, project_id):
+        eid = tmp_db.create_entity(project_id, "company", "Globex")
+        refresh(tmp_db, project_id)
+        tmp_db.set_entity_attribute(eid, "pricing", json.dumps(["Freemium", "Enterprise"]))
+        passages = retrieve(tmp_db, project_id, "freemium pricing")
+        assert passages[0]["title"] == "Globex"
+        assert "Freemium, Enterprise" in passages[0]["text"]
+        tmp_db.delete_entity(eid)
+        assert _titles(tmp_db, project_id, "freemium") == []
+
+    def test_projects_are_isolated(self, tmp_db, project_id, indexed):
+        other = tmp_db.create_project(name="Other", purpose="x")
+        _company(tmp_db, other, "Payroll Other", "Payroll too")
+        assert _titles(tmp_db, project_id, "payroll") == ["Acme"]
+
+    def test_delete_project_clears_index(self, tmp_db, project_id, indexed):
+        tmp_db.delete_project(project_id)
+        with tmp_db._get_conn() as conn:
+            for table in ("search_index", "search_dirty", "search_index_state"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+
+
+class TestEvidenceDocuments:
+
+    def test_sidecar_text_is_indexed(self, tmp_db, project_id, tmp_path, monkeypatch):
+        import core.capture as capture_mod
+        monkeypatch.setattr(capture_mod, "EVIDENCE_DIR", tmp_path / "evidence")
+        eid = tmp_db.create_entity(project_id, "company", "Globex")
+        content = b"Globex retention policy: records are purged after ninety days."
+        path = capture_mod.store_file(project_id, eid, "document", content, "policy.txt")
+        capture_mod.write_text_sidecar(path, content)
+        tmp_db.add_evidence(eid, "document", path, source_name="Upload")
+
+        passages = retrieve(tmp_db, project_id, "when are records purged")
+        assert passages[0]["kind"] == "evidence"
+        assert passages[0]["title"] == "Globex — document"
+        assert "ninety days" in passages[0]["text"]
+
+    def test_missing_sidecar_indexes_metadata_only(self, tmp_db, project_id):
+        eid = tmp_db.create_entity(project_id, "company", "Globex")
+        tmp_db.add_evidence(eid, "screenshot", "1/1/screenshot/missing.png",
+                            source_name="Mobbin")
+        assert _titles(tmp_db, project_id, "mobbin") == ["Globex — screenshot"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Queries and passage selection
+# ═══════════════════════════════════════════════════════════════
+
+class TestMatchQuery:
+
+    def test_drops_stopwords_and_quotes_terms(self):
+        assert match_query("Which of them use AI pricing?") == '"use" OR "ai" OR "pricing"'
+
+    def test_fts_syntax_is_neutralised(self):
+        assert match_query('NEAR(ab cd) "xy" OR -zz*') == '"near" OR "ab" OR "cd" OR "xy" OR "zz"'
+
+    def test_nothing_meaningful(self):
+        assert match_query("what is the?") is None
+
+    def test_syntax_in_question_does_not_break_search(self, tmp_db, project_id):
+        _company(tmp_db, project_id, "Acme", "Payroll")
+        assert _titles(tmp_db, project_id, 'payroll" AND (') == ["Acme"]
+
+
+class TestSelectPassages:
+
+    def _match(self, title, body, snippet="…snippet…", score=-1.0):
+        return {"kind": "company", "ref_id": 1, "title": title, "body": body,
+                "snippet": snippet, "score": score}
+
+    def test_long_documents_use_snippet(self):
+        passages = select_passages([self._match("A", "x" * 4000)])
+        assert passages[0]["text"] == "…snippet…"
+
+    def test_respects_token_budget(self):
+        matches = [self._match(f"M{i}", "word " * 200) for i in range(50)]
+        passages = select_passages(matches, token_budget=1000)
+        used = sum(search_index.estimate_tokens(p["title"]) +
+                   search_index.estimate_tokens(p["text"]) + 4 for p in passages)
+        assert 0 < used <= 1000
+        assert [p["title"] for p in passages] == [f"M{i}" for i in range(len(passages))]
+
+    def test_skips_oversized_for_smaller_later_match(self):
+        matches = [self._match("Big", "y" * 1000, snippet="s" * 2000),
+                   self._match("Small", "short")]
+        assert [p["title"] for p in select_passages(matches, token_budget=100)] == ["Small"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# Chat endpoints
+# ═══════════════════════════════════════════════════════════════
+
+def _sse_events(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestChatEndpoints:
+
+    @pytest.fixture
+    def chat_project(self, client):
+        pid = client.db.create_project(name="Chat", purpose="x")
+        for i in range(220):
+            _company(client.db, pid, f"Vendor {i:03d}", "Generic software")
+        _company(client.db, pid, "Zzyzx Labs", "Cryogenic freezer telemetry")
+        return pid
+
+    def test_chat_context_uses_retrieved_passages(self, client, chat_project, monkeypatch):
+        import web.blueprints.ai as ai_mod
+        captured = {}
+
+        def fake_sdk(prompt, model, timeout, context=None, **kwargs):
+            captured["context"] = context
+            return {"result": "- Zzyzx Labs"}
+
+        monkeypatch.setattr(ai_mod, "instructor_available", lambda: False)
+        monkeypatch.setattr(ai_mod, "run_sdk_cached", fake_sdk)
+        r = client.post("/api/ai/chat", json={"question": "cryogenic telemetry",
+                                              "project_id": chat_project})
+        assert r.status_code == 200
+        data = r.get_json()
+        assert data["answer"] == "- Zzyzx Labs"
+        assert data["sources"][0]["title"] == "Zzyzx Labs"
+        assert "Cryogenic freezer telemetry" in captured["context"]
+        assert "Vendor 000" not in captured["context"]
+
+    def test_stream_emits_sources_tokens_done(self, client, chat_project, monkeypatch):
+        import web.blueprints.ai as ai_mod
+
+        def fake_stream(prompt, model, timeout, context=None, **kwargs):
+            assert "Zzyzx Labs" in context
+            yield "- Zzyzx "
+            yield "Labs"
+
+        monkeypatch.setattr(ai_mod, "stream_text", fake_stream)
+        r = client.post("/api/ai/chat/stream", json={"question": "Who does cryogenic telemetry?",
+                                                     "project_id": chat_project})
+        assert r.status_code == 200
+        assert r.mimetype == "text/event-stream"
+        events = _sse_events(r.get_data(as_text=True))
+        assert [e for e, _ in events] == ["sources", "token", "token", "done"]
+        assert events[0][1]["sources"][0]["title"] == "Zzyzx Labs"
+        assert "".join(d["text"] for e, d in events if e == "token") == "- Zzyzx Labs"
+
+    def test_stream_reports_llm_failure(self, client, chat_project, monkeypatch):
+        import web.blueprints.ai as ai_mod
+
+        def failing_stream(*args, **kwargs):
+            yield "partial"
+            raise RuntimeError("upstream closed")
+
+        monkeypatch.setattr(ai_mod, "stream_text", failing_stream)
+        r = client.post("/api/ai/chat/stream", json={"question": "telemetry",
+                                                     "project_id": chat_project})
+        events = _sse_events(r.get_data(as_text=True))
+        assert [e for e, _ in events] == ["sources", "token", "error"]
+        assert "upstream closed" not in events[-1][1]["error"]
+
+    def test_stream_requires_question(self, client):
+        r = client.post("/api/ai/chat/stream", json={"question": " "})
+        assert r.status_code == 400
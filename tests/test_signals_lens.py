@@ -431,6 +431,44 @@ class TestSignalsTimeline:
         assert "content_change" in ev["title"]
         assert ev["severity"] in ("low", "medium", "high", "info")
 
+    def test_pages_follow_merged_order(self, signal_project_multi_entity):
+        """Offset pages over interleaved sources equal slices of the full timeline."""
+        c = signal_project_multi_entity["client"]
+        db = signal_project_multi_entity["db"]
+        pid = signal_project_multi_entity["project_id"]
+        eid1, eid2 = signal_project_multi_entity["entity_ids"]
+        for day in range(1, 8):
+            db.set_entity_attribute(eid2, "description", f"v{day}",
+                                    captured_at=f"2026-03-{day:02d} 09:00:00")
+            db.add_evidence(entity_id=eid1, evidence_type="screenshot",
+                            file_path=f"/evidence/test/{day}.png",
+                            captured_at=f"2026-03-{day:02d} 09:00:00")
+
+        full = c.get(f"/api/lenses/signals/timeline?project_id={pid}&limit=200").get_json()
+        assert full["total"] == len(full["events"]) == 20
+        # Same-timestamp events: change feed, then attributes, then evidence
+        assert [e["type"] for e in full["events"][:2]] == ["attribute_updated", "evidence_captured"]
+
+        paged = []
+        for offset in range(0, 20, 3):
+            data = c.get(f"/api/lenses/signals/timeline?project_id={pid}"
+                         f"&limit=3&offset={offset}").get_json()
+            assert data["total"] == 20
+            paged += data["events"]
+        assert paged == full["events"]
+
+    def test_deleted_entities_excluded(self, signal_project_multi_entity):
+        """Events of soft-deleted entities drop out of the timeline and its total."""
+        c = signal_project_multi_entity["client"]
+        db = signal_project_multi_entity["db"]
+        pid = signal_project_multi_entity["project_id"]
+        eid1 = signal_project_multi_entity["entity_ids"][0]
+        db.delete_entity(eid1)
+
+        data = c.get(f"/api/lenses/signals/timeline?project_id={pid}").get_json()
+        assert data["total"] == 1
+        assert [e["entity_name"] for e in data["events"]] == ["Beta Inc"]
+
 
 # ═══════════════════════════════════════════════════════════════
 # Signals Activity Tests
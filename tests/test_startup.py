@@ -0,0 +1,85 @@
+"""Startup budget: create_app() stays fast and leaves heavy modules unloaded.
+
+Heavy dependencies (the Anthropic SDK, pandas, numpy, Playwright, HTML
+parsers, the scrapers package) are imported on first use inside the
+functions that need them. These tests start a fresh interpreter, import
+web.app and call create_app(), then check the wall time and which
+modules got loaded.
+
+Run: pytest tests/test_startup.py -v
+Markers: api
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.api
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# import web.app + create_app(), measured in a fresh interpreter (was ~2.4s
+# while every blueprint pulled in anthropic and pandas at import time)
+STARTUP_BUDGET_SECONDS = float(os.environ.get("STARTUP_BUDGET_SECONDS", "2.0"))
+
+DENYLIST = [
+    "anthropic", "instructor", "pandas", "numpy", "openpyxl", "playwright",
+    "bs4", "lxml", "core.scrapers",
+]
+
+_PROBE = """
+import json, sys, time
+from pathlib import Path
+
+import config
+data = Path(sys.argv[1])
+config.DATA_DIR = data
+config.LOGS_DIR = data / "logs"
+config.BACKUP_DIR = data / "backups"
+config.DB_PATH = data / "taxonomy.db"
+config.APP_SETTINGS_FILE = data / ".app_settings.json"
+
+start = time.perf_counter()
+from web.app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("startup-data")
+    # Once to create the database, then timed against the existing file,
+    # like a normal server start
+    runs = []
+    for _ in range(2):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE, str(data_dir)],
+            cwd=ROOT, capture_output=True, text=True, timeout=120,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return runs[-1]
+
+
+class TestStartupBudget:
+
+    def test_within_wall_time_budget(self, startup):
+        assert startup["seconds"] < STARTUP_BUDGET_SECONDS, (
+            f"create_app() took {startup['seconds']:.2f}s "
+            f"(budget {STARTUP_BUDGET_SECONDS}s)")
+
+    @pytest.mark.parametrize("module", DENYLIST)
+    def test_heavy_module_not_loaded(self, startup, module):
+        loaded = [m for m in startup["modules"]
+                  if m == module or m.startswith(module + ".")]
+        assert not loaded, f"create_app() imported {module}; import it where it is used"
+
+    def test_app_registers_all_blueprints(self, app):
+        # Deferring imports must not drop routes
+        assert {"processing", "data", "entities", "capture", "ai"} <= set(app.blueprints)
@@ -84,7 +84,16 @@ def _check_rate_limit(key, category="default"):
 
 
 def _cleanup_stale_results():
-    """Remove stale async result files older than 7 days."""
+    """Purge async jobs finished more than 7 days ago.
+
+    Also removes result files left by the JSON-file job pattern that the
+    job queue replaced.
+    """
+    try:
+        from web.async_jobs import purge_finished_jobs
+        purge_finished_jobs(max_age_days=7)
+    except Exception:
+        logger.opt(exception=True).debug("Async job purge failed")
     cutoff = time.time() - 86400 * 7
     prefixes = ("report_", "discover_", "similar_", "reresearch_", "review_", "diagram_",
                  "pricing_", "explore_dim_", "populate_dim_", "landscape_", "gap_")
@@ -109,6 +118,30 @@ def _maybe_cleanup_results():
         _cleanup_stale_results()
 
 
+_CACHE_MAINTENANCE_INTERVAL = 900
+_last_cache_maintenance = 0
+
+
+def _maybe_maintain_cache(db):
+    """Sweep and trim the mcp_cache table in the background every 15 minutes."""
+    global _last_cache_maintenance
+    now = time.time()
+    if now - _last_cache_maintenance <= _CACHE_MAINTENANCE_INTERVAL:
+        return
+    _last_cache_maintenance = now
+
+    def _maintain():
+        from core.mcp_client import run_cache_maintenance
+        conn = db._get_conn()
+        try:
+            run_cache_maintenance(conn)
+        finally:
+            conn.close()
+
+    from web.async_jobs import run_in_thread
+    run_in_thread(_maintain)
+
+
 def create_app():
     _setup_logging()
     logger.info("Starting Research Taxonomy Library v{}", APP_VERSION)
@@ -153,11 +186,17 @@ def create_app():
 
     _cleanup_stale_results()
 
+    # --- Opt-in profiling (first, so the other hooks are timed too) ---
+    from web.profiling import init_app as init_profiling
+    init_profiling(app)
+
     # --- Request logging & periodic maintenance ---
     @app.before_request
     def _log_request():
         g.request_start = time.time()
         _maybe_cleanup_results()
+        if not app.config.get("TESTING"):
+            _maybe_maintain_cache(app.db)
 
     @app.after_request
     def _after_request(response):
@@ -419,6 +458,13 @@ def create_app():
     app.register_blueprint(enrichment_bp)
     app.register_blueprint(costs_bp)
 
+    # Requeue (or fail) async jobs orphaned by the previous process
+    from web.async_jobs import recover_jobs
+    try:
+        recover_jobs(app)
+    except Exception:
+        logger.opt(exception=True).warning("Async job recovery failed")
+
     return app
 
 
@@ -428,6 +474,11 @@ def _register_shutdown():
     import signal
 
     def _cleanup():
+        try:
+            from core.export_scheduler import flush_exports
+            flush_exports()
+        except Exception:
+            pass
         try:
             from web.async_jobs import shutdown_pool
             shutdown_pool(wait=False)
@@ -1,16 +1,45 @@
-"""Reusable helpers for the async-job-via-JSON-file pattern.
+"""Durable async job queue for long-running endpoint work.
 
 Many endpoints follow the same flow:
-  1. Generate a short UUID
-  2. Spawn a worker in a thread pool
-  3. Write result to DATA_DIR / "{prefix}_{id}.json"
-  4. A poll endpoint checks whether that file exists yet
+  1. Generate a short id
+  2. Run a worker in the background
+  3. Record the worker's result under that id
+  4. A poll endpoint returns the result once it exists
 
-This module centralises all of that boilerplate.
+Jobs are rows in a small SQLite database (DATA_DIR / "async_jobs.db") with
+state, priority, progress, result blob and heartbeat, so a poll is a primary
+key lookup and job state survives restarts.
+
+Jobs run on a separate worker pool per job class, so a 5-minute market
+report cannot hold up a quick job of another class:
+
+    llm      — LLM-bound work (reports, research, discovery, extraction)
+    browser  — Playwright captures
+    http     — plain HTTP / MCP enrichment
+    cpu      — local computation
+
+Within a pool, higher-priority jobs are picked first.
+
+:func:`start_async_job`, :func:`write_result` and :func:`poll_result` keep
+their original signatures, so existing callers move onto the queue without
+changes; class and priority come from ``PREFIX_CLASSES`` and
+``PREFIX_PRIORITIES``. New code can use :func:`submit_job` directly, report
+progress with :func:`report_progress` (published to the project's SSE
+stream) and honour :func:`cancel_job` via :func:`is_cancelled`.
+
+On restart, :func:`recover_jobs` requeues jobs left queued or running by a
+previous process if they were submitted through a registered handler (see
+:func:`register_handler` / :func:`enqueue`); others are marked interrupted,
+which pollers see as an error.
 """
+import itertools
 import json
 import logging
 import os
+import queue
+import sqlite3
+import threading
+import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor
 
@@ -18,7 +47,76 @@ from config import DATA_DIR
 
 logger = logging.getLogger(__name__)
 
-# Shared thread pool with graceful shutdown support.
+JOBS_DB_NAME = "async_jobs.db"
+
+# Worker threads per job class
+JOB_CLASSES = {"llm": 4, "browser": 2, "http": 4, "cpu": 2}
+DEFAULT_JOB_CLASS = "llm"
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+PREFIX_CLASSES = {
+    "capture": "browser",
+    "bulk_capture": "browser",
+    "enrichment": "http",
+    "enrichment_batch": "http",
+}
+# Quick interactive jobs jump ahead of long batch work in the same pool
+PREFIX_PRIORITIES = {
+    "similar": PRIORITY_HIGH,
+    "pricing": PRIORITY_HIGH,
+    "enrichment": PRIORITY_HIGH,
+    "report": PRIORITY_LOW,
+    "enrichment_batch": PRIORITY_LOW,
+    "bulk_capture": PRIORITY_LOW,
+    "bulk_extract": PRIORITY_LOW,
+    "populate_dim": PRIORITY_LOW,
+}
+
+ACTIVE_STATES = ("queued", "running")
+TERMINAL_STATES = ("complete", "error", "cancelled", "interrupted")
+
+HEARTBEAT_INTERVAL = 15       # seconds between heartbeats for running jobs
+STALE_AFTER = 60              # a job without heartbeat for this long is orphaned
+MAX_ATTEMPTS = 3              # requeues of a handler job before giving up
+
+_PROCESS_TOKEN = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+_JOBS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS async_jobs (
+    id TEXT PRIMARY KEY,
+    prefix TEXT NOT NULL,
+    job_class TEXT NOT NULL DEFAULT 'llm',
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'queued',
+    project_id INTEGER,
+    progress REAL,
+    progress_message TEXT,
+    result_json TEXT,
+    error TEXT,
+    handler TEXT,
+    args_json TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+_JOBS_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_async_jobs_state ON async_jobs(state, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_async_jobs_prefix ON async_jobs(prefix, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_async_jobs_project ON async_jobs(project_id, created_at)",
+]
+
+_SCHEMA_ENSURED = set()   # database paths whose schema exists
+_schema_lock = threading.Lock()
+
+# Fire-and-forget pool for run_in_thread (not persisted).
 #
 # NOTE: core/pipeline.py and web/blueprints/processing.py create their own
 # short-lived ThreadPoolExecutors inside ``with`` blocks.  This is intentional:
@@ -28,39 +126,314 @@ logger = logging.getLogger(__name__)
 # Both scoped executors self-close after the ``with`` block completes.
 _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="async_job")
 
+_HANDLERS = {}            # handler name -> work_fn, for jobs that survive restarts
+_cancelled = set()        # job ids cancelled in this process
+_app = None               # Flask app handler jobs run under (set by recover_jobs)
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker by :func:`check_cancelled` once its job is cancelled."""
+
+
+# -- storage ------------------------------------------------------------------
+
+def _db_path():
+    return DATA_DIR / JOBS_DB_NAME
+
+
+def _connect():
+    """Open a connection to the jobs database, creating the schema on first use."""
+    path = _db_path()
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    key = str(path)
+    if key not in _SCHEMA_ENSURED:
+        with _schema_lock:
+            if key not in _SCHEMA_ENSURED:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_JOBS_TABLE_SQL)
+                for sql in _JOBS_INDEXES_SQL:
+                    conn.execute(sql)
+                conn.commit()
+                try:
+                    os.chmod(path, 0o600)
+                except OSError:
+                    pass
+                _SCHEMA_ENSURED.add(key)
+    return conn
+
+
+def _execute(sql, params=()):
+    """Run one write statement in its own transaction. Returns rowcount."""
+    conn = _connect()
+    try:
+        with conn:
+            return conn.execute(sql, params).rowcount
+    finally:
+        conn.close()
+
+
+def _fetchone(sql, params=()):
+    conn = _connect()
+    try:
+        return conn.execute(sql, params).fetchone()
+    finally:
+        conn.close()
+
+
+def _state_for_status(status):
+    """Map a worker's result ``status`` to a job state."""
+    if status in ("complete", "completed", "done"):
+        return "complete"
+    if status in ("error", "failed"):
+        return "error"
+    if status == "cancelled":
+        return "cancelled"
+    return "running"
+
+
+def _row_to_dict(row):
+    d = dict(row)
+    d.pop("args_json", None)
+    d.pop("owner", None)
+    result_json = d.pop("result_json", None)
+    d["result"] = json.loads(result_json) if result_json else None
+    return d
+
+
+# -- worker pools -------------------------------------------------------------
+
+class _WorkerPool:
+    """Fixed set of daemon threads consuming a priority queue."""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, priority, fn):
+        self._start()
+        self._queue.put((-priority, next(self._seq), fn))
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.size):
+                t = threading.Thread(target=self._work, daemon=True,
+                                     name=f"async_job_{self.name}_{i}")
+                t.start()
+                self._threads.append(t)
+
+    def _work(self):
+        while True:
+            _, _, fn = self._queue.get()
+            if fn is None:
+                return
+            try:
+                fn()
+            except Exception:
+                logger.exception("Unhandled error in %s worker", self.name)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            # Sentinels sort after every queued job
+            self._queue.put((float("inf"), next(self._seq), None))
+        if wait:
+            for t in threads:
+                t.join()
+
+
+_pools = {name: _WorkerPool(name, size) for name, size in JOB_CLASSES.items()}
+_heartbeat_stop = None       # Event for the running heartbeat thread, if any
+_heartbeat_lock = threading.Lock()
+
+
+def _heartbeat_loop(stop):
+    while not stop.wait(HEARTBEAT_INTERVAL):
+        try:
+            _execute(
+                "UPDATE async_jobs SET heartbeat_at = ? WHERE owner = ? AND state = 'running'",
+                (time.time(), _PROCESS_TOKEN),
+            )
+        except Exception:
+            logger.debug("Job heartbeat failed", exc_info=True)
+
+
+def _ensure_heartbeat():
+    global _heartbeat_stop
+    with _heartbeat_lock:
+        if _heartbeat_stop is None:
+            _heartbeat_stop = threading.Event()
+            threading.Thread(target=_heartbeat_loop, args=(_heartbeat_stop,),
+                             daemon=True, name="async_job_heartbeat").start()
+
+
+def _stop_heartbeat():
+    global _heartbeat_stop
+    with _heartbeat_lock:
+        if _heartbeat_stop is not None:
+            _heartbeat_stop.set()
+            _heartbeat_stop = None
+
+
+# -- publishing ---------------------------------------------------------------
+
+def _publish(job_id, event_type):
+    """Send the job's current state to its project's SSE stream, if any."""
+    row = _fetchone(
+        "SELECT id, prefix, state, project_id, progress, progress_message, error "
+        "FROM async_jobs WHERE id = ?", (job_id,),
+    )
+    if not row or not row["project_id"]:
+        return
+    try:
+        from web.notifications import notify_sse
+        payload = dict(row)
+        payload["job_id"] = payload.pop("id")
+        notify_sse(row["project_id"], event_type, payload)
+    except Exception:
+        logger.debug("Job SSE publish failed for %s", job_id, exc_info=True)
+
+
+# -- public API ---------------------------------------------------------------
 
 def make_job_id():
     """Generate a job identifier (16-char hex for brute-force resistance)."""
     return uuid.uuid4().hex[:16]
 
 
+def register_handler(name):
+    """Decorator registering *work_fn* under *name* so its jobs survive restarts.
+
+    Handler jobs are submitted with :func:`enqueue`; their arguments must be
+    JSON-serialisable. A requeued handler can read its previous progress
+    with :func:`get_job` to resume rather than start over.
+    """
+    def _decorator(fn):
+        _HANDLERS[name] = fn
+        return fn
+    return _decorator
+
+
+def submit_job(prefix, work_fn, args=(), kwargs=None, job_class=None,
+               priority=None, project_id=None, handler=None, app=None,
+               initial_result=None):
+    """Persist a job and queue *work_fn* on its class's worker pool.
+
+    *work_fn* receives ``(job_id, *args, **kwargs)`` and should call
+    :func:`write_result` when finished. If it raises, the job is recorded
+    as an error; if it returns without a result, as complete.
+
+    Args:
+        prefix: Job kind — also the namespace :func:`poll_result` checks
+        job_class: One of JOB_CLASSES (default from PREFIX_CLASSES)
+        priority: Higher runs first within the pool (default from PREFIX_PRIORITIES)
+        project_id: Project whose SSE stream receives progress events
+        handler: Registered handler name (set by :func:`enqueue`)
+        app: Flask app to run the worker under (application context)
+        initial_result: Result returned by polls before the worker writes one
+
+    Returns the generated ``job_id`` (16-char hex string).
+    """
+    job_id = make_job_id()
+    job_class = job_class or PREFIX_CLASSES.get(prefix, DEFAULT_JOB_CLASS)
+    if job_class not in _pools:
+        raise ValueError(f"Unknown job class: {job_class}")
+    if priority is None:
+        priority = PREFIX_PRIORITIES.get(prefix, PRIORITY_NORMAL)
+    kwargs = kwargs or {}
+
+    _execute(
+        """INSERT INTO async_jobs
+           (id, prefix, job_class, priority, state, project_id, handler,
+            args_json, result_json, owner, heartbeat_at, created_at)
+           VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?)""",
+        (job_id, prefix, job_class, priority, project_id, handler,
+         json.dumps({"args": list(args), "kwargs": kwargs}) if handler else None,
+         json.dumps(initial_result) if initial_result is not None else None,
+         _PROCESS_TOKEN, time.time(), time.time()),
+    )
+    _dispatch(job_id, prefix, job_class, priority, work_fn, args, kwargs, app)
+    return job_id
+
+
+def enqueue(handler_name, *args, project_id=None, priority=None, app=None,
+            initial_result=None):
+    """Submit a job for a registered handler (see :func:`register_handler`).
+
+    The handler runs under *app*'s context (default: the current app).
+    """
+    work_fn = _HANDLERS[handler_name]
+    if app is None:
+        try:
+            from flask import current_app
+            app = current_app._get_current_object()
+        except RuntimeError:
+            app = _app
+    return submit_job(handler_name, work_fn, args=args, priority=priority,
+                      project_id=project_id, handler=handler_name, app=app,
+                      initial_result=initial_result)
+
+
 def start_async_job(prefix, work_fn, *args, **kwargs):
-    """Submit *work_fn* to the thread pool and return the job id.
+    """Submit *work_fn* to the job queue and return the job id.
 
     *work_fn* receives ``(job_id, *args, **kwargs)`` and must call
     :func:`write_result` when finished.
 
     Returns the generated ``job_id`` (16-char hex string).
     """
-    job_id = make_job_id()
+    return submit_job(prefix, work_fn, args=args, kwargs=kwargs)
 
-    def _wrapper():
+
+def _dispatch(job_id, prefix, job_class, priority, work_fn, args, kwargs, app):
+    def _run():
+        claimed = _execute(
+            """UPDATE async_jobs
+               SET state = 'running', started_at = ?, heartbeat_at = ?,
+                   owner = ?, attempts = attempts + 1
+               WHERE id = ? AND state = 'queued'""",
+            (time.time(), time.time(), _PROCESS_TOKEN, job_id),
+        )
+        if not claimed:
+            return  # cancelled while queued
+        _ensure_heartbeat()
         try:
-            work_fn(job_id, *args, **kwargs)
+            if app is not None:
+                with app.app_context():
+                    work_fn(job_id, *args, **kwargs)
+            else:
+                work_fn(job_id, *args, **kwargs)
+        except JobCancelled:
+            logger.info("Async job %s_%s cancelled", prefix, job_id)
         except Exception as exc:
             logger.exception("Async job %s_%s failed", prefix, job_id)
             _ensure_result(prefix, job_id, {"status": "error", "error": str(exc)[:500]})
+        else:
+            if _execute(
+                """UPDATE async_jobs SET state = 'complete', finished_at = ?
+                   WHERE id = ? AND state = 'running'""",
+                (time.time(), job_id),
+            ):
+                _publish(job_id, "job_finished")
+        finally:
+            _cancelled.discard(job_id)
 
-    _executor.submit(_wrapper)
-    return job_id
+    _pools[job_class].submit(priority, _run)
 
 
 def run_in_thread(fn, *args, **kwargs):
     """Fire-and-forget: run *fn* in the thread pool.
 
-    Use this for jobs that poll via the database rather than JSON files.
-    Unlike :func:`start_async_job`, this does NOT auto-generate an id
-    or write a JSON result — the caller manages its own id/state.
+    Use this for jobs that poll via the database rather than the job queue.
+    Unlike :func:`start_async_job`, this does NOT create a job row or
+    record a result — the caller manages its own id/state.
     """
     def _wrapper():
         try:
@@ -72,46 +445,235 @@ def run_in_thread(fn, *args, **kwargs):
 
 
 def write_result(prefix, job_id, data):
-    """Write *data* (dict) to the result file for this job (owner-only perms)."""
-    path = DATA_DIR / f"{prefix}_{job_id}.json"
-    path.write_text(json.dumps(data))
+    """Record *data* (dict) as this job's result.
+
+    ``data["status"]`` decides the job state: complete/completed, error, or
+    anything else (e.g. "running") for an intermediate progress snapshot.
+    A cancelled job keeps its cancelled state.
+    """
+    state = _state_for_status(data.get("status"))
+    now = time.time()
+    finished_at = now if state in TERMINAL_STATES else None
+    _execute(
+        """INSERT INTO async_jobs
+           (id, prefix, state, result_json, error, created_at, finished_at, heartbeat_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(id) DO UPDATE SET
+               result_json = excluded.result_json,
+               error = excluded.error,
+               heartbeat_at = excluded.heartbeat_at,
+               state = CASE WHEN async_jobs.state = 'cancelled'
+                            THEN async_jobs.state ELSE excluded.state END,
+               finished_at = COALESCE(async_jobs.finished_at, excluded.finished_at)""",
+        (job_id, prefix, state, json.dumps(data),
+         data.get("error") if state == "error" else None,
+         now, finished_at, now),
+    )
+    _publish(job_id, "job_finished" if finished_at else "job_progress")
+
+
+def report_progress(job_id, progress, message=None, project_id=None):
+    """Record progress (0.0–1.0) for a running job and publish it over SSE.
+
+    *project_id* attaches the job to a project's SSE stream if it was
+    submitted without one. Raises :class:`JobCancelled` if the job has been
+    cancelled, so workers stop at their next progress report.
+    """
+    _execute(
+        """UPDATE async_jobs SET progress = ?, progress_message = ?, heartbeat_at = ?,
+               project_id = COALESCE(?, project_id)
+           WHERE id = ?""",
+        (progress, message, time.time(), project_id, job_id),
+    )
+    _publish(job_id, "job_progress")
+    check_cancelled(job_id)
+
+
+def is_cancelled(job_id):
+    """True if *job_id* was cancelled in this process."""
+    return job_id in _cancelled
+
+
+def check_cancelled(job_id):
+    """Raise :class:`JobCancelled` if *job_id* has been cancelled."""
+    if job_id in _cancelled:
+        raise JobCancelled(job_id)
+
+
+def cancel_job(job_id):
+    """Cancel a queued or running job.
+
+    Queued jobs never start. Running jobs stop at their next
+    :func:`report_progress` / :func:`check_cancelled` call.
+
+    Returns True if the job was active and is now cancelled.
+    """
+    changed = _execute(
+        """UPDATE async_jobs SET state = 'cancelled', finished_at = ?
+           WHERE id = ? AND state IN ('queued', 'running')""",
+        (time.time(), job_id),
+    )
+    if changed:
+        _cancelled.add(job_id)
+        _publish(job_id, "job_finished")
+    return bool(changed)
+
+
+def get_job(job_id):
+    """Return a job as a dict (state, progress, result, ...), or None."""
+    row = _fetchone("SELECT * FROM async_jobs WHERE id = ?", (job_id,))
+    return _row_to_dict(row) if row else None
+
+
+def list_jobs(state=None, prefix=None, project_id=None, limit=50):
+    """List recent jobs, newest first, with optional filters."""
+    clauses, params = [], []
+    if state:
+        clauses.append("state = ?")
+        params.append(state)
+    if prefix:
+        clauses.append("prefix = ?")
+        params.append(prefix)
+    if project_id:
+        clauses.append("project_id = ?")
+        params.append(project_id)
+    where = " AND ".join(clauses) if clauses else "1=1"
+    conn = _connect()
     try:
-        os.chmod(path, 0o600)
-    except OSError:
-        pass
+        rows = conn.execute(
+            f"SELECT * FROM async_jobs WHERE {where} ORDER BY created_at DESC LIMIT ?",
+            params + [limit],
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_dict(r) for r in rows]
+
+
+def is_valid_job_id(job_id):
+    return bool(job_id) and all(c in "0123456789abcdef" for c in job_id)
 
 
 def poll_result(prefix, job_id, pending_extra=None):
     """Return the result dict, or ``{"status": "pending"}`` if not ready yet.
 
-    *pending_extra* is an optional dict merged into the pending response.
+    Pending responses include ``progress``/``progress_message`` once the
+    worker reports progress. *pending_extra* is an optional dict merged
+    into the pending response.
     """
-    # Validate job_id format to prevent path traversal
-    if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+    if not is_valid_job_id(job_id):
         return {"status": "error", "error": "Invalid job ID"}
-    path = DATA_DIR / f"{prefix}_{job_id}.json"
-    if not path.exists():
-        resp = {"status": "pending"}
-        if pending_extra:
-            resp.update(pending_extra)
+    row = _fetchone(
+        """SELECT state, result_json, error, progress, progress_message
+           FROM async_jobs WHERE id = ? AND prefix = ?""",
+        (job_id, prefix),
+    )
+    result = json.loads(row["result_json"]) if row and row["result_json"] else None
+
+    if row and row["state"] == "cancelled":
+        return {**(result or {}), "status": "cancelled"}
+    if row and row["state"] == "interrupted":
+        return {"status": "error", "error": row["error"]}
+    if result is not None:
+        return result
+    if row and row["state"] in TERMINAL_STATES:
+        resp = {"status": row["state"]}
+        if row["error"]:
+            resp["error"] = row["error"]
         return resp
-    return json.loads(path.read_text())
+
+    resp = {"status": "pending"}
+    if row and row["progress"] is not None:
+        resp["progress"] = row["progress"]
+        resp["progress_message"] = row["progress_message"]
+    if pending_extra:
+        resp.update(pending_extra)
+    return resp
+
+
+def recover_jobs(app=None):
+    """Requeue or fail jobs orphaned by a previous process. Called at startup.
+
+    Handler jobs are requeued (up to MAX_ATTEMPTS runs); everything else is
+    marked interrupted. Returns ``{"requeued": n, "interrupted": m}``.
+    """
+    global _app
+    if app is not None:
+        _app = app
+
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            """SELECT * FROM async_jobs
+               WHERE state IN ('queued', 'running')
+                 AND (owner IS NULL OR owner != ?)
+                 AND (heartbeat_at IS NULL OR heartbeat_at < ?)""",
+            (_PROCESS_TOKEN, time.time() - STALE_AFTER),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    requeued = interrupted = 0
+    for row in rows:
+        handler = _HANDLERS.get(row["handler"]) if row["handler"] else None
+        if handler and row["attempts"] < MAX_ATTEMPTS:
+            claimed = _execute(
+                """UPDATE async_jobs SET state = 'queued', owner = ?, heartbeat_at = ?
+                   WHERE id = ? AND state IN ('queued', 'running')""",
+                (_PROCESS_TOKEN, time.time(), row["id"]),
+            )
+            if claimed:
+                call = json.loads(row["args_json"] or "{}")
+                _dispatch(row["id"], row["prefix"], row["job_class"], row["priority"],
+                          handler, call.get("args", []), call.get("kwargs", {}), _app)
+                requeued += 1
+        else:
+            _execute(
+                """UPDATE async_jobs SET state = 'interrupted', finished_at = ?,
+                       error = 'Interrupted by application restart'
+                   WHERE id = ? AND state IN ('queued', 'running')""",
+                (time.time(), row["id"]),
+            )
+            interrupted += 1
+
+    if requeued or interrupted:
+        logger.info("Recovered async jobs: %d requeued, %d interrupted",
+                    requeued, interrupted)
+    return {"requeued": requeued, "interrupted": interrupted}
+
+
+def purge_finished_jobs(max_age_days=7):
+    """Delete finished jobs older than *max_age_days*. Returns rows deleted."""
+    placeholders = ",".join("?" * len(TERMINAL_STATES))
+    return _execute(
+        f"DELETE FROM async_jobs WHERE state IN ({placeholders}) AND finished_at < ?",
+        (*TERMINAL_STATES, time.time() - 86400 * max_age_days),
+    )
 
 
 def shutdown_pool(wait=True):
-    """Gracefully shut down the thread pool. Called on app exit."""
-    logger.info("Shutting down async job pool (wait=%s)", wait)
+    """Gracefully shut down the worker pools. Called on app exit.
+
+    Jobs still queued stay queued in the database and are recovered on the
+    next start (handler jobs) or marked interrupted.
+    """
+    logger.info("Shutting down async job pools (wait=%s)", wait)
+    for pool in _pools.values():
+        pool.shutdown(wait=wait)
+    _stop_heartbeat()
     _executor.shutdown(wait=wait)
 
 
 # -- internal -----------------------------------------------------------------
 
 def _ensure_result(prefix, job_id, data):
-    """Write a result file only if one doesn't already exist."""
-    path = DATA_DIR / f"{prefix}_{job_id}.json"
-    if not path.exists():
-        path.write_text(json.dumps(data))
-        try:
-            os.chmod(path, 0o600)
-        except OSError:
-            pass
+    """Record an error result unless the job already finished."""
+    state = _state_for_status(data.get("status"))
+    changed = _execute(
+        """UPDATE async_jobs SET state = ?, result_json = ?, error = ?, finished_at = ?
+           WHERE id = ? AND state IN ('queued', 'running')""",
+        (state, json.dumps(data), data.get("error"), time.time(), job_id),
+    )
+    if not changed and not get_job(job_id):
+        write_result(prefix, job_id, data)
+    elif changed:
+        _publish(job_id, "job_finished")
@@ -19,6 +19,18 @@ def require_project_id():
     return pid, None
 
 
+def paged_json(page):
+    """JSON list response for a storage Page.
+
+    The body stays a plain list; the cursor for the next page (pass it back
+    as ``?cursor=``) goes in the X-Next-Cursor header when there is one.
+    """
+    response = jsonify(page)
+    if getattr(page, "next_cursor", None):
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return response
+
+
 def now_iso():
     """Return current UTC time as ISO-8601 string."""
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
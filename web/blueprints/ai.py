@@ -22,7 +22,7 @@ from config import (
 from core.git_sync import sync_to_git_async
 from core.llm import (
     run_cli, is_gemini_model, LLM_BACKEND,
-    instructor_available, run_instructor, run_sdk_cached,
+    instructor_available, run_instructor, run_sdk_cached, stream_text,
 )
 from storage.db import Database
 from web.async_jobs import start_async_job, write_result, poll_result
@@ -495,56 +495,40 @@ def get_similar_status(similar_id):
 
 # --- Chat ---
 
-@ai_bp.route("/api/ai/chat", methods=["POST"])
-def ai_chat():
-    """AI chat with taxonomy data.
+_CHAT_INSTRUCTIONS = """Answer this question using ONLY the data above. Be extremely brief and data-focused.
+Rules:
+- Use bullet points, not paragraphs
+- Include specific company names, numbers, and categories
+- Maximum 5-8 bullet points
+- No preamble or pleasantries"""
 
-    Strategy:
-      1. Instructor + prompt caching on taxonomy context (if available).
-      2. SDK with prompt caching (if SDK available).
-      3. CLI (original path).
 
-    Chat does NOT use web tools, so all SDK paths are available.
+def _chat_context(db, project_id, question):
+    """Prompt context for a chat question and the passages it cites.
+
+    The passages are the best BM25 matches for the question in the
+    project's search index (core.search_index), packed into a token
+    budget. With no match the context lists a few companies so general
+    questions still get an answer.
     """
-    db = current_app.db
-    data = request.json
-    question = data.get("question", "").strip()
-    project_id = data.get("project_id")
-    model = _validate_model(data.get("model")) or DEFAULT_MODEL
-    if not question:
-        return jsonify({"error": "Question is required"}), 400
+    from core.search_index import format_passages, retrieve
 
-    companies = db.get_companies(project_id=project_id, limit=200)
     stats = db.get_stats(project_id=project_id)
     categories = db.get_category_stats(project_id=project_id)
+    passages = retrieve(db, project_id, question) if project_id else []
 
-    # Filter to relevant companies based on message keywords to reduce context
-    keywords = {w for w in question.lower().split() if len(w) > 2}
-    if keywords:
-        relevant = [
-            c for c in companies
-            if any(
-                k in c.get("name", "").lower()
-                or k in (c.get("what") or "").lower()
-                or k in (c.get("category_name") or "").lower()
-                for k in keywords
-            )
-        ]
-        if not relevant:
-            relevant = companies[:20]  # Fallback if no keyword match
-        else:
-            relevant = relevant[:30]  # Cap at 30 relevant companies
-    else:
-        relevant = companies[:30]
-
-    # Build the taxonomy context (cacheable across chat turns)
     context = f"""You have access to a taxonomy database with {stats['total_companies']} companies across {stats['total_categories']} categories.
 
 Categories: {', '.join(c['name'] + f' ({c["company_count"]})' for c in categories if not c.get('parent_id'))}
 
-Companies (name | category | what they do | tags):
 """
-    for c in relevant:
+    if passages:
+        context += ("Records most relevant to the question "
+                    "(numbered, most relevant first):\n\n" + format_passages(passages))
+        return context, passages
+
+    context += "Companies (name | category | what they do | tags):\n"
+    for c in db.get_companies(project_id=project_id, limit=20):
         parts = [c['name']]
         cat = c.get('category_name') or ''
         if cat:
@@ -556,21 +540,45 @@ Companies (name | category | what they do | tags):
         if tags:
             parts.append(tags)
         context += f"- {' | '.join(parts)}\n"
+    return context, passages
 
-    instructions = """Answer this question using ONLY the data above. Be extremely brief and data-focused.
-Rules:
-- Use bullet points, not paragraphs
-- Include specific company names, numbers, and categories
-- Maximum 5-8 bullet points
-- No preamble or pleasantries"""
 
+def _chat_sources(passages):
+    return [{"kind": p["kind"], "id": p["ref_id"], "title": p["title"]} for p in passages]
+
+
+@ai_bp.route("/api/ai/chat", methods=["POST"])
+def ai_chat():
+    """AI chat with taxonomy data.
+
+    The context is retrieved from the project's search index rather than
+    a fixed slice of companies, so any record in the project can ground
+    the answer. Response: {answer, sources: [{kind, id, title}]}
+
+    Strategy:
+      1. Instructor + prompt caching on taxonomy context (if available).
+      2. SDK with prompt caching (if SDK available).
+      3. CLI (original path).
+
+    Chat does NOT use web tools, so all SDK paths are available.
+    """
+    db = current_app.db
+    data = request.json
+    question = data.get("question", "").strip()
+    project_id = data.get("project_id")
+    model = _validate_model(data.get("model")) or DEFAULT_MODEL
+    if not question:
+        return jsonify({"error": "Question is required"}), 400
+
+    context, passages = _chat_context(db, project_id, question)
+    sources = _chat_sources(passages)
     safe_question = _sanitize_for_prompt(question)
 
     # --- Path 1: Instructor (SDK + Pydantic + prompt caching) ---
     if instructor_available() and ChatResponse is not None:
         try:
             result, meta = run_instructor(
-                f"{instructions}\n\nQuestion: {safe_question}",
+                f"{_CHAT_INSTRUCTIONS}\n\nQuestion: {safe_question}",
                 model,
                 response_model=ChatResponse,
                 timeout=60,
@@ -578,19 +586,19 @@ Rules:
                 context=context,
             )
             logger.info("Instructor chat completed in %dms", meta.get("duration_ms", 0))
-            return jsonify({"answer": result.answer})
+            return jsonify({"answer": result.answer, "sources": sources})
         except Exception as e:
             logger.warning("Instructor chat failed, falling back: %s", e)
 
     # --- Path 2: SDK with prompt caching ---
     try:
         response = run_sdk_cached(
-            f"{instructions}\n\nQuestion: {safe_question}",
+            f"{_CHAT_INSTRUCTIONS}\n\nQuestion: {safe_question}",
             model, timeout=60,
             context=context,
         )
         answer = response.get("result", "")
-        return jsonify({"answer": answer})
+        return jsonify({"answer": answer, "sources": sources})
     except subprocess.TimeoutExpired:
         return jsonify({"error": "Request timed out. Try a simpler question."}), 500
     except json.JSONDecodeError:
@@ -598,16 +606,64 @@ Rules:
     except Exception as e:
         # Final fallback: plain run_cli with full prompt
         try:
-            full_prompt = f"{context}\n\n{instructions}\n\nQuestion: {safe_question}"
+            full_prompt = f"{context}\n\n{_CHAT_INSTRUCTIONS}\n\nQuestion: {safe_question}"
             response = run_cli(full_prompt, model, timeout=60,
                               project_id=project_id, operation="ai_context")
             answer = response.get("result", "")
-            return jsonify({"answer": answer})
+            return jsonify({"answer": answer, "sources": sources})
         except Exception as e2:
             logger.error("Chat failed (all paths): %s", e2)
             return jsonify({"error": "An internal error occurred. Check logs for details."}), 500
 
 
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@ai_bp.route("/api/ai/chat/stream", methods=["POST"])
+def ai_chat_stream():
+    """AI chat streamed as server-sent events.
+
+    Same retrieval as /api/ai/chat. Events, in order: ``sources`` (the
+    cited records), ``token`` ({text}) for each chunk of the answer as the
+    model produces it, then ``done`` — or ``error`` ({error}) if the call
+    fails part-way.
+    """
+    db = current_app.db
+    data = request.json or {}
+    question = data.get("question", "").strip()
+    project_id = data.get("project_id")
+    model = _validate_model(data.get("model")) or DEFAULT_MODEL
+    if not question:
+        return jsonify({"error": "Question is required"}), 400
+
+    # Retrieval runs before the response starts so errors here are plain 500s
+    context, passages = _chat_context(db, project_id, question)
+    prompt = f"{_CHAT_INSTRUCTIONS}\n\nQuestion: {_sanitize_for_prompt(question)}"
+
+    def generate():
+        yield _sse("sources", {"sources": _chat_sources(passages)})
+        try:
+            for text in stream_text(prompt, model, timeout=60, context=context,
+                                    max_tokens=2048, project_id=project_id,
+                                    operation="ai_chat"):
+                yield _sse("token", {"text": text})
+        except subprocess.TimeoutExpired:
+            yield _sse("error", {"error": "Request timed out. Try a simpler question."})
+            return
+        except Exception as e:
+            logger.error("Streaming chat failed: %s", e)
+            yield _sse("error", {"error": "An internal error occurred. Check logs for details."})
+            return
+        yield _sse("done", {})
+
+    return current_app.response_class(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # --- Market Report ---
 
 def _run_market_report(job_id, category_name, project_id, model):
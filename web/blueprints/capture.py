@@ -7,12 +7,12 @@ Endpoints:
     GET  /api/capture/bulk/<id>     — Poll bulk capture job status
     POST /api/evidence/upload       — Manual file upload
     GET  /api/evidence/<id>/file    — Serve evidence file
+    GET  /api/evidence/<id>/text    — Derived text + metadata (sidecar)
     DELETE /api/evidence/<id>/file  — Delete evidence file + record
     GET  /api/evidence/stats        — Evidence storage stats for a project
 """
 import ipaddress
 import json
-import threading
 from datetime import datetime
 from urllib.parse import urlparse
 
@@ -26,11 +26,22 @@ from core.capture import (
     evidence_path_absolute,
     delete_file,
     get_mime_type,
+    load_evidence_text,
+    read_text_metadata,
     validate_upload,
     ALLOWED_EVIDENCE_TYPES,
     MAX_UPLOAD_SIZE,
 )
 
+from web.async_jobs import (
+    enqueue,
+    get_job,
+    is_valid_job_id,
+    list_jobs,
+    register_handler,
+    write_result,
+)
+
 from ._utils import is_safe_url as _is_safe_url
 
 capture_bp = Blueprint("capture", __name__)
@@ -263,6 +274,32 @@ def serve_evidence_file(evidence_id):
     return send_file(abs_path, mimetype=mime)
 
 
+@capture_bp.route("/api/evidence/<int:evidence_id>/text")
+def serve_evidence_text(evidence_id):
+    """Return the derived text of an evidence file with its sidecar metadata.
+
+    The sidecar is generated on first request for evidence captured before
+    text derivation existed.
+    """
+    record = current_app.db.get_evidence_by_id(evidence_id)
+    if not record:
+        return jsonify({"error": "Evidence not found"}), 404
+
+    relative_path = record["file_path"]
+    if not evidence_path_absolute(relative_path).exists():
+        return jsonify({"error": "Evidence file not found on disk"}), 404
+
+    text = load_evidence_text(relative_path)
+    if text is None:
+        return jsonify({"error": "No text could be derived from this evidence"}), 422
+
+    return jsonify({
+        "evidence_id": evidence_id,
+        "text": text,
+        "metadata": read_text_metadata(relative_path) or {},
+    })
+
+
 # ── Evidence File Deletion (file + record) ────────────────────
 
 @capture_bp.route("/api/evidence/<int:evidence_id>/file", methods=["DELETE"])
@@ -337,16 +374,37 @@ def evidence_stats():
 
 
 # ── Background Capture Jobs ──────────────────────────────────
-
-_capture_jobs = {}  # job_id -> {"status": ..., "result": ..., "type": ...}
-_job_lock = threading.Lock()
-_job_counter = 0
+#
+# Single async captures run on the job queue's browser pool as a registered
+# handler, so a capture queued when the app stops is retried on restart.
+
+@register_handler("capture")
+def _run_capture_job(job_id, capture_type, url, project_id, entity_id, kwargs):
+    """Queue worker for one async capture (runs inside the app context)."""
+    job = get_job(job_id) or {}
+    info = {k: v for k, v in (job.get("result") or {}).items()
+            if k in ("type", "url", "started_at")}
+    db = current_app.db
+    if capture_type == "website":
+        result = capture_website(
+            url=url, project_id=project_id, entity_id=entity_id,
+            db=db, **kwargs,
+        )
+    else:
+        result = capture_document(
+            url=url, project_id=project_id, entity_id=entity_id, db=db,
+        )
+    write_result("capture", job_id, {
+        **info,
+        "status": "completed" if result.success else "failed",
+        "result": result.to_dict(),
+    })
 
 
 def _start_capture_job(app, capture_type: str, url: str,
                        project_id: int, entity_id: int,
                        kwargs: dict) -> str:
-    """Start a capture job in a background thread.
+    """Queue a capture job on the browser worker pool.
 
     Args:
         app: Flask application instance (not the proxy)
@@ -356,61 +414,43 @@ def _start_capture_job(app, capture_type: str, url: str,
         entity_id: Entity ID
         kwargs: Additional capture kwargs
     """
-    global _job_counter
-    with _job_lock:
-        _job_counter += 1
-        job_id = f"capture_{_job_counter}"
-        _capture_jobs[job_id] = {
+    return enqueue(
+        "capture", capture_type, url, project_id, entity_id, kwargs,
+        project_id=project_id, app=app,
+        initial_result={
             "status": "running",
             "type": capture_type,
             "url": url,
             "result": None,
             "started_at": datetime.now().isoformat(),
-        }
+        },
+    )
+
 
-    def _run():
-        with app.app_context():
-            if capture_type == "website":
-                result = capture_website(
-                    url=url, project_id=project_id, entity_id=entity_id,
-                    db=app.db, **kwargs,
-                )
-            elif capture_type == "document":
-                result = capture_document(
-                    url=url, project_id=project_id, entity_id=entity_id,
-                    db=app.db,
-                )
-            else:
-                result = None
-
-            with _job_lock:
-                _capture_jobs[job_id]["status"] = "completed" if (result and result.success) else "failed"
-                _capture_jobs[job_id]["result"] = result.to_dict() if result else None
-
-    thread = threading.Thread(target=_run, daemon=True)
-    thread.start()
-    return job_id
+def _capture_job_view(job):
+    """Shape a queue job like the original in-memory capture job record."""
+    view = dict(job["result"] or {})
+    if job["state"] in ("queued", "cancelled", "interrupted") or "status" not in view:
+        view["status"] = job["state"]
+    if job.get("error"):
+        view["error"] = job["error"]
+    return view
 
 
 @capture_bp.route("/api/capture/jobs/<job_id>")
 def get_capture_job(job_id):
     """Get the status of a background capture job."""
-    with _job_lock:
-        job = _capture_jobs.get(job_id)
-    if not job:
+    job = get_job(job_id) if is_valid_job_id(job_id) else None
+    if not job or job["prefix"] != "capture":
         return jsonify({"error": "Job not found"}), 404
-    return jsonify(job)
+    return jsonify(_capture_job_view(job))
 
 
 @capture_bp.route("/api/capture/jobs")
 def list_capture_jobs():
-    """List all capture jobs (most recent first)."""
-    with _job_lock:
-        jobs = dict(_capture_jobs)
-    result = []
-    for jid, jdata in sorted(jobs.items(), reverse=True):
-        result.append({"id": jid, **jdata})
-    return jsonify(result)
+    """List recent capture jobs (most recent first)."""
+    jobs = list_jobs(prefix="capture", limit=100)
+    return jsonify([{"id": j["id"], **_capture_job_view(j)} for j in jobs])
 
 
 # ── Bulk Capture ──────────────────────────────────────────────
@@ -476,8 +516,9 @@ def _run_bulk_capture(job_id, app, project_id, items):
     """Background worker for bulk capture.
 
     Iterates over items, captures each URL, writes progress updates.
+    Stops between items once the job is cancelled.
     """
-    from web.async_jobs import write_result
+    from web.async_jobs import report_progress
 
     total = len(items)
     results = []
@@ -542,6 +583,9 @@ def _run_bulk_capture(job_id, app, project_id, items):
                 "failed": failed,
                 "results": results,
             })
+            if completed < total:
+                report_progress(job_id, completed / total,
+                                f"{completed}/{total} captured", project_id=project_id)
 
     # Final write (in case the loop-end write had status "running")
     write_result("bulk_capture", job_id, {
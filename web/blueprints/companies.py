@@ -16,9 +16,12 @@ from core.compat import (
     create_entity_from_company_data,
     update_entity_from_company_data,
 )
+from core.export_scheduler import schedule_export
+from storage.pagination import InvalidCursor
 from web.async_jobs import start_async_job, write_result, poll_result
 from web.notifications import notify_sse
-from storage.export import export_markdown, export_json
+
+from ._utils import paged_json
 
 companies_bp = Blueprint("companies", __name__)
 
@@ -30,19 +33,6 @@ def list_companies():
     db = current_app.db
     project_id = request.args.get("project_id", type=int)
 
-    # Entity-mode delegation
-    if project_uses_entities(db, project_id):
-        companies = list_entities_as_companies(
-            db, project_id,
-            category_id=request.args.get("category_id", type=int),
-            search=request.args.get("search"),
-            starred_only=request.args.get("starred") == "1",
-            sort_by=request.args.get("sort_by", "name"),
-            sort_dir=request.args.get("sort_dir", "asc"),
-            offset=max(0, request.args.get("offset", 0, type=int)),
-        )
-        return jsonify(companies)
-
     category_id = request.args.get("category_id", type=int)
     search = request.args.get("search")
     starred_only = request.args.get("starred") == "1"
@@ -55,15 +45,29 @@ def list_companies():
     funding_stage = request.args.get("funding_stage")
     relationship_status = request.args.get("relationship_status")
     offset = max(0, request.args.get("offset", 0, type=int))
+    cursor = request.args.get("cursor")
 
-    companies = db.get_companies(
-        project_id=project_id, category_id=category_id, search=search,
-        starred_only=starred_only, needs_enrichment=needs_enrichment,
-        sort_by=sort_by, sort_dir=sort_dir, offset=offset,
-        tags=tags, geography=geography, funding_stage=funding_stage,
-        relationship_status=relationship_status,
-    )
-    return jsonify(companies)
+    try:
+        # Entity-mode delegation
+        if project_uses_entities(db, project_id):
+            return paged_json(list_entities_as_companies(
+                db, project_id,
+                category_id=category_id, search=search, starred_only=starred_only,
+                needs_enrichment=needs_enrichment, sort_by=sort_by, sort_dir=sort_dir,
+                offset=offset, cursor=cursor, tags=tags, geography=geography,
+                funding_stage=funding_stage, relationship_status=relationship_status,
+            ))
+
+        companies = db.get_companies(
+            project_id=project_id, category_id=category_id, search=search,
+            starred_only=starred_only, needs_enrichment=needs_enrichment,
+            sort_by=sort_by, sort_dir=sort_dir, offset=offset, cursor=cursor,
+            tags=tags, geography=geography, funding_stage=funding_stage,
+            relationship_status=relationship_status,
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return paged_json(companies)
 
 
 @companies_bp.route("/api/companies/<int:company_id>")
@@ -123,8 +127,7 @@ def update_company(company_id):
         return jsonify({"status": "ok"})
 
     db.update_company(company_id, fields)
-    export_markdown(db, project_id=project_id)
-    export_json(db, project_id=project_id)
+    schedule_export(db, project_id=project_id)
     company = db.get_company(company_id)
     name = company["name"] if company else f"#{company_id}"
     if project_id:
@@ -148,6 +151,7 @@ def delete_company(company_id):
                 (company_id,),
             )
             conn.commit()
+        db.invalidate_entity_mode(entity_company.get("project_id"))
         project_id = entity_company.get("project_id")
         if project_id:
             db.log_activity(project_id, "company_deleted",
@@ -378,6 +382,7 @@ def restore_company(company_id):
                 (company_id,),
             )
             conn.commit()
+        db.invalidate_entity_mode(entity["project_id"])
         if entity["project_id"]:
             db.log_activity(entity["project_id"], "company_restored",
                             f"Restored {entity['name']} from trash",
@@ -409,6 +414,7 @@ def permanent_delete(company_id):
             conn.execute("DELETE FROM evidence WHERE entity_id = ?", (company_id,))
             conn.execute("DELETE FROM entities WHERE id = ?", (company_id,))
             conn.commit()
+        db.invalidate_entity_mode()
         return jsonify({"status": "ok"})
 
     current_app.db.permanently_delete(company_id)
@@ -559,6 +565,8 @@ def bulk_action():
             else:
                 db.delete_company(cid)
             updated += 1
+        if _is_entity:
+            db.invalidate_entity_mode()
 
     else:
         return jsonify({"error": f"Unknown action: {action}"}), 400
@@ -4,6 +4,7 @@ Provides endpoints for:
 - Cost summary by model and operation
 - Daily cost trends
 - Project budget management (get/set)
+- mcp_cache statistics and maintenance
 """
 from flask import Blueprint, request, jsonify, current_app
 from loguru import logger
@@ -211,3 +212,45 @@ def set_budget():
 
     logger.info("Budget set for project {}: ${}", pid, budget_usd)
     return jsonify({"status": "ok", "project_id": pid, "budget_usd": budget_usd})
+
+
+# ── GET /api/costs/cache ─────────────────────────────────────
+
+@costs_bp.route("/api/costs/cache")
+def cache_stats():
+    """Return mcp_cache size, bytes and hit rate per source."""
+    from core.mcp_client import get_cache_stats
+
+    conn = current_app.db._get_conn()
+    try:
+        stats = get_cache_stats(conn)
+    finally:
+        conn.close()
+    return jsonify(stats)
+
+
+# ── GET /api/costs/cache/responses ───────────────────────────
+
+@costs_bp.route("/api/costs/cache/responses")
+def response_cache_stats():
+    """Return lens/report response cache hit rates and tier sizes."""
+    from web.response_cache import response_cache
+
+    stats = response_cache.stats()
+    stats["store"] = current_app.db.get_response_cache_stats()
+    return jsonify(stats)
+
+
+# ── POST /api/costs/cache/maintenance ────────────────────────
+
+@costs_bp.route("/api/costs/cache/maintenance", methods=["POST"])
+def cache_maintenance():
+    """Run an expiry sweep and budget eviction on mcp_cache immediately."""
+    from core.mcp_client import run_cache_maintenance
+
+    conn = current_app.db._get_conn()
+    try:
+        summary = run_cache_maintenance(conn)
+    finally:
+        conn.close()
+    return jsonify({"status": "ok", **summary})
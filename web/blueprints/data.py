@@ -1,11 +1,13 @@
 """Data API: export, import, stats, charts, filters, tags, views, map layouts."""
-import csv
 import io
+from pathlib import Path
 
-from flask import Blueprint, current_app, jsonify, request, send_file
+from flask import Blueprint, current_app, jsonify, request
+from loguru import logger
 
+from core.bulk_import import SUPPORTED_EXTENSIONS, import_companies, iter_rows
 from core.git_sync import sync_to_git_async
-from storage.export import export_csv, export_json, export_markdown
+from storage.export import iter_csv, iter_json, iter_markdown
 from web.notifications import notify_sse
 
 data_bp = Blueprint("data", __name__)
@@ -13,31 +15,72 @@ data_bp = Blueprint("data", __name__)
 
 # --- Export ---
 
+def _stream_download(chunks, filename, mimetype):
+    """Stream an export straight to the client without a temp file."""
+    return current_app.response_class(
+        chunks,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @data_bp.route("/api/export/json")
 def download_json():
     project_id = request.args.get("project_id", type=int)
-    path = export_json(current_app.db, project_id=project_id)
-    return send_file(path, as_attachment=True, download_name="taxonomy_data.json")
+    return _stream_download(iter_json(current_app.db, project_id=project_id),
+                            "taxonomy_data.json", "application/json")
 
 
 @data_bp.route("/api/export/md")
 def download_md():
     project_id = request.args.get("project_id", type=int)
-    path = export_markdown(current_app.db, project_id=project_id)
-    return send_file(path, as_attachment=True, download_name="taxonomy_master.md")
+    return _stream_download(iter_markdown(current_app.db, project_id=project_id),
+                            "taxonomy_master.md", "text/markdown")
 
 
 @data_bp.route("/api/export/csv")
 def download_csv():
     project_id = request.args.get("project_id", type=int)
-    path = export_csv(current_app.db, project_id=project_id)
-    return send_file(path, as_attachment=True, download_name="taxonomy_export.csv")
+    return _stream_download(iter_csv(current_app.db, project_id=project_id),
+                            "taxonomy_export.csv", "text/csv")
+
+
+@data_bp.route("/api/export/analytics", methods=["POST"])
+def export_analytics():
+    """Write the project's columnar analytics tables (Parquet/Feather) under DATA_DIR."""
+    from storage.columnar import export_columnar
 
+    data = request.json or {}
+    project_id = data.get("project_id")
+    if not project_id:
+        return jsonify({"error": "project_id is required"}), 400
+    try:
+        result = export_columnar(current_app.db, project_id,
+                                 fmt=data.get("format", "parquet"),
+                                 full=bool(data.get("full")))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ImportError as e:
+        return jsonify({"error": str(e)}), 501
+    return jsonify(result)
+
+
+# --- CSV / XLSX Import ---
+
+MAX_IMPORT_SIZE = 25 * 1024 * 1024  # 25 MB
+MAX_IMPORT_ROWS = 50000
+# Row errors returned in the response; the full count is always reported
+MAX_REPORTED_ERRORS = 500
 
-# --- CSV Import ---
 
 @data_bp.route("/api/import/csv", methods=["POST"])
 def import_csv():
+    """Bulk-import companies from a CSV or XLSX upload.
+
+    Rows are streamed from the upload, validated in chunks and written in
+    one transaction. ``skip_existing=1`` leaves companies already in the
+    project untouched instead of updating them.
+    """
     db = current_app.db
     project_id = request.form.get("project_id", type=int)
     if not project_id:
@@ -45,24 +88,43 @@ def import_csv():
     file = request.files.get("file")
     if not file:
         return jsonify({"error": "No file uploaded"}), 400
-
-    MAX_CSV_SIZE = 10 * 1024 * 1024  # 10 MB
-    content_bytes = file.stream.read(MAX_CSV_SIZE + 1)
-    if len(content_bytes) > MAX_CSV_SIZE:
-        return jsonify({"error": "CSV file too large (max 10MB)"}), 400
-    content = content_bytes.decode("utf-8", errors="replace")
-    reader = csv.DictReader(io.StringIO(content))
-    rows = list(reader)
-    if len(rows) > 10000:
-        return jsonify({"error": "Too many rows (max 10,000)"}), 400
-    imported = db.import_companies_from_rows(rows, project_id)
+    filename = file.filename or "upload.csv"
+    if Path(filename).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        return jsonify({"error": "Unsupported file type (use .csv or .xlsx)"}), 400
+
+    file.stream.seek(0, io.SEEK_END)
+    if file.stream.tell() > MAX_IMPORT_SIZE:
+        return jsonify({"error": "Import file too large (max 25MB)"}), 400
+    file.stream.seek(0)
+
+    try:
+        report = import_companies(
+            db, project_id, iter_rows(file.stream, filename),
+            skip_existing=request.form.get("skip_existing") in ("1", "true"),
+            max_rows=MAX_IMPORT_ROWS,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.warning("Import of {} failed: {}", filename, e)
+        return jsonify({"error": "Could not read the uploaded file"}), 400
+
+    imported = report["created"] + report["updated"]
     db.log_activity(project_id, "csv_imported",
-                    f"Imported {imported} companies from CSV ({len(rows)} rows)",
+                    f"Imported {imported} companies from {filename} "
+                    f"({report['total_rows']} rows, {report['skipped']} skipped)",
                     "project", project_id)
     notify_sse(project_id, "company_added",
                {"count": imported, "source": "csv_import"})
     sync_to_git_async(f"CSV import: {imported} companies")
-    return jsonify({"imported": imported, "total_rows": len(rows)})
+    return jsonify({
+        "imported": imported,
+        "created": report["created"],
+        "updated": report["updated"],
+        "skipped": report["skipped"],
+        "total_rows": report["total_rows"],
+        "errors": report["errors"][:MAX_REPORTED_ERRORS],
+    })
 
 
 # --- Stats & Charts ---
@@ -232,7 +232,9 @@ def feature_landscape():
     if not project_id:
         return jsonify({"error": "project_id is required"}), 400
 
-    title = f"Feature Landscape{' \u2014 ' + category_filter if category_filter else ''}"
+    title = "Feature Landscape"
+    if category_filter:
+        title += f" \u2014 {category_filter}"
     analysis_id = db.save_analysis(
         project_id, "feature_landscape", title=title,
         parameters={"category": category_filter, "model": model},
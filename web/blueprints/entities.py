@@ -14,10 +14,14 @@ import logging
 from flask import Blueprint, current_app, jsonify, request
 
 from config import RESEARCH_MODEL
+from core.entity_graph import DEFAULT_GRAPH_LIMIT, build_graph
 from core.schema import (
     validate_schema, normalize_schema, get_type_hierarchy,
     SCHEMA_TEMPLATES,
 )
+from storage.pagination import InvalidCursor
+
+from ._utils import paged_json
 
 logger = logging.getLogger(__name__)
 
@@ -614,22 +618,27 @@ def list_entities():
     offset = request.args.get("offset", type=int)
     if offset is not None:
         offset = max(0, offset)
+    cursor = request.args.get("cursor")
 
     # Handle "root" as special parent_id value
     if parent_id and parent_id != "root":
         parent_id = int(parent_id)
 
-    entities = current_app.db.get_entities(
-        project_id,
-        type_slug=type_slug,
-        parent_entity_id=parent_id,
-        category_id=category_id,
-        search=search,
-        sort_by=sort_by,
-        limit=limit,
-        offset=offset,
-    )
-    return jsonify(entities)
+    try:
+        entities = current_app.db.get_entities(
+            project_id,
+            type_slug=type_slug,
+            parent_entity_id=parent_id,
+            category_id=category_id,
+            search=search,
+            sort_by=sort_by,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return paged_json(entities)
 
 
 @entities_bp.route("/api/entities/<int:entity_id>")
@@ -964,73 +973,38 @@ def entity_stats():
 def entity_graph():
     """Get entities and relationships as graph nodes + edges for KG views.
 
-    Returns: {nodes: [{id, name, type, attributes, ...}], edges: [{from, to, type, ...}]}
+    Query params:
+        project_id: required
+        type: only entities of this type
+        limit: max nodes (default 200, max 5000)
+        focus: entity id; return its k-hop neighbourhood instead
+        depth: hops from focus (default 1, max 4)
+        attrs: comma-separated attribute slugs to include as attr_<slug>
+               ("*" for all; none by default)
+        layout: 1 to add cached force-layout x/y to every node
+
+    Returns: {nodes: [{id, entity_id, name, type, ...}],
+              edges: [{source, target, type, label}], version, truncated}
     """
     project_id = request.args.get("project_id", type=int)
     if not project_id:
         return jsonify({"error": "project_id is required"}), 400
 
-    type_slug = request.args.get("type")
-    limit = request.args.get("limit", 200, type=int)
-
-    entities = current_app.db.get_entities(
-        project_id,
-        type_slug=type_slug,
-        limit=limit,
-        include_attributes=True,
-    )
-
-    nodes = []
-    all_entity_ids = {e["id"] for e in entities}
-
-    for e in entities:
-        node = {
-            "id": f"entity-{e['id']}",
-            "entity_id": e["id"],
-            "name": e["name"],
-            "type": e["type_slug"],
-            "parent_entity_id": e.get("parent_entity_id"),
-            "child_count": e.get("child_count", 0),
-            "evidence_count": e.get("evidence_count", 0),
-            "is_starred": e.get("is_starred", False),
-            "category_id": e.get("category_id"),
-        }
-        # Flatten top-level attributes for display
-        attrs = e.get("attributes", {})
-        for attr_slug, attr_data in attrs.items():
-            val = attr_data["value"] if isinstance(attr_data, dict) else attr_data
-            node[f"attr_{attr_slug}"] = val
-        nodes.append(node)
-
-    # Collect edges: parent-child (hierarchy) + explicit relationships
-    edges = []
-
-    # Hierarchy edges
-    for e in entities:
-        if e.get("parent_entity_id") and e["parent_entity_id"] in all_entity_ids:
-            edges.append({
-                "source": f"entity-{e['parent_entity_id']}",
-                "target": f"entity-{e['id']}",
-                "type": "has_child",
-                "label": "has",
-            })
-
-    # Explicit entity relationships
-    for e in entities:
-        try:
-            rels = current_app.db.get_entity_relationships(e["id"], direction="outgoing")
-            for rel in rels:
-                if rel["to_entity_id"] in all_entity_ids:
-                    edges.append({
-                        "source": f"entity-{rel['from_entity_id']}",
-                        "target": f"entity-{rel['to_entity_id']}",
-                        "type": rel["relationship_type"],
-                        "label": rel["relationship_type"],
-                    })
-        except Exception:
-            pass
-
-    return jsonify({"nodes": nodes, "edges": edges})
+    attrs_param = request.args.get("attrs", "").strip()
+    if attrs_param == "*":
+        attrs = None
+    else:
+        attrs = [s.strip() for s in attrs_param.split(",") if s.strip()]
+
+    return jsonify(build_graph(
+        current_app.db, project_id,
+        type_slug=request.args.get("type"),
+        focus=request.args.get("focus", type=int),
+        depth=request.args.get("depth", 1, type=int),
+        limit=request.args.get("limit", DEFAULT_GRAPH_LIMIT, type=int),
+        attrs=attrs,
+        layout=request.args.get("layout") in ("1", "true"),
+    ))
 
 
 @entities_bp.route("/api/entity-locations")
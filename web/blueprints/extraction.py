@@ -3,6 +3,9 @@
 Endpoints:
     POST /api/extract                    — Trigger extraction for an entity
     POST /api/extract/from-url           — Extract from a URL directly
+    POST /api/extract/bulk               — Plan + run project-wide extraction (background)
+    GET  /api/extract/bulk/<key>         — Bulk extraction progress
+    POST /api/extract/bulk/<key>/cancel  — Cancel a bulk extraction
     POST /api/extract/classify           — Classify content and extract with specialized extractor
     GET  /api/extract/extractors         — List available document extractors
     GET  /api/extract/jobs               — List extraction jobs
@@ -15,109 +18,139 @@ Endpoints:
     GET  /api/extract/contradictions     — Detect contradictions for an entity
     GET  /api/extract/stats              — Extraction statistics for a project
 """
-import threading
-
 from flask import Blueprint, request, jsonify, current_app
 from loguru import logger
 
+from storage.pagination import InvalidCursor
+from web.async_jobs import (
+    JobCancelled,
+    cancel_job,
+    get_job,
+    is_cancelled,
+    is_valid_job_id,
+    list_jobs,
+    report_progress,
+    submit_job,
+    write_result,
+)
+
+from ._utils import paged_json
+
 extraction_bp = Blueprint("extraction", __name__)
 
 # ── Background Jobs ──────────────────────────────────────────
+#
+# Both job kinds run on the async job queue's LLM pool (web.async_jobs).
+
+def _run_extraction_job(job_id, app, entity_id, evidence_id, project_id, model):
+    """Queue worker: extract one entity from one (or all of its) evidence."""
+    base = {"entity_id": entity_id, "evidence_id": evidence_id}
+
+    def _fail(error):
+        write_result("extract", job_id, {**base, "status": "failed",
+                                         "result": {"error": error}})
+
+    with app.app_context():
+        try:
+            db = current_app.db
+            entity = db.get_entity(entity_id)
+            if not entity:
+                return _fail("Entity not found")
+
+            pid = project_id or entity["project_id"]
+            type_def = db.get_entity_type_def(pid, entity["type_slug"])
+            if not type_def:
+                return _fail("Entity type not found")
+
+            if evidence_id:
+                evidence = db.get_evidence_by_id(evidence_id)
+                if not evidence:
+                    return _fail("Evidence not found")
+                from core.extraction import extract_from_evidence
+                result = extract_from_evidence(
+                    evidence=evidence, entity=entity,
+                    schema_type_def=type_def, db=db, model=model,
+                )
+            else:
+                # Extract from all text-based evidence for this entity
+                all_evidence = db.get_evidence(entity_id=entity_id)
+                from core.extraction import extract_from_evidence, ExtractionResult
+                combined_attrs = []
+                total_cost = 0.0
+                total_duration = 0
+
+                for ev in all_evidence:
+                    r = extract_from_evidence(
+                        evidence=ev, entity=entity,
+                        schema_type_def=type_def, db=db, model=model,
+                    )
+                    if r.success:
+                        combined_attrs.extend(r.extracted_attributes)
+                        total_cost += r.cost_usd
+                        total_duration += r.duration_ms
+
+                result = ExtractionResult(
+                    success=len(combined_attrs) > 0,
+                    entity_id=entity_id,
+                    extracted_attributes=combined_attrs,
+                    model=model,
+                    cost_usd=total_cost,
+                    duration_ms=total_duration,
+                    error="No extractable evidence found" if not combined_attrs and all_evidence else None,
+                )
+
+            write_result("extract", job_id, {**base, "status": "completed",
+                                             "result": result.to_dict()})
 
-_extraction_jobs = {}  # {job_key: {status, result, ...}}
-_job_lock = threading.Lock()
-_job_counter = 0
+        except Exception as e:
+            logger.error("Extraction job %s failed: %s", job_id, e)
+            _fail(str(e))
 
 
 def _start_extraction_job(app, entity_id, evidence_id=None,
                           project_id=None, model=None):
-    """Start an extraction job in a background thread.
+    """Queue an extraction job.
 
     Returns: job_key (str)
     """
-    global _job_counter
-    with _job_lock:
-        _job_counter += 1
-        job_key = f"extract_{_job_counter}"
-        _extraction_jobs[job_key] = {
-            "status": "running",
-            "entity_id": entity_id,
-            "evidence_id": evidence_id,
-            "result": None,
-        }
-
-    def _run():
-        with app.app_context():
-            try:
-                db = current_app.db
-                entity = db.get_entity(entity_id)
-                if not entity:
-                    with _job_lock:
-                        _extraction_jobs[job_key]["status"] = "failed"
-                        _extraction_jobs[job_key]["result"] = {"error": "Entity not found"}
-                    return
-
-                pid = project_id or entity["project_id"]
-                type_def = db.get_entity_type_def(pid, entity["type_slug"])
-                if not type_def:
-                    with _job_lock:
-                        _extraction_jobs[job_key]["status"] = "failed"
-                        _extraction_jobs[job_key]["result"] = {"error": "Entity type not found"}
-                    return
-
-                if evidence_id:
-                    evidence = db.get_evidence_by_id(evidence_id)
-                    if not evidence:
-                        with _job_lock:
-                            _extraction_jobs[job_key]["status"] = "failed"
-                            _extraction_jobs[job_key]["result"] = {"error": "Evidence not found"}
-                        return
-                    from core.extraction import extract_from_evidence
-                    result = extract_from_evidence(
-                        evidence=evidence, entity=entity,
-                        schema_type_def=type_def, db=db, model=model,
-                    )
-                else:
-                    # Extract from all text-based evidence for this entity
-                    all_evidence = db.get_evidence(entity_id=entity_id)
-                    from core.extraction import extract_from_evidence, ExtractionResult
-                    combined_attrs = []
-                    total_cost = 0.0
-                    total_duration = 0
-
-                    for ev in all_evidence:
-                        r = extract_from_evidence(
-                            evidence=ev, entity=entity,
-                            schema_type_def=type_def, db=db, model=model,
-                        )
-                        if r.success:
-                            combined_attrs.extend(r.extracted_attributes)
-                            total_cost += r.cost_usd
-                            total_duration += r.duration_ms
-
-                    result = ExtractionResult(
-                        success=len(combined_attrs) > 0,
-                        entity_id=entity_id,
-                        extracted_attributes=combined_attrs,
-                        model=model,
-                        cost_usd=total_cost,
-                        duration_ms=total_duration,
-                        error="No extractable evidence found" if not combined_attrs and all_evidence else None,
-                    )
+    return submit_job(
+        "extract", _run_extraction_job,
+        args=(app, entity_id, evidence_id, project_id, model),
+        project_id=project_id,
+        initial_result={"status": "running", "entity_id": entity_id,
+                        "evidence_id": evidence_id, "result": None},
+    )
 
-                with _job_lock:
-                    _extraction_jobs[job_key]["status"] = "completed"
-                    _extraction_jobs[job_key]["result"] = result.to_dict()
 
-            except Exception as e:
-                logger.error("Extraction job %s failed: %s", job_key, e)
-                with _job_lock:
-                    _extraction_jobs[job_key]["status"] = "failed"
-                    _extraction_jobs[job_key]["result"] = {"error": str(e)}
+def _job_view(job):
+    """A queue job's last result, with the queue state where it is more current."""
+    view = dict(job["result"] or {})
+    if job["state"] == "queued":
+        view["status"] = "pending"
+    elif job["state"] in ("cancelled", "interrupted") or "status" not in view:
+        view["status"] = job["state"]
+    return view
 
-    t = threading.Thread(target=_run, daemon=True)
-    t.start()
-    return job_key
+
+def _run_bulk_extraction(job_id, db, plan, model, concurrency):
+    """Queue worker: run a bulk extraction plan, mirroring progress into the job."""
+    from core.bulk_extraction import BulkExtractionJob
+
+    def _on_progress(job):
+        if is_cancelled(job_id):
+            job.cancel()
+            return
+        snapshot = job.to_dict()
+        write_result("bulk_extract", job_id, snapshot)
+        done, total = snapshot["progress"]["tasks_done"], snapshot["progress"]["tasks_total"]
+        try:
+            report_progress(job_id, done / total if total else 1.0, f"{done}/{total} tasks")
+        except JobCancelled:
+            job.cancel()
+
+    job = BulkExtractionJob(db, plan, model=model, concurrency=concurrency,
+                            on_progress=_on_progress)
+    write_result("bulk_extract", job_id, job.run())
 
 
 # ── Endpoints ────────────────────────────────────────────────
@@ -297,18 +330,15 @@ def delete_extraction_job(job_id):
 
 @extraction_bp.route("/api/extract/async-jobs", methods=["GET"])
 def list_async_jobs():
-    """List in-memory async extraction jobs."""
+    """List queued/running/finished async extraction jobs."""
     job_key = request.args.get("job_key")
     if job_key:
-        with _job_lock:
-            job = _extraction_jobs.get(job_key)
-        if not job:
+        job = get_job(job_key) if is_valid_job_id(job_key) else None
+        if not job or job["prefix"] != "extract":
             return jsonify({"error": "Job not found"}), 404
-        return jsonify({"job_key": job_key, **job})
+        return jsonify({"job_key": job_key, **_job_view(job)})
 
-    with _job_lock:
-        jobs = {k: v for k, v in _extraction_jobs.items()}
-    return jsonify(jobs)
+    return jsonify({j["id"]: _job_view(j) for j in list_jobs(prefix="extract", limit=100)})
 
 
 @extraction_bp.route("/api/extract/results", methods=["GET"])
@@ -341,8 +371,12 @@ def get_review_queue():
     offset = max(0, request.args.get("offset", 0, type=int))
 
     db = current_app.db
-    queue = db.get_extraction_queue(project_id, limit=limit, offset=offset)
-    return jsonify(queue)
+    try:
+        queue = db.get_extraction_queue(project_id, limit=limit, offset=offset,
+                                        cursor=request.args.get("cursor"))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return paged_json(queue)
 
 
 @extraction_bp.route("/api/extract/queue/grouped", methods=["GET"])
@@ -362,12 +396,15 @@ def get_review_queue_grouped():
     offset = max(0, request.args.get("offset", 0, type=int))
 
     db = current_app.db
-    groups = db.get_review_queue_grouped(
-        project_id, min_confidence=min_confidence,
-        max_confidence=max_confidence, entity_id=entity_id,
-        limit=limit, offset=offset,
-    )
-    return jsonify(groups)
+    try:
+        groups = db.get_review_queue_grouped(
+            project_id, min_confidence=min_confidence,
+            max_confidence=max_confidence, entity_id=entity_id,
+            limit=limit, offset=offset, cursor=request.args.get("cursor"),
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return paged_json(groups)
 
 
 @extraction_bp.route("/api/extract/results/<int:result_id>/flag", methods=["POST"])
@@ -485,20 +522,97 @@ def get_extraction_stats():
     return jsonify(stats)
 
 
+@extraction_bp.route("/api/extract/bulk", methods=["POST"])
+def trigger_bulk_extraction():
+    """Extract from all (new) evidence in a project as one deduplicated job.
+
+    Body: {project_id, [entity_ids], [evidence_ids], [evidence_types],
+           [include_extracted], [model], [concurrency], [dry_run]}
+
+    dry_run returns the plan summary without calling the LLM.
+    """
+    data = request.json or {}
+    project_id = data.get("project_id")
+    if not project_id:
+        return jsonify({"error": "project_id is required"}), 400
+
+    db = current_app.db
+    if not db.get_project(project_id):
+        return jsonify({"error": f"Project {project_id} not found"}), 404
+
+    from core.bulk_extraction import plan_bulk_extraction
+    plan = plan_bulk_extraction(
+        db, project_id,
+        entity_ids=data.get("entity_ids"),
+        evidence_ids=data.get("evidence_ids"),
+        evidence_types=data.get("evidence_types"),
+        include_extracted=bool(data.get("include_extracted")),
+    )
+    if data.get("dry_run"):
+        return jsonify({"plan": plan.summary()})
+    if not plan.tasks:
+        return jsonify({"status": "nothing_to_do", "plan": plan.summary()})
+
+    from core.bulk_extraction import DEFAULT_CONCURRENCY
+    job_key = submit_job(
+        "bulk_extract", _run_bulk_extraction,
+        args=(db, plan, data.get("model"), data.get("concurrency") or DEFAULT_CONCURRENCY),
+        project_id=project_id,
+        initial_result={"status": "running", "plan": plan.summary()},
+    )
+    return jsonify({"job_key": job_key, "status": "running",
+                    "plan": plan.summary()}), 202
+
+
+def _get_bulk_job(job_key):
+    job = get_job(job_key) if is_valid_job_id(job_key) else None
+    return job if job and job["prefix"] == "bulk_extract" else None
+
+
+@extraction_bp.route("/api/extract/bulk/<job_key>", methods=["GET"])
+def get_bulk_extraction(job_key):
+    """Progress of a bulk extraction job."""
+    job = _get_bulk_job(job_key)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"job_key": job_key, **_job_view(job)})
+
+
+@extraction_bp.route("/api/extract/bulk/<job_key>/cancel", methods=["POST"])
+def cancel_bulk_extraction(job_key):
+    """Cancel a bulk extraction. Finished tasks stay recorded."""
+    if not _get_bulk_job(job_key):
+        return jsonify({"error": "Job not found"}), 404
+    cancel_job(job_key)
+    return jsonify({"job_key": job_key, "status": "cancelling"})
+
+
 @extraction_bp.route("/api/extract/classify", methods=["POST"])
 def classify_and_extract():
     """Classify content and extract using the best document-specific extractor.
 
-    Body: {content, [entity_name], [model], [force_extractor]}
+    Body: {content | evidence_id, [entity_name], [model], [force_extractor]}
+
+    With evidence_id, the evidence's precomputed text sidecar is used.
     """
     data = request.json or {}
     content = data.get("content")
+    evidence_id = data.get("evidence_id")
     entity_name = data.get("entity_name")
     model = data.get("model")
     force_extractor = data.get("force_extractor")
 
+    if not content and evidence_id:
+        evidence = current_app.db.get_evidence_by_id(evidence_id)
+        if not evidence:
+            return jsonify({"error": "Evidence not found"}), 404
+        from core.capture import load_evidence_text
+        content = load_evidence_text(evidence["file_path"])
+        if not content:
+            return jsonify({"error": "No text could be derived from this evidence"}), 422
+
     if not content:
-        return jsonify({"error": "content is required"}), 400
+        return jsonify({"error": "content or evidence_id is required"}), 400
 
     from core.extractors.classifier import extract_with_classification
     result = extract_with_classification(
@@ -4,14 +4,53 @@ import json
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from storage.pagination import InvalidCursor, Keyset
+from web.response_cache import cached_response
+
 from . import lenses_bp
 from ._shared import _require_project_id, _FINANCIAL_SLUGS
 
+# Matrix columns: entities by name, case-insensitively
+_MATRIX_ORDER = Keyset("matrix-entities", ("name COLLATE NOCASE", "name"), ("id", "id"))
+
+
+def _page_entities(conn, project_id, entity_type, limit, offset, cursor):
+    """(total live entities, Page of {id, name}) for a matrix page.
+
+    Raises:
+        InvalidCursor: malformed cursor or one from another listing
+    """
+    conditions = ["project_id = ?", "is_deleted = 0"]
+    params = [project_id]
+    if entity_type:
+        conditions.append("type_slug = ?")
+        params.append(entity_type)
+    total_count = conn.execute(
+        f"SELECT COUNT(*) as cnt FROM entities WHERE {' AND '.join(conditions)}",
+        params,
+    ).fetchone()["cnt"]
+
+    after, after_params = _MATRIX_ORDER.where(cursor)
+    if after:
+        conditions.append(after)
+        params.extend(after_params)
+    rows = conn.execute(
+        f"""SELECT id, name FROM entities
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {_MATRIX_ORDER.order_by()}
+            LIMIT ? OFFSET ?""",
+        params + [limit + 1, 0 if cursor else offset],
+    ).fetchall()
+    return total_count, _MATRIX_ORDER.page(rows, limit)
+
+
 @lenses_bp.route("/api/lenses/competitive/matrix")
+@cached_response()
 def competitive_matrix():
     """Feature comparison matrix.
 
     Query: ?project_id=N&entity_type=slug&attr_slug=features
+           &limit=100&offset=0 (or &cursor=<pagination.next_cursor>)
 
     Returns:
         {
@@ -32,39 +71,16 @@ def competitive_matrix():
     limit = request.args.get("limit", 100, type=int)
     offset = max(0, request.args.get("offset", 0, type=int))
     limit = min(limit, 500)  # Cap at 500
+    cursor = request.args.get("cursor")
 
     db = current_app.db
 
     with db._get_conn() as conn:
-        # Count total entities for pagination metadata
-        if entity_type:
-            total_count = conn.execute(
-                "SELECT COUNT(*) as cnt FROM entities WHERE project_id = ? AND type_slug = ? AND is_deleted = 0",
-                (project_id, entity_type),
-            ).fetchone()["cnt"]
-            entity_rows = conn.execute(
-                """
-                SELECT id, name FROM entities
-                WHERE project_id = ? AND type_slug = ? AND is_deleted = 0
-                ORDER BY name COLLATE NOCASE
-                LIMIT ? OFFSET ?
-                """,
-                (project_id, entity_type, limit, offset),
-            ).fetchall()
-        else:
-            total_count = conn.execute(
-                "SELECT COUNT(*) as cnt FROM entities WHERE project_id = ? AND is_deleted = 0",
-                (project_id,),
-            ).fetchone()["cnt"]
-            entity_rows = conn.execute(
-                """
-                SELECT id, name FROM entities
-                WHERE project_id = ? AND is_deleted = 0
-                ORDER BY name COLLATE NOCASE
-                LIMIT ? OFFSET ?
-                """,
-                (project_id, limit, offset),
-            ).fetchall()
+        try:
+            total_count, entity_rows = _page_entities(
+                conn, project_id, entity_type, limit, offset, cursor)
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
 
         entities = [{"id": r["id"], "name": r["name"]} for r in entity_rows]
         entity_ids = [e["id"] for e in entities]
@@ -72,7 +88,8 @@ def competitive_matrix():
         if not entity_ids:
             return jsonify({
                 "entities": [], "features": [], "matrix": {},
-                "pagination": {"limit": limit, "offset": offset, "total": total_count},
+                "pagination": {"limit": limit, "offset": offset, "total": total_count,
+                               "next_cursor": entity_rows.next_cursor},
             })
 
         # Fetch canonical features for this project+attr_slug (if any)
@@ -170,7 +187,8 @@ def competitive_matrix():
         "matrix": matrix,
         "attr_slug": attr_slug,
         "canonical": use_canonical,
-        "pagination": {"limit": limit, "offset": offset, "total": total_count},
+        "pagination": {"limit": limit, "offset": offset, "total": total_count,
+                               "next_cursor": entity_rows.next_cursor},
     })
 
 
@@ -428,6 +446,7 @@ _FINANCIAL_SLUGS = {
 
 
 @lenses_bp.route("/api/lenses/competitive/enriched-matrix")
+@cached_response()
 def competitive_enriched_matrix():
     """Extended feature matrix with optional financial columns.
 
@@ -455,39 +474,17 @@ def competitive_enriched_matrix():
     limit = request.args.get("limit", 100, type=int)
     offset = max(0, request.args.get("offset", 0, type=int))
     limit = min(limit, 500)  # Cap at 500
+    cursor = request.args.get("cursor")
 
     db = current_app.db
 
     with db._get_conn() as conn:
         # ── Fetch entities (same logic as competitive_matrix) ──
-        if entity_type:
-            total_count = conn.execute(
-                "SELECT COUNT(*) as cnt FROM entities WHERE project_id = ? AND type_slug = ? AND is_deleted = 0",
-                (project_id, entity_type),
-            ).fetchone()["cnt"]
-            entity_rows = conn.execute(
-                """
-                SELECT id, name FROM entities
-                WHERE project_id = ? AND type_slug = ? AND is_deleted = 0
-                ORDER BY name COLLATE NOCASE
-                LIMIT ? OFFSET ?
-                """,
-                (project_id, entity_type, limit, offset),
-            ).fetchall()
-        else:
-            total_count = conn.execute(
-                "SELECT COUNT(*) as cnt FROM entities WHERE project_id = ? AND is_deleted = 0",
-                (project_id,),
-            ).fetchone()["cnt"]
-            entity_rows = conn.execute(
-                """
-                SELECT id, name FROM entities
-                WHERE project_id = ? AND is_deleted = 0
-                ORDER BY name COLLATE NOCASE
-                LIMIT ? OFFSET ?
-                """,
-                (project_id, limit, offset),
-            ).fetchall()
+        try:
+            total_count, entity_rows = _page_entities(
+                conn, project_id, entity_type, limit, offset, cursor)
+        except InvalidCursor as e:
+            return jsonify({"error": str(e)}), 400
 
         entities = [{"id": r["id"], "name": r["name"]} for r in entity_rows]
         entity_ids = [e["id"] for e in entities]
@@ -497,7 +494,8 @@ def competitive_enriched_matrix():
                 "entities": [], "features": [], "matrix": {},
                 "attr_slug": attr_slug, "canonical": False,
                 "financial_columns": [], "financial_data": {},
-                "pagination": {"limit": limit, "offset": offset, "total": total_count},
+                "pagination": {"limit": limit, "offset": offset, "total": total_count,
+                               "next_cursor": entity_rows.next_cursor},
             })
 
         # ── Feature matrix (duplicated from competitive_matrix) ──
@@ -624,11 +622,13 @@ def competitive_enriched_matrix():
         "canonical": use_canonical,
         "financial_columns": sorted(all_financial_slugs_found),
         "financial_data": financial_data,
-        "pagination": {"limit": limit, "offset": offset, "total": total_count},
+        "pagination": {"limit": limit, "offset": offset, "total": total_count,
+                               "next_cursor": entity_rows.next_cursor},
     })
 
 
 @lenses_bp.route("/api/lenses/competitive/market-map")
+@cached_response()
 def competitive_market_map():
     """Bubble chart: entities positioned by two attributes, sized by a metric.
 
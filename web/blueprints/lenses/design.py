@@ -4,6 +4,8 @@ import json
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from web.response_cache import cached_response
+
 from . import lenses_bp
 from ._shared import _require_project_id, _has_design_attr, _STAGE_ORDER, _UI_PATTERN_TO_CATEGORY, _PATTERN_CATEGORIES
 
@@ -189,6 +191,7 @@ def design_journey():
 
 
 @lenses_bp.route("/api/lenses/design/patterns")
+@cached_response()
 def design_patterns():
     """Pattern library — design patterns extracted from evidence and extraction results.
 
@@ -419,6 +422,7 @@ def design_patterns():
 
 
 @lenses_bp.route("/api/lenses/design/scoring")
+@cached_response()
 def design_scoring():
     """UX scoring — compute UX completeness scores for entities with evidence.
 
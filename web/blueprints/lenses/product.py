@@ -3,10 +3,13 @@
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from web.response_cache import cached_response
+
 from . import lenses_bp
 from ._shared import _require_project_id, _has_pricing_attr
 
 @lenses_bp.route("/api/lenses/product/pricing")
+@cached_response()
 def product_pricing():
     """Pricing landscape — all pricing-related attributes per entity.
 
@@ -1,14 +1,226 @@
-"""Signals Lens endpoints."""
+"""Signals Lens endpoints.
+
+Every signal is a row in one of three source tables — change_feed
+(monitoring), entity_attributes (attribute updates) and evidence
+(captures). The endpoints merge them with UNION ALL queries so that
+ordering, paging and aggregation run in SQLite: the timeline asks each
+source only for its newest offset + limit rows, counts come from the
+sources' entity_id indexes, and trends are grouped per day inside each
+source before the weekly buckets are formed.
+"""
 import json
 from datetime import datetime, timedelta
 
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from web.response_cache import cached_response
+
 from . import lenses_bp
 from ._shared import _require_project_id
 
+# Event type → (source table, timestamp column). Order doubles as the
+# tie-break between events with the same timestamp.
+_EVENT_SOURCES = {
+    "change_detected": ("change_feed", "created_at"),
+    "attribute_updated": ("entity_attributes", "captured_at"),
+    "evidence_captured": ("evidence", "captured_at"),
+}
+_EVENT_TYPES = list(_EVENT_SOURCES)
+
+# The summary's windows end at "now"; a cached summary may lag by this much
+_SUMMARY_CACHE_TTL = 300
+
+
+def _existing_tables(conn):
+    # change_feed and monitors are created lazily by the monitoring blueprint
+    return {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()}
+
+
+def _available_sources(tables):
+    """Event types whose source table is among *tables*."""
+    return [t for t, (table, _) in _EVENT_SOURCES.items() if table in tables]
+
+
+def _source_filter(table, ts, entity_id=None, since=False, by_time=False):
+    """WHERE body restricting source *table* (alias s) to live entities of :pid.
+
+    *by_time* adds change_feed's own project_id so its (project_id,
+    created_at) index can drive a newest-first scan.
+    """
+    conditions = ["e.project_id = :pid", "e.is_deleted = 0"]
+    if by_time and table == "change_feed":
+        conditions.append("s.project_id = :pid")
+    if entity_id:
+        conditions.append("e.id = :eid")
+    if since:
+        conditions.append(f"s.{ts} >= :since")
+    return " AND ".join(conditions)
+
+
+def _recent_events_sql(sources, entity_id=None):
+    """UNION ALL of each source's newest :n events as (type, rank, source_id, timestamp).
+
+    Named params: :pid, :n, and :eid with *entity_id*.
+    """
+    # Project-wide, each source's timestamp index drives the join and stops
+    # after n rows, instead of sorting every event of every entity (CROSS
+    # JOIN pins that loop order in SQLite). One entity's events are few
+    # enough to sort.
+    by_time = not entity_id
+    branches = []
+    for event_type in sources:
+        table, ts = _EVENT_SOURCES[event_type]
+        branches.append(f"""SELECT * FROM (
+            SELECT '{event_type}' as type, {_EVENT_TYPES.index(event_type)} as rank,
+                   s.id as source_id, s.{ts} as timestamp
+            FROM {table} s {"CROSS JOIN" if by_time else "JOIN"} entities e ON e.id = s.entity_id
+            WHERE {_source_filter(table, ts, entity_id, by_time=by_time)}
+            ORDER BY s.{ts} DESC, s.id DESC LIMIT :n)""")
+    return " UNION ALL ".join(branches)
+
+
+def _daily_counts_sql(sources, entity_id=None):
+    """UNION ALL of (type, day, cnt): events per source per calendar day.
+
+    Each source is grouped on its own, so only one row per day crosses
+    the UNION. Named params: :pid, and :eid with *entity_id*.
+    """
+    return " UNION ALL ".join(
+        f"""SELECT '{event_type}' as type, substr(s.{ts}, 1, 10) as day, COUNT(*) as cnt
+            FROM {table} s JOIN entities e ON e.id = s.entity_id
+            WHERE {_source_filter(table, ts, entity_id)}
+            GROUP BY day"""
+        for event_type, (table, ts) in _EVENT_SOURCES.items() if event_type in sources
+    )
+
+
+def _event_total(conn, project_id, sources, entity_id=None):
+    """Number of events of the project's live entities (or of one entity).
+
+    Summed from per-entity COUNTs on each source's entity_id index, which
+    never touches the event rows themselves.
+    """
+    counts = [f"(SELECT COUNT(*) FROM {table} s WHERE s.entity_id = e.id)"
+              for event_type, (table, _) in _EVENT_SOURCES.items() if event_type in sources]
+    return conn.execute(
+        f"""SELECT COALESCE(SUM({" + ".join(counts)}), 0) FROM entities e
+            WHERE e.project_id = :pid AND e.is_deleted = 0{" AND e.id = :eid" if entity_id else ""}""",
+        {"pid": project_id, "eid": entity_id},
+    ).fetchone()[0]
+
+
+def _load_event_details(conn, page):
+    """Timeline event dicts for (type, source_id, ...) rows, in page order."""
+    ids = {t: json.dumps([r["source_id"] for r in page if r["type"] == t])
+           for t in _EVENT_TYPES}
+    details = {}
+    if ids["change_detected"] != "[]":
+        for row in conn.execute(
+            """SELECT cf.id, cf.change_type, cf.title, cf.description, cf.created_at,
+                      cf.severity, cf.details_json, e.id as entity_id, e.name as entity_name
+               FROM change_feed cf JOIN entities e ON e.id = cf.entity_id
+               WHERE cf.id IN (SELECT value FROM json_each(?))""",
+            (ids["change_detected"],),
+        ):
+            metadata = {}
+            if row["details_json"]:
+                try:
+                    metadata = json.loads(row["details_json"]) if isinstance(row["details_json"], str) else row["details_json"]
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            details[("change_detected", row["id"])] = {
+                "type": "change_detected",
+                "entity_id": row["entity_id"],
+                "entity_name": row["entity_name"],
+                "title": f"{row['change_type']}: {row['title']}",
+                "description": row["description"] or "",
+                "severity": row["severity"] or "info",
+                "timestamp": row["created_at"],
+                "metadata": metadata,
+            }
+    if ids["attribute_updated"] != "[]":
+        for row in conn.execute(
+            """SELECT ea.id, ea.attr_slug, ea.value, ea.source, ea.captured_at,
+                      ea.entity_id, e.name as entity_name
+               FROM entity_attributes ea JOIN entities e ON e.id = ea.entity_id
+               WHERE ea.id IN (SELECT value FROM json_each(?))""",
+            (ids["attribute_updated"],),
+        ):
+            details[("attribute_updated", row["id"])] = {
+                "type": "attribute_updated",
+                "entity_id": row["entity_id"],
+                "entity_name": row["entity_name"],
+                "title": f"Attribute: {row['attr_slug']}",
+                "description": f"Set to '{row['value'] or ''}'",
+                "severity": "info",
+                "timestamp": row["captured_at"],
+                "metadata": {"source": row["source"], "attr_slug": row["attr_slug"]},
+            }
+    if ids["evidence_captured"] != "[]":
+        for row in conn.execute(
+            """SELECT ev.id, ev.evidence_type, ev.source_url, ev.source_name,
+                      ev.captured_at, ev.entity_id, e.name as entity_name
+               FROM evidence ev JOIN entities e ON e.id = ev.entity_id
+               WHERE ev.id IN (SELECT value FROM json_each(?))""",
+            (ids["evidence_captured"],),
+        ):
+            details[("evidence_captured", row["id"])] = {
+                "type": "evidence_captured",
+                "entity_id": row["entity_id"],
+                "entity_name": row["entity_name"],
+                "title": f"Evidence: {row['evidence_type']}",
+                "description": row["source_name"] or row["source_url"] or "",
+                "severity": "info",
+                "timestamp": row["captured_at"],
+                "metadata": {
+                    "evidence_type": row["evidence_type"],
+                    "source_url": row["source_url"],
+                },
+            }
+    return [details[(r["type"], r["source_id"])] for r in page]
+
+
+def _event_counts(conn, project_id, sources, since):
+    """{(entity_id, event_type): count} of live entities' events since *since*."""
+    branches = " UNION ALL ".join(
+        f"""SELECT '{event_type}' as type, s.entity_id, COUNT(*) as cnt
+            FROM {table} s JOIN entities e ON e.id = s.entity_id
+            WHERE {_source_filter(table, ts, since=True)}
+            GROUP BY s.entity_id"""
+        for event_type, (table, ts) in _EVENT_SOURCES.items() if event_type in sources
+    )
+    rows = conn.execute(branches, {"pid": project_id, "since": since}).fetchall()
+    return {(r["entity_id"], r["type"]): r["cnt"] for r in rows}
+
+
+def _entity_activity(conn, project_id, tables):
+    """Live entities by name, with per-source event counts.
+
+    Counts are correlated subqueries on each source's entity_id index, so
+    no event row is read or sorted.
+
+    Returns: rows of {id, name, <event type>: count..., last_change, monitor_count}
+    """
+    columns = [f"(SELECT COUNT(*) FROM {table} s WHERE s.entity_id = e.id) as {event_type}"
+               if table in tables else f"0 as {event_type}"
+               for event_type, (table, _) in _EVENT_SOURCES.items()]
+    columns.append("(SELECT MAX(created_at) FROM change_feed s WHERE s.entity_id = e.id) as last_change"
+                   if "change_feed" in tables else "NULL as last_change")
+    columns.append("(SELECT COUNT(*) FROM monitors m WHERE m.entity_id = e.id) as monitor_count"
+                   if "monitors" in tables else "0 as monitor_count")
+    return conn.execute(
+        f"""SELECT e.id, e.name, {", ".join(columns)}
+            FROM entities e
+            WHERE e.project_id = ? AND e.is_deleted = 0
+            ORDER BY e.name COLLATE NOCASE""",
+        (project_id,),
+    ).fetchall()
+
+
 @lenses_bp.route("/api/lenses/signals/timeline")
+@cached_response()
 def signals_timeline():
     """Chronological event timeline combining change feed, attribute updates,
     and evidence captures.
@@ -34,123 +246,27 @@ def signals_timeline():
     limit = min(limit, 200)
 
     db = current_app.db
-    events = []
+    params = {"pid": project_id, "eid": entity_id, "n": offset + limit,
+              "limit": limit, "offset": offset}
 
     with db._get_conn() as conn:
-        entity_filter = ""
-        params_base = [project_id]
-        if entity_id:
-            entity_filter = " AND e.id = ?"
-            params_base = [project_id, entity_id]
-
-        # 1) Change feed entries (from monitoring)
-        try:
-            cf_rows = conn.execute(
-                f"""
-                SELECT cf.id, cf.monitor_id, cf.change_type, cf.title,
-                       cf.description, cf.created_at,
-                       cf.severity, cf.details_json, cf.source_url,
-                       e.id as entity_id, e.name as entity_name
-                FROM change_feed cf
-                JOIN entities e ON e.id = cf.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                ORDER BY cf.created_at DESC
-                """,
-                params_base,
-            ).fetchall()
-
-            for row in cf_rows:
-                metadata = {}
-                if row["details_json"]:
-                    try:
-                        metadata = json.loads(row["details_json"]) if isinstance(row["details_json"], str) else row["details_json"]
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-                events.append({
-                    "type": "change_detected",
-                    "entity_id": row["entity_id"],
-                    "entity_name": row["entity_name"],
-                    "title": f"{row['change_type']}: {row['title']}",
-                    "description": row["description"] or "",
-                    "severity": row["severity"] or "info",
-                    "timestamp": row["created_at"],
-                    "metadata": metadata,
-                })
-        except Exception:
-            logger.debug("change_feed table not available for signals timeline")
-
-        # 2) Entity attribute changes
-        try:
-            ea_rows = conn.execute(
-                f"""
-                SELECT ea.id, ea.attr_slug, ea.value, ea.source,
-                       ea.captured_at, ea.entity_id,
-                       e.name as entity_name
-                FROM entity_attributes ea
-                JOIN entities e ON e.id = ea.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                ORDER BY ea.captured_at DESC
-                """,
-                params_base,
-            ).fetchall()
-
-            for row in ea_rows:
-                events.append({
-                    "type": "attribute_updated",
-                    "entity_id": row["entity_id"],
-                    "entity_name": row["entity_name"],
-                    "title": f"Attribute: {row['attr_slug']}",
-                    "description": f"Set to '{row['value'] or ''}'",
-                    "severity": "info",
-                    "timestamp": row["captured_at"],
-                    "metadata": {"source": row["source"], "attr_slug": row["attr_slug"]},
-                })
-        except Exception:
-            logger.debug("entity_attributes table not available for signals timeline")
-
-        # 3) Evidence captures
-        try:
-            ev_rows = conn.execute(
-                f"""
-                SELECT ev.id, ev.evidence_type, ev.source_url, ev.source_name,
-                       ev.captured_at, ev.entity_id,
-                       e.name as entity_name
-                FROM evidence ev
-                JOIN entities e ON e.id = ev.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                ORDER BY ev.captured_at DESC
-                """,
-                params_base,
-            ).fetchall()
-
-            for row in ev_rows:
-                events.append({
-                    "type": "evidence_captured",
-                    "entity_id": row["entity_id"],
-                    "entity_name": row["entity_name"],
-                    "title": f"Evidence: {row['evidence_type']}",
-                    "description": row["source_name"] or row["source_url"] or "",
-                    "severity": "info",
-                    "timestamp": row["captured_at"],
-                    "metadata": {
-                        "evidence_type": row["evidence_type"],
-                        "source_url": row["source_url"],
-                    },
-                })
-        except Exception:
-            logger.debug("evidence table not available for signals timeline")
-
-    # Sort all events by timestamp descending
-    events.sort(key=lambda e: e["timestamp"] or "", reverse=True)
-
-    total = len(events)
-    paged = events[offset:offset + limit]
+        sources = _available_sources(_existing_tables(conn))
+        # Newest first; only the top offset + limit rows of each source can
+        # land on this page, so each branch is cut there before merging
+        page = conn.execute(
+            f"""SELECT type, source_id FROM ({_recent_events_sql(sources, entity_id)})
+                ORDER BY timestamp DESC, rank, source_id DESC
+                LIMIT :limit OFFSET :offset""",
+            params,
+        ).fetchall()
+        total = _event_total(conn, project_id, sources, entity_id)
+        events = _load_event_details(conn, page)
 
     logger.info("Signals timeline: {} total events (returning {}) for project {}",
-                total, len(paged), project_id)
+                total, len(events), project_id)
 
     return jsonify({
-        "events": paged,
+        "events": events,
         "total": total,
         "limit": limit,
         "offset": offset,
@@ -158,6 +274,7 @@ def signals_timeline():
 
 
 @lenses_bp.route("/api/lenses/signals/activity")
+@cached_response()
 def signals_activity():
     """Per-entity activity summary.
 
@@ -176,109 +293,23 @@ def signals_activity():
     db = current_app.db
 
     with db._get_conn() as conn:
-        # Base entities
-        entity_rows = conn.execute(
-            """SELECT id, name FROM entities
-               WHERE project_id = ? AND is_deleted = 0
-               ORDER BY name COLLATE NOCASE""",
-            (project_id,),
-        ).fetchall()
-
-        if not entity_rows:
-            return jsonify({"entities": []})
-
-        entity_ids = [r["id"] for r in entity_rows]
-        placeholders = ",".join("?" * len(entity_ids))
-
-        # Change feed counts per entity
-        change_counts = {}
-        last_changes = {}
-        try:
-            cf_rows = conn.execute(
-                f"""
-                SELECT cf.entity_id,
-                       COUNT(*) as cnt,
-                       MAX(cf.created_at) as last_change
-                FROM change_feed cf
-                WHERE cf.entity_id IN ({placeholders})
-                GROUP BY cf.entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in cf_rows:
-                change_counts[row["entity_id"]] = row["cnt"]
-                last_changes[row["entity_id"]] = row["last_change"]
-        except Exception:
-            logger.debug("change_feed table not available for signals activity")
-
-        # Monitor counts per entity
-        monitor_counts = {}
-        try:
-            m_rows = conn.execute(
-                f"""
-                SELECT entity_id, COUNT(*) as cnt
-                FROM monitors
-                WHERE entity_id IN ({placeholders})
-                GROUP BY entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in m_rows:
-                monitor_counts[row["entity_id"]] = row["cnt"]
-        except Exception:
-            logger.debug("monitors table not available for signals activity")
-
-        # Evidence counts per entity
-        evidence_counts = {}
-        try:
-            ev_rows = conn.execute(
-                f"""
-                SELECT entity_id, COUNT(*) as cnt
-                FROM evidence
-                WHERE entity_id IN ({placeholders})
-                GROUP BY entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in ev_rows:
-                evidence_counts[row["entity_id"]] = row["cnt"]
-        except Exception:
-            logger.debug("evidence table not available for signals activity")
-
-        # Attribute update counts per entity
-        attr_counts = {}
-        try:
-            ea_rows = conn.execute(
-                f"""
-                SELECT entity_id, COUNT(*) as cnt
-                FROM entity_attributes
-                WHERE entity_id IN ({placeholders})
-                GROUP BY entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in ea_rows:
-                attr_counts[row["entity_id"]] = row["cnt"]
-        except Exception:
-            logger.debug("entity_attributes table not available for signals activity")
-
-    results = []
-    for row in entity_rows:
-        eid = row["id"]
-        results.append({
-            "entity_id": eid,
-            "entity_name": row["name"],
-            "change_count": change_counts.get(eid, 0),
-            "last_change": last_changes.get(eid),
-            "monitor_count": monitor_counts.get(eid, 0),
-            "evidence_count": evidence_counts.get(eid, 0),
-            "attribute_updates": attr_counts.get(eid, 0),
-        })
+        entity_rows = _entity_activity(conn, project_id, _existing_tables(conn))
+
+    results = [{
+        "entity_id": row["id"],
+        "entity_name": row["name"],
+        "change_count": row["change_detected"],
+        "last_change": row["last_change"],
+        "monitor_count": row["monitor_count"],
+        "evidence_count": row["evidence_captured"],
+        "attribute_updates": row["attribute_updated"],
+    } for row in entity_rows]
 
     return jsonify({"entities": results})
 
 
 @lenses_bp.route("/api/lenses/signals/trends")
+@cached_response()
 def signals_trends():
     """Event counts grouped by time period (week buckets).
 
@@ -302,110 +333,35 @@ def signals_trends():
 
     db = current_app.db
 
-    # SQLite: strftime('%Y-%W', date) gives year-week
-    # We'll use date(timestamp, 'weekday 0', '-6 days') to get Monday of each week
-
+    # Events are counted per day first (a prefix of the timestamp), then
+    # date(day, 'weekday 0', '-6 days') buckets the distinct days by the
+    # Monday of their week
     with db._get_conn() as conn:
-        entity_filter = ""
-        params_base = [project_id]
-        if entity_id:
-            entity_filter = " AND e.id = ?"
-            params_base = [project_id, entity_id]
-
-        # Collect all timestamped events with their week bucket
-        week_data = {}  # week_start → {change_count, attribute_count, evidence_count}
-
-        # 1) Change feed events by week
-        try:
-            cf_rows = conn.execute(
-                f"""
-                SELECT date(cf.created_at, 'weekday 0', '-6 days') as week_start,
-                       COUNT(*) as cnt
-                FROM change_feed cf
-                JOIN entities e ON e.id = cf.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                  AND cf.created_at IS NOT NULL
-                GROUP BY week_start
-                ORDER BY week_start
-                """,
-                params_base,
-            ).fetchall()
-            for row in cf_rows:
-                ws = row["week_start"]
-                if ws:
-                    week_data.setdefault(ws, {"change_count": 0, "attribute_count": 0, "evidence_count": 0})
-                    week_data[ws]["change_count"] = row["cnt"]
-        except Exception:
-            logger.debug("change_feed table not available for signals trends")
-
-        # 2) Attribute updates by week
-        try:
-            ea_rows = conn.execute(
-                f"""
-                SELECT date(ea.captured_at, 'weekday 0', '-6 days') as week_start,
-                       COUNT(*) as cnt
-                FROM entity_attributes ea
-                JOIN entities e ON e.id = ea.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                  AND ea.captured_at IS NOT NULL
+        sources = _available_sources(_existing_tables(conn))
+        rows = conn.execute(
+            f"""SELECT week_start, date(week_start, '+6 days') as period_end,
+                       SUM(CASE WHEN type = 'change_detected' THEN cnt ELSE 0 END) as change_count,
+                       SUM(CASE WHEN type = 'attribute_updated' THEN cnt ELSE 0 END) as attribute_count,
+                       SUM(CASE WHEN type = 'evidence_captured' THEN cnt ELSE 0 END) as evidence_count,
+                       SUM(cnt) as total
+                FROM (SELECT type, date(day, 'weekday 0', '-6 days') as week_start, cnt
+                      FROM ({_daily_counts_sql(sources, entity_id)}))
                 GROUP BY week_start
-                ORDER BY week_start
-                """,
-                params_base,
-            ).fetchall()
-            for row in ea_rows:
-                ws = row["week_start"]
-                if ws:
-                    week_data.setdefault(ws, {"change_count": 0, "attribute_count": 0, "evidence_count": 0})
-                    week_data[ws]["attribute_count"] = row["cnt"]
-        except Exception:
-            logger.debug("entity_attributes table not available for signals trends")
-
-        # 3) Evidence captures by week
-        try:
-            ev_rows = conn.execute(
-                f"""
-                SELECT date(ev.captured_at, 'weekday 0', '-6 days') as week_start,
-                       COUNT(*) as cnt
-                FROM evidence ev
-                JOIN entities e ON e.id = ev.entity_id
-                WHERE e.project_id = ? AND e.is_deleted = 0{entity_filter}
-                  AND ev.captured_at IS NOT NULL
-                GROUP BY week_start
-                ORDER BY week_start
-                """,
-                params_base,
-            ).fetchall()
-            for row in ev_rows:
-                ws = row["week_start"]
-                if ws:
-                    week_data.setdefault(ws, {"change_count": 0, "attribute_count": 0, "evidence_count": 0})
-                    week_data[ws]["evidence_count"] = row["cnt"]
-        except Exception:
-            logger.debug("evidence table not available for signals trends")
-
-    # Build sorted period list
-    periods = []
-    for week_start in sorted(week_data.keys()):
-        counts = week_data[week_start]
-        total = counts["change_count"] + counts["attribute_count"] + counts["evidence_count"]
-        periods.append({
-            "period_start": week_start,
-            "period_end": week_start[:10],  # same format; end = start + 6 days
-            "change_count": counts["change_count"],
-            "attribute_count": counts["attribute_count"],
-            "evidence_count": counts["evidence_count"],
-            "total": total,
-        })
+                -- HAVING, not WHERE: SQLite would push a WHERE down into
+                -- every source row instead of the per-day groups
+                HAVING week_start IS NOT NULL
+                ORDER BY week_start""",
+            {"pid": project_id, "eid": entity_id},
+        ).fetchall()
 
-    # Compute proper period_end (start + 6 days)
-    for p in periods:
-        try:
-            start_dt = datetime.strptime(p["period_start"], "%Y-%m-%d")
-            end_dt = start_dt + timedelta(days=6)
-            p["period_end"] = end_dt.strftime("%Y-%m-%d")
-        except (ValueError, TypeError):
-            pass
+    periods = [{
+        "period_start": r["week_start"],
+        "period_end": r["period_end"],
+        "change_count": r["change_count"],
+        "attribute_count": r["attribute_count"],
+        "evidence_count": r["evidence_count"],
+        "total": r["total"],
+    } for r in rows]
 
     result = {"periods": periods}
     if entity_id:
@@ -415,6 +371,7 @@ def signals_trends():
 
 
 @lenses_bp.route("/api/lenses/signals/heatmap")
+@cached_response()
 def signals_heatmap():
     """Entity x event-type heatmap matrix.
 
@@ -435,108 +392,45 @@ def signals_heatmap():
     db = current_app.db
 
     with db._get_conn() as conn:
-        # Base entities
-        entity_rows = conn.execute(
-            """SELECT id, name FROM entities
-               WHERE project_id = ? AND is_deleted = 0
-               ORDER BY name COLLATE NOCASE""",
-            (project_id,),
-        ).fetchall()
-
-        if not entity_rows:
-            return jsonify({
-                "entities": [],
-                "event_types": [],
-                "matrix": [],
-                "raw": [],
-            })
+        entity_rows = _entity_activity(conn, project_id, _existing_tables(conn))
+    if not entity_rows:
+        return jsonify({
+            "entities": [],
+            "event_types": [],
+            "matrix": [],
+            "raw": [],
+        })
 
-        entity_ids = [r["id"] for r in entity_rows]
-        placeholders = ",".join("?" * len(entity_ids))
-
-        # Collect counts per entity per event type
-        raw_data = {}  # (entity_id, event_type) → count
-
-        # 1) Change feed events
-        try:
-            cf_rows = conn.execute(
-                f"""
-                SELECT cf.entity_id, COUNT(*) as cnt
-                FROM change_feed cf
-                WHERE cf.entity_id IN ({placeholders})
-                GROUP BY cf.entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in cf_rows:
-                raw_data[(row["entity_id"], "change_detected")] = row["cnt"]
-        except Exception:
-            logger.debug("change_feed table not available for signals heatmap")
-
-        # 2) Attribute updates
-        try:
-            ea_rows = conn.execute(
-                f"""
-                SELECT entity_id, COUNT(*) as cnt
-                FROM entity_attributes
-                WHERE entity_id IN ({placeholders})
-                GROUP BY entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in ea_rows:
-                raw_data[(row["entity_id"], "attribute_updated")] = row["cnt"]
-        except Exception:
-            logger.debug("entity_attributes table not available for signals heatmap")
-
-        # 3) Evidence captures
-        try:
-            ev_rows = conn.execute(
-                f"""
-                SELECT entity_id, COUNT(*) as cnt
-                FROM evidence
-                WHERE entity_id IN ({placeholders})
-                GROUP BY entity_id
-                """,
-                entity_ids,
-            ).fetchall()
-            for row in ev_rows:
-                raw_data[(row["entity_id"], "evidence_captured")] = row["cnt"]
-        except Exception:
-            logger.debug("evidence table not available for signals heatmap")
-
-    # Build matrix
     entity_names = [r["name"] for r in entity_rows]
-    event_types = ["change_detected", "attribute_updated", "evidence_captured"]
-
-    eid_to_idx = {r["id"]: i for i, r in enumerate(entity_rows)}
-    matrix = [[0] * len(event_types) for _ in range(len(entity_rows))]
-
+    matrix = []
     raw_list = []
-    for (eid, etype), count in raw_data.items():
-        idx = eid_to_idx.get(eid)
-        if idx is not None:
-            col = event_types.index(etype)
-            matrix[idx][col] = count
-            raw_list.append({
-                "entity_id": eid,
-                "entity_name": entity_names[idx],
-                "event_type": etype,
-                "count": count,
-            })
+    for row in entity_rows:
+        cells = []
+        for event_type in _EVENT_TYPES:
+            count = row[event_type]
+            cells.append(count)
+            if count:
+                raw_list.append({
+                    "entity_id": row["id"],
+                    "entity_name": row["name"],
+                    "event_type": event_type,
+                    "count": count,
+                })
+        matrix.append(cells)
 
     # Sort raw list by entity name then event type
     raw_list.sort(key=lambda r: (r["entity_name"].lower(), r["event_type"]))
 
     return jsonify({
         "entities": entity_names,
-        "event_types": event_types,
+        "event_types": _EVENT_TYPES,
         "matrix": matrix,
         "raw": raw_list,
     })
 
 
 @lenses_bp.route("/api/lenses/signals/summary")
+@cached_response(ttl=_SUMMARY_CACHE_TTL)
 def signals_summary():
     """Market-level change summary: what shifted across all entities.
 
@@ -563,9 +457,9 @@ def signals_summary():
     days = min(max(days, 1), 365)
 
     db = current_app.db
+    severity_breakdown = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
 
     with db._get_conn() as conn:
-        # 1. Entity activity counts
         entity_rows = conn.execute(
             """SELECT id, name FROM entities
                WHERE project_id = ? AND is_deleted = 0
@@ -581,130 +475,82 @@ def signals_summary():
                 "most_active_entities": [],
                 "top_changed_fields": [],
                 "recent_highlights": [],
-                "source_breakdown": {"change_detected": 0, "attribute_updated": 0, "evidence_captured": 0},
-                "severity_breakdown": {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0},
+                "source_breakdown": {t: 0 for t in _EVENT_TYPES},
+                "severity_breakdown": severity_breakdown,
             })
 
-        entity_ids = [r["id"] for r in entity_rows]
         entity_map = {r["id"]: r["name"] for r in entity_rows}
-        placeholders = ",".join("?" * len(entity_ids))
-
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
 
-        # 2. Change feed analysis
-        change_counts = {}  # entity_id -> count
-        field_changes = {}  # field_name -> {count, entity_ids}
-        severity_breakdown = {"critical": 0, "high": 0, "medium": 0, "low": 0, "info": 0}
-        recent_highlights = []
+        sources = _available_sources(_existing_tables(conn))
+        counts = _event_counts(conn, project_id, sources, since=cutoff)
 
-        try:
-            cf_rows = conn.execute(
-                f"""SELECT cf.change_type, cf.title, cf.description,
-                           cf.created_at, cf.severity, cf.details_json,
-                           cf.source_url, cf.entity_id
-                    FROM change_feed cf
-                    WHERE cf.entity_id IN ({placeholders})
-                      AND cf.created_at >= ?
-                    ORDER BY cf.created_at DESC""",
-                entity_ids + [cutoff],
-            ).fetchall()
-
-            for row in cf_rows:
-                eid = row["entity_id"]
-                change_counts[eid] = change_counts.get(eid, 0) + 1
-
-                fname = row["title"] or "unknown"
-                if fname not in field_changes:
-                    field_changes[fname] = {"count": 0, "entity_ids": set()}
-                field_changes[fname]["count"] += 1
-                field_changes[fname]["entity_ids"].add(eid)
-
-                sev = row["severity"] or "info"
-                if sev in severity_breakdown:
-                    severity_breakdown[sev] += 1
-
-                if len(recent_highlights) < 10:
-                    recent_highlights.append({
-                        "entity_name": entity_map.get(eid, ""),
-                        "change_type": row["change_type"],
-                        "field_name": fname,
-                        "description": row["description"] or "",
-                        "timestamp": row["created_at"],
-                    })
-        except Exception:
-            logger.debug("change_feed not available for signals summary")
-
-        # 3. Attribute update counts
-        attr_counts = {}  # entity_id -> count
-        try:
-            ea_rows = conn.execute(
-                f"""SELECT entity_id, COUNT(*) as cnt
-                    FROM entity_attributes
-                    WHERE entity_id IN ({placeholders})
-                      AND captured_at >= ?
-                    GROUP BY entity_id""",
-                entity_ids + [cutoff],
-            ).fetchall()
-            for row in ea_rows:
-                attr_counts[row["entity_id"]] = row["cnt"]
-        except Exception:
-            logger.debug("entity_attributes not available for signals summary")
-
-        # 4. Evidence capture counts
-        evidence_counts = {}  # entity_id -> count
-        try:
-            ev_rows = conn.execute(
-                f"""SELECT entity_id, COUNT(*) as cnt
-                    FROM evidence
-                    WHERE entity_id IN ({placeholders})
-                      AND captured_at >= ?
-                    GROUP BY entity_id""",
-                entity_ids + [cutoff],
-            ).fetchall()
-            for row in ev_rows:
-                evidence_counts[row["entity_id"]] = row["cnt"]
-        except Exception:
-            logger.debug("evidence not available for signals summary")
-
-    # Build results
-    total_changes = sum(change_counts.values())
-    total_attrs = sum(attr_counts.values())
-    total_evidence = sum(evidence_counts.values())
-    total_events = total_changes + total_attrs + total_evidence
-
-    # Most active entities (by total events, top 10)
-    entity_activity = []
-    for eid in entity_ids:
-        total = change_counts.get(eid, 0) + attr_counts.get(eid, 0) + evidence_counts.get(eid, 0)
-        if total > 0:
-            entity_activity.append({
-                "entity_id": eid,
-                "entity_name": entity_map.get(eid, ""),
-                "event_count": total,
-            })
-    entity_activity.sort(key=lambda e: e["event_count"], reverse=True)
-    most_active = entity_activity[:10]
-
-    # Top changed fields (from change feed)
-    top_fields = []
-    for fname, data in sorted(field_changes.items(), key=lambda x: x[1]["count"], reverse=True)[:10]:
-        top_fields.append({
-            "field_name": fname,
-            "change_count": data["count"],
-            "entities_affected": len(data["entity_ids"]),
-        })
+        top_fields = []
+        recent_highlights = []
+        if "change_detected" in sources:
+            recent = """
+                FROM change_feed cf JOIN entities e ON e.id = cf.entity_id
+                WHERE cf.project_id = :pid AND e.project_id = :pid
+                  AND e.is_deleted = 0 AND cf.created_at >= :since"""
+            params = {"pid": project_id, "since": cutoff}
+
+            for row in conn.execute(
+                f"SELECT COALESCE(cf.severity, 'info') as sev, COUNT(*) as cnt {recent} GROUP BY sev",
+                params,
+            ):
+                if row["sev"] in severity_breakdown:
+                    severity_breakdown[row["sev"]] = row["cnt"]
+
+            top_fields = [{
+                "field_name": row["field_name"],
+                "change_count": row["change_count"],
+                "entities_affected": row["entities_affected"],
+            } for row in conn.execute(
+                f"""SELECT COALESCE(cf.title, 'unknown') as field_name,
+                           COUNT(*) as change_count,
+                           COUNT(DISTINCT cf.entity_id) as entities_affected
+                    {recent}
+                    GROUP BY field_name
+                    ORDER BY change_count DESC, MAX(cf.created_at) DESC
+                    LIMIT 10""",
+                params,
+            )]
+
+            recent_highlights = [{
+                "entity_name": entity_map.get(row["entity_id"], ""),
+                "change_type": row["change_type"],
+                "field_name": row["title"] or "unknown",
+                "description": row["description"] or "",
+                "timestamp": row["created_at"],
+            } for row in conn.execute(
+                f"""SELECT cf.entity_id, cf.change_type, cf.title, cf.description,
+                           cf.created_at
+                    {recent}
+                    ORDER BY cf.created_at DESC, cf.id DESC
+                    LIMIT 10""",
+                params,
+            )]
+
+    source_breakdown = {t: 0 for t in _EVENT_TYPES}
+    entity_totals = {}
+    for (eid, event_type), count in counts.items():
+        source_breakdown[event_type] += count
+        entity_totals[eid] = entity_totals.get(eid, 0) + count
+
+    # Most active entities (by total events, top 10; ties in name order)
+    most_active = sorted(
+        ({"entity_id": r["id"], "entity_name": r["name"], "event_count": entity_totals[r["id"]]}
+         for r in entity_rows if entity_totals.get(r["id"])),
+        key=lambda e: e["event_count"], reverse=True,
+    )[:10]
 
     return jsonify({
         "period_days": days,
         "entity_count": len(entity_rows),
-        "total_events": total_events,
+        "total_events": sum(source_breakdown.values()),
         "most_active_entities": most_active,
         "top_changed_fields": top_fields,
         "recent_highlights": recent_highlights,
-        "source_breakdown": {
-            "change_detected": total_changes,
-            "attribute_updated": total_attrs,
-            "evidence_captured": total_evidence,
-        },
+        "source_breakdown": source_breakdown,
         "severity_breakdown": severity_breakdown,
     })
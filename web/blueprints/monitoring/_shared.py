@@ -83,6 +83,30 @@ CREATE TABLE IF NOT EXISTS change_feed (
 )
 """
 
+_CHANGE_FEED_INDEXES_SQL = (
+    # Backs the feed's newest-first keyset pagination
+    """CREATE INDEX IF NOT EXISTS idx_change_feed_project_created
+       ON change_feed(project_id, is_dismissed, created_at, id)""",
+    # Signals lens: project timeline, and per-entity counts / timelines
+    """CREATE INDEX IF NOT EXISTS idx_change_feed_project_time
+       ON change_feed(project_id, created_at)""",
+    """CREATE INDEX IF NOT EXISTS idx_change_feed_entity_time
+       ON change_feed(entity_id, created_at)""",
+)
+
+# The signals lens reads change_feed and monitors; bump project_versions
+# (see storage/schema.sql) like the entity tables do.
+_PROJECT_VERSION_TRIGGERS_SQL = tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS trg_project_version_{table}_{event.lower()}
+        AFTER {event} ON {table} BEGIN
+            INSERT INTO project_versions (project_id, version)
+            SELECT project_id, 1 FROM entities WHERE id = {row}.entity_id
+            ON CONFLICT(project_id) DO UPDATE SET version = version + 1;
+        END"""
+    for table in ("change_feed", "monitors")
+    for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD"))
+)
+
 _TABLE_ENSURED = False
 
 
@@ -93,6 +117,8 @@ def _ensure_tables(conn):
         conn.execute(_MONITORS_TABLE_SQL)
         conn.execute(_MONITOR_CHECKS_TABLE_SQL)
         conn.execute(_CHANGE_FEED_TABLE_SQL)
+        for sql in _CHANGE_FEED_INDEXES_SQL + _PROJECT_VERSION_TRIGGERS_SQL:
+            conn.execute(sql)
         _TABLE_ENSURED = True
 
 
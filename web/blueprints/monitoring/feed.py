@@ -4,9 +4,14 @@ import json
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from storage.pagination import InvalidCursor, Keyset
+
 from . import monitoring_bp
 from ._shared import _require_project_id, _now_iso, _ensure_tables, _row_to_feed_item
 
+# Newest first; id orders changes detected in the same second
+_FEED_ORDER = Keyset("change-feed", ("cf.created_at", "created_at", True), ("cf.id", "id", True))
+
 # ═════════════════════════════════════════════════════════════
 # 7. Change Feed
 # ═════════════════════════════════════════════════════════════
@@ -23,9 +28,10 @@ def get_feed():
         is_read (optional): Filter by read status (0 or 1)
         limit (optional): Max results (default: 50)
         offset (optional): Pagination offset (default: 0)
+        cursor (optional): next_cursor of the previous page (replaces offset)
 
     Returns:
-        List of change feed items, newest first.
+        {items, total, limit, offset, next_cursor}, items newest first.
     """
     project_id, err = _require_project_id()
     if err:
@@ -37,9 +43,14 @@ def get_feed():
     is_read = request.args.get("is_read", type=int)
     limit = request.args.get("limit", 50, type=int)
     offset = max(0, request.args.get("offset", 0, type=int))
+    cursor = request.args.get("cursor")
 
     # Clamp limit
     limit = max(1, min(limit, 200))
+    try:
+        after, after_params = _FEED_ORDER.where(cursor)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
 
     db = current_app.db
 
@@ -74,10 +85,13 @@ def get_feed():
         )
         total = conn.execute(count_query, params).fetchone()["total"]
 
-        query += " ORDER BY cf.created_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        if after:
+            query += f" AND {after}"
+            params.extend(after_params)
+        query += f" ORDER BY {_FEED_ORDER.order_by()} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, 0 if cursor else offset])
 
-        rows = conn.execute(query, params).fetchall()
+        rows = _FEED_ORDER.page(conn.execute(query, params).fetchall(), limit)
 
     items = [_row_to_feed_item(row) for row in rows]
 
@@ -86,6 +100,7 @@ def get_feed():
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": rows.next_cursor,
     })
 
 
@@ -1,4 +1,4 @@
-"""Processing API: jobs, batches, triage, pipeline execution."""
+"""Processing API: jobs, batches, triage, pipeline execution, async job queue."""
 import json
 
 from flask import Blueprint, current_app, jsonify, request
@@ -10,6 +10,7 @@ from core.llm import get_op_estimates
 from core.pipeline import Pipeline
 from core.url_resolver import extract_urls_from_text
 from storage.db import Database
+from web import async_jobs
 from web.async_jobs import make_job_id, run_in_thread
 from web.notifications import notify_sse, send_slack
 
@@ -46,6 +47,42 @@ def get_batch_details(batch_id):
     return jsonify(current_app.db.get_batch_details(batch_id))
 
 
+# --- Async job queue ---
+
+@processing_bp.route("/api/async-jobs")
+def list_async_jobs():
+    """List queued/running/finished async jobs. Query: ?state&prefix&project_id&limit"""
+    state = request.args.get("state")
+    if state and state not in async_jobs.ACTIVE_STATES + async_jobs.TERMINAL_STATES:
+        return jsonify({"error": f"Invalid state: {state}"}), 400
+    return jsonify(async_jobs.list_jobs(
+        state=state,
+        prefix=request.args.get("prefix"),
+        project_id=request.args.get("project_id", type=int),
+        limit=min(request.args.get("limit", 50, type=int), 500),
+    ))
+
+
+@processing_bp.route("/api/async-jobs/<job_id>")
+def get_async_job(job_id):
+    """Get one async job: state, progress, heartbeat and result."""
+    job = async_jobs.get_job(job_id) if async_jobs.is_valid_job_id(job_id) else None
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+@processing_bp.route("/api/async-jobs/<job_id>/cancel", methods=["POST"])
+def cancel_async_job(job_id):
+    """Cancel a queued or running async job."""
+    job = async_jobs.get_job(job_id) if async_jobs.is_valid_job_id(job_id) else None
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if not async_jobs.cancel_job(job_id):
+        return jsonify({"error": f"Job already {job['state']}"}), 409
+    return jsonify({"job_id": job_id, "state": "cancelled"})
+
+
 # --- Retry helpers ---
 
 def _run_retry(batch_id, urls, project_id, model, desc_prefix):
@@ -113,7 +150,7 @@ def retry_all_errors(batch_id):
 def _run_pipeline(batch_id, urls, workers, model, project_id):
     pipe_db = Database()
     pipeline = Pipeline(pipe_db, workers=workers, model=model,
-                        project_id=project_id)
+                        project_id=project_id, defer_export=True)
     pipeline.run(urls, batch_id)
     if project_id:
         stats = pipe_db.get_batch_summary(batch_id)
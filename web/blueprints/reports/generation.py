@@ -5,6 +5,8 @@ from datetime import datetime, timezone
 from flask import request, jsonify, current_app
 from loguru import logger
 
+from web.response_cache import cached_call
+
 from . import reports_bp
 from ._shared import (
     _require_project_id, _now_iso, _ensure_table,
@@ -922,6 +924,22 @@ _TEMPLATE_HANDLERS = {
 }
 
 
+def _gather(db, template, project_id, entity_ids):
+    """Run *template*'s gather function, cached per project data version.
+
+    The structured and AI reports share the result, so regenerating either
+    for an unchanged project skips the aggregation queries.
+    """
+    gather_fn = _TEMPLATE_HANDLERS[template][0]
+
+    def compute():
+        with db._get_conn() as conn:
+            return gather_fn(conn, project_id, entity_ids)
+
+    return cached_call(db, project_id, f"report:{template}",
+                       {"entity_ids": entity_ids}, compute)
+
+
 # ═══════════════════════════════════════════════════════════════
 # Generate Report (structured, no AI)
 # ═══════════════════════════════════════════════════════════════
@@ -947,7 +965,7 @@ def generate_report():
     if template not in _TEMPLATE_HANDLERS:
         return jsonify({"error": f"Unknown template: {template}. Valid: {list(_TEMPLATE_HANDLERS.keys())}"}), 400
 
-    gather_fn, build_fn = _TEMPLATE_HANDLERS[template]
+    _, build_fn = _TEMPLATE_HANDLERS[template]
     db = current_app.db
 
     # Verify project exists
@@ -959,8 +977,7 @@ def generate_report():
     with db._get_conn() as conn:
         _ensure_table(conn)
 
-        # Gather data
-        gathered = gather_fn(conn, project_id, entity_ids)
+    gathered = _gather(db, template, project_id, entity_ids)
 
     # Build sections
     sections = build_fn(gathered)
@@ -1038,13 +1055,12 @@ def generate_ai_report():
     if template not in _TEMPLATE_HANDLERS:
         return jsonify({"error": f"Unknown template: {template}. Valid: {list(_TEMPLATE_HANDLERS.keys())}"}), 400
 
-    gather_fn, _ = _TEMPLATE_HANDLERS[template]
     db = current_app.db
 
-    # Gather data
     with db._get_conn() as conn:
         _ensure_table(conn)
-        gathered = gather_fn(conn, project_id, entity_ids)
+
+    gathered = _gather(db, template, project_id, entity_ids)
 
     # Get project info for context
     with db._get_conn() as conn:
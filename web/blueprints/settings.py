@@ -2,7 +2,6 @@
    app settings, backups, prerequisites, auto-update."""
 import json
 import logging
-import queue
 import shutil
 import urllib.request
 from datetime import datetime
@@ -14,7 +13,10 @@ from config import (
     APP_VERSION, DATA_DIR, BACKUP_DIR, DB_PATH, LOGS_DIR,
     load_app_settings, save_app_settings, check_prerequisites,
 )
-from web.notifications import sse_clients, _is_valid_slack_webhook
+from storage.pagination import InvalidCursor
+from web.notifications import event_bus, _is_valid_slack_webhook
+
+from ._utils import paged_json
 
 logger = logging.getLogger(__name__)
 settings_bp = Blueprint("settings", __name__)
@@ -76,7 +78,12 @@ def get_activity():
     project_id = request.args.get("project_id", type=int)
     limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
     offset = max(request.args.get("offset", 0, type=int), 0)
-    return jsonify(current_app.db.get_activity(project_id, limit=limit, offset=offset))
+    try:
+        activity = current_app.db.get_activity(project_id, limit=limit, offset=offset,
+                                               cursor=request.args.get("cursor"))
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return paged_json(activity)
 
 
 # --- Notification Preferences ---
@@ -334,26 +341,21 @@ def sse_stream():
     if not project:
         return "project not found", 404
 
-    q = queue.Queue()
-    if project_id not in sse_clients:
-        sse_clients[project_id] = []
-    sse_clients[project_id].append(q)
-
-    def generate():
-        try:
-            yield "event: connected\ndata: {}\n\n"
-            while True:
-                try:
-                    msg = q.get(timeout=30)
-                    yield msg
-                except queue.Empty:
-                    yield ": keepalive\n\n"
-        finally:
-            if project_id in sse_clients and q in sse_clients[project_id]:
-                sse_clients[project_id].remove(q)
-
-    return current_app.response_class(
-        generate(),
+    # EventSource sends Last-Event-ID on its own reconnects; sse.js passes
+    # ?last_event_id when it reconnects by hand after an error
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        last_id = None
+
+    if not event_bus.acquire_stream():
+        return "too many event streams", 503, {"Retry-After": "10"}
+
+    response = current_app.response_class(
+        event_bus.stream(project_id, last_id=last_id),
         mimetype="text/event-stream",
         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+    response.call_on_close(event_bus.release_stream)
+    return response
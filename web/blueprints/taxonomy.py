@@ -2,8 +2,8 @@
 from flask import Blueprint, current_app, jsonify, request
 
 from config import DEFAULT_MODEL
+from core.export_scheduler import schedule_export
 from core.git_sync import sync_to_git_async
-from storage.export import export_markdown, export_json
 from web.async_jobs import start_async_job, write_result, poll_result
 from web.notifications import notify_sse, send_slack
 
@@ -64,8 +64,7 @@ def apply_taxonomy_review():
     changes = data.get("changes", [])
     project_id = data.get("project_id")
     applied = apply_taxonomy_changes(db, changes, project_id=project_id)
-    export_markdown(db, project_id=project_id)
-    export_json(db, project_id=project_id)
+    schedule_export(db, project_id=project_id)
     if project_id and applied:
         desc = f"Applied {len(applied)} taxonomy changes"
         db.log_activity(project_id, "taxonomy_changed", desc, "taxonomy", None)
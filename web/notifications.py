@@ -1,28 +1,160 @@
-"""SSE (Server-Sent Events) infrastructure and Slack webhook notifications."""
+"""SSE (Server-Sent Events) infrastructure and Slack webhook notifications.
+
+Events go into a bounded ring buffer per project, each with a
+monotonically increasing id. Streams don't own queues: each keeps a
+cursor into its project's buffer, so memory stays bounded however slow
+or stalled a client is. A reconnecting client sends ``Last-Event-ID``
+and is replayed what it missed; a client that fell behind the buffer
+gets a ``resync`` event telling it to reload instead.
+
+High-frequency event types (``COALESCED_EVENTS``) keep only their latest
+event per key in the buffer, so progress updates never crowd out other
+events and a client that wakes late sees one update, not hundreds.
+"""
+import itertools
 import json
-import queue
+import threading
+import time
+from collections import deque
+
+
+REPLAY_BUFFER_SIZE = 256       # events kept per project for replay
+MAX_STREAMS = 32               # concurrent /api/events/stream connections
+STREAM_MAX_SECONDS = 300       # streams close after this; clients reconnect and replay
+KEEPALIVE_SECONDS = 30
+COALESCE_WINDOW = 0.25         # seconds a stream lingers to batch progress-only wakeups
+
+# event type -> data field identifying the thing being updated
+COALESCED_EVENTS = {
+    "job_progress": "job_id",
+}
+
+
+class EventBus:
+    """Per-project ring buffers of events with replay and coalescing."""
+
+    def __init__(self, buffer_size=REPLAY_BUFFER_SIZE, max_streams=MAX_STREAMS):
+        self.buffer_size = buffer_size
+        self.max_streams = max_streams
+        self._buffers = {}                 # project_id -> deque of (id, type, key, payload)
+        self._evicted = {}                 # project_id -> newest id pushed out of the buffer
+        # Millisecond start keeps ids increasing across restarts, so a
+        # client's Last-Event-ID from a previous process reads as stale
+        self._first_id = int(time.time() * 1000)
+        self._ids = itertools.count(self._first_id)
+        self._cond = threading.Condition()
+        self._streams = 0
+
+    def publish(self, project_id, event_type, data):
+        """Append an event and wake the project's streams. Returns its id."""
+        payload = json.dumps(data)
+        key_field = COALESCED_EVENTS.get(event_type)
+        key = data.get(key_field) if key_field and isinstance(data, dict) else None
+        with self._cond:
+            buf = self._buffers.get(project_id)
+            if buf is None:
+                buf = self._buffers[project_id] = deque(maxlen=self.buffer_size)
+            if key is not None:
+                for item in buf:
+                    if item[1] == event_type and item[2] == key:
+                        buf.remove(item)
+                        break
+            if len(buf) == buf.maxlen:
+                self._evicted[project_id] = buf[0][0]
+            event_id = next(self._ids)
+            buf.append((event_id, event_type, key, payload))
+            self._cond.notify_all()
+        return event_id
+
+    def last_id(self, project_id):
+        with self._cond:
+            buf = self._buffers.get(project_id)
+            return buf[-1][0] if buf else 0
+
+    def events_since(self, project_id, last_id):
+        """Events after *last_id* as ``(events, gap)``.
+
+        *gap* is True when the client can't be caught up by replay: events
+        after *last_id* were already dropped from the buffer, or *last_id*
+        predates this process.
+        """
+        with self._cond:
+            return self._events_since(project_id, last_id)
+
+    def _events_since(self, project_id, last_id):
+        if last_id and (last_id < self._first_id or last_id < self._evicted.get(project_id, 0)):
+            return [], True
+        buf = self._buffers.get(project_id)
+        if not buf:
+            return [], False
+        return [e for e in buf if e[0] > last_id], False
+
+    def wait(self, project_id, last_id, timeout):
+        """Block until events newer than *last_id* exist or *timeout* passes."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                events, gap = self._events_since(project_id, last_id)
+                remaining = deadline - time.monotonic()
+                if events or gap or remaining <= 0:
+                    return events, gap
+                self._cond.wait(remaining)
+
+    def acquire_stream(self):
+        """Reserve a stream slot. Returns False when MAX_STREAMS are open."""
+        with self._cond:
+            if self._streams >= self.max_streams:
+                return False
+            self._streams += 1
+            return True
+
+    def release_stream(self):
+        with self._cond:
+            self._streams = max(0, self._streams - 1)
+
+    @property
+    def stream_count(self):
+        return self._streams
+
+    def stream(self, project_id, last_id=None, max_seconds=STREAM_MAX_SECONDS,
+               keepalive=KEEPALIVE_SECONDS):
+        """Generate SSE frames for a project.
+
+        With *last_id*, missed events are replayed first; otherwise only new
+        events are sent. The stream ends after *max_seconds* so that
+        stalled connections release their thread; EventSource reconnects
+        with Last-Event-ID and loses nothing.
+        """
+        yield "retry: 3000\nevent: connected\ndata: {}\n\n"
+        cursor = self.last_id(project_id) if last_id is None else last_id
+        end = time.monotonic() + max_seconds
+        while True:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            events, gap = self.wait(project_id, cursor, min(keepalive, remaining))
+            if gap:
+                cursor = self.last_id(project_id)
+                yield f"id: {cursor}\nevent: resync\ndata: {{}}\n\n"
+                continue
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            if all(e[2] is not None for e in events):
+                # Only progress so far: give it a moment to coalesce
+                time.sleep(COALESCE_WINDOW)
+                events, _ = self.events_since(project_id, cursor)
+            for event_id, event_type, _, payload in events:
+                cursor = event_id
+                yield f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
 
 
-sse_clients = {}  # project_id -> list of queues
+event_bus = EventBus()
 
 
 def notify_sse(project_id, event_type, data):
     """Push an event to all SSE clients for a project."""
-    if project_id in sse_clients:
-        msg = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-        dead = []
-        for q in sse_clients[project_id]:
-            try:
-                q.put_nowait(msg)
-            except Exception:
-                dead.append(q)
-        for q in dead:
-            try:
-                sse_clients[project_id].remove(q)
-            except ValueError:
-                pass
-        if not sse_clients[project_id]:
-            del sse_clients[project_id]
+    event_bus.publish(project_id, event_type, data)
 
 
 def _is_valid_slack_webhook(url):
@@ -0,0 +1,353 @@
+"""Opt-in per-request profiling: latency, SQL counters and a slow-query log.
+
+Enabled with ``APP_PROFILING=1`` (or ``app.config["PROFILING"] = True``).
+While a request is being handled, connections from ``Database._get_conn``
+are ``ProfiledConnection`` instances whose cursors time every statement
+(execute plus fetches) and count the rows returned. The totals are
+attributed to the request through a context variable, so queries from
+background threads are not mixed in.
+
+Per endpoint (method + URL rule) the profiler keeps request count, a
+latency histogram, recent-latency percentiles, and SQL statements, SQL
+time and rows per request. Statements slower than
+``PROFILING_SLOW_QUERY_MS`` go into a ring buffer with their normalised
+SQL and the storage method that issued them.
+
+Every profiled response carries a ``Server-Timing`` header (total, sql,
+app); ``GET /api/_perf`` returns the aggregates and ``DELETE`` resets them.
+"""
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+
+from flask import g, jsonify, request
+
+from config import PROFILING_ENABLED, PROFILING_SLOW_QUERY_MS
+
+SLOW_LOG_SIZE = 200
+RECENT_LATENCIES = 512          # per endpoint, for p50/p95
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_STORAGE_DIR = str(Path(__file__).resolve().parent.parent / "storage")
+_THIS_FILE = __file__
+
+_current = ContextVar("profiling_request_stats", default=None)
+
+
+# ── SQL normalisation and caller lookup ──────────────────────
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql, max_length=500):
+    """*sql* with literals replaced by ``?`` and whitespace collapsed.
+
+    Statements that differ only in their values (or in the length of an
+    ``IN (?, ?, ...)`` list) normalise to the same text.
+    """
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(?, ...)", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip()
+    return sql if len(sql) <= max_length else sql[:max_length] + "..."
+
+
+def _caller():
+    """``module.Qualified.name`` of the storage function running this statement.
+
+    Falls back to the nearest caller outside this module (e.g. a blueprint
+    using a connection directly).
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != _THIS_FILE:
+            name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            where = f"{frame.f_globals.get('__name__', '?')}.{name}"
+            if filename.startswith(_STORAGE_DIR):
+                return where
+            if fallback is None and "sqlite3" not in filename and "contextlib" not in filename:
+                fallback = where
+        frame = frame.f_back
+    return fallback
+
+
+# ── Per-request state ────────────────────────────────────────
+
+class _Statement:
+    __slots__ = ("sql", "caller", "endpoint", "ms", "rows", "at", "logged")
+
+    def __init__(self, sql, caller, endpoint):
+        self.sql = sql
+        self.caller = caller
+        self.endpoint = endpoint
+        self.ms = 0.0
+        self.rows = 0
+        self.at = time.time()
+        self.logged = False
+
+    def to_dict(self):
+        return {
+            "sql": normalize_sql(self.sql),
+            "caller": self.caller,
+            "endpoint": self.endpoint,
+            "ms": round(self.ms, 3),
+            "rows": self.rows,
+            "at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.at)),
+        }
+
+
+class RequestStats:
+    """SQL totals for the request being handled."""
+
+    def __init__(self, endpoint, profiler):
+        self.endpoint = endpoint
+        self.statements = 0
+        self.sql_ms = 0.0
+        self.rows = 0
+        self._profiler = profiler
+
+    def begin(self, sql):
+        self.statements += 1
+        return _Statement(sql, _caller(), self.endpoint)
+
+    def spend(self, statement, seconds, rows=0):
+        ms = seconds * 1000
+        statement.ms += ms
+        statement.rows += rows
+        self.sql_ms += ms
+        self.rows += rows
+        if not statement.logged and statement.ms >= self._profiler.slow_query_ms:
+            # Logged once; later fetches keep updating the same entry
+            statement.logged = True
+            self._profiler.log_slow(statement)
+
+
+# ── Instrumented connection ──────────────────────────────────
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that charges execute and fetch time to the current request."""
+
+    _statement = None
+    _stats = None
+
+    def _run(self, method, sql, args):
+        stats = _current.get()
+        if stats is None:
+            self._statement = None
+            return method(sql, *args)
+        self._stats = stats
+        self._statement = stats.begin(sql)
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            stats.spend(self._statement, time.perf_counter() - start)
+
+    def execute(self, sql, parameters=(), /):
+        return self._run(super().execute, sql, (parameters,))
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self._run(super().executemany, sql, (seq_of_parameters,))
+
+    def executescript(self, sql_script, /):
+        return self._run(super().executescript, sql_script, ())
+
+    def _fetch(self, method, *args):
+        if self._statement is None:
+            return method(*args)
+        start = time.perf_counter()
+        result = method(*args)
+        if result is None:
+            rows = 0
+        elif isinstance(result, list):
+            rows = len(result)
+        else:
+            rows = 1
+        self._stats.spend(self._statement, time.perf_counter() - start, rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, size if size is not None else self.arraysize)
+
+    def fetchall(self):
+        return self._fetch(super().fetchall)
+
+    def __next__(self):
+        if self._statement is None:
+            return super().__next__()
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._stats.spend(self._statement, time.perf_counter() - start)
+            raise
+        self._stats.spend(self._statement, time.perf_counter() - start, 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors (including ``conn.execute``'s) are profiled."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script, /):
+        return self.cursor().executescript(sql_script)
+
+
+# ── Aggregates ───────────────────────────────────────────────
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Profiler:
+    """Per-endpoint latency and SQL aggregates, plus the slow-query ring buffer."""
+
+    def __init__(self, slow_query_ms=PROFILING_SLOW_QUERY_MS, slow_log_size=SLOW_LOG_SIZE):
+        self.slow_query_ms = slow_query_ms
+        self._endpoints = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def log_slow(self, statement):
+        self._slow.append(statement)
+
+    def record(self, endpoint, duration_ms, stats):
+        """Add one finished request to *endpoint*'s aggregates."""
+        with self._lock:
+            agg = self._endpoints.get(endpoint)
+            if agg is None:
+                agg = self._endpoints[endpoint] = {
+                    "requests": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "buckets": [0] * (len(HISTOGRAM_BUCKETS_MS) + 1),
+                    "recent": deque(maxlen=RECENT_LATENCIES),
+                    "sql_statements": 0, "sql_ms": 0.0, "rows": 0,
+                }
+            agg["requests"] += 1
+            agg["total_ms"] += duration_ms
+            agg["max_ms"] = max(agg["max_ms"], duration_ms)
+            agg["recent"].append(duration_ms)
+            bucket = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS_MS)
+                           if duration_ms <= bound), len(HISTOGRAM_BUCKETS_MS))
+            agg["buckets"][bucket] += 1
+            agg["sql_statements"] += stats.statements
+            agg["sql_ms"] += stats.sql_ms
+            agg["rows"] += stats.rows
+
+    def snapshot(self):
+        """Aggregates per endpoint (most total time first) and the slow-query log."""
+        labels = [f"<={b}ms" for b in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            endpoints = []
+            for endpoint, agg in self._endpoints.items():
+                n = agg["requests"]
+                recent = sorted(agg["recent"])
+                endpoints.append({
+                    "endpoint": endpoint,
+                    "requests": n,
+                    "total_ms": round(agg["total_ms"], 3),
+                    "mean_ms": round(agg["total_ms"] / n, 3),
+                    "p50_ms": round(_percentile(recent, 50), 3),
+                    "p95_ms": round(_percentile(recent, 95), 3),
+                    "max_ms": round(agg["max_ms"], 3),
+                    "histogram": dict(zip(labels, agg["buckets"])),
+                    "sql_statements_per_request": round(agg["sql_statements"] / n, 2),
+                    "sql_ms_per_request": round(agg["sql_ms"] / n, 3),
+                    "rows_per_request": round(agg["rows"] / n, 2),
+                    "sql_share": (round(agg["sql_ms"] / agg["total_ms"], 3)
+                                  if agg["total_ms"] else 0.0),
+                })
+            slow = [s.to_dict() for s in reversed(self._slow)]
+        endpoints.sort(key=lambda e: e["total_ms"], reverse=True)
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "endpoints": endpoints,
+            "slow_queries": slow,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._slow.clear()
+
+
+profiler = Profiler()
+
+
+# ── Flask wiring ─────────────────────────────────────────────
+
+def _instrument(db):
+    # app.db can be replaced after create_app (tests do), so check per request
+    if db.connection_factory is not ProfiledConnection:
+        db.connection_factory = ProfiledConnection
+
+
+def _server_timing(total_ms, stats):
+    return (f'total;dur={total_ms:.1f}, '
+            f'sql;dur={stats.sql_ms:.1f};desc="{stats.statements} queries, {stats.rows} rows", '
+            f'app;dur={max(total_ms - stats.sql_ms, 0.0):.1f}')
+
+
+def init_app(app):
+    """Register the profiling hooks and the ``/api/_perf`` endpoint on *app*.
+
+    Register before other request hooks so their time is included.
+    """
+    app.config.setdefault("PROFILING", PROFILING_ENABLED)
+
+    @app.before_request
+    def _start_profile():
+        if not app.config.get("PROFILING") or request.path == "/api/_perf":
+            return
+        _instrument(app.db)
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        g.profile_start = time.perf_counter()
+        _current.set(RequestStats(f"{request.method} {rule}", profiler))
+
+    @app.after_request
+    def _finish_profile(response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        total_ms = (time.perf_counter() - g.profile_start) * 1000
+        profiler.record(stats.endpoint, total_ms, stats)
+        response.headers["Server-Timing"] = _server_timing(total_ms, stats)
+        return response
+
+    @app.teardown_request
+    def _clear_profile(_exc):
+        _current.set(None)
+
+    @app.route("/api/_perf")
+    def perf_stats():
+        if not app.config.get("PROFILING"):
+            return jsonify({"error": "Profiling is disabled; start the app with "
+                                     "APP_PROFILING=1"}), 404
+        return jsonify(profiler.snapshot())
+
+    @app.route("/api/_perf", methods=["DELETE"])
+    def perf_reset():
+        profiler.reset()
+        return jsonify({"status": "ok"})
@@ -0,0 +1,241 @@
+"""Versioned response cache for the read-heavy lens and report endpoints.
+
+Responses are keyed by (endpoint, query parameters) and stored with the
+project's data version (``project_versions``, bumped by triggers on every
+write to the tables these endpoints read). An entry is only served while
+the project is still at that version, so no write path has to purge it.
+
+Two tiers: a bounded in-process LRU in front of the persisted
+``response_cache`` table, which survives restarts and is shared between
+workers. Every cached response carries a strong ETag (hash of the body);
+a request whose ``If-None-Match`` matches gets a bodyless 304.
+
+Endpoints whose output also depends on the clock (e.g. "last 30 days")
+pass ``ttl`` so their entries expire with a time bucket as well.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from loguru import logger
+
+MEMORY_MAX_ENTRIES = 512
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+# Browsers keep cached responses but revalidate them with the ETag
+CACHE_CONTROL = "no-cache"
+
+
+class ResponseCache:
+    """In-process LRU of serialized responses, plus per-endpoint counters."""
+
+    def __init__(self, max_entries=MEMORY_MAX_ENTRIES, max_bytes=MEMORY_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()      # cache_key -> (version, etag, body)
+        self._bytes = 0
+        self._stats = {}                   # endpoint -> {counter: n}
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    # ── Memory tier ──────────────────────────────────────────
+
+    def get(self, cache_key, version):
+        """(etag, body) held for *cache_key* at *version*, or None."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry[1], entry[2]
+
+    def put(self, cache_key, version, etag, body):
+        """Hold *body*, replacing any other version of the key; evict LRU to fit."""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[cache_key] = (version, etag, body)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop every in-process entry (the persisted tier is untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # ── Counters ─────────────────────────────────────────────
+
+    def count(self, endpoint, outcome):
+        """Record a lookup outcome: memory_hits, store_hits, misses or not_modified."""
+        with self._lock:
+            counters = self._stats.setdefault(endpoint, {
+                "memory_hits": 0, "store_hits": 0, "misses": 0, "not_modified": 0,
+            })
+            counters[outcome] += 1
+
+    def stats(self):
+        """Memory tier size and per-endpoint hit rates."""
+        with self._lock:
+            endpoints = {}
+            totals = {"memory_hits": 0, "store_hits": 0, "misses": 0, "not_modified": 0}
+            for endpoint, counters in sorted(self._stats.items()):
+                endpoints[endpoint] = {**counters, "hit_rate": _hit_rate(counters)}
+                for name, n in counters.items():
+                    totals[name] += n
+            return {
+                "memory": {
+                    "entries": len(self._entries),
+                    "bytes": self._bytes,
+                    "max_entries": self.max_entries,
+                    "max_bytes": self.max_bytes,
+                    "evictions": self._evictions,
+                },
+                "totals": {**totals, "hit_rate": _hit_rate(totals)},
+                "endpoints": endpoints,
+            }
+
+    def reset_stats(self):
+        """Zero the counters."""
+        with self._lock:
+            self._stats.clear()
+            self._evictions = 0
+
+
+def _hit_rate(counters):
+    hits = counters["memory_hits"] + counters["store_hits"]
+    lookups = hits + counters["misses"]
+    return round(hits / lookups, 4) if lookups else None
+
+
+response_cache = ResponseCache()
+
+
+def _cache_key(db, endpoint, params):
+    # The database path keeps apps on different databases apart in one process
+    raw = json.dumps([str(db.db_path), endpoint, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _etag_for(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def _lookup(db, endpoint, cache_key, version):
+    """(etag, body) from the memory tier, then the persisted one; None on a miss."""
+    hit = response_cache.get(cache_key, version)
+    if hit is not None:
+        response_cache.count(endpoint, "memory_hits")
+        return hit
+    try:
+        row = db.get_cached_response(cache_key, version)
+    except Exception as e:  # a cache read must never fail the request
+        logger.warning("response cache read failed for {}: {}", endpoint, e)
+        row = None
+    if row is None:
+        response_cache.count(endpoint, "misses")
+        return None
+    hit = (row["etag"], row["body"].encode())
+    response_cache.put(cache_key, version, *hit)
+    response_cache.count(endpoint, "store_hits")
+    return hit
+
+
+def _store(db, endpoint, cache_key, project_id, version, etag, body):
+    response_cache.put(cache_key, version, etag, body)
+    try:
+        db.put_cached_response(cache_key, project_id, endpoint, version, etag, body.decode())
+    except Exception as e:
+        logger.warning("response cache write failed for {}: {}", endpoint, e)
+
+
+def _version(db, project_id, ttl):
+    version = str(db.get_project_version(project_id))
+    if ttl:
+        version += f":{int(time.time() // ttl)}"
+    return version
+
+
+def cached_response(ttl=None):
+    """Cache a GET view's 200 JSON response per project data version.
+
+    The view must take its project from ``?project_id=``; requests without
+    one go straight to the view. The key covers the endpoint and every
+    query parameter. The version is read before the view runs, so a write
+    landing mid-computation can only make the entry stale-looking (and
+    recomputed), never serve old data under a new version.
+
+    Args:
+        ttl: Seconds; also expire entries on this time bucket, for views
+             whose output depends on the current time
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            project_id = request.args.get("project_id", type=int)
+            if not project_id:
+                return view(*args, **kwargs)
+
+            db = current_app.db
+            endpoint = request.endpoint
+            params = sorted(request.args.items(multi=True))
+            cache_key = _cache_key(db, endpoint, params)
+            version = _version(db, project_id, ttl)
+
+            hit = _lookup(db, endpoint, cache_key, version)
+            if hit is not None:
+                etag, body = hit
+                response = current_app.response_class(body, mimetype="application/json")
+                response.headers["X-Cache"] = "hit"
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or not response.is_json:
+                    return response
+                body = response.get_data()
+                etag = _etag_for(body)
+                _store(db, endpoint, cache_key, project_id, version, etag, body)
+                response.headers["X-Cache"] = "miss"
+
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = CACHE_CONTROL
+            response = response.make_conditional(request)
+            if response.status_code == 304:
+                response_cache.count(endpoint, "not_modified")
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_call(db, project_id, name, params, compute):
+    """Return ``compute()``, cached per project data version like a response.
+
+    For JSON-serializable intermediate results shared between endpoints
+    (e.g. a report's gathered data). Values come back as decoded JSON.
+
+    Args:
+        db: Database
+        project_id: Project whose data *compute* reads
+        name: Stable name for the computation (used in stats)
+        params: JSON-serializable arguments distinguishing results
+        compute: Zero-argument callable producing the value
+    """
+    cache_key = _cache_key(db, name, params)
+    version = _version(db, project_id, None)
+    hit = _lookup(db, name, cache_key, version)
+    if hit is not None:
+        return json.loads(hit[1])
+    value = compute()
+    body = json.dumps(value).encode()
+    _store(db, name, cache_key, project_id, version, _etag_for(body), body)
+    return json.loads(body)
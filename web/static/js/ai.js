@@ -442,33 +442,63 @@ async function sendChatMessage() {
     body.scrollTop = body.scrollHeight;
     input.value = '';
 
+    const pending = document.getElementById('chatPending');
+    pending.removeAttribute('id');
+    const render = (text) => {
+        if (window.marked) {
+            pending.innerHTML = sanitize(marked.parse(text, { breaks: true, gfm: true }));
+        } else {
+            pending.innerHTML = esc(text).replace(/\n/g, '<br>');
+        }
+        body.scrollTop = body.scrollHeight;
+    };
+    const showError = (message) => {
+        pending.innerHTML = `<span class="re-research-error">${esc(message)}</span>`;
+    };
+
+    // The answer arrives as server-sent events (sources, token..., done | error)
     try {
-        const res = await safeFetch('/api/ai/chat', {
+        const res = await safeFetch('/api/ai/chat/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ question, project_id: currentProjectId, model: 'claude-haiku-4-5-20251001' }),
         });
-        const data = await res.json();
-        const pending = document.getElementById('chatPending');
-        if (pending) {
-            if (data.error) {
-                pending.innerHTML = `<span class="re-research-error">${esc(data.error)}</span>`;
-            } else {
-                const answer = data.answer || 'No answer';
-                if (window.marked) {
-                    pending.innerHTML = sanitize(marked.parse(answer, { breaks: true, gfm: true }));
-                } else {
-                    pending.innerHTML = esc(answer).replace(/\n/g, '<br>');
+        if (!res.ok) {
+            const data = await res.json().catch(() => ({}));
+            showError(data.error || `Error: HTTP ${res.status}`);
+        } else {
+            const reader = res.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let answer = '';
+            let finished = false;
+            while (!finished) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let sep;
+                while ((sep = buffer.indexOf('\n\n')) !== -1) {
+                    const frame = buffer.slice(0, sep);
+                    buffer = buffer.slice(sep + 2);
+                    const event = (frame.match(/^event: (.*)$/m) || [])[1];
+                    const payload = JSON.parse((frame.match(/^data: (.*)$/m) || [])[1] || '{}');
+                    if (event === 'token') {
+                        answer += payload.text;
+                        render(answer);
+                    } else if (event === 'error') {
+                        showError(payload.error);
+                        finished = true;
+                        break;
+                    } else if (event === 'done') {
+                        finished = true;
+                        break;
+                    }
                 }
             }
-            pending.removeAttribute('id');
+            if (!answer && !pending.querySelector('.re-research-error')) render('No answer');
         }
     } catch (err) {
-        const pending = document.getElementById('chatPending');
-        if (pending) {
-            pending.innerHTML = `<span class="re-research-error">Error: ${esc(err.message)}</span>`;
-            pending.removeAttribute('id');
-        }
+        showError(`Error: ${err.message}`);
     }
     releaseAiLock();
     body.scrollTop = body.scrollHeight;
@@ -70,7 +70,13 @@ async function importCsv(event) {
     if (data.error) {
         resultDiv.innerHTML = `<p class="re-research-error">${esc(data.error)}</p>`;
     } else {
-        resultDiv.innerHTML = `<p class="re-research-success">Imported ${data.imported} of ${data.total_rows} rows.</p>`;
+        let html = `<p class="re-research-success">Imported ${data.imported} of ${data.total_rows} rows `
+            + `(${data.created} new, ${data.updated} updated, ${data.skipped} skipped).</p>`;
+        if (data.errors && data.errors.length) {
+            html += '<ul class="import-errors">' + data.errors.map(e =>
+                `<li>Row ${e.row}: ${esc(e.error)}${e.url ? ' — ' + esc(e.url) : ''}</li>`).join('') + '</ul>';
+        }
+        resultDiv.innerHTML = html;
         loadCompanies();
         loadStats();
     }
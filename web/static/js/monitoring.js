@@ -11,7 +11,7 @@
 let _monitoringStats = null;
 let _monitoringFeed = [];
 let _monitoringMonitors = [];
-let _monitoringFeedOffset = 0;
+let _monitoringFeedCursor = null; // next_cursor of the last loaded page
 let _monitoringFeedLimit = 50;
 let _monitoringFeedFilters = {};   // {change_type, severity, is_read}
 let _monitoringFeedHasMore = false;
@@ -34,7 +34,7 @@ async function initMonitoring() {
     _renderMonitoringSkeleton(container);
 
     // Reset pagination state
-    _monitoringFeedOffset = 0;
+    _monitoringFeedCursor = null;
     _monitoringFeedHasMore = false;
 
     await Promise.all([
@@ -123,10 +123,13 @@ async function _loadChangeFeed(append) {
     if (!currentProjectId) return;
 
     if (!append) {
-        _monitoringFeedOffset = 0;
+        _monitoringFeedCursor = null;
     }
 
-    let url = `/api/monitoring/feed?project_id=${currentProjectId}&limit=${_monitoringFeedLimit}&offset=${_monitoringFeedOffset}`;
+    let url = `/api/monitoring/feed?project_id=${currentProjectId}&limit=${_monitoringFeedLimit}`;
+    if (append && _monitoringFeedCursor) {
+        url += `&cursor=${encodeURIComponent(_monitoringFeedCursor)}`;
+    }
 
     if (_monitoringFeedFilters.change_type) {
         url += `&change_type=${encodeURIComponent(_monitoringFeedFilters.change_type)}`;
@@ -150,7 +153,8 @@ async function _loadChangeFeed(append) {
             _monitoringFeed = items;
         }
 
-        _monitoringFeedHasMore = items.length >= _monitoringFeedLimit;
+        _monitoringFeedCursor = data.next_cursor || null;
+        _monitoringFeedHasMore = !!_monitoringFeedCursor;
         _renderChangeFeed();
         _updateDesktopBadge();
     } catch (e) {
@@ -273,12 +277,11 @@ function _setFeedFilter(key, value) {
     } else {
         delete _monitoringFeedFilters[key];
     }
-    _monitoringFeedOffset = 0;
+    _monitoringFeedCursor = null;
     _loadChangeFeed();
 }
 
 function _loadMoreFeed() {
-    _monitoringFeedOffset += _monitoringFeedLimit;
     _loadChangeFeed(true);
 }
 
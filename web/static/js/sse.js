@@ -5,6 +5,8 @@
 let eventSource = null;
 let notifItems = [];
 let _sseRetryDelay = 1000;
+let _sseLastEventId = null;
+let _sseProjectId = null;
 const _SSE_MAX_RETRY_DELAY = 30000;
 
 function connectSSE() {
@@ -14,12 +16,25 @@ function connectSSE() {
     }
     if (!currentProjectId) return;
 
-    eventSource = new EventSource(`/api/events/stream?project_id=${currentProjectId}`);
+    // Replay missed events when reconnecting to the same project
+    if (_sseProjectId !== currentProjectId) _sseLastEventId = null;
+    _sseProjectId = currentProjectId;
+    let url = `/api/events/stream?project_id=${currentProjectId}`;
+    if (_sseLastEventId) url += `&last_event_id=${encodeURIComponent(_sseLastEventId)}`;
+    eventSource = new EventSource(url);
 
     eventSource.addEventListener('open', () => {
         _sseRetryDelay = 1000; // reset backoff on successful connection
     });
 
+    // Fell too far behind for replay: refresh everything instead
+    eventSource.addEventListener('resync', (e) => {
+        _sseLastEventId = e.lastEventId || _sseLastEventId;
+        loadCompanies();
+        loadStats();
+        loadTaxonomy();
+    });
+
     eventSource.addEventListener('batch_complete', (e) => {
         const data = JSON.parse(e.data);
         loadCompanies();
@@ -49,6 +64,13 @@ function connectSSE() {
         addNotifBellItem(data.message || 'New company added');
     });
 
+    ['batch_complete', 'taxonomy_changed', 'company_added', 'company_updated',
+     'job_progress', 'job_finished'].forEach(type => {
+        eventSource.addEventListener(type, (e) => {
+            if (e.lastEventId) _sseLastEventId = e.lastEventId;
+        });
+    });
+
     eventSource.onerror = () => {
         if (eventSource) eventSource.close();
         eventSource = null;